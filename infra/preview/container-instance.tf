@@ -38,6 +38,8 @@ resource "oci_container_instances_container_instance" "galley" {
       "GALLEY_BUCKET_NAME"         = oci_objectstorage_bucket.galley.name
       "GALLEY_BUCKET_NAMESPACE"    = data.oci_objectstorage_namespace.current.namespace
       "GALLEY_REGION"              = var.region
+      "GALLEY_STORAGE_BACKEND"     = "object_storage"
+      "GALLEY_SNAPSHOT_RETENTION"  = "10"
       "GALLEY_URL_TOKEN"           = random_password.url_token.result
       "GALLEY_WORK_COMPARTMENT_ID" = local.work_compartment_id
     }
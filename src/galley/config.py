@@ -4,6 +4,8 @@ from pathlib import Path
 
 from pydantic_settings import BaseSettings
 
+from galley.models.session import SessionStatus
+
 _PACKAGE_ROOT = Path(__file__).parent
 _REPO_ROOT = _PACKAGE_ROOT.parent.parent
 
@@ -19,6 +21,56 @@ class ServerConfig(BaseSettings):
     port: int = 8000
     url_token: str = ""
 
+    # セッションキャッシュ（プロセス内LRU）
+    session_cache_size: int = 128
+    session_cache_ttl: float = 300.0
+
+    # セッション保存形式（json / orjson / msgpack）と書き込み時のfsync
+    session_serializer: str = "json"
+    session_fsync: bool = True
+
+    # 回答ジャーナルをsession.jsonへ畳み込むサイズ閾値（バイト）
+    answer_journal_max_bytes: int = 64 * 1024
+
+    # ディスクI/O用スレッドプール（ワーカー数と、空きを待てる処理数の上限）
+    io_workers: int = 4
+    io_queue_depth: int = 64
+
+    # セッションの保存先（local / sqlite / object_storage）
+    storage_backend: str = "local"
+
+    # SQLiteバックエンドの接続プールサイズ（スレッド数）
+    sqlite_pool_size: int = 4
+
+    # セッションGC（保持ポリシーはすべて0で無効。いずれかを設定するとバックグラウンドで定期実行）
+    session_gc_interval: float = 3600.0
+    session_gc_batch_size: int = 50
+    session_retention_days: float = 0.0
+    session_retention_statuses: list[SessionStatus] = ["completed"]
+    session_storage_budget_bytes: int = 0
+    snapshot_retention: int = 0
+
+    # 長時間かかる操作（Terraform・ビルド/デプロイ）のジョブ同時実行数
+    job_max_concurrency: int = 2
+
+    # Resource Managerジョブのポーリング間隔（秒）。初期間隔から最大間隔まで徐々に伸ばす
+    rm_poll_initial_interval: float = 2.0
+    rm_poll_max_interval: float = 15.0
+
+    # Terraform plan結果を再利用する期間（秒）。0以下で無効
+    plan_cache_ttl: float = 600.0
+
+    # 読み取り系のOCI CLIコマンドとデプロイ時のOCI操作をプロセス内のSDKで実行する
+    oci_sdk_enabled: bool = True
+
+    # 読み取り系OCI CLIコマンドの結果を再利用する期間（秒）。サービスごとの指定が優先。0以下で無効
+    oci_cli_cache_ttl: float = 60.0
+    oci_cli_cache_service_ttls: dict[str, float] = {"iam": 600.0}
+    oci_cli_cache_max_entries: int = 256
+
+    # run_oci_cli_batchで同時に実行するOCI CLIコマンド数
+    oci_cli_batch_concurrency: int = 4
+
     # Object Storage (Terraform自動設定)
     bucket_name: str = ""
     bucket_namespace: str = ""
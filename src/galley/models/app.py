@@ -1,6 +1,6 @@
 """アプリケーション層関連のデータモデル。"""
 
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any, Literal
 
 from pydantic import BaseModel, Field
@@ -46,3 +46,29 @@ class AppStatus(BaseModel):
     endpoint: str | None = None
     health_check: dict[str, Any] | None = None
     last_deployed_at: datetime | None = None
+
+
+class SnapshotFile(BaseModel):
+    """スナップショットに含まれるファイルのエントリ。"""
+
+    digest: str  # 内容のSHA-256（ブロブのキー）
+    size: int
+    mode: int = 0o644
+    mtime_ns: int = 0  # 変更検知用（次回スナップショット時にハッシュ計算を省略する）
+
+
+class AppSnapshot(BaseModel):
+    """アプリケーションコードのスナップショット（マニフェスト）。"""
+
+    snapshot_id: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    files: dict[str, SnapshotFile] = Field(default_factory=dict)
+
+
+class SnapshotInfo(BaseModel):
+    """スナップショットの概要。"""
+
+    snapshot_id: str
+    created_at: datetime
+    file_count: int
+    total_bytes: int
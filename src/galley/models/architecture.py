@@ -1,10 +1,15 @@
 """アーキテクチャ関連のデータモデル。"""
 
 import uuid
+from collections.abc import Iterable
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, Self, SupportsIndex, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from galley.models.validation import ValidationResult
+
+_T = TypeVar("_T")
 
 
 class Component(BaseModel):
@@ -26,12 +31,284 @@ class Connection(BaseModel):
     description: str
 
 
+class _TrackedList(list[_T]):
+    """変更のたびに ``version`` を増やすリスト。
+
+    Architectureのcomponents/connectionsに使い、メソッドを経由しない変更（要素の置き換えを含む）を
+    索引が検知できるようにする。
+    """
+
+    version = 0
+
+    def _changed(self) -> None:
+        self.version += 1
+
+    def __setitem__(self, *args: Any) -> None:
+        self._changed()
+        super().__setitem__(*args)
+
+    def __delitem__(self, *args: Any) -> None:
+        self._changed()
+        super().__delitem__(*args)
+
+    def __iadd__(self, other: Iterable[_T]) -> Self:  # type: ignore[misc,override]
+        self._changed()
+        return super().__iadd__(other)
+
+    def __imul__(self, n: SupportsIndex) -> Self:
+        self._changed()
+        return super().__imul__(n)
+
+    def append(self, *args: Any) -> None:
+        self._changed()
+        super().append(*args)
+
+    def extend(self, *args: Any) -> None:
+        self._changed()
+        super().extend(*args)
+
+    def insert(self, *args: Any) -> None:
+        self._changed()
+        super().insert(*args)
+
+    def remove(self, *args: Any) -> None:
+        self._changed()
+        super().remove(*args)
+
+    def pop(self, *args: Any) -> Any:
+        self._changed()
+        return super().pop(*args)
+
+    def clear(self) -> None:
+        self._changed()
+        super().clear()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        self._changed()
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._changed()
+        super().reverse()
+
+
+def _version(items: list[Any]) -> int:
+    return items.version if isinstance(items, _TrackedList) else -1
+
+
+def _remove_identical(items: list[Any], item: Any) -> bool:
+    """リストから同一オブジェクトの要素を削除する。含まれない場合は False。
+
+    ``list.remove`` は等価比較（フィールドの比較）を行うため、同一性で位置を探す（O(n)）。
+    """
+    for position, candidate in enumerate(items):
+        if candidate is item:
+            del items[position]
+            return True
+    return False
+
+
+class _ArchitectureIndex:
+    """コンポーネントID・接続元・接続先からの索引。
+
+    Architectureのcomponents/connectionsと同じオブジェクトを参照する派生データのため、
+    シリアライズもコピーもしない（コピー先では必要になった時点で作り直す）。
+    """
+
+    def __init__(self, components: list[Component], connections: list[Connection]) -> None:
+        self.components: dict[str, Component] = {c.id: c for c in components}
+        self.outgoing: dict[str, list[Connection]] = {}
+        self.incoming: dict[str, list[Connection]] = {}
+        for conn in connections:
+            self.add_connection(conn)
+        self.sync(components, connections)
+
+    def sync(self, components: list[Component], connections: list[Connection]) -> None:
+        """索引を更新した時点のリストの状態（版と長さ）を記録する。"""
+        self.state = (_version(components), len(components), _version(connections), len(connections))
+
+    def is_stale(self, components: list[Component], connections: list[Connection]) -> bool:
+        """リストが索引の構築・更新時から（索引を経由せずに）変更されていれば True。"""
+        return self.state != (_version(components), len(components), _version(connections), len(connections))
+
+    def add_connection(self, connection: Connection) -> None:
+        self.outgoing.setdefault(connection.source_id, []).append(connection)
+        self.incoming.setdefault(connection.target_id, []).append(connection)
+
+    def remove_connection(self, connection: Connection) -> None:
+        for bucket, key in ((self.outgoing, connection.source_id), (self.incoming, connection.target_id)):
+            remaining = [c for c in bucket.get(key, []) if c is not connection]
+            if remaining:
+                bucket[key] = remaining
+            else:
+                bucket.pop(key, None)
+
+    def __copy__(self) -> None:
+        return None
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> None:
+        return None
+
+
 class Architecture(BaseModel):
-    """OCIアーキテクチャ定義。"""
+    """OCIアーキテクチャ定義。
+
+    コンポーネント・接続の参照と変更は ``get_component`` / ``add_component`` などのメソッドを使う。
+    これらはIDの索引を使うため、コンポーネント数によらず一定時間で対象を見つけられる。
+    ただし削除はリスト上の位置を探すため、リストの長さに比例する時間がかかる。
+    """
 
     session_id: str
     components: list[Component] = Field(default_factory=list)
     connections: list[Connection] = Field(default_factory=list)
     validation_results: list[Any] | None = None
+    # validation_resultsを生成したバリデーションルールのダイジェスト（差分検証の可否判定用）
+    validation_rules_digest: str | None = None
+    # 前回の検証以降に変更されたコンポーネントのID（差分検証用）
+    dirty_component_ids: list[str] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    _index: _ArchitectureIndex | None = PrivateAttr(default=None)
+    # dirty_component_idsの重複確認用の集合（未構築の場合はNone）
+    _dirty: set[str] | None = PrivateAttr(default=None)
+
+    def model_post_init(self, context: Any, /) -> None:
+        # 索引がメソッドを経由しない変更を検知できるよう、変更を記録するリストに置き換える
+        self.__dict__["components"] = _TrackedList(self.components)
+        self.__dict__["connections"] = _TrackedList(self.connections)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ("components", "connections"):
+            value = _TrackedList(value)
+        super().__setattr__(name, value)
+        if name in ("components", "connections"):
+            self._index = None
+        elif name == "dirty_component_ids":
+            self._dirty = None
+
+    def _get_index(self, *, rebuild: bool = False) -> _ArchitectureIndex:
+        """索引を返す。
+
+        未構築の場合、メソッドを経由せずにリストが変更された場合（要素の追加・削除・置き換え）、
+        rebuild が True の場合は作り直す。リストの要素自体のIDの変更は検知できないため、
+        参照・削除の時点で食い違いが見つかった場合にのみ作り直す。
+        """
+        index = self._index
+        if rebuild or index is None or index.is_stale(self.components, self.connections):
+            index = _ArchitectureIndex(self.components, self.connections)
+            self._index = index
+        return index
+
+    def get_component(self, component_id: str) -> Component | None:
+        """IDに対応するコンポーネントを返す。存在しない場合はNone。"""
+        component = self._get_index().components.get(component_id)
+        if component is not None and component.id != component_id:
+            # 索引の構築後にIDが変更されている
+            component = self._get_index(rebuild=True).components.get(component_id)
+        return component
+
+    def outgoing_connections(self, component_id: str) -> list[Connection]:
+        """コンポーネントを接続元とする接続を返す。"""
+        return list(self._get_index().outgoing.get(component_id, []))
+
+    def incoming_connections(self, component_id: str) -> list[Connection]:
+        """コンポーネントを接続先とする接続を返す。"""
+        return list(self._get_index().incoming.get(component_id, []))
+
+    def add_component(self, component: Component) -> None:
+        """コンポーネントを末尾に追加する。
+
+        Args:
+            component: 追加するコンポーネント。
+        """
+        index = self._get_index()
+        self.components.append(component)
+        index.components[component.id] = component
+        index.sync(self.components, self.connections)
+
+    def remove_component(self, component_id: str) -> list[Connection] | None:
+        """コンポーネントと、それを接続元・接続先とする接続を削除する。
+
+        対象は索引で見つけるが、リストからの削除は位置を探すため
+        O(コンポーネント数 + 削除する接続数 × 接続数) の時間がかかる。
+
+        Args:
+            component_id: 削除するコンポーネントID。
+
+        Returns:
+            削除した接続のリスト。コンポーネントが存在しない場合はNone。
+        """
+        index = self._get_index()
+        component = index.components.get(component_id)
+        if component is None or component.id != component_id or not _remove_identical(self.components, component):
+            # 索引がリストと食い違っている（要素が直接置き換えられた）場合は作り直して探し直す
+            index = self._get_index(rebuild=True)
+            component = index.components.get(component_id)
+            if component is None:
+                return None
+            _remove_identical(self.components, component)
+        del index.components[component_id]
+
+        # 自己参照の接続は接続元・接続先の両方に現れるため重複を除く
+        incident = {id(c): c for c in index.outgoing.get(component_id, []) + index.incoming.get(component_id, [])}
+        for conn in incident.values():
+            _remove_identical(self.connections, conn)
+            index.remove_connection(conn)
+        index.sync(self.components, self.connections)
+        return list(incident.values())
+
+    def add_connection(self, connection: Connection) -> None:
+        """接続を末尾に追加する。
+
+        Args:
+            connection: 追加する接続。
+        """
+        index = self._get_index()
+        self.connections.append(connection)
+        index.add_connection(connection)
+        index.sync(self.components, self.connections)
+
+    def remove_connection(self, connection: Connection) -> None:
+        """接続を削除する。
+
+        リストからの削除は位置を探すため、O(接続数) の時間がかかる。
+
+        Args:
+            connection: 削除する接続（``connections`` に含まれるオブジェクト）。
+
+        Raises:
+            ValueError: 接続が ``connections`` に含まれない場合。
+        """
+        index = self._get_index()
+        if not _remove_identical(self.connections, connection):
+            raise ValueError("connection is not in connections")
+        index.remove_connection(connection)
+        index.sync(self.components, self.connections)
+
+    def mark_dirty(self, *component_ids: str) -> None:
+        """コンポーネントを前回の検証以降に変更されたものとして記録する。
+
+        接続の追加・削除は両端のコンポーネントを記録する。検証結果が無い場合は次回の検証が
+        全件検証になるため記録しない。
+
+        Args:
+            component_ids: 変更されたコンポーネントのID。
+        """
+        if self.validation_results is None:
+            return
+        recorded = self._dirty
+        if recorded is None:
+            recorded = self._dirty = set(self.dirty_component_ids)
+        for component_id in component_ids:
+            if component_id not in recorded:
+                recorded.add(component_id)
+                self.dirty_component_ids.append(component_id)
+
+
+class ArchitecturePatchResult(BaseModel):
+    """アーキテクチャの一括変更（patch_architecture）の結果。"""
+
+    results: list[dict[str, Any]]  # 操作ごとの結果（操作と同じ順序）
+    # 適用後の検証結果。検証を指定しなかった場合、アーキテクチャが無く検証できなかった場合はNone
+    validation: list[ValidationResult] | None = None
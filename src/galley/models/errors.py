@@ -48,6 +48,14 @@ class ComponentNotFoundError(GalleyError):
         self.component_id = component_id
 
 
+class PatchOperationError(GalleyError):
+    """patch_architectureの操作を適用できない場合の例外。"""
+
+    def __init__(self, index: int, message: str) -> None:
+        super().__init__(f"Patch operation {index} failed: {message}. No operations were applied.")
+        self.index = index
+
+
 class StorageError(GalleyError):
     """ストレージ操作のエラー。"""
 
@@ -109,3 +117,19 @@ class AppNotScaffoldedError(GalleyError):
     def __init__(self, session_id: str) -> None:
         super().__init__(f"Application not scaffolded for session: {session_id}")
         self.session_id = session_id
+
+
+class SnapshotNotFoundError(GalleyError):
+    """スナップショットが存在しない場合の例外。"""
+
+    def __init__(self, snapshot_id: str) -> None:
+        super().__init__(f"Snapshot not found: {snapshot_id}")
+        self.snapshot_id = snapshot_id
+
+
+class JobNotFoundError(GalleyError):
+    """ジョブが存在しない場合の例外。"""
+
+    def __init__(self, job_id: str) -> None:
+        super().__init__(f"Job not found: {job_id}")
+        self.job_id = job_id
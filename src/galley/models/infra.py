@@ -27,6 +27,7 @@ class TerraformResult(BaseModel):
     exit_code: int
     plan_summary: str | None = None
     errors: list[TerraformErrorDetail] | None = None
+    cached: bool = False  # 前回のplan結果を再利用した場合はTrue
 
 
 class CLIResult(BaseModel):
@@ -37,6 +38,17 @@ class CLIResult(BaseModel):
     stderr: str
     exit_code: int
     setup_hint: str | None = None
+    cached: bool = False  # 読み取り系コマンドのキャッシュ済み結果を返した場合True
+
+
+class CLIBatchItem(BaseModel):
+    """OCI CLI一括実行の1コマンドの結果。"""
+
+    command: str
+    result: CLIResult | None = None
+    error: str | None = None  # コマンドを実行できなかった場合のエラー種別
+    message: str | None = None
+    duration_seconds: float = 0.0  # 実行時間（同時実行数の空き待ちを含まない）
 
 
 RMJobStatus = Literal["ACCEPTED", "IN_PROGRESS", "SUCCEEDED", "FAILED", "CANCELING", "CANCELED"]
@@ -61,3 +73,37 @@ class RMJob(BaseModel):
     operation: Literal["PLAN", "APPLY", "DESTROY"]
     lifecycle_state: RMJobStatus
     log_location: str | None = None
+
+
+class RMPollerMetrics(BaseModel):
+    """RMジョブポーラーの統計情報。"""
+
+    polls: int = 0  # ポーリング（バッチ）回数
+    api_calls: int = 0  # get_job / list_jobs の呼び出し回数
+    poll_errors: int = 0
+    jobs_tracked: int = 0
+    jobs_completed: int = 0
+    in_flight: int = 0
+    # ジョブ終了（time_finished）から検知までの遅延
+    detection_count: int = 0
+    detection_latency_avg_seconds: float = 0.0
+    detection_latency_max_seconds: float = 0.0
+
+
+class CLICacheMetrics(BaseModel):
+    """OCI CLI結果キャッシュの統計情報。"""
+
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0  # force指定でキャッシュを使わなかった回数
+    evictions: int = 0  # 件数の上限で破棄した件数
+    invalidations: int = 0  # 変更系コマンドの実行で破棄した件数
+    entries: int = 0
+
+
+class PlanCacheMetrics(BaseModel):
+    """plan結果キャッシュの統計情報。"""
+
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
@@ -0,0 +1,36 @@
+"""非同期ジョブ関連のデータモデル。"""
+
+import uuid
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+JobKind = Literal["terraform_plan", "terraform_apply", "terraform_destroy", "build_and_deploy"]
+JobStatus = Literal["queued", "running", "succeeded", "failed", "canceled"]
+
+# 終了状態
+TERMINAL_JOB_STATUSES: frozenset[JobStatus] = frozenset({"succeeded", "failed", "canceled"})
+
+
+class Job(BaseModel):
+    """長時間かかるツール操作の実行単位。"""
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    kind: JobKind
+    session_id: str
+    status: JobStatus = "queued"
+    params: dict[str, Any] = Field(default_factory=dict)
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    rm_job_id: str | None = None  # Resource Managerジョブ（再起動後の再開に使う）
+    progress_lines: int = 0  # 進捗として報告されたログの行数
+    progress_message: str | None = None  # 最新の進捗メッセージ（ログの最終行）
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @property
+    def done(self) -> bool:
+        """終了状態かどうか。"""
+        return self.status in TERMINAL_JOB_STATUSES
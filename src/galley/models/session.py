@@ -45,5 +45,6 @@ class Session(BaseModel):
     hearing_result: HearingResult | None = None
     architecture: Architecture | None = None
     rm_stack_id: str | None = None
+    rm_stack_hash: str | None = None  # RMスタックに最後にアップロードした構成のハッシュ
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -0,0 +1,18 @@
+"""ストレージ管理関連のデータモデル。"""
+
+from datetime import UTC, datetime
+
+from pydantic import BaseModel, Field
+
+
+class GCReport(BaseModel):
+    """セッションガベージコレクションの実行結果。"""
+
+    started_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    finished_at: datetime | None = None
+    deleted_sessions: list[str] = Field(default_factory=list)
+    pruned_snapshots: int = 0
+    skipped_locked: int = 0
+    skipped_in_use: int = 0  # ジョブ・Terraform操作の実行中、RMスタック作成済み、デプロイ済みで削除しなかった数
+    reclaimed_bytes: int = 0
+    total_bytes: int | None = None
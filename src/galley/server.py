@@ -1,24 +1,69 @@
 """FastMCPベースのMCPサーバーエントリポイント。"""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
 from fastmcp import FastMCP
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from galley.config import ServerConfig
+from galley.models.errors import StorageError
 from galley.prompts.infra import register_infra_prompts
 from galley.prompts.workflow import register_workflow_prompts
 from galley.resources.design import register_design_resources
 from galley.resources.hearing import register_hearing_resources
 from galley.services.app import AppService
+from galley.services.cli_cache import CLIResultCache
 from galley.services.design import DesignService
 from galley.services.hearing import HearingService
 from galley.services.infra import InfraService
+from galley.services.jobs import JobService
+from galley.services.oci_sdk import OCISDKExecutor
+from galley.storage.gc import SessionGarbageCollector
+from galley.storage.object_storage import ObjectStorageService
+from galley.storage.oci_client import OCIClientFactory
+from galley.storage.serializers import get_serializer
 from galley.storage.service import StorageService
+from galley.storage.sqlite import SQLiteStorageService
 from galley.tools.app import register_app_tools
 from galley.tools.design import register_design_tools
 from galley.tools.export import register_export_tools
 from galley.tools.hearing import register_hearing_tools
 from galley.tools.infra import register_infra_tools
+from galley.tools.jobs import register_job_tools
+
+
+def _create_storage(config: ServerConfig, client_factory: OCIClientFactory) -> StorageService:
+    """設定に応じたストレージサービスを作成する。
+
+    Raises:
+        StorageError: 未知のバックエンドが指定された場合。
+    """
+    options: dict[str, Any] = {
+        "cache_size": config.session_cache_size,
+        "cache_ttl": config.session_cache_ttl,
+        "serializer": get_serializer(config.session_serializer),
+        "fsync": config.session_fsync,
+        "journal_max_bytes": config.answer_journal_max_bytes,
+        "io_workers": config.io_workers,
+        "io_queue_depth": config.io_queue_depth,
+    }
+    if config.storage_backend == "local":
+        return StorageService(data_dir=config.data_dir, **options)
+    if config.storage_backend == "sqlite":
+        return SQLiteStorageService(data_dir=config.data_dir, pool_size=config.sqlite_pool_size, **options)
+    if config.storage_backend == "object_storage":
+        return ObjectStorageService(
+            data_dir=config.data_dir,
+            namespace=config.bucket_namespace,
+            bucket_name=config.bucket_name,
+            region=config.region,
+            client_factory=client_factory,
+            **options,
+        )
+    raise StorageError(f"Unknown storage backend: {config.storage_backend}")
 
 
 def create_server(config: ServerConfig | None = None) -> FastMCP:
@@ -33,16 +78,63 @@ def create_server(config: ServerConfig | None = None) -> FastMCP:
     if config is None:
         config = ServerConfig()
 
-    mcp = FastMCP("galley")
-
-    # データアクセス層
-    storage = StorageService(data_dir=config.data_dir)
+    # データアクセス層（OCI SDKの認証情報・クライアントは全サービスで共有する）
+    oci_clients = OCIClientFactory(region=config.region)
+    storage = _create_storage(config, oci_clients)
+    job_service = JobService(storage, max_concurrency=config.job_max_concurrency)
+    oci_sdk = OCISDKExecutor(oci_clients) if config.oci_sdk_enabled else None
+
+    @asynccontextmanager
+    async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+        # 前回の起動時に完了しなかったジョブを再開する（初回のみ）
+        await job_service.recover()
+        # セッションGCはサーバー稼働中のみバックグラウンドで実行する
+        session_gc.start()
+        try:
+            yield
+        finally:
+            await session_gc.stop()
+            # 接続ごとにlifespanが繰り返されるため、いずれも次回の利用時に起動し直せる形で停止する。
+            # ジョブはRMジョブの監視より先に止め、監視の終了をジョブのキャンセルとして扱わないようにする
+            await job_service.close()
+            await infra_service.rm_poller.close()
+            await storage.close()
+
+    mcp = FastMCP("galley", lifespan=lifespan)
 
     # サービス層
     hearing_service = HearingService(storage=storage, config_dir=config.config_dir)
     design_service = DesignService(storage=storage, config_dir=config.config_dir)
-    infra_service = InfraService(storage=storage, config_dir=config.config_dir)
-    app_service = AppService(storage=storage, config_dir=config.config_dir, config=config)
+    infra_service = InfraService(
+        storage=storage,
+        config_dir=config.config_dir,
+        poll_initial_interval=config.rm_poll_initial_interval,
+        poll_max_interval=config.rm_poll_max_interval,
+        plan_cache_ttl=config.plan_cache_ttl,
+        jobs=job_service,
+        oci_sdk=oci_sdk,
+        client_factory=oci_clients,
+        cli_cache=CLIResultCache(
+            config.oci_cli_cache_ttl,
+            service_ttls=config.oci_cli_cache_service_ttls,
+            max_entries=config.oci_cli_cache_max_entries,
+        ),
+        cli_batch_concurrency=config.oci_cli_batch_concurrency,
+    )
+    app_service = AppService(
+        storage=storage, config_dir=config.config_dir, config=config, jobs=job_service, oci_sdk=oci_sdk
+    )
+    # ジョブ・Terraform操作の実行中やデプロイ済みのセッションはGCで削除しない
+    session_gc = SessionGarbageCollector(
+        storage,
+        retention_days=config.session_retention_days,
+        retention_statuses=config.session_retention_statuses,
+        max_total_bytes=config.session_storage_budget_bytes,
+        snapshot_retention=config.snapshot_retention,
+        interval=config.session_gc_interval,
+        batch_size=config.session_gc_batch_size,
+        busy_checks=(job_service.has_active_job, infra_service.has_running_operation, app_service.has_deployment),
+    )
 
     # MCPインターフェース登録 — ヒアリング層
     register_hearing_tools(mcp, hearing_service, config_dir=config.config_dir)
@@ -55,6 +147,7 @@ def create_server(config: ServerConfig | None = None) -> FastMCP:
 
     # MCPインターフェース登録 — インフラ層
     register_infra_tools(mcp, infra_service)
+    register_job_tools(mcp, job_service)
 
     # MCPインターフェース登録 — アプリケーション層
     register_app_tools(mcp, app_service)
@@ -11,16 +11,21 @@ import tarfile
 import tempfile
 import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
-from galley.models.app import AppStatus, DeployResult, TemplateMetadata
+from galley.models.app import AppStatus, DeployResult, SnapshotInfo, TemplateMetadata
 from galley.models.errors import (
     AppNotScaffoldedError,
     ArchitectureNotFoundError,
     ProtectedFileError,
     TemplateNotFoundError,
 )
+from galley.models.jobs import Job
+from galley.services.jobs import JobService
+from galley.services.oci_sdk import OCISDKExecutor
+from galley.storage.io import write_text_file
 from galley.storage.service import StorageService
+from galley.storage.snapshots import SNAPSHOTS_DIRNAME, SnapshotStore
 
 if TYPE_CHECKING:
     from galley.config import ServerConfig
@@ -28,6 +33,9 @@ if TYPE_CHECKING:
 # ファイルパスで禁止するパターン
 _DISALLOWED_PATH_PATTERNS = ("..", "~")
 
+# instance-agentコマンドの終了状態
+_COMMAND_TERMINAL_STATES = ("SUCCEEDED", "FAILED", "CANCELED", "TIMED_OUT")
+
 
 def _validate_file_path(file_path: str) -> str:
     """ファイルパスのトラバーサルを検証する。
@@ -49,6 +57,12 @@ def _validate_file_path(file_path: str) -> str:
     return file_path
 
 
+def _create_tarball(source_dir: Path, tarball_path: str) -> None:
+    """ディレクトリをtar.gzにまとめる。"""
+    with tarfile.open(tarball_path, "w:gz") as tar:
+        tar.add(str(source_dir), arcname=".")
+
+
 class AppService:
     """アプリケーションのテンプレート管理・デプロイを行う。"""
 
@@ -57,11 +71,23 @@ class AppService:
         storage: StorageService,
         config_dir: Path,
         config: ServerConfig | None = None,
+        jobs: JobService | None = None,
+        oci_sdk: OCISDKExecutor | None = None,
     ) -> None:
         self._storage = storage
         self._config_dir = config_dir
         self._templates_dir = config_dir / "templates"
         self._config = config
+        # ビルド・デプロイのジョブ管理
+        self._jobs = jobs or JobService(storage)
+        # OCI操作をプロセス内で実行するSDK実行器（利用できない場合はOCI CLIを使う）
+        self._oci_sdk = oci_sdk
+
+    def _sdk(self) -> OCISDKExecutor | None:
+        """利用可能なSDK実行器を返す。利用できない場合はNone。"""
+        if self._oci_sdk is not None and self._oci_sdk.available:
+            return self._oci_sdk
+        return None
 
     def _app_dir(self, session_id: str) -> Path:
         """セッションのアプリケーションディレクトリを返す。"""
@@ -71,7 +97,11 @@ class AppService:
     def _snapshots_dir(self, session_id: str) -> Path:
         """セッションのスナップショットディレクトリを返す。"""
         session_dir = self._storage.get_session_dir(session_id)
-        return session_dir / "snapshots"
+        return session_dir / SNAPSHOTS_DIRNAME
+
+    def _snapshot_store(self, session_id: str) -> SnapshotStore:
+        """セッションのスナップショットストアを返す。"""
+        return SnapshotStore(self._snapshots_dir(session_id))
 
     def _load_template_metadata(self, template_name: str) -> TemplateMetadata:
         """テンプレートメタデータを読み込む。
@@ -143,20 +173,38 @@ class AppService:
             ArchitectureNotFoundError: アーキテクチャが未設定の場合。
             TemplateNotFoundError: テンプレートが見つからない場合。
         """
-        session = await self._storage.load_session(session_id)
-        if session.architecture is None:
-            raise ArchitectureNotFoundError(session_id)
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            if session.architecture is None:
+                raise ArchitectureNotFoundError(session_id)
 
-        metadata = self._load_template_metadata(template_name)
+            metadata = self._load_template_metadata(template_name)
 
-        # テンプレートのappディレクトリを取得
-        safe_name = Path(template_name).name
-        template_app_dir = self._templates_dir / safe_name / "app"
-        if not template_app_dir.exists():
-            raise TemplateNotFoundError(template_name)
+            # テンプレートのappディレクトリを取得
+            safe_name = Path(template_name).name
+            template_app_dir = self._templates_dir / safe_name / "app"
+            if not template_app_dir.exists():
+                raise TemplateNotFoundError(template_name)
+
+            # ファイルのコピー・置換はI/Oスレッドで行う
+            app_dir = self._app_dir(session_id)
+            files = await self._storage.run_io(self._copy_template, template_app_dir, app_dir, metadata, params)
+
+            return {
+                "project_path": str(app_dir),
+                "template_name": metadata.name,
+                "files": sorted(files),
+            }
 
+    @staticmethod
+    def _copy_template(
+        template_app_dir: Path,
+        app_dir: Path,
+        metadata: TemplateMetadata,
+        params: dict[str, object],
+    ) -> list[str]:
+        """テンプレートをプロジェクトディレクトリにコピーし、生成されたファイル一覧を返す。"""
         # プロジェクトディレクトリにコピー
-        app_dir = self._app_dir(session_id)
         if app_dir.exists():
             shutil.rmtree(app_dir)
         shutil.copytree(template_app_dir, app_dir)
@@ -179,13 +227,7 @@ class AppService:
                 continue
 
         # 生成されたファイル一覧
-        files = [str(f.relative_to(app_dir)) for f in app_dir.rglob("*") if f.is_file()]
-
-        return {
-            "project_path": str(app_dir),
-            "template_name": metadata.name,
-            "files": sorted(files),
-        }
+        return [str(f.relative_to(app_dir)) for f in app_dir.rglob("*") if f.is_file()]
 
     async def update_app_code(
         self,
@@ -211,31 +253,31 @@ class AppService:
         """
         validated_path = _validate_file_path(file_path)
 
-        await self._storage.load_session(session_id)
+        async with self._storage.session_lock(session_id):
+            await self._storage.load_session(session_id)
 
-        app_dir = self._app_dir(session_id)
-        if not app_dir.exists():
-            raise AppNotScaffoldedError(session_id)
+            app_dir = self._app_dir(session_id)
+            if not app_dir.exists():
+                raise AppNotScaffoldedError(session_id)
 
-        # テンプレートメタデータからprotected_pathsを取得
-        protected_paths = self._get_protected_paths(session_id)
-        for pattern in protected_paths:
-            if fnmatch.fnmatch(validated_path, pattern):
-                raise ProtectedFileError(validated_path)
+            # テンプレートメタデータからprotected_pathsを取得
+            protected_paths = self._get_protected_paths(session_id)
+            for pattern in protected_paths:
+                if fnmatch.fnmatch(validated_path, pattern):
+                    raise ProtectedFileError(validated_path)
 
-        # スナップショット保存
-        snapshot_id = await self._save_snapshot(session_id)
+            # スナップショット保存
+            snapshot_id = await self._save_snapshot(session_id)
 
-        # ファイル更新
-        target_file = app_dir / validated_path
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        target_file.write_text(new_content, encoding="utf-8")
+            # ファイル更新
+            target_file = app_dir / validated_path
+            await self._storage.run_io(write_text_file, target_file, new_content)
 
-        return {
-            "success": True,
-            "snapshot_id": snapshot_id,
-            "file_path": validated_path,
-        }
+            return {
+                "success": True,
+                "snapshot_id": snapshot_id,
+                "file_path": validated_path,
+            }
 
     def _get_protected_paths(self, session_id: str) -> list[str]:
         """セッションのアプリに関連するprotected_pathsを取得する。"""
@@ -256,28 +298,78 @@ class AppService:
     async def _save_snapshot(self, session_id: str) -> str:
         """アプリディレクトリのスナップショットを保存する。
 
+        変更のないファイルは既存のブロブを参照するため、増えるのは変更分のみ。
+
         Args:
             session_id: セッションID。
 
         Returns:
             スナップショットID。
         """
-        import uuid
+        store = self._snapshot_store(session_id)
+        info = await self._storage.run_io(store.create, self._app_dir(session_id))
+        return info.snapshot_id
 
-        app_dir = self._app_dir(session_id)
-        snapshot_id = str(uuid.uuid4())[:8]
-        snapshots_dir = self._snapshots_dir(session_id)
-        snapshot_dir = snapshots_dir / snapshot_id
+    async def list_snapshots(self, session_id: str) -> list[SnapshotInfo]:
+        """アプリケーションコードのスナップショット一覧を新しい順に返す。
+
+        Args:
+            session_id: セッションID。
+
+        Returns:
+            スナップショットの概要のリスト。
 
-        shutil.copytree(app_dir, snapshot_dir)
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+        """
+        await self._storage.load_session(session_id)
+        return await self._storage.run_io(self._snapshot_store(session_id).list_snapshots)
+
+    async def restore_snapshot(self, session_id: str, snapshot_id: str) -> dict[str, object]:
+        """アプリケーションコードをスナップショットの状態に戻す。
+
+        復元前の状態もスナップショットとして保存するため、復元自体を取り消せる。
 
-        return snapshot_id
+        Args:
+            session_id: セッションID。
+            snapshot_id: 復元するスナップショットのID。
+
+        Returns:
+            復元結果（復元前の状態のスナップショットID含む）。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+            SnapshotNotFoundError: スナップショットが存在しない場合。
+        """
+        async with self._storage.session_lock(session_id):
+            await self._storage.load_session(session_id)
+            store = self._snapshot_store(session_id)
+            await self._storage.run_io(store.get, snapshot_id)
+
+            app_dir = self._app_dir(session_id)
+            backup_id: str | None = None
+            current = None
+            if app_dir.exists():
+                backup_id = await self._save_snapshot(session_id)
+                current = await self._storage.run_io(store.get, backup_id)
+            restored = await self._storage.run_io(store.restore, snapshot_id, app_dir, current)
+
+            return {
+                "success": True,
+                "snapshot_id": snapshot_id,
+                "backup_snapshot_id": backup_id,
+                "file_count": len(restored.files),
+            }
 
     def _k8s_dir(self, session_id: str) -> Path:
         """セッションのK8sマニフェストディレクトリを返す。"""
         session_dir = self._storage.get_session_dir(session_id)
         return session_dir / "k8s"
 
+    def has_deployment(self, session_id: str) -> bool:
+        """セッションのアプリケーションをOKEへデプロイしたこと（K8sマニフェストの生成）があるかどうか。"""
+        return self._k8s_dir(session_id).exists()
+
     def _kubeconfig_path(self, session_id: str) -> Path:
         """セッションのkubeconfigファイルパスを返す。"""
         session_dir = self._storage.get_session_dir(session_id)
@@ -420,6 +512,14 @@ spec:
         kubeconfig = self._kubeconfig_path(session_id)
         kubeconfig.parent.mkdir(parents=True, exist_ok=True)
 
+        sdk = self._sdk()
+        if sdk is not None:
+            try:
+                await sdk.create_kubeconfig(cluster_id, kubeconfig)
+            except Exception as e:
+                raise RuntimeError(f"Failed to get kubeconfig: {e}") from e
+            return kubeconfig
+
         args = [
             "oci",
             "ce",
@@ -466,13 +566,20 @@ spec:
             tmp_path = tmp.name
 
         try:
-            with tarfile.open(tmp_path, "w:gz") as tar:
-                tar.add(str(app_dir), arcname=".")
+            await self._storage.run_io(_create_tarball, app_dir, tmp_path)
 
             config = self._config
             if not config or not config.bucket_name or not config.bucket_namespace:
                 raise RuntimeError("Object Storage configuration is not set")
 
+            sdk = self._sdk()
+            if sdk is not None:
+                try:
+                    await sdk.put_object(config.bucket_namespace, config.bucket_name, object_name, Path(tmp_path))
+                except Exception as e:
+                    raise RuntimeError(f"Failed to upload app tarball: {e}") from e
+                return object_name
+
             auth_args = ["--auth", "resource_principal"] if os.environ.get("OCI_RESOURCE_PRINCIPAL_VERSION") else []
             args = [
                 "oci",
@@ -550,8 +657,38 @@ spec:
         if not compartment_id:
             raise RuntimeError("Compartment ID is not configured. Set GALLEY_WORK_COMPARTMENT_ID environment variable.")
 
-        content_json = json.dumps({"source": {"sourceType": "TEXT", "text": build_script}})
-        target_json = json.dumps({"instanceId": config.build_instance_id})
+        command_id = await self._create_build_command(compartment_id, config.build_instance_id, build_script)
+
+        # 5. コマンド完了を待機
+        cmd_exit_code, output = await self._wait_for_command(command_id, config.build_instance_id)
+        if cmd_exit_code != 0:
+            raise RuntimeError(f"Docker build failed (exit={cmd_exit_code}): {output}")
+
+        return image_uri
+
+    async def _create_build_command(self, compartment_id: str, instance_id: str, script: str) -> str:
+        """Build Instance でスクリプトを実行する instance-agent コマンドを作成する。
+
+        Args:
+            compartment_id: コマンドを作成するコンパートメントのOCID。
+            instance_id: Build InstanceのOCID。
+            script: 実行するスクリプト。
+
+        Returns:
+            コマンドのOCID。
+
+        Raises:
+            RuntimeError: コマンドの作成に失敗した場合。
+        """
+        sdk = self._sdk()
+        if sdk is not None:
+            try:
+                return await sdk.create_instance_agent_command(compartment_id, instance_id, script, 600)
+            except Exception as e:
+                raise RuntimeError(f"Failed to create build command: {e}") from e
+
+        content_json = json.dumps({"source": {"sourceType": "TEXT", "text": script}})
+        target_json = json.dumps({"instanceId": instance_id})
 
         auth_args = ["--auth", "resource_principal"] if os.environ.get("OCI_RESOURCE_PRINCIPAL_VERSION") else []
         args = [
@@ -577,17 +714,10 @@ spec:
         # command ID を取得
         try:
             result = json.loads(stdout)
-            command_id = result["data"]["id"]
+            return str(result["data"]["id"])
         except (json.JSONDecodeError, KeyError) as e:
             raise RuntimeError(f"Failed to parse command create response: {e}") from e
 
-        # 5. コマンド完了を待機
-        cmd_exit_code, output = await self._wait_for_command(command_id, config.build_instance_id)
-        if cmd_exit_code != 0:
-            raise RuntimeError(f"Docker build failed (exit={cmd_exit_code}): {output}")
-
-        return image_uri
-
     @staticmethod
     def _build_script(
         *,
@@ -652,7 +782,22 @@ echo "BUILD_SUCCESS"
         auth_args = ["--auth", "resource_principal"] if os.environ.get("OCI_RESOURCE_PRINCIPAL_VERSION") else []
         start = time.monotonic()
 
+        sdk = self._sdk()
+
         while time.monotonic() - start < max_wait:
+            if sdk is not None:
+                try:
+                    state, sdk_exit_code, sdk_output = await sdk.get_instance_agent_command_execution(
+                        command_id, instance_id
+                    )
+                except Exception:
+                    await asyncio.sleep(poll_interval)
+                    continue
+                if state in _COMMAND_TERMINAL_STATES:
+                    return (sdk_exit_code if sdk_exit_code is not None else -1, sdk_output)
+                await asyncio.sleep(poll_interval)
+                continue
+
             args = [
                 "oci",
                 *auth_args,
@@ -676,7 +821,7 @@ echo "BUILD_SUCCESS"
                 await asyncio.sleep(poll_interval)
                 continue
 
-            if state in ("SUCCEEDED", "FAILED", "CANCELED", "TIMED_OUT"):
+            if state in _COMMAND_TERMINAL_STATES:
                 cmd_exit_code = data["data"].get("content", {}).get("exit-code", -1)
                 output_text = data["data"].get("content", {}).get("output", {}).get("text", "")
                 return (cmd_exit_code, output_text)
@@ -685,6 +830,46 @@ echo "BUILD_SUCCESS"
 
         return (-1, "Build timed out")
 
+    async def submit_build_and_deploy(
+        self,
+        session_id: str,
+        cluster_id: str,
+        image_uri: str | None = None,
+        namespace: str = "default",
+    ) -> Job:
+        """ビルド・デプロイをジョブとして投入し、完了を待たずに返す。
+
+        結果はジョブの ``result`` に DeployResult のJSON表現として保存される。
+
+        Args:
+            session_id: セッションID。
+            cluster_id: OKEクラスタのOCID。
+            image_uri: コンテナイメージURI（未指定時はビルドを実行）。
+            namespace: K8s名前空間。
+
+        Returns:
+            投入したジョブ。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+            AppNotScaffoldedError: アプリが未生成の場合。
+            InfraOperationInProgressError: 同一セッションでジョブが実行中の場合。
+        """
+        await self._storage.load_session(session_id)
+        if not self._app_dir(session_id).exists():
+            raise AppNotScaffoldedError(session_id)
+
+        async def handler(job: Job) -> dict[str, Any]:
+            result = await self.build_and_deploy(session_id, cluster_id, image_uri, namespace)
+            return result.model_dump()
+
+        return await self._jobs.submit(
+            "build_and_deploy",
+            session_id,
+            handler,
+            params={"cluster_id": cluster_id, "image_uri": image_uri, "namespace": namespace},
+        )
+
     async def build_and_deploy(
         self,
         session_id: str,
@@ -730,7 +915,7 @@ echo "BUILD_SUCCESS"
                 )
 
         # 1. K8sマニフェスト生成
-        k8s_dir = self._generate_k8s_manifests(session_id, image_uri, namespace)
+        k8s_dir = await self._storage.run_io(self._generate_k8s_manifests, session_id, image_uri, namespace)
 
         # 2. kubeconfig取得
         try:
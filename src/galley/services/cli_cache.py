@@ -0,0 +1,133 @@
+"""読み取り系OCI CLIコマンドの結果キャッシュ。"""
+
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+from galley.models.infra import CLICacheMetrics, CLIResult
+from galley.services.oci_cli_args import parse_command
+
+# キャッシュの有効期間のデフォルト（秒）
+DEFAULT_CLI_CACHE_TTL = 60.0
+
+# サービスごとの有効期間のデフォルト（秒）。変更頻度の低いリソースを長く保持する
+DEFAULT_CLI_CACHE_SERVICE_TTLS: dict[str, float] = {
+    "iam": 600.0,  # 可用性ドメイン・コンパートメント・リージョン等
+}
+
+# キャッシュする件数の上限のデフォルト
+DEFAULT_CLI_CACHE_MAX_ENTRIES = 256
+
+# 読み取り専用として扱う動詞（"list-vnics" のような派生形も含む）
+_READ_ONLY_VERBS = ("list", "get")
+
+# 結果をローカルファイルに書き出すオプション（実行の副作用があるためキャッシュしない。正規化後の名前）
+_SIDE_EFFECT_OPTIONS = frozenset({"file", "download_dir", "dest_dir"})
+
+
+@dataclass
+class _CLIEntry:
+    """キャッシュした実行結果。"""
+
+    service: str
+    result: CLIResult
+    expires_at: float
+
+
+def is_read_only(args: list[str]) -> bool:
+    """検証済みのCLI引数が読み取り専用のコマンド（``list`` / ``get`` 系の動詞）かどうか。"""
+    command = parse_command(args)
+    if command is None or len(command.words) < 2:
+        return False
+    verb = command.words[-1]
+    if not any(verb == v or verb.startswith(f"{v}-") for v in _READ_ONLY_VERBS):
+        return False
+    return not any(name in _SIDE_EFFECT_OPTIONS for name in command.options)
+
+
+class CLIResultCache:
+    """読み取り系OCI CLIコマンドの成功した結果を一定時間保持する。
+
+    キーは認証方式と正規化した引数（コマンド語と、名前順に並べたオプション）で、
+    オプションの順序や ``--name=value`` / ``--name value`` の表記の違いは同じコマンドとして扱う。
+    有効期間はサービス（``compute`` / ``iam`` 等）ごとに設定でき、件数が上限を超えた場合は
+    最も長く使われていない結果から破棄する。変更系のコマンドを実行した場合は、
+    同じサービスの結果を :meth:`invalidate_service` で破棄する。有効期間が0以下のサービスはキャッシュしない。
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_CLI_CACHE_TTL,
+        *,
+        service_ttls: Mapping[str, float] | None = None,
+        max_entries: int = DEFAULT_CLI_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._service_ttls = dict(DEFAULT_CLI_CACHE_SERVICE_TTLS if service_ttls is None else service_ttls)
+        self._max_entries = max(max_entries, 0)
+        self._clock = clock
+        self._entries: OrderedDict[str, _CLIEntry] = OrderedDict()
+        self._metrics = CLICacheMetrics()
+
+    @property
+    def metrics(self) -> CLICacheMetrics:
+        """キャッシュの統計情報。"""
+        return self._metrics.model_copy(update={"entries": len(self._entries)})
+
+    def _service_ttl(self, service: str) -> float:
+        return self._service_ttls.get(service, self._ttl)
+
+    @staticmethod
+    def key(args: list[str]) -> tuple[str, str] | None:
+        """読み取り系コマンドの (サービス, キャッシュキー) を返す。キャッシュ対象外の場合はNone。"""
+        if not is_read_only(args):
+            return None
+        command = parse_command(args)
+        assert command is not None
+        return command.service, json.dumps([command.auth, command.words, sorted(command.options.items())])
+
+    def get(self, args: list[str]) -> CLIResult | None:
+        """キャッシュ済みの有効な結果を返す。無い場合・対象外のコマンドの場合はNone。"""
+        key = self.key(args)
+        if key is None or self._max_entries == 0:
+            return None
+        _service, cache_key = key
+        entry = self._entries.get(cache_key)
+        if entry is not None and entry.expires_at <= self._clock():
+            del self._entries[cache_key]
+            entry = None
+        if entry is None:
+            self._metrics.misses += 1
+            return None
+        self._entries.move_to_end(cache_key)
+        self._metrics.hits += 1
+        return entry.result.model_copy(update={"cached": True})
+
+    def put(self, args: list[str], result: CLIResult) -> None:
+        """成功した読み取り系コマンドの結果を保存する。"""
+        key = self.key(args)
+        if key is None or not result.success or self._max_entries == 0:
+            return
+        service, cache_key = key
+        ttl = self._service_ttl(service)
+        if ttl <= 0:
+            return
+        self._entries[cache_key] = _CLIEntry(service, result, self._clock() + ttl)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._metrics.evictions += 1
+
+    def record_bypass(self) -> None:
+        """キャッシュを使わずに実行したことを記録する。"""
+        self._metrics.bypasses += 1
+
+    def invalidate_service(self, service: str) -> None:
+        """サービスのキャッシュ済みの結果を破棄する。"""
+        stale = [key for key, entry in self._entries.items() if entry.service == service]
+        for key in stale:
+            del self._entries[key]
+        self._metrics.invalidations += len(stale)
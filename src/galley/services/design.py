@@ -4,17 +4,20 @@ import ipaddress
 import json
 import re
 import uuid
+from collections import OrderedDict
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 import yaml
+from pydantic import ValidationError
 
-from galley.models.architecture import Architecture, Component, Connection
+from galley.models.architecture import Architecture, ArchitecturePatchResult, Component, Connection
 from galley.models.errors import (
     ArchitectureNotFoundError,
     ComponentNotFoundError,
     HearingNotCompletedError,
+    PatchOperationError,
     StorageError,
 )
 from galley.models.validation import ValidationResult
@@ -346,6 +349,37 @@ _TF_DEFAULTS: dict[str, dict[str, str]] = {
 }
 
 
+# コンポーネントごとに保持するレンダリング済みHCLの件数の上限
+_RENDER_CACHE_MAX_ENTRIES = 4096
+
+
+# Terraform変数参照（var.<名前>）。先頭をリテラルにして高速な前方一致検索を使わせる
+_VARIABLE_REFERENCE = re.compile(r"(var\.\w+)")
+
+
+def _substitute_references(text: str, refs: dict[str, str]) -> str:
+    """テキスト中のTerraform変数参照（``var.<名前>``）を1回の走査で置換する。
+
+    参照は名前全体で照合するため、``var.subnet_id`` が ``var.subnet_ids`` や
+    ``local.var.subnet_id`` の一部に一致することはない。置換後の文字列は再走査しないため、
+    置換先に別の参照が含まれていても連鎖的に置換されない。
+
+    Args:
+        text: レンダリング済みのリソース定義。
+        refs: 変数参照（例: ``var.subnet_id``）→置換先の参照のマッピング。
+    """
+    if not refs:
+        return text
+    parts = _VARIABLE_REFERENCE.split(text)
+    # 奇数番目が変数参照。直前が識別子の途中（英数字・_・.）のものは置換しない
+    for i in range(1, len(parts), 2):
+        preceding = parts[i - 1]
+        if preceding and (preceding[-1].isalnum() or preceding[-1] in "_."):
+            continue
+        parts[i] = refs.get(parts[i], parts[i])
+    return "".join(parts)
+
+
 class DesignService:
     """アーキテクチャ設計の管理とバリデーションを行う。"""
 
@@ -354,6 +388,8 @@ class DesignService:
         self._config_dir = config_dir
         self._validator = ArchitectureValidator(config_dir=config_dir)
         self._services_cache: list[dict[str, Any]] | None = None
+        # レンダリング済みのコンポーネントHCL（キーはサービスタイプ・表示名・設定・解決済み参照）
+        self._render_cache: OrderedDict[str, str] = OrderedDict()
 
     def _load_services(self) -> list[dict[str, Any]]:
         """OCIサービス定義を読み込む。"""
@@ -389,43 +425,44 @@ class DesignService:
             SessionNotFoundError: セッションが存在しない場合。
             HearingNotCompletedError: ヒアリングが未完了の場合。
         """
-        session = await self._storage.load_session(session_id)
-        if session.hearing_result is None:
-            raise HearingNotCompletedError(session_id)
-
-        # コンポーネントをパースし、仮ID→UUIDのマッピングを構築
-        id_mapping: dict[str, str] = {}
-        parsed_components: list[Component] = []
-        for comp_data in components:
-            original_id = comp_data.get("id", "")
-            is_temp_id = bool(original_id) and not self._is_uuid(original_id)
-            if is_temp_id:
-                # 仮IDの場合: idフィールドを除外してパース（新しいUUIDを生成させる）
-                comp_without_id = {k: v for k, v in comp_data.items() if k != "id"}
-                parsed = Component.model_validate(comp_without_id)
-                id_mapping[original_id] = parsed.id
-            else:
-                parsed = Component.model_validate(comp_data)
-            parsed_components.append(parsed)
-
-        # connectionsのsource_id/target_idを実UUIDに変換
-        resolved_connections: list[dict[str, Any]] = []
-        for conn_data in connections:
-            resolved = dict(conn_data)
-            resolved["source_id"] = id_mapping.get(resolved["source_id"], resolved["source_id"])
-            resolved["target_id"] = id_mapping.get(resolved["target_id"], resolved["target_id"])
-            resolved_connections.append(resolved)
-        parsed_connections = [Connection.model_validate(c) for c in resolved_connections]
-
-        architecture = Architecture(
-            session_id=session_id,
-            components=parsed_components,
-            connections=parsed_connections,
-        )
-        session.architecture = architecture
-        session.updated_at = datetime.now(UTC)
-        await self._storage.save_session(session)
-        return architecture
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            if session.hearing_result is None:
+                raise HearingNotCompletedError(session_id)
+
+            # コンポーネントをパースし、仮ID→UUIDのマッピングを構築
+            id_mapping: dict[str, str] = {}
+            parsed_components: list[Component] = []
+            for comp_data in components:
+                original_id = comp_data.get("id", "")
+                is_temp_id = bool(original_id) and not self._is_uuid(original_id)
+                if is_temp_id:
+                    # 仮IDの場合: idフィールドを除外してパース（新しいUUIDを生成させる）
+                    comp_without_id = {k: v for k, v in comp_data.items() if k != "id"}
+                    parsed = Component.model_validate(comp_without_id)
+                    id_mapping[original_id] = parsed.id
+                else:
+                    parsed = Component.model_validate(comp_data)
+                parsed_components.append(parsed)
+
+            # connectionsのsource_id/target_idを実UUIDに変換
+            resolved_connections: list[dict[str, Any]] = []
+            for conn_data in connections:
+                resolved = dict(conn_data)
+                resolved["source_id"] = id_mapping.get(resolved["source_id"], resolved["source_id"])
+                resolved["target_id"] = id_mapping.get(resolved["target_id"], resolved["target_id"])
+                resolved_connections.append(resolved)
+            parsed_connections = [Connection.model_validate(c) for c in resolved_connections]
+
+            architecture = Architecture(
+                session_id=session_id,
+                components=parsed_components,
+                connections=parsed_connections,
+            )
+            session.architecture = architecture
+            session.updated_at = datetime.now(UTC)
+            await self._storage.save_session(session)
+            return architecture
 
     async def add_component(
         self,
@@ -449,24 +486,26 @@ class DesignService:
             SessionNotFoundError: セッションが存在しない場合。
             HearingNotCompletedError: ヒアリングが未完了の場合。
         """
-        session = await self._storage.load_session(session_id)
-        if session.hearing_result is None:
-            raise HearingNotCompletedError(session_id)
-
-        if session.architecture is None:
-            session.architecture = Architecture(session_id=session_id)
-
-        component = Component(
-            id=str(uuid.uuid4()),
-            service_type=service_type,
-            display_name=display_name,
-            config=config or {},
-        )
-        session.architecture.components.append(component)
-        session.architecture.updated_at = datetime.now(UTC)
-        session.updated_at = datetime.now(UTC)
-        await self._storage.save_session(session)
-        return component
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            if session.hearing_result is None:
+                raise HearingNotCompletedError(session_id)
+
+            if session.architecture is None:
+                session.architecture = Architecture(session_id=session_id)
+
+            component = Component(
+                id=str(uuid.uuid4()),
+                service_type=service_type,
+                display_name=display_name,
+                config=config or {},
+            )
+            session.architecture.add_component(component)
+            session.architecture.mark_dirty(component.id)
+            session.architecture.updated_at = datetime.now(UTC)
+            session.updated_at = datetime.now(UTC)
+            await self._storage.save_session(session)
+            return component
 
     async def remove_component(self, session_id: str, component_id: str) -> None:
         """アーキテクチャからコンポーネントを削除する。
@@ -482,25 +521,24 @@ class DesignService:
             ArchitectureNotFoundError: アーキテクチャが未設定の場合。
             ComponentNotFoundError: コンポーネントが見つからない場合。
         """
-        session = await self._storage.load_session(session_id)
-        if session.architecture is None:
-            raise ArchitectureNotFoundError(session_id)
-
-        arch = session.architecture
-        original_count = len(arch.components)
-        arch.components = [c for c in arch.components if c.id != component_id]
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            if session.architecture is None:
+                raise ArchitectureNotFoundError(session_id)
 
-        if len(arch.components) == original_count:
-            raise ComponentNotFoundError(component_id)
+            arch = session.architecture
+            removed = arch.remove_component(component_id)
+            if removed is None:
+                raise ComponentNotFoundError(component_id)
 
-        # 関連する接続を削除
-        arch.connections = [
-            conn for conn in arch.connections if conn.source_id != component_id and conn.target_id != component_id
-        ]
+            # 関連する接続も削除される（接続先のコンポーネントは検証結果が変わりうるため変更扱いにする）
+            arch.mark_dirty(component_id)
+            for conn in removed:
+                arch.mark_dirty(conn.source_id, conn.target_id)
 
-        arch.updated_at = datetime.now(UTC)
-        session.updated_at = datetime.now(UTC)
-        await self._storage.save_session(session)
+            arch.updated_at = datetime.now(UTC)
+            session.updated_at = datetime.now(UTC)
+            await self._storage.save_session(session)
 
     async def configure_component(
         self,
@@ -523,25 +561,178 @@ class DesignService:
             ArchitectureNotFoundError: アーキテクチャが未設定の場合。
             ComponentNotFoundError: コンポーネントが見つからない場合。
         """
-        session = await self._storage.load_session(session_id)
-        if session.architecture is None:
-            raise ArchitectureNotFoundError(session_id)
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            if session.architecture is None:
+                raise ArchitectureNotFoundError(session_id)
+
+            component = session.architecture.get_component(component_id)
+            if component is None:
+                raise ComponentNotFoundError(component_id)
+
+            component.config.update(config)
+            session.architecture.mark_dirty(component_id)
+            session.architecture.updated_at = datetime.now(UTC)
+            session.updated_at = datetime.now(UTC)
+            await self._storage.save_session(session)
+            return component
+
+    async def patch_architecture(
+        self, session_id: str, operations: list[dict[str, Any]], *, validate: bool = False
+    ) -> ArchitecturePatchResult:
+        """複数のコンポーネント・接続の変更をまとめて適用する。
+
+        操作はメモリ上で順に適用し、追加した接続の参照先の存在は最後に1回だけ確認して、
+        セッションを1回だけ保存する。いずれかの操作が失敗した場合は何も保存しない。
+        検証を指定した場合は、同じロックを保持したまま適用後のアーキテクチャを検証し、
+        検証結果も合わせて保存する（変更と検証の間に他の操作が割り込まない）。
+
+        操作は ``op`` キーで種別を指定する:
+
+        - ``add``: ``service_type``, ``display_name``, ``config``（任意）, ``id``（任意）。
+          UUID形式でない ``id`` は仮IDとして扱い、後続の操作から参照できる（1つのパッチ内で重複不可）
+        - ``remove``: ``component_id``。関連する接続も削除する
+        - ``configure``: ``component_id``, ``config``（既存設定とマージ）
+        - ``connect``: ``source_id``, ``target_id``, ``connection_type``, ``description``（任意）
+        - ``disconnect``: ``source_id``, ``target_id``, ``connection_type``（任意）。一致する接続をすべて削除する
 
-        for component in session.architecture.components:
-            if component.id == component_id:
-                component.config.update(config)
-                session.architecture.updated_at = datetime.now(UTC)
-                session.updated_at = datetime.now(UTC)
-                await self._storage.save_session(session)
-                return component
+        Args:
+            session_id: セッションID。
+            operations: 適用する操作のリスト（先頭から順に適用）。
+            validate: Trueの場合は適用後に :meth:`validate_architecture` と同じ検証を行う。
 
-        raise ComponentNotFoundError(component_id)
+        Returns:
+            操作ごとの結果（``operations`` と同じ順序）と検証結果。アーキテクチャが未作成で
+            操作が無い場合は検証できないため、検証結果はNone。
 
-    async def validate_architecture(self, session_id: str) -> list[ValidationResult]:
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+            HearingNotCompletedError: アーキテクチャが未作成で、ヒアリングが未完了の場合。
+            PatchOperationError: 操作を適用できない場合。
+        """
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            arch = session.architecture
+            if arch is None:
+                if session.hearing_result is None:
+                    raise HearingNotCompletedError(session_id)
+                arch = Architecture(session_id=session_id)
+
+            temp_ids: dict[str, str] = {}
+            added_connections: list[tuple[int, Connection]] = []
+            results: list[dict[str, Any]] = []
+            for index, operation in enumerate(operations):
+                try:
+                    result = self._apply_patch_operation(arch, operation, temp_ids)
+                except KeyError as e:
+                    raise PatchOperationError(index, f"missing field {e}") from None
+                except (ComponentNotFoundError, ValidationError, TypeError, ValueError) as e:
+                    raise PatchOperationError(index, str(e)) from None
+                if result["op"] == "connect":
+                    added_connections.append((index, arch.connections[-1]))
+                results.append(result)
+
+            # 参照整合性の確認（参照先が後から削除された接続は削除済みのため対象外）
+            for index, conn in added_connections:
+                if not any(c is conn for c in arch.outgoing_connections(conn.source_id)):
+                    continue
+                for endpoint in (conn.source_id, conn.target_id):
+                    if arch.get_component(endpoint) is None:
+                        raise PatchOperationError(index, str(ComponentNotFoundError(endpoint)))
+
+            validation: list[ValidationResult] | None = None
+            if validate and (operations or session.architecture is not None):
+                validation = self._run_validation(arch)
+            elif not operations:
+                return ArchitecturePatchResult(results=results)
+            now = datetime.now(UTC)
+            arch.updated_at = now
+            session.architecture = arch
+            session.updated_at = now
+            await self._storage.save_session(session)
+            return ArchitecturePatchResult(results=results, validation=validation)
+
+    def _apply_patch_operation(
+        self, arch: Architecture, operation: dict[str, Any], temp_ids: dict[str, str]
+    ) -> dict[str, Any]:
+        """patch_architectureの1操作をアーキテクチャに適用し、結果を返す。"""
+        op = operation["op"]
+        if op == "add":
+            original_id = operation.get("id", "")
+            is_temp_id = bool(original_id) and not self._is_uuid(original_id)
+            if is_temp_id and original_id in temp_ids:
+                raise ValueError(f"Temporary id already used in this patch: {original_id}")
+            component = Component(
+                id=original_id if original_id and not is_temp_id else str(uuid.uuid4()),
+                service_type=operation["service_type"],
+                display_name=operation["display_name"],
+                config=operation.get("config") or {},
+            )
+            if arch.get_component(component.id) is not None:
+                raise ValueError(f"Component already exists: {component.id}")
+            if is_temp_id:
+                temp_ids[original_id] = component.id
+            arch.add_component(component)
+            arch.mark_dirty(component.id)
+            return {"op": op, "component": component.model_dump()}
+
+        if op == "remove":
+            component_id = temp_ids.get(operation["component_id"], operation["component_id"])
+            removed = arch.remove_component(component_id)
+            if removed is None:
+                raise ComponentNotFoundError(component_id)
+            arch.mark_dirty(component_id)
+            for conn in removed:
+                arch.mark_dirty(conn.source_id, conn.target_id)
+            return {"op": op, "component_id": component_id, "removed_connections": len(removed)}
+
+        if op == "configure":
+            component_id = temp_ids.get(operation["component_id"], operation["component_id"])
+            target = arch.get_component(component_id)
+            if target is None:
+                raise ComponentNotFoundError(component_id)
+            target.config.update(operation["config"])
+            arch.mark_dirty(component_id)
+            return {"op": op, "component": target.model_dump()}
+
+        source_id = temp_ids.get(operation["source_id"], operation["source_id"])
+        target_id = temp_ids.get(operation["target_id"], operation["target_id"])
+        if op == "connect":
+            connection = Connection(
+                source_id=source_id,
+                target_id=target_id,
+                connection_type=operation["connection_type"],
+                description=operation.get("description", ""),
+            )
+            arch.add_connection(connection)
+            arch.mark_dirty(source_id, target_id)
+            return {"op": op, "connection": connection.model_dump()}
+
+        if op == "disconnect":
+            connection_type = operation.get("connection_type")
+            matches = [
+                c
+                for c in arch.outgoing_connections(source_id)
+                if c.target_id == target_id and (connection_type is None or c.connection_type == connection_type)
+            ]
+            if not matches:
+                raise ValueError(f"Connection not found: {source_id} -> {target_id}")
+            for conn in matches:
+                arch.remove_connection(conn)
+            arch.mark_dirty(source_id, target_id)
+            return {"op": op, "removed_connections": len(matches)}
+
+        raise ValueError(f"Unknown operation: {op!r} (expected add, remove, configure, connect or disconnect)")
+
+    async def validate_architecture(self, session_id: str, *, full: bool = False) -> list[ValidationResult]:
         """アーキテクチャをバリデーションルールに基づいて検証する。
 
+        前回の検証結果がある場合は、その後に変更されたコンポーネントと接続だけを検証し直し、
+        前回の結果とマージする（結果は全体の検証と同じ）。
+
         Args:
             session_id: セッションID。
+            full: Trueの場合は前回の結果を使わず、アーキテクチャ全体を検証する。
 
         Returns:
             検出された問題のリスト。
@@ -550,18 +741,29 @@ class DesignService:
             SessionNotFoundError: セッションが存在しない場合。
             ArchitectureNotFoundError: アーキテクチャが未設定の場合。
         """
-        session = await self._storage.load_session(session_id)
-        if session.architecture is None:
-            raise ArchitectureNotFoundError(session_id)
-
-        results = self._validator.validate(session.architecture)
-
-        # 結果をアーキテクチャに保存
-        session.architecture.validation_results = [r.model_dump() for r in results]
-        session.architecture.updated_at = datetime.now(UTC)
-        session.updated_at = datetime.now(UTC)
-        await self._storage.save_session(session)
-
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            if session.architecture is None:
+                raise ArchitectureNotFoundError(session_id)
+
+            results = self._run_validation(session.architecture, full=full)
+            session.architecture.updated_at = datetime.now(UTC)
+            session.updated_at = datetime.now(UTC)
+            await self._storage.save_session(session)
+
+            return results
+
+    def _run_validation(self, arch: Architecture, *, full: bool = False) -> list[ValidationResult]:
+        """アーキテクチャを検証し、結果をアーキテクチャに記録する（保存は呼び出し側で行う）。"""
+        rules_digest = self._validator.rules_digest
+        previous: list[ValidationResult] | None = None
+        if not full and arch.validation_results is not None and arch.validation_rules_digest == rules_digest:
+            previous = [ValidationResult.model_validate(r) for r in arch.validation_results]
+        results = self._validator.validate(arch, previous=previous, dirty_component_ids=arch.dirty_component_ids)
+
+        arch.validation_results = [r.model_dump() for r in results]
+        arch.validation_rules_digest = rules_digest
+        arch.dirty_component_ids = []
         return results
 
     async def list_available_services(self) -> list[dict[str, Any]]:
@@ -613,10 +815,11 @@ class DesignService:
         if arch.connections:
             lines.append("## 接続関係")
             lines.append("")
-            comp_map = {c.id: c.display_name for c in arch.components}
             for conn in arch.connections:
-                source_name = comp_map.get(conn.source_id, conn.source_id)
-                target_name = comp_map.get(conn.target_id, conn.target_id)
+                source = arch.get_component(conn.source_id)
+                target = arch.get_component(conn.target_id)
+                source_name = source.display_name if source is not None else conn.source_id
+                target_name = target.display_name if target is not None else conn.target_id
                 lines.append(f"- {source_name} → {target_name} ({conn.connection_type}): {conn.description}")
             lines.append("")
 
@@ -1081,6 +1284,61 @@ class DesignService:
 
         return template.format(**params)
 
+    def _render_component_with_refs(self, comp: Component, comp_refs: dict[str, str]) -> str:
+        """ローカル参照を適用したコンポーネントのリソース定義を返す。
+
+        同じサービスタイプ・表示名・設定・参照の組み合わせはレンダリング結果を再利用する。
+        自動補完されたネットワークリソースはexportのたびにIDが変わるため、IDはキーに含めない。
+        """
+        key = json.dumps(
+            [comp.service_type, comp.display_name, comp.config, sorted(comp_refs.items())],
+            sort_keys=True,
+            default=str,
+        )
+        rendered = self._render_cache.get(key)
+        if rendered is not None:
+            self._render_cache.move_to_end(key)
+            return rendered
+
+        rendered = _substitute_references(self._render_component_tf(comp), comp_refs)
+        self._render_cache[key] = rendered
+        if len(self._render_cache) > _RENDER_CACHE_MAX_ENTRIES:
+            self._render_cache.popitem(last=False)
+        return rendered
+
+    @staticmethod
+    def _write_terraform_files(terraform_dir: Path, files: dict[str, str]) -> list[str]:
+        """Terraformファイルをディレクトリに書き出す。
+
+        既存のファイルと内容が一致するファイルは書き込まない（更新日時も変えない）。
+
+        Returns:
+            書き込んだファイル名のリスト。
+        """
+        terraform_dir.mkdir(parents=True, exist_ok=True)
+        written: list[str] = []
+        for filename, content in files.items():
+            path = terraform_dir / filename
+            try:
+                existing = path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                existing = None
+            if existing == content:
+                continue
+            path.write_text(content, encoding="utf-8")
+            written.append(filename)
+        return written
+
+    @staticmethod
+    def _read_terraform_files(terraform_dir: Path) -> dict[str, str]:
+        """ディレクトリ内のTerraformファイルを読み込む。ディレクトリがなければ空を返す。"""
+        files: dict[str, str] = {}
+        if terraform_dir.exists():
+            for tf_file in sorted(terraform_dir.iterdir()):
+                if tf_file.is_file():
+                    files[tf_file.name] = tf_file.read_text(encoding="utf-8")
+        return files
+
     async def export_iac(self, session_id: str) -> dict[str, Any]:
         """IaCテンプレート（Terraform）を出力する。
 
@@ -1186,12 +1444,9 @@ class DesignService:
         comp_lines.append(f"# Components: {len(expanded_components)}")
         comp_lines.append("")
         for comp in expanded_components:
-            rendered = self._render_component_tf(comp)
             # R4: ローカル参照置換（コンポーネント特性に基づくpublic/private振り分け）
             comp_refs = self._get_component_refs(comp, local_refs)
-            for old_ref, new_ref in comp_refs.items():
-                rendered = rendered.replace(old_ref, new_ref)
-            comp_lines.append(rendered)
+            comp_lines.append(self._render_component_with_refs(comp, comp_refs))
             comp_lines.append("")
         files["components.tf"] = "\n".join(comp_lines)
 
@@ -1230,11 +1485,9 @@ class DesignService:
         if output_lines:
             files["outputs.tf"] = "\n".join(output_lines) + "\n"
 
-        # セッションのデータディレクトリにファイルを書き出す
+        # セッションのデータディレクトリにファイルを書き出す（I/Oスレッドで実行）
         terraform_dir = self._storage.get_session_dir(session_id) / "terraform"
-        terraform_dir.mkdir(parents=True, exist_ok=True)
-        for filename, content in files.items():
-            (terraform_dir / filename).write_text(content, encoding="utf-8")
+        await self._storage.run_io(self._write_terraform_files, terraform_dir, files)
 
         return {"terraform_files": files, "terraform_dir": str(terraform_dir)}
 
@@ -1263,18 +1516,14 @@ class DesignService:
 
         # terraform_dirに既存ファイルがあればディスクから読み込む
         terraform_dir = self._storage.get_session_dir(session_id) / "terraform"
-        if terraform_dir.exists():
-            files: dict[str, str] = {}
-            for tf_file in sorted(terraform_dir.iterdir()):
-                if tf_file.is_file():
-                    files[tf_file.name] = tf_file.read_text(encoding="utf-8")
-            if files:
-                return {
-                    "summary": summary,
-                    "mermaid": mermaid,
-                    "terraform_files": files,
-                    "terraform_dir": str(terraform_dir),
-                }
+        files = await self._storage.run_io(self._read_terraform_files, terraform_dir)
+        if files:
+            return {
+                "summary": summary,
+                "mermaid": mermaid,
+                "terraform_files": files,
+                "terraform_dir": str(terraform_dir),
+            }
 
         # 既存ファイルがなければ新規生成
         iac_result = await self.export_iac(session_id)
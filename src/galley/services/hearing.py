@@ -66,15 +66,15 @@ class HearingService:
             SessionNotFoundError: セッションが存在しない場合。
             HearingAlreadyCompletedError: ヒアリングが既に完了している場合。
         """
-        session = await self._storage.load_session(session_id)
-        if session.status == "completed":
-            raise HearingAlreadyCompletedError(session_id)
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            if session.status == "completed":
+                raise HearingAlreadyCompletedError(session_id)
 
-        answer = Answer(question_id=question_id, value=value)
-        session.answers[question_id] = answer
-        session.updated_at = datetime.now(UTC)
-        await self._storage.save_session(session)
-        return answer
+            # セッション全体は書き直さず、回答ジャーナルへの追記のみ行う
+            answer = Answer(question_id=question_id, value=value)
+            await self._storage.append_answers(session_id, [answer])
+            return answer
 
     async def save_answers_batch(
         self,
@@ -94,22 +94,20 @@ class HearingService:
             SessionNotFoundError: セッションが存在しない場合。
             HearingAlreadyCompletedError: ヒアリングが既に完了している場合。
         """
-        session = await self._storage.load_session(session_id)
-        if session.status == "completed":
-            raise HearingAlreadyCompletedError(session_id)
-
-        saved_answers: list[Answer] = []
-        for answer_data in answers:
-            answer = Answer(
-                question_id=answer_data["question_id"],
-                value=answer_data["value"],
-            )
-            session.answers[answer_data["question_id"]] = answer
-            saved_answers.append(answer)
-
-        session.updated_at = datetime.now(UTC)
-        await self._storage.save_session(session)
-        return saved_answers
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            if session.status == "completed":
+                raise HearingAlreadyCompletedError(session_id)
+
+            saved_answers = [
+                Answer(
+                    question_id=answer_data["question_id"],
+                    value=answer_data["value"],
+                )
+                for answer_data in answers
+            ]
+            await self._storage.append_answers(session_id, saved_answers)
+            return saved_answers
 
     async def complete_hearing(self, session_id: str) -> HearingResult:
         """ヒアリングを完了し、構造化された結果を生成する。
@@ -124,16 +122,18 @@ class HearingService:
             SessionNotFoundError: セッションが存在しない場合。
             HearingAlreadyCompletedError: ヒアリングが既に完了している場合。
         """
-        session = await self._storage.load_session(session_id)
-        if session.status == "completed":
-            raise HearingAlreadyCompletedError(session_id)
-
-        hearing_result = self._build_hearing_result(session)
-        session.hearing_result = hearing_result
-        session.status = "completed"
-        session.updated_at = datetime.now(UTC)
-        await self._storage.save_session(session)
-        return hearing_result
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            if session.status == "completed":
+                raise HearingAlreadyCompletedError(session_id)
+
+            hearing_result = self._build_hearing_result(session)
+            session.hearing_result = hearing_result
+            session.status = "completed"
+            session.updated_at = datetime.now(UTC)
+            # 保存時に回答ジャーナルはsession.jsonへ畳み込まれる
+            await self._storage.save_session(session)
+            return hearing_result
 
     async def get_hearing_result(self, session_id: str) -> HearingResult:
         """ヒアリング結果を取得する。
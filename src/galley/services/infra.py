@@ -2,11 +2,16 @@
 
 import asyncio
 import base64
+import hashlib
 import io
+import json
+import logging
 import os
 import re
 import shlex
+import time
 import zipfile
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any
 
@@ -17,7 +22,24 @@ from galley.models.errors import (
     CommandNotAllowedError,
     InfraOperationInProgressError,
 )
-from galley.models.infra import CLIResult, RMJob, TerraformCommand, TerraformErrorDetail, TerraformResult
+from galley.models.infra import CLIBatchItem, CLIResult, RMJob, TerraformCommand, TerraformErrorDetail, TerraformResult
+from galley.models.jobs import Job, JobKind
+from galley.services.cli_cache import CLIResultCache, is_read_only
+from galley.services.jobs import JobService
+from galley.services.oci_cli_args import command_service
+from galley.services.oci_sdk import OCISDKExecutor
+from galley.services.plan_cache import DEFAULT_PLAN_CACHE_TTL, PlanCache
+from galley.services.rm_logs import RMJobLogStream
+from galley.services.rm_poller import (
+    DEFAULT_POLL_BACKOFF,
+    DEFAULT_POLL_INITIAL_INTERVAL,
+    DEFAULT_POLL_MAX_INTERVAL,
+    TERMINAL_JOB_STATES,
+    RMJobPoller,
+)
+from galley.storage.io import write_text_file
+from galley.storage.locks import SessionLockManager
+from galley.storage.oci_client import OCIClientFactory
 from galley.storage.service import StorageService
 
 # terraform_dirで禁止するパスパターン
@@ -26,8 +48,25 @@ _DISALLOWED_PATH_PATTERNS = ("..", "~")
 # RM自動入力変数（これらはvariablesから除外してRMに任せる）
 _RM_AUTO_VARIABLES = frozenset({"region", "compartment_ocid", "tenancy_ocid", "current_user_ocid"})
 
-# ジョブポーリング間隔（秒）
-_JOB_POLL_INTERVAL = 5
+# TerraformコマンドとRMジョブのoperation・ジョブ種別の対応
+_RM_OPERATIONS: dict[TerraformCommand, str] = {"plan": "PLAN", "apply": "APPLY", "destroy": "DESTROY"}
+_TERRAFORM_JOB_KINDS: dict[TerraformCommand, JobKind] = {
+    "plan": "terraform_plan",
+    "apply": "terraform_apply",
+    "destroy": "terraform_destroy",
+}
+_TERRAFORM_COMMANDS: dict[JobKind, TerraformCommand] = {kind: cmd for cmd, kind in _TERRAFORM_JOB_KINDS.items()}
+
+logger = logging.getLogger(__name__)
+
+# RMジョブ作成直後にジョブOCIDを受け取るコールバック
+RMJobCallback = Callable[[str], Awaitable[None]]
+
+# RMジョブ実行中に新しいログ行を受け取るコールバック
+RMLogCallback = Callable[[list[str]], Awaitable[None]]
+
+# RMスタックにアップロードするzipのエントリに設定する固定のタイムスタンプ
+_ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
 
 # ジョブタイムアウト（秒）
 _JOB_TIMEOUT_PLAN = 300  # 5分
@@ -80,6 +119,10 @@ ALLOWED_OCI_SERVICES: frozenset[str] = frozenset(
     }
 )
 
+# run_oci_cli_batchで同時に実行するコマンド数のデフォルトと、1回に渡せるコマンド数の上限
+DEFAULT_CLI_BATCH_CONCURRENCY = 4
+MAX_CLI_BATCH_SIZE = 50
+
 # Terraform plan出力からサマリーを抽出する正規表現
 _PLAN_SUMMARY_RE = re.compile(r"(\d+ to add, \d+ to change, \d+ to destroy)")
 
@@ -94,60 +137,131 @@ _TF_ERROR_RE = re.compile(
 class InfraService:
     """インフラストラクチャの構築・管理を行う。"""
 
-    def __init__(self, storage: StorageService, config_dir: Path) -> None:
+    def __init__(
+        self,
+        storage: StorageService,
+        config_dir: Path,
+        *,
+        poll_initial_interval: float = DEFAULT_POLL_INITIAL_INTERVAL,
+        poll_max_interval: float = DEFAULT_POLL_MAX_INTERVAL,
+        plan_cache_ttl: float = DEFAULT_PLAN_CACHE_TTL,
+        jobs: JobService | None = None,
+        oci_sdk: OCISDKExecutor | None = None,
+        client_factory: OCIClientFactory | None = None,
+        cli_cache: CLIResultCache | None = None,
+        cli_batch_concurrency: int = DEFAULT_CLI_BATCH_CONCURRENCY,
+    ) -> None:
         self._storage = storage
         self._config_dir = config_dir
-        # セッション単位の排他ロック
-        self._session_locks: dict[str, asyncio.Lock] = {}
-        # RMクライアント（遅延初期化）
-        self._rm_client: oci.resource_manager.ResourceManagerClient | None = None
+        # 認証情報・SDKクライアントの共有ファクトリ
+        self._clients = client_factory or OCIClientFactory()
+        # run_oci_cliの読み取り系コマンドをプロセス内で実行するSDK実行器（Noneの場合は常にCLIを使う）
+        self._oci_sdk = oci_sdk
+        # セッション単位の排他ロック（Terraform操作の多重実行防止）
+        self._operation_locks = SessionLockManager()
+        # RMジョブ実行中にログを取得する間隔（新しいログが無い間は最大間隔まで伸ばす）
+        self._log_interval = poll_initial_interval
+        self._log_max_interval = max(poll_max_interval, poll_initial_interval)
+        # 実行中ジョブの状態確認をまとめて行うポーラー
+        self._rm_poller = RMJobPoller(
+            lambda: self._get_rm_client(),
+            initial_interval=poll_initial_interval,
+            max_interval=poll_max_interval,
+        )
+        # 変更の無いスタックに対するplan結果の再利用
+        self._plan_cache = PlanCache(plan_cache_ttl)
+        # 読み取り系OCI CLIコマンドの結果の再利用
+        self._cli_cache = cli_cache or CLIResultCache()
+        # run_oci_cli_batchで同時に実行するコマンド数の上限（全バッチで共有）
+        self._cli_batch_slots = asyncio.Semaphore(max(cli_batch_concurrency, 1))
+        # 長時間かかる操作のジョブ管理（再起動後の再開・キャンセル処理を登録する）
+        self._jobs = jobs or JobService(storage)
+        for kind in _TERRAFORM_JOB_KINDS.values():
+            self._jobs.register(kind, resume=self._resume_terraform_job, cancel=self._cancel_rm_job)
+
+    @property
+    def plan_cache(self) -> PlanCache:
+        """plan結果のキャッシュ。"""
+        return self._plan_cache
+
+    @property
+    def cli_cache(self) -> CLIResultCache:
+        """読み取り系OCI CLIコマンドの結果キャッシュ。"""
+        return self._cli_cache
+
+    @property
+    def rm_poller(self) -> RMJobPoller:
+        """RMジョブの共有ポーラー。"""
+        return self._rm_poller
+
+    def has_running_operation(self, session_id: str) -> bool:
+        """セッションでTerraform操作（RMジョブの実行）が進行中かどうか。"""
+        return self._operation_locks.locked(session_id)
 
     def _get_session_lock(self, session_id: str) -> asyncio.Lock:
         """セッション単位のasyncio.Lockを取得する。"""
-        if session_id not in self._session_locks:
-            self._session_locks[session_id] = asyncio.Lock()
-        return self._session_locks[session_id]
+        return self._operation_locks.get(session_id)
 
     def _get_rm_client(self) -> oci.resource_manager.ResourceManagerClient:
-        """RMクライアントを遅延初期化して返す。"""
-        if self._rm_client is None:
-            if os.environ.get("OCI_RESOURCE_PRINCIPAL_VERSION"):
-                signer = oci.auth.signers.get_resource_principals_signer()
-                self._rm_client = oci.resource_manager.ResourceManagerClient({}, signer=signer)
-            else:
-                config = oci.config.from_file()
-                self._rm_client = oci.resource_manager.ResourceManagerClient(config)
-        return self._rm_client
+        """共有のRMクライアントを返す。"""
+        return self._clients.client(oci.resource_manager.ResourceManagerClient)
 
     @staticmethod
-    def _zip_terraform_dir(terraform_dir: Path) -> str:
-        """Terraformディレクトリをzip化してbase64エンコード文字列を返す。
+    def _list_terraform_files(terraform_dir: Path) -> list[tuple[str, Path]]:
+        """RMスタックにアップロードするファイルを相対パス（POSIX形式）順に返す。
 
         .terraform/ と *.tfstate* ファイルを除外する。
         """
+        files: list[tuple[str, Path]] = []
+        for file_path in terraform_dir.rglob("*"):
+            if not file_path.is_file():
+                continue
+            rel = file_path.relative_to(terraform_dir)
+            # .terraform/ ディレクトリと tfstate ファイルを除外
+            if any(p == ".terraform" for p in rel.parts):
+                continue
+            if "tfstate" in file_path.name:
+                continue
+            files.append((rel.as_posix(), file_path))
+        files.sort()
+        return files
+
+    @classmethod
+    def _zip_terraform_dir(cls, terraform_dir: Path) -> str:
+        """Terraformディレクトリをzip化してbase64エンコード文字列を返す。
+
+        エントリの順序・タイムスタンプ・属性を固定し、同じ内容からは同じzipを生成する。
+        """
         buf = io.BytesIO()
         with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
-            for file_path in terraform_dir.rglob("*"):
-                if not file_path.is_file():
-                    continue
-                rel = file_path.relative_to(terraform_dir)
-                # .terraform/ ディレクトリと tfstate ファイルを除外
-                parts = rel.parts
-                if any(p == ".terraform" for p in parts):
-                    continue
-                if "tfstate" in file_path.name:
-                    continue
-                zf.write(file_path, str(rel))
+            for rel, file_path in cls._list_terraform_files(terraform_dir):
+                info = zipfile.ZipInfo(rel, date_time=_ZIP_TIMESTAMP)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                zf.writestr(info, file_path.read_bytes())
         return base64.b64encode(buf.getvalue()).decode("ascii")
 
+    @classmethod
+    def _hash_terraform_dir(cls, terraform_dir: Path) -> str:
+        """アップロード対象のファイルのパスと内容から、Terraformディレクトリのハッシュを計算する。"""
+        hasher = hashlib.sha256()
+        for rel, file_path in cls._list_terraform_files(terraform_dir):
+            content = file_path.read_bytes()
+            hasher.update(f"{rel}\0{len(content)}\0".encode())
+            hasher.update(content)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _hash_stack_config(content_hash: str, display_name: str, variables: dict[str, str]) -> str:
+        """RMスタックの構成（Terraformファイル・表示名・変数）のハッシュを計算する。"""
+        payload = json.dumps(
+            {"content": content_hash, "display_name": display_name, "variables": variables}, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
     def _get_tenancy_ocid(self) -> str:
         """テナンシーOCIDを取得する。"""
-        if os.environ.get("OCI_RESOURCE_PRINCIPAL_VERSION"):
-            signer = oci.auth.signers.get_resource_principals_signer()
-            return str(signer.tenancy_id)
-        else:
-            config = oci.config.from_file()
-            return str(config.get("tenancy", ""))
+        return self._clients.tenancy_id
 
     def _build_rm_variables(self, variables: dict[str, str] | None) -> dict[str, str]:
         """RM用変数を構築する。
@@ -192,66 +306,82 @@ class InfraService:
         terraform_dir: Path,
         variables: dict[str, str] | None = None,
     ) -> str:
-        """RMスタックを作成または更新し、stack_idを返す。"""
-        session = await self._storage.load_session(session_id)
-        client = self._get_rm_client()
+        """RMスタックを作成または更新し、stack_idを返す。
 
-        zip_content = self._zip_terraform_dir(terraform_dir)
-        filtered_vars = self._build_rm_variables(variables)
-
-        # コンパートメントIDの取得
-        compartment_id = os.environ.get("GALLEY_WORK_COMPARTMENT_ID", "")
-        if not compartment_id and variables:
-            compartment_id = variables.get("compartment_ocid", "")
-
-        # purposeからスタック表示名を生成
-        purpose = None
-        if "purpose" in session.answers:
-            val = session.answers["purpose"].value
-            purpose = val if isinstance(val, str) else ", ".join(val)
-        stack_display_name = self._build_stack_display_name(session_id, purpose)
-
-        if session.rm_stack_id:
-            # スタック更新
-            update_details = oci.resource_manager.models.UpdateStackDetails(
-                display_name=stack_display_name,
-                config_source=oci.resource_manager.models.UpdateZipUploadConfigSourceDetails(
-                    zip_file_base64_encoded=zip_content,
-                ),
-                variables=filtered_vars,
-            )
-            await asyncio.to_thread(
-                client.update_stack,
-                session.rm_stack_id,
-                update_details,
-            )
-            return session.rm_stack_id
-        else:
-            # スタック新規作成
-            create_details = oci.resource_manager.models.CreateStackDetails(
-                compartment_id=compartment_id,
-                display_name=stack_display_name,
-                config_source=oci.resource_manager.models.CreateZipUploadConfigSourceDetails(
-                    zip_file_base64_encoded=zip_content,
-                ),
-                variables=filtered_vars,
-                terraform_version="1.5.x",
-            )
-            response = await asyncio.to_thread(
-                client.create_stack,
-                create_details,
-            )
-            stack_id: str = response.data.id
-            # セッションにstack_idを保存
-            session.rm_stack_id = stack_id
-            await self._storage.save_session(session)
-            return stack_id
+        Terraformファイル・表示名・変数が前回のアップロードから変わっていない場合は、
+        zip化とスタック更新を省略する。
+        """
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            client = self._get_rm_client()
+
+            content_hash = await self._storage.run_io(self._hash_terraform_dir, terraform_dir)
+            filtered_vars = self._build_rm_variables(variables)
+
+            # コンパートメントIDの取得
+            compartment_id = os.environ.get("GALLEY_WORK_COMPARTMENT_ID", "")
+            if not compartment_id and variables:
+                compartment_id = variables.get("compartment_ocid", "")
+
+            # purposeからスタック表示名を生成
+            purpose = None
+            if "purpose" in session.answers:
+                val = session.answers["purpose"].value
+                purpose = val if isinstance(val, str) else ", ".join(val)
+            stack_display_name = self._build_stack_display_name(session_id, purpose)
+
+            stack_hash = self._hash_stack_config(content_hash, stack_display_name, filtered_vars)
+            if session.rm_stack_id and session.rm_stack_hash == stack_hash:
+                return session.rm_stack_id
+
+            zip_content = await self._storage.run_io(self._zip_terraform_dir, terraform_dir)
+            if session.rm_stack_id:
+                # スタック更新
+                update_details = oci.resource_manager.models.UpdateStackDetails(
+                    display_name=stack_display_name,
+                    config_source=oci.resource_manager.models.UpdateZipUploadConfigSourceDetails(
+                        zip_file_base64_encoded=zip_content,
+                    ),
+                    variables=filtered_vars,
+                )
+                await asyncio.to_thread(
+                    client.update_stack,
+                    session.rm_stack_id,
+                    update_details,
+                )
+                session.rm_stack_hash = stack_hash
+                await self._storage.save_session(session)
+                return session.rm_stack_id
+            else:
+                # スタック新規作成
+                create_details = oci.resource_manager.models.CreateStackDetails(
+                    compartment_id=compartment_id,
+                    display_name=stack_display_name,
+                    config_source=oci.resource_manager.models.CreateZipUploadConfigSourceDetails(
+                        zip_file_base64_encoded=zip_content,
+                    ),
+                    variables=filtered_vars,
+                    terraform_version="1.5.x",
+                )
+                response = await asyncio.to_thread(
+                    client.create_stack,
+                    create_details,
+                )
+                stack_id: str = response.data.id
+                # セッションにstack_idを保存
+                session.rm_stack_id = stack_id
+                session.rm_stack_hash = stack_hash
+                await self._storage.save_session(session)
+                return stack_id
 
     async def _run_rm_job(
         self,
         stack_id: str,
         operation: str,
         command: TerraformCommand,
+        *,
+        on_created: RMJobCallback | None = None,
+        on_log: RMLogCallback | None = None,
     ) -> TerraformResult:
         """RMジョブを作成・ポーリング・ログ取得してTerraformResultを返す。"""
         client = self._get_rm_client()
@@ -275,29 +405,77 @@ class InfraService:
         )
         response = await asyncio.to_thread(client.create_job, create_job_details)
         job_id: str = response.data.id
+        if on_created is not None:
+            await on_created(job_id)
+
+        return await self._await_rm_job(
+            job_id,
+            operation,
+            command,
+            compartment_id=getattr(response.data, "compartment_id", None),
+            on_log=on_log,
+        )
 
-        # ポーリング
+    async def _await_rm_job(
+        self,
+        job_id: str,
+        operation: str,
+        command: TerraformCommand,
+        compartment_id: str | None = None,
+        on_log: RMLogCallback | None = None,
+    ) -> TerraformResult:
+        """RMジョブの完了を待ちながらログを逐次取得し、TerraformResultを返す。"""
+        client = self._get_rm_client()
+        logs = RMJobLogStream(client, job_id)
+        streaming = True
+
+        async def stream_logs() -> bool:
+            """新しいログを取得してコールバックに渡す。新しいログがあればTrueを返す。"""
+            nonlocal streaming
+            if not streaming:
+                return False
+            try:
+                lines = await logs.fetch()
+            except Exception:
+                # 逐次取得できない場合は完了後にまとめて取得する
+                logger.warning("Failed to stream logs for job %s", job_id, exc_info=True)
+                streaming = False
+                return False
+            if lines and on_log is not None:
+                await on_log(lines)
+            return bool(lines)
+
+        # 共有ポーラーで終了を待ち、その間にログを取得する
         timeout = _JOB_TIMEOUT_PLAN if operation == "PLAN" else _JOB_TIMEOUT_APPLY_DESTROY
-        elapsed = 0
         lifecycle_state = ""
-        while elapsed < timeout:
-            await asyncio.sleep(_JOB_POLL_INTERVAL)
-            elapsed += _JOB_POLL_INTERVAL
-            job_response = await asyncio.to_thread(client.get_job, job_id)
-            lifecycle_state = job_response.data.lifecycle_state
-            if lifecycle_state in ("SUCCEEDED", "FAILED", "CANCELED"):
-                break
-
-        # ログ取得（get_job_logs_contentで生ログテキストを取得）
-        stdout = ""
+        waiter = asyncio.create_task(self._rm_poller.wait(job_id, compartment_id=compartment_id, timeout=timeout))
+        interval = self._log_interval
         try:
-            logs_response = await asyncio.to_thread(client.get_job_logs_content, job_id)
-            stdout = logs_response.data.text if hasattr(logs_response.data, "text") else str(logs_response.data)
-        except Exception:
-            stdout = f"(Failed to retrieve job logs for {job_id})"
+            while not waiter.done():
+                await asyncio.wait({waiter}, timeout=interval)
+                if await stream_logs():
+                    interval = self._log_interval
+                else:
+                    interval = min(interval * DEFAULT_POLL_BACKOFF, self._log_max_interval)
+            lifecycle_state = waiter.result().lifecycle_state
+        except TimeoutError:
+            pass
+        finally:
+            waiter.cancel()
+
+        # 終了直前のログを取りこぼさないよう最後にもう一度取得する
+        await stream_logs()
+        if streaming:
+            stdout = logs.text
+        else:
+            try:
+                logs_response = await asyncio.to_thread(client.get_job_logs_content, job_id)
+                stdout = logs_response.data.text if hasattr(logs_response.data, "text") else str(logs_response.data)
+            except Exception:
+                stdout = f"(Failed to retrieve job logs for {job_id})"
 
         # タイムアウトチェック
-        if lifecycle_state not in ("SUCCEEDED", "FAILED", "CANCELED"):
+        if lifecycle_state not in TERMINAL_JOB_STATES:
             return TerraformResult(
                 success=False,
                 command=command,
@@ -371,26 +549,11 @@ class InfraService:
             return "No changes. Infrastructure is up-to-date."
         return None
 
-    async def run_terraform_plan(
-        self,
-        session_id: str,
-        terraform_dir: str,
-        variables: dict[str, str] | None = None,
-    ) -> TerraformResult:
-        """OCI Resource Manager経由でTerraform planを実行する。
-
-        Terraformファイルをzip化してRMスタックにアップロードし、
-        Planジョブを実行して結果を返す。
-
-        Args:
-            session_id: セッションID。
-            terraform_dir: Terraformファイルが格納されたディレクトリパス。
-            variables: Terraform変数。RM自動入力変数(region, compartment_ocid等)は自動除外される。
-
-        Returns:
-            Terraform実行結果。
+    async def _check_terraform_request(self, session_id: str, terraform_dir: str) -> Path:
+        """Terraform操作の前提条件を検証し、検証済みのディレクトリパスを返す。
 
         Raises:
+            ValueError: terraform_dirに不正なパターンが含まれる場合。
             SessionNotFoundError: セッションが存在しない場合。
             ArchitectureNotFoundError: アーキテクチャが未設定の場合。
             InfraOperationInProgressError: 同一セッションで操作が実行中の場合。
@@ -401,28 +564,103 @@ class InfraService:
         if session.architecture is None:
             raise ArchitectureNotFoundError(session_id)
 
-        lock = self._get_session_lock(session_id)
-        if lock.locked():
+        if self.has_running_operation(session_id):
             raise InfraOperationInProgressError(session_id)
+        return validated_dir
 
-        async with lock:
+    async def _run_terraform(
+        self,
+        session_id: str,
+        terraform_dir: str,
+        variables: dict[str, str] | None,
+        command: TerraformCommand,
+        on_rm_job_created: RMJobCallback | None = None,
+        on_log: RMLogCallback | None = None,
+        *,
+        force: bool = False,
+    ) -> TerraformResult:
+        """RMスタックを更新し、commandに対応するRMジョブを実行する。
+
+        planはスタックの構成が前回の成功時から変わっていなければ、forceが指定されない限り
+        前回の結果を返す。apply / destroy はスタックのplan結果を破棄する。
+        """
+        validated_dir = await self._check_terraform_request(session_id, terraform_dir)
+
+        async with self._get_session_lock(session_id):
             try:
                 stack_id = await self._ensure_rm_stack(session_id, validated_dir, variables)
-                return await self._run_rm_job(stack_id, "PLAN", "plan")
+                if command != "plan":
+                    self._plan_cache.invalidate(stack_id)
+                    try:
+                        return await self._run_rm_job(
+                            stack_id, _RM_OPERATIONS[command], command, on_created=on_rm_job_created, on_log=on_log
+                        )
+                    finally:
+                        self._plan_cache.invalidate(stack_id)
+
+                # スタック構成のハッシュ（Terraformファイルの内容・変数）をキーにplan結果を再利用する
+                stack_hash = (await self._storage.load_session(session_id)).rm_stack_hash
+                if stack_hash and not force and self._plan_cache.enabled:
+                    cached = self._plan_cache.get(stack_id, stack_hash)
+                    if cached is not None:
+                        return cached
+                result = await self._run_rm_job(stack_id, "PLAN", command, on_created=on_rm_job_created, on_log=on_log)
+                if stack_hash:
+                    self._plan_cache.put(stack_id, stack_hash, result)
+                return result
             except Exception as e:
                 return TerraformResult(
                     success=False,
-                    command="plan",
+                    command=command,
                     stdout="",
                     stderr=str(e),
                     exit_code=1,
                 )
 
+    async def run_terraform_plan(
+        self,
+        session_id: str,
+        terraform_dir: str,
+        variables: dict[str, str] | None = None,
+        *,
+        force: bool = False,
+        on_rm_job_created: RMJobCallback | None = None,
+        on_log: RMLogCallback | None = None,
+    ) -> TerraformResult:
+        """OCI Resource Manager経由でTerraform planを実行する。
+
+        Terraformファイルをzip化してRMスタックにアップロードし、
+        Planジョブを実行して結果を返す。Terraformファイルと変数が前回の成功したplanから
+        変わっていない場合は、キャッシュの有効期間内であれば前回の結果（``cached=True``）を返す。
+
+        Args:
+            session_id: セッションID。
+            terraform_dir: Terraformファイルが格納されたディレクトリパス。
+            variables: Terraform変数。RM自動入力変数(region, compartment_ocid等)は自動除外される。
+            force: Trueの場合はキャッシュを使わずにPlanジョブを実行する。
+            on_rm_job_created: RMジョブ作成直後にジョブOCIDを受け取るコールバック。
+            on_log: RMジョブ実行中に新しいログ行を受け取るコールバック。
+
+        Returns:
+            Terraform実行結果。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+            ArchitectureNotFoundError: アーキテクチャが未設定の場合。
+            InfraOperationInProgressError: 同一セッションで操作が実行中の場合。
+        """
+        return await self._run_terraform(
+            session_id, terraform_dir, variables, "plan", on_rm_job_created, on_log, force=force
+        )
+
     async def run_terraform_apply(
         self,
         session_id: str,
         terraform_dir: str,
         variables: dict[str, str] | None = None,
+        *,
+        on_rm_job_created: RMJobCallback | None = None,
+        on_log: RMLogCallback | None = None,
     ) -> TerraformResult:
         """OCI Resource Manager経由でTerraform applyを実行する。
 
@@ -433,6 +671,8 @@ class InfraService:
             session_id: セッションID。
             terraform_dir: Terraformファイルが格納されたディレクトリパス。
             variables: Terraform変数。RM自動入力変数は自動除外される。
+            on_rm_job_created: RMジョブ作成直後にジョブOCIDを受け取るコールバック。
+            on_log: RMジョブ実行中に新しいログ行を受け取るコールバック。
 
         Returns:
             Terraform実行結果。
@@ -442,34 +682,16 @@ class InfraService:
             ArchitectureNotFoundError: アーキテクチャが未設定の場合。
             InfraOperationInProgressError: 同一セッションで操作が実行中の場合。
         """
-        validated_dir = _validate_terraform_dir(terraform_dir)
-
-        session = await self._storage.load_session(session_id)
-        if session.architecture is None:
-            raise ArchitectureNotFoundError(session_id)
-
-        lock = self._get_session_lock(session_id)
-        if lock.locked():
-            raise InfraOperationInProgressError(session_id)
-
-        async with lock:
-            try:
-                stack_id = await self._ensure_rm_stack(session_id, validated_dir, variables)
-                return await self._run_rm_job(stack_id, "APPLY", "apply")
-            except Exception as e:
-                return TerraformResult(
-                    success=False,
-                    command="apply",
-                    stdout="",
-                    stderr=str(e),
-                    exit_code=1,
-                )
+        return await self._run_terraform(session_id, terraform_dir, variables, "apply", on_rm_job_created, on_log)
 
     async def run_terraform_destroy(
         self,
         session_id: str,
         terraform_dir: str,
         variables: dict[str, str] | None = None,
+        *,
+        on_rm_job_created: RMJobCallback | None = None,
+        on_log: RMLogCallback | None = None,
     ) -> TerraformResult:
         """OCI Resource Manager経由でTerraform destroyを実行する。
 
@@ -479,6 +701,8 @@ class InfraService:
             session_id: セッションID。
             terraform_dir: Terraformファイルが格納されたディレクトリパス。
             variables: Terraform変数。RM自動入力変数は自動除外される。
+            on_rm_job_created: RMジョブ作成直後にジョブOCIDを受け取るコールバック。
+            on_log: RMジョブ実行中に新しいログ行を受け取るコールバック。
 
         Returns:
             Terraform実行結果。
@@ -488,28 +712,81 @@ class InfraService:
             ArchitectureNotFoundError: アーキテクチャが未設定の場合。
             InfraOperationInProgressError: 同一セッションで操作が実行中の場合。
         """
-        validated_dir = _validate_terraform_dir(terraform_dir)
+        return await self._run_terraform(session_id, terraform_dir, variables, "destroy", on_rm_job_created, on_log)
 
-        session = await self._storage.load_session(session_id)
-        if session.architecture is None:
-            raise ArchitectureNotFoundError(session_id)
+    async def submit_terraform_job(
+        self,
+        command: TerraformCommand,
+        session_id: str,
+        terraform_dir: str,
+        variables: dict[str, str] | None = None,
+        *,
+        force: bool = False,
+    ) -> Job:
+        """Terraform操作をジョブとして投入し、完了を待たずに返す。
 
-        lock = self._get_session_lock(session_id)
-        if lock.locked():
-            raise InfraOperationInProgressError(session_id)
+        前提条件（セッション・アーキテクチャ・パス）は投入前に検証する。
+        結果はジョブの ``result`` に TerraformResult のJSON表現として保存される。
 
-        async with lock:
-            try:
-                stack_id = await self._ensure_rm_stack(session_id, validated_dir, variables)
-                return await self._run_rm_job(stack_id, "DESTROY", "destroy")
-            except Exception as e:
-                return TerraformResult(
-                    success=False,
-                    command="destroy",
-                    stdout="",
-                    stderr=str(e),
-                    exit_code=1,
-                )
+        Args:
+            command: plan / apply / destroy。
+            session_id: セッションID。
+            terraform_dir: Terraformファイルが格納されたディレクトリパス。
+            variables: Terraform変数。
+            force: planでキャッシュを使わない場合はTrue。
+
+        Returns:
+            投入したジョブ。
+
+        Raises:
+            ValueError: terraform_dirに不正なパターンが含まれる場合。
+            SessionNotFoundError: セッションが存在しない場合。
+            ArchitectureNotFoundError: アーキテクチャが未設定の場合。
+            InfraOperationInProgressError: 同一セッションで操作・ジョブが実行中の場合。
+        """
+        await self._check_terraform_request(session_id, terraform_dir)
+
+        async def handler(job: Job) -> dict[str, Any]:
+            async def record_rm_job(rm_job_id: str) -> None:
+                job.rm_job_id = rm_job_id
+                await self._jobs.update(job)
+
+            result = await self._run_terraform(
+                session_id,
+                terraform_dir,
+                variables,
+                command,
+                record_rm_job,
+                self._job_log_reporter(job),
+                force=force,
+            )
+            return result.model_dump()
+
+        params: dict[str, Any] = {"terraform_dir": terraform_dir, "variables": variables or {}}
+        if command == "plan":
+            params["force"] = force
+        return await self._jobs.submit(_TERRAFORM_JOB_KINDS[command], session_id, handler, params=params)
+
+    async def _resume_terraform_job(self, job: Job) -> dict[str, Any]:
+        """再起動前に作成したRMジョブの完了を待ち、結果を返す。"""
+        command = _TERRAFORM_COMMANDS[job.kind]
+        result = await self._await_rm_job(
+            job.rm_job_id or "", _RM_OPERATIONS[command], command, on_log=self._job_log_reporter(job)
+        )
+        return result.model_dump()
+
+    def _job_log_reporter(self, job: Job) -> RMLogCallback:
+        """RMジョブのログをジョブの進捗として通知するコールバックを返す。"""
+
+        async def report(lines: list[str]) -> None:
+            self._jobs.report_progress(job.id, lines)
+
+        return report
+
+    async def _cancel_rm_job(self, job: Job) -> None:
+        """ジョブに対応するRMジョブをキャンセルする。"""
+        client = self._get_rm_client()
+        await asyncio.to_thread(client.cancel_job, job.rm_job_id)
 
     async def get_rm_job_status(self, job_id: str) -> dict[str, Any]:
         """Resource Managerジョブの状態とログを取得する。
@@ -592,11 +869,19 @@ class InfraService:
         "See: https://docs.oracle.com/en-us/iaas/Content/API/Concepts/sdkconfig.htm"
     )
 
-    async def run_oci_cli(self, command: str) -> CLIResult:
+    async def run_oci_cli(self, command: str, *, force: bool = False) -> CLIResult:
         """OCI CLIコマンドを実行する。
 
+        読み取り系のコマンド（``list`` / ``get``）の成功した結果はキャッシュし、有効期間内に
+        同じコマンドが実行された場合はキャッシュ済みの結果を返す。変更系のコマンドが成功した場合は
+        同じサービスのキャッシュを破棄する。
+
+        SDK実行器が利用できる場合、読み取り系のコマンドはCLIプロセスを起動せずにSDKで実行する。
+        SDKで実行できないコマンドはOCI CLIで実行する。
+
         Args:
             command: OCI CLIコマンド文字列。
+            force: Trueの場合はキャッシュを使わずに実行する（結果はキャッシュに保存する）。
 
         Returns:
             CLI実行結果。
@@ -604,7 +889,74 @@ class InfraService:
         Raises:
             CommandNotAllowedError: コマンドがホワイトリスト外の場合。
         """
-        args = self._validate_oci_command(command)
+        return await self._run_validated_oci_cli(self._validate_oci_command(command), force=force)
+
+    async def _run_validated_oci_cli(self, args: list[str], *, force: bool) -> CLIResult:
+        """検証済みのOCI CLI引数を、結果キャッシュを使って実行する。"""
+        read_only = is_read_only(args)
+        if read_only and force:
+            self._cli_cache.record_bypass()
+        elif read_only:
+            cached = self._cli_cache.get(args)
+            if cached is not None:
+                return cached
+
+        result = await self._execute_oci_cli(args)
+        if read_only:
+            self._cli_cache.put(args, result)
+        elif result.success:
+            self._cli_cache.invalidate_service(command_service(args))
+        return result
+
+    async def run_oci_cli_batch(self, commands: list[str], *, force: bool = False) -> list[CLIBatchItem]:
+        """複数のOCI CLIコマンドを同時に実行する。
+
+        各コマンドは :meth:`run_oci_cli` と同様にホワイトリストで検証し、SDK実行器・結果キャッシュを
+        使って実行する。同時に実行するコマンド数は ``cli_batch_concurrency`` までに制限する。
+        ホワイトリスト外のコマンドや実行中に例外が発生したコマンドはそのコマンドの結果にエラーを記録し、
+        他のコマンドは実行する。
+
+        Args:
+            commands: OCI CLIコマンド文字列のリスト（最大 ``MAX_CLI_BATCH_SIZE`` 件）。
+            force: Trueの場合はキャッシュを使わずに実行する。
+
+        Returns:
+            入力と同じ順序の実行結果。
+
+        Raises:
+            ValueError: コマンド数が上限を超える場合。
+        """
+        if len(commands) > MAX_CLI_BATCH_SIZE:
+            raise ValueError(f"Too many commands: {len(commands)} (max {MAX_CLI_BATCH_SIZE})")
+
+        async def run(command: str) -> CLIBatchItem:
+            try:
+                args = self._validate_oci_command(command)
+            except CommandNotAllowedError as e:
+                return CLIBatchItem(command=command, error=type(e).__name__, message=str(e))
+            async with self._cli_batch_slots:
+                start = time.perf_counter()
+                try:
+                    result = await self._run_validated_oci_cli(args, force=force)
+                except Exception as e:
+                    # 1件の失敗で他のコマンドの結果を失わないよう、例外はそのコマンドの結果に記録する
+                    logger.warning("OCI CLI command failed in batch: %s", command, exc_info=True)
+                    return CLIBatchItem(
+                        command=command,
+                        error=type(e).__name__,
+                        message=str(e),
+                        duration_seconds=time.perf_counter() - start,
+                    )
+                return CLIBatchItem(command=command, result=result, duration_seconds=time.perf_counter() - start)
+
+        return list(await asyncio.gather(*(run(command) for command in commands)))
+
+    async def _execute_oci_cli(self, args: list[str]) -> CLIResult:
+        """検証済みのOCI CLI引数を（可能ならSDKで）実行する。"""
+        if self._oci_sdk is not None:
+            result = await self._oci_sdk.run_cli(args)
+            if result is not None:
+                return result
 
         exit_code, stdout, stderr = await self._run_subprocess(args)
 
@@ -642,26 +994,26 @@ class InfraService:
             ArchitectureNotFoundError: アーキテクチャが未設定の場合。
             ValueError: パスが不正な場合。
         """
-        session = await self._storage.load_session(session_id)
-        if session.architecture is None:
-            raise ArchitectureNotFoundError(session_id)
+        async with self._storage.session_lock(session_id):
+            session = await self._storage.load_session(session_id)
+            if session.architecture is None:
+                raise ArchitectureNotFoundError(session_id)
 
-        # パストラバーサル防止
-        if ".." in file_path or file_path.startswith("/"):
-            raise ValueError(f"Invalid file_path: must be a relative path without '..': {file_path}")
+            # パストラバーサル防止
+            if ".." in file_path or file_path.startswith("/"):
+                raise ValueError(f"Invalid file_path: must be a relative path without '..': {file_path}")
 
-        terraform_dir = self._storage.get_session_dir(session_id) / "terraform"
-        target = (terraform_dir / file_path).resolve()
+            terraform_dir = self._storage.get_session_dir(session_id) / "terraform"
+            target = (terraform_dir / file_path).resolve()
 
-        # terraform_dir 配下であることを確認
-        if not str(target).startswith(str(terraform_dir.resolve())):
-            raise ValueError(f"Invalid file_path: must be within terraform directory: {file_path}")
+            # terraform_dir 配下であることを確認
+            if not str(target).startswith(str(terraform_dir.resolve())):
+                raise ValueError(f"Invalid file_path: must be within terraform directory: {file_path}")
 
-        # ディレクトリが存在しない場合はエラー
-        if not terraform_dir.exists():
-            raise ValueError(f"Terraform directory does not exist for session {session_id}. Run export_iac first.")
+            # ディレクトリが存在しない場合はエラー
+            if not terraform_dir.exists():
+                raise ValueError(f"Terraform directory does not exist for session {session_id}. Run export_iac first.")
 
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_text(new_content, encoding="utf-8")
+            await self._storage.run_io(write_text_file, target, new_content)
 
-        return {"file_path": str(target), "message": f"File updated: {file_path}"}
+            return {"file_path": str(target), "message": f"File updated: {file_path}"}
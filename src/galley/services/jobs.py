@@ -0,0 +1,335 @@
+"""長時間かかる操作を非同期ジョブとして実行するサービス。"""
+
+import asyncio
+import contextlib
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from galley.models.errors import InfraOperationInProgressError
+from galley.models.jobs import Job, JobKind
+from galley.storage.service import StorageService
+
+logger = logging.getLogger(__name__)
+
+# ジョブの処理本体。結果（JSON化可能な辞書）を返す
+JobHandler = Callable[[Job], Awaitable[dict[str, Any]]]
+
+# ジョブのキャンセル時に外部の処理（RMジョブ等）を止める処理
+JobCanceller = Callable[[Job], Awaitable[None]]
+
+# 進捗を受け取るコールバック（ジョブと新しい進捗行を受け取る）
+ProgressCallback = Callable[[Job, list[str]], Awaitable[None]]
+
+# ジョブ同時実行数のデフォルト
+DEFAULT_JOB_MAX_CONCURRENCY = 2
+
+# wait_jobで待機できる最大時間（秒）
+MAX_WAIT_SECONDS = 300.0
+
+# 実行中のジョブごとにメモリに保持する進捗行の数
+_PROGRESS_BUFFER_LINES = 500
+
+
+@dataclass
+class _JobProgress:
+    """実行中のジョブの進捗行。"""
+
+    lines: deque[str] = field(default_factory=lambda: deque(maxlen=_PROGRESS_BUFFER_LINES))
+    count: int = 0
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def append(self, lines: list[str]) -> None:
+        self.lines.extend(lines)
+        self.count += len(lines)
+        # 待機中の全員に通知し、次の通知用に新しいイベントを用意する
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    def since(self, cursor: int) -> list[str]:
+        """cursor行目以降の進捗行を返す（バッファから溢れた行は含まない）。"""
+        new = min(self.count - cursor, len(self.lines))
+        return list(self.lines)[len(self.lines) - new :] if new > 0 else []
+
+
+class JobService:
+    """ジョブの投入・実行・状態管理を行う。
+
+    ジョブは投入時にStorageServiceへ保存し、状態が変わるたびに保存し直す。
+    実行は ``max_concurrency`` 件までに制限し、それ以上は空きが出るまで ``queued`` のまま待つ。
+    サーバー再起動後は :meth:`recover` で未完了のジョブを再開する。再開処理が登録されていない
+    種類のジョブや、外部ジョブが未作成のまま中断したジョブは失敗として記録する。
+    ``canceled`` として記録するのは :meth:`cancel` で明示的にキャンセルしたジョブだけで、
+    サーバー停止（:meth:`close` やイベントループ終了時のタスクのキャンセル）で中断したジョブは
+    ``queued`` / ``running`` のまま残し、次回の :meth:`recover` で再開する。
+    """
+
+    def __init__(self, storage: StorageService, *, max_concurrency: int = DEFAULT_JOB_MAX_CONCURRENCY) -> None:
+        self._storage = storage
+        self._slots = asyncio.Semaphore(max(max_concurrency, 1))
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._jobs: dict[str, Job] = {}
+        self._saves: dict[str, asyncio.Task[None]] = {}
+        self._progress: dict[str, _JobProgress] = {}
+        self._resumers: dict[JobKind, JobHandler] = {}
+        self._cancellers: dict[JobKind, JobCanceller] = {}
+        self._cancel_requested: set[str] = set()
+        self._recovered = False
+
+    def register(
+        self,
+        kind: JobKind,
+        *,
+        resume: JobHandler | None = None,
+        cancel: JobCanceller | None = None,
+    ) -> None:
+        """ジョブ種別ごとの再開処理・キャンセル処理を登録する。
+
+        Args:
+            kind: ジョブ種別。
+            resume: 再起動後に ``rm_job_id`` を持つ未完了ジョブを再開する処理。
+            cancel: キャンセル時に外部の処理を止める処理。
+        """
+        if resume is not None:
+            self._resumers[kind] = resume
+        if cancel is not None:
+            self._cancellers[kind] = cancel
+
+    async def submit(
+        self,
+        kind: JobKind,
+        session_id: str,
+        handler: JobHandler,
+        params: dict[str, Any] | None = None,
+    ) -> Job:
+        """ジョブを投入し、実行完了を待たずに返す。
+
+        Args:
+            kind: ジョブ種別。
+            session_id: セッションID。
+            handler: ジョブの処理本体。
+            params: 記録用のパラメータ。
+
+        Returns:
+            投入したジョブ。
+
+        Raises:
+            InfraOperationInProgressError: 同じセッションで未完了のジョブがある場合。
+        """
+        if self.has_active_job(session_id):
+            raise InfraOperationInProgressError(session_id)
+        job = Job(kind=kind, session_id=session_id, params=params or {})
+        await self._storage.save_job(job)
+        self._start(job, handler)
+        return job.model_copy()
+
+    def has_active_job(self, session_id: str) -> bool:
+        """セッションに未完了（``queued`` / ``running``）のジョブがあるかどうか。"""
+        return any(job.session_id == session_id for job in self._jobs.values())
+
+    def _start(self, job: Job, handler: JobHandler) -> None:
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(self._execute(job, handler))
+
+    async def _execute(self, job: Job, handler: JobHandler) -> None:
+        try:
+            async with self._slots:
+                job.status = "running"
+                job.started_at = job.started_at or datetime.now(UTC)
+                await self._save(job)
+                result = await handler(job)
+            job.result = result
+            job.status = "succeeded" if result.get("success", True) else "failed"
+        except asyncio.CancelledError:
+            if job.id not in self._cancel_requested:
+                # サーバー停止による中断。保存済みの状態のまま残し、次回の起動時にrecoverで再開する
+                self._forget(job.id)
+                raise
+            job.status = "canceled"
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            job.status = "failed"
+            job.error = f"{type(e).__name__}: {e}"
+        job.finished_at = datetime.now(UTC)
+        try:
+            await self._save(job)
+        finally:
+            self._forget(job.id)
+
+    def _forget(self, job_id: str) -> None:
+        """終了・中断したジョブの実行中の状態を破棄する。"""
+        self._jobs.pop(job_id, None)
+        self._tasks.pop(job_id, None)
+        self._progress.pop(job_id, None)
+        self._cancel_requested.discard(job_id)
+
+    async def _save(self, job: Job) -> None:
+        """ジョブを保存する。同じジョブの保存は呼び出し順に行う。
+
+        保存はI/Oスレッドで行われ、呼び出し側がキャンセルされても書き込み自体は止まらない。
+        古い状態の書き込みが後から完了して新しい状態を上書きしないよう、直前の保存の完了を待ってから書き込む。
+        """
+        previous = self._saves.get(job.id)
+        snapshot = job.model_copy(deep=True)
+
+        async def write() -> None:
+            if previous is not None:
+                with contextlib.suppress(Exception):
+                    await previous
+            await self._storage.save_job(snapshot)
+
+        task = asyncio.create_task(write())
+        self._saves[job.id] = task
+
+        def forget(done: asyncio.Task[None]) -> None:
+            if self._saves.get(job.id) is done:
+                del self._saves[job.id]
+
+        task.add_done_callback(forget)
+        await asyncio.shield(task)
+
+    async def update(self, job: Job) -> None:
+        """実行中のジョブの途中経過（``rm_job_id`` 等）を保存する。"""
+        await self._save(job)
+
+    def report_progress(self, job_id: str, lines: list[str]) -> None:
+        """実行中のジョブの進捗（ログ行）を記録し、待機中の呼び出し元に通知する。
+
+        進捗はメモリにのみ保持し、ジョブの保存は行わない。
+        """
+        job = self._jobs.get(job_id)
+        if job is None or not lines:
+            return
+        job.progress_lines += len(lines)
+        job.progress_message = next((line for line in reversed(lines) if line.strip()), job.progress_message)
+        self._progress.setdefault(job_id, _JobProgress()).append(lines)
+
+    async def get(self, job_id: str) -> Job:
+        """ジョブの現在の状態を返す。
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合。
+        """
+        running = self._jobs.get(job_id)
+        if running is not None:
+            return running.model_copy()
+        return await self._storage.load_job(job_id)
+
+    async def wait(
+        self,
+        job_id: str,
+        timeout: float = 30.0,
+        on_progress: ProgressCallback | None = None,
+    ) -> Job:
+        """ジョブの完了を最大timeout秒待ち、その時点の状態を返す。
+
+        Args:
+            job_id: ジョブID。
+            timeout: 待機する最大秒数（上限 ``MAX_WAIT_SECONDS``）。
+            on_progress: 待機中に報告された進捗行を受け取るコールバック。
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合。
+        """
+        task = self._tasks.get(job_id)
+        timeout = min(max(timeout, 0.0), MAX_WAIT_SECONDS)
+        if task is not None and on_progress is None:
+            await asyncio.wait({task}, timeout=timeout)
+        elif task is not None and on_progress is not None:
+            await self._wait_with_progress(job_id, task, timeout, on_progress)
+        return await self.get(job_id)
+
+    async def _wait_with_progress(
+        self, job_id: str, task: asyncio.Task[None], timeout: float, on_progress: ProgressCallback
+    ) -> None:
+        """ジョブの完了を待ちながら、新しい進捗行をコールバックに渡す。"""
+        progress = self._progress.setdefault(job_id, _JobProgress())
+        cursor = progress.count
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            lines = progress.since(cursor)
+            cursor = progress.count
+            if lines:
+                await on_progress(await self.get(job_id), lines)
+            remaining = deadline - loop.time()
+            if task.done() or remaining <= 0:
+                return
+            changed = asyncio.ensure_future(progress.changed.wait())
+            try:
+                await asyncio.wait({task, changed}, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                changed.cancel()
+
+    async def cancel(self, job_id: str) -> Job:
+        """ジョブをキャンセルする。終了済みのジョブはそのまま返す。
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合。
+        """
+        job = await self.get(job_id)
+        if job.done:
+            return job
+        # 外部ジョブの終了をタスク側が検知して失敗扱いにしないよう、先にタスクを止める
+        task = self._tasks.pop(job_id, None)
+        if task is not None:
+            self._cancel_requested.add(job_id)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            self._cancel_requested.discard(job_id)
+        # 開始前にキャンセルされたタスクや、実行中のタスクが無い（再開されなかった）ジョブ
+        if not (await self.get(job_id)).done:
+            job = self._jobs.pop(job_id, job)
+            job.status = "canceled"
+            job.finished_at = datetime.now(UTC)
+            await self._save(job)
+        job = await self.get(job_id)
+        canceller = self._cancellers.get(job.kind)
+        if canceller is not None and job.rm_job_id:
+            try:
+                await canceller(job)
+            except Exception:
+                logger.warning("Failed to cancel external job for %s", job_id, exc_info=True)
+        return job
+
+    async def close(self) -> None:
+        """実行中のジョブのタスクを止め、保存中の書き込みの完了を待つ（サーバー停止時）。
+
+        止めたジョブは ``queued`` / ``running`` のまま保存されており、次回の :meth:`recover` で
+        再開する（停止後に再び :meth:`recover` を呼べるようにする）。
+        """
+        tasks = dict(self._tasks)
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        # 開始前に止めたタスクは後始末を行わないため、ここで破棄する
+        for job_id in tasks:
+            self._forget(job_id)
+        await asyncio.gather(*self._saves.values(), return_exceptions=True)
+        self._recovered = False
+
+    async def list_jobs(self, session_id: str) -> list[Job]:
+        """セッションのジョブを作成日時の古い順に返す。"""
+        return await self._storage.list_jobs(session_id=session_id)
+
+    async def recover(self) -> None:
+        """前回の起動時に完了しなかったジョブを再開する（2回目以降の呼び出しは何もしない）。"""
+        if self._recovered:
+            return
+        self._recovered = True
+        for job in await self._storage.list_jobs(statuses={"queued", "running"}):
+            if job.id in self._jobs:
+                continue
+            resume = self._resumers.get(job.kind)
+            if resume is not None and job.rm_job_id:
+                logger.info("Resuming job %s (%s) after restart", job.id, job.kind)
+                self._start(job, resume)
+                continue
+            job.status = "failed"
+            job.error = "Interrupted by server restart"
+            job.finished_at = datetime.now(UTC)
+            await self._storage.save_job(job)
@@ -0,0 +1,90 @@
+"""OCI CLIの引数の解析。
+
+結果キャッシュ（:mod:`galley.services.cli_cache`）とSDK実行器（:mod:`galley.services.oci_sdk`）は
+同じ解析結果を使うため、キャッシュのキーと実際に実行される内容が食い違わない。
+"""
+
+from dataclasses import dataclass
+
+# 既定の認証方式（``--auth`` 省略時）
+DEFAULT_AUTH = "api_key"
+
+# CLIの別名・短縮形のオプションと、正規化後の名前（SDKのパラメータ名）
+_OPTION_ALIASES: dict[str, str] = {
+    "-c": "compartment_id",
+    "-ns": "namespace_name",
+    "--namespace": "namespace_name",
+    "-bn": "bucket_name",
+}
+
+
+@dataclass(frozen=True)
+class OCICommand:
+    """解析したOCI CLIコマンド。"""
+
+    auth: str  # 認証方式（``--auth`` の値）
+    words: list[str]  # コマンド語（サービス・リソース・動詞）
+    options: dict[str, str | bool]  # 正規化したオプション名と値（値を取らないフラグはTrue）
+
+    @property
+    def service(self) -> str:
+        """サービス名（``compute`` 等）。コマンド語が無い場合は空文字列。"""
+        return self.words[0] if self.words else ""
+
+
+def _strip_prefix(args: list[str]) -> tuple[str, list[str]]:
+    """先頭の ``oci`` と ``--auth <方式>`` を取り除き、認証方式と残りの引数を返す。"""
+    tokens = list(args[1:] if args and args[0] == "oci" else args)
+    if tokens[:1] == ["--auth"] and len(tokens) >= 2:
+        return tokens[1], tokens[2:]
+    return DEFAULT_AUTH, tokens
+
+
+def _is_option(token: str) -> bool:
+    """オプション名のトークンか（``-1`` のような負の数は値として扱う）。"""
+    return token.startswith("--") or (token[:1] == "-" and token[1:2].isalpha())
+
+
+def _option_name(token: str) -> str:
+    """オプション名を正規化する（別名を解決し、``--compartment-id`` を ``compartment_id`` にする）。"""
+    return _OPTION_ALIASES.get(token) or token.lstrip("-").replace("-", "_")
+
+
+def parse_command(args: list[str]) -> OCICommand | None:
+    """CLI引数を認証方式・コマンド語・オプションに分ける。
+
+    オプションは ``--name value`` / ``--name=value`` のどちらの表記も受け付ける。同じオプション
+    （別名を含む）が複数回指定されたコマンドは、CLIがすべての値を受け取るため1つの値に畳み込めず、
+    解釈できないものとして扱う（キャッシュ・SDK実行の対象外となり、CLIでそのまま実行される）。
+
+    Returns:
+        解析結果。オプションの後ろに位置引数がある、同じオプションが重複している等、解釈できない場合はNone。
+    """
+    auth, tokens = _strip_prefix(args)
+    split = next((i for i, t in enumerate(tokens) if t.startswith("-")), len(tokens))
+    options: dict[str, str | bool] = {}
+    rest = tokens[split:]
+    i = 0
+    while i < len(rest):
+        if not _is_option(rest[i]):
+            return None
+        name, eq, inline = rest[i].partition("=")
+        key = _option_name(name)
+        if key in options:
+            return None
+        if eq:
+            options[key] = inline
+            i += 1
+        elif i + 1 < len(rest) and not _is_option(rest[i + 1]):
+            options[key] = rest[i + 1]
+            i += 2
+        else:
+            options[key] = True
+            i += 1
+    return OCICommand(auth=auth, words=tokens[:split], options=options)
+
+
+def command_service(args: list[str]) -> str:
+    """CLI引数のサービス名（``compute`` 等）を返す。"""
+    _auth, tokens = _strip_prefix(args)
+    return tokens[0] if tokens and not tokens[0].startswith("-") else ""
@@ -0,0 +1,273 @@
+"""OCI CLIコマンドをプロセス内のOCI SDK呼び出しで実行する。"""
+
+import asyncio
+import functools
+import importlib
+import inspect
+import json
+import logging
+import re
+from collections.abc import Callable
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import oci
+
+from galley.models.infra import CLIResult
+from galley.services.oci_cli_args import DEFAULT_AUTH, parse_command
+from galley.storage.oci_client import OCIClientFactory
+
+logger = logging.getLogger(__name__)
+
+# SDKクライアントを生成する関数（クライアントクラスとリージョンを受け取る。リージョンNoneは既定）
+ClientFactory = Callable[[type[Any], str | None], Any]
+
+# CLIのサービス名と対応するSDKクライアント（oci配下の "モジュール.クラス"）
+_SERVICE_CLIENTS: dict[str, tuple[str, ...]] = {
+    "iam": ("identity.IdentityClient",),
+    "compute": ("core.ComputeClient",),
+    "network": ("core.VirtualNetworkClient",),
+    "bv": ("core.BlockstorageClient",),
+    "os": ("object_storage.ObjectStorageClient",),
+    "db": ("database.DatabaseClient",),
+    "container-instances": ("container_instances.ContainerInstanceClient",),
+    "resource-manager": ("resource_manager.ResourceManagerClient",),
+    "dns": ("dns.DnsClient",),
+    "ce": ("container_engine.ContainerEngineClient",),
+    "oke": ("container_engine.ContainerEngineClient",),
+    "apigateway": ("apigateway.GatewayClient", "apigateway.DeploymentClient", "apigateway.ApiGatewayClient"),
+    "functions": ("functions.FunctionsManagementClient",),
+    "events": ("events.EventsClient",),
+    "logging": ("logging.LoggingManagementClient",),
+    "monitoring": ("monitoring.MonitoringClient",),
+    "vault": ("vault.VaultsClient",),
+    "kms": ("key_management.KmsVaultClient",),
+    "artifacts": ("artifacts.ArtifactsClient",),
+    "devops": ("devops.DevopsClient",),
+}
+
+# 名前から導出できないコマンドとSDKメソッドの対応
+_METHOD_ALIASES: dict[tuple[str, ...], str] = {
+    ("os", "ns", "get"): "get_namespace",
+}
+
+# SDKで実行する動詞（読み取り専用のコマンドのみ。変更系はCLIで実行する）
+_SDK_VERBS = frozenset({"list", "get"})
+
+# SDK呼び出しに渡さずに処理するオプション
+_OUTPUT_OPTION = "output"
+_REGION_OPTION = "region"
+_ALL_OPTION = "all"
+
+# SDKのdocstringから読み取るパラメータの型
+_PARAM_TYPE_RE = re.compile(r":param (\S+) (\w+):")
+
+
+def _to_cli_json(value: Any) -> Any:
+    """SDKのレスポンスをOCI CLIと同じ形式（属性名はケバブケース）のJSON値に変換する。"""
+    if hasattr(value, "swagger_types"):
+        return {name.replace("_", "-"): _to_cli_json(getattr(value, name)) for name in value.swagger_types}
+    if isinstance(value, list):
+        return [_to_cli_json(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_cli_json(v) for k, v in value.items()}
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    return value
+
+
+@functools.cache
+def _param_types(method: Callable[..., Any]) -> dict[str, str]:
+    """SDKメソッドのパラメータ名と型（docstring記載の型名）を返す。"""
+    return {name: type_name for type_name, name in _PARAM_TYPE_RE.findall(inspect.getdoc(method) or "")}
+
+
+def _coerce(value: str | bool, type_name: str | None) -> Any:
+    """CLIの引数値をSDKのパラメータ型に変換する。"""
+    if isinstance(value, bool) or type_name in (None, "str"):
+        return value
+    if type_name == "int":
+        return int(value)
+    if type_name == "float":
+        return float(value)
+    if type_name == "bool":
+        return value.lower() == "true"
+    if type_name.startswith(("list", "dict")) or value.startswith(("[", "{")):
+        return json.loads(value)
+    return value
+
+
+class OCISDKExecutor:
+    """OCI CLIと同等の操作をプロセス内のSDKクライアントで実行する。
+
+    CLIはコマンドごとにPythonプロセスを起動してSDKを読み込み、TLS接続を張り直すため、
+    1回あたり数秒かかる。この実行器は :class:`OCIClientFactory` の共有クライアントを使い、
+    認証情報と接続を再利用する。
+
+    :meth:`run_cli` はホワイトリスト済みのサービスの読み取り専用コマンド（``list`` / ``get``）を
+    SDKメソッドに対応付けて実行し、OCI CLIと同じ形式のJSONを返す。対応付けられない
+    コマンドや変更系のコマンドはNoneを返すので、呼び出し側でCLIを実行する。
+    アプリケーションのデプロイで使う操作（Object Storageへのアップロード、kubeconfig取得、
+    インスタンスエージェントのコマンド実行）は個別のメソッドで提供する。
+    """
+
+    def __init__(self, client_factory: ClientFactory | None = None) -> None:
+        self._client_factory: ClientFactory = client_factory or OCIClientFactory()
+        self._available: bool | None = None
+        self._namespace: str | None = None
+
+    @property
+    def available(self) -> bool:
+        """SDKの認証情報を読み込めるかどうか（初回のみ確認する）。"""
+        if self._available is None:
+            try:
+                self._client_factory(oci.identity.IdentityClient, None)
+                self._available = True
+            except Exception as e:
+                logger.info("OCI SDK executor is unavailable, falling back to the OCI CLI: %s", e)
+                self._available = False
+        return self._available
+
+    def _client(self, dotted: str, region: str | None = None) -> Any:
+        module_name, class_name = dotted.rsplit(".", 1)
+        client_class = getattr(importlib.import_module(f"oci.{module_name}"), class_name)
+        return self._client_factory(client_class, region)
+
+    def _resolve(self, words: list[str], region: str | None) -> Callable[..., Any] | None:
+        """CLIのコマンド語（サービス・リソース・動詞）に対応するSDKメソッドを返す。"""
+        service, *resource, verb = words
+        clients = _SERVICE_CLIENTS.get(service)
+        if clients is None or verb not in _SDK_VERBS or not resource:
+            return None
+        alias = _METHOD_ALIASES.get(tuple(words))
+        name = "_".join(resource).replace("-", "_")
+        if alias is not None:
+            candidates = [alias]
+        elif verb == "get":
+            candidates = [f"get_{name}"]
+        else:
+            candidates = [f"list_{name}s", f"list_{name}es"]
+            if name.endswith("y"):
+                candidates.append(f"list_{name[:-1]}ies")
+        for dotted in clients:
+            module_name, class_name = dotted.rsplit(".", 1)
+            client_class = getattr(importlib.import_module(f"oci.{module_name}"), class_name)
+            for candidate in candidates:
+                if callable(getattr(client_class, candidate, None)):
+                    return getattr(self._client(dotted, region), candidate)  # type: ignore[no-any-return]
+        return None
+
+    async def run_cli(self, args: list[str]) -> CLIResult | None:
+        """検証済みのOCI CLI引数をSDKで実行する。
+
+        Args:
+            args: OCI CLIの引数（先頭の ``oci`` と ``--auth`` は省略可）。
+
+        Returns:
+            CLI実行結果。SDKで実行できないコマンドの場合はNone。
+        """
+        command = parse_command(args)
+        # 共有クライアントの認証方式（APIキー・リソースプリンシパル）以外を指定したコマンドはCLIに任せる
+        if command is None or command.auth not in (DEFAULT_AUTH, "resource_principal"):
+            return None
+        words, options = command.words, dict(command.options)
+        if len(words) < 3 or not self.available:
+            return None
+        if options.pop(_OUTPUT_OPTION, "json") != "json":
+            return None
+        region = options.pop(_REGION_OPTION, None)
+        fetch_all = options.pop(_ALL_OPTION, False) is True
+        if region is not None and not isinstance(region, str):
+            return None
+
+        method = self._resolve(words, region)
+        if method is None:
+            return None
+        types = _param_types(method)
+        try:
+            kwargs = {name: _coerce(value, types.get(name)) for name, value in options.items()}
+        except ValueError:
+            return None
+        if words[0] == "os" and "namespace_name" in types and "namespace_name" not in kwargs:
+            kwargs["namespace_name"] = await self.get_namespace()
+
+        try:
+            if fetch_all and words[-1] == "list":
+                response = await asyncio.to_thread(oci.pagination.list_call_get_all_results, method, **kwargs)
+            else:
+                response = await asyncio.to_thread(method, **kwargs)
+        except oci.exceptions.ServiceError as e:
+            error = {"code": e.code, "message": e.message, "opc-request-id": e.request_id, "status": e.status}
+            return CLIResult(
+                success=False, stdout="", stderr=f"ServiceError:\n{json.dumps(error, indent=4)}", exit_code=1
+            )
+        except (TypeError, ValueError) as e:
+            # 必須パラメータの不足や未知のオプション（CLIに任せてエラーメッセージを揃える）
+            logger.debug("Falling back to the OCI CLI for %s: %s", " ".join(words), e)
+            return None
+
+        output: dict[str, Any] = {"data": _to_cli_json(response.data)}
+        if not fetch_all and getattr(response, "has_next_page", False):
+            output["opc-next-page"] = response.next_page
+        return CLIResult(success=True, stdout=json.dumps(output, indent=4), stderr="", exit_code=0)
+
+    async def get_namespace(self) -> str:
+        """Object Storageのネームスペースを返す。"""
+        if self._namespace is None:
+            client = self._client("object_storage.ObjectStorageClient")
+            response = await asyncio.to_thread(client.get_namespace)
+            self._namespace = str(response.data)
+        return self._namespace
+
+    async def put_object(self, namespace: str, bucket_name: str, object_name: str, file_path: Path) -> None:
+        """ファイルをObject Storageにアップロードする（``oci os object put`` 相当）。"""
+        client = self._client("object_storage.ObjectStorageClient")
+
+        def _put() -> None:
+            with file_path.open("rb") as body:
+                client.put_object(namespace, bucket_name, object_name, body)
+
+        await asyncio.to_thread(_put)
+
+    async def create_kubeconfig(self, cluster_id: str, file_path: Path, token_version: str = "2.0.0") -> None:
+        """OKEクラスタのkubeconfigをファイルに書き込む（``oci ce cluster create-kubeconfig`` 相当）。"""
+        client = self._client("container_engine.ContainerEngineClient")
+        details = oci.container_engine.models.CreateClusterKubeconfigContentDetails(token_version=token_version)
+        response = await asyncio.to_thread(client.create_kubeconfig, cluster_id, details)
+        content = response.data.text
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(file_path.write_text, content, encoding="utf-8")
+        file_path.chmod(0o600)
+
+    async def create_instance_agent_command(
+        self, compartment_id: str, instance_id: str, script: str, timeout_seconds: int
+    ) -> str:
+        """インスタンスエージェントでスクリプトを実行するコマンドを作成し、コマンドIDを返す。"""
+        client = self._client("compute_instance_agent.ComputeInstanceAgentClient")
+        models = oci.compute_instance_agent.models
+        details = models.CreateInstanceAgentCommandDetails(
+            compartment_id=compartment_id,
+            execution_time_out_in_seconds=timeout_seconds,
+            target=models.InstanceAgentCommandTarget(instance_id=instance_id),
+            content=models.InstanceAgentCommandContent(
+                source=models.InstanceAgentCommandSourceViaTextDetails(source_type="TEXT", text=script)
+            ),
+        )
+        response = await asyncio.to_thread(client.create_instance_agent_command, details)
+        return str(response.data.id)
+
+    async def get_instance_agent_command_execution(
+        self, command_id: str, instance_id: str
+    ) -> tuple[str, int | None, str]:
+        """インスタンスエージェントのコマンド実行状態を返す。
+
+        Returns:
+            (lifecycle_state, exit_code, output) のタプル。
+        """
+        client = self._client("compute_instance_agent.ComputeInstanceAgentClient")
+        response = await asyncio.to_thread(client.get_instance_agent_command_execution, command_id, instance_id)
+        execution = response.data
+        content = execution.content
+        exit_code = getattr(content, "exit_code", None)
+        return execution.lifecycle_state, exit_code, getattr(content, "text", None) or ""
@@ -0,0 +1,66 @@
+"""Terraform plan結果のキャッシュ。"""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from galley.models.infra import PlanCacheMetrics, TerraformResult
+
+# plan結果を再利用できる期間のデフォルト（秒）
+DEFAULT_PLAN_CACHE_TTL = 600.0
+
+
+@dataclass
+class _PlanEntry:
+    """キャッシュしたplan結果。"""
+
+    config_hash: str
+    result: TerraformResult
+    expires_at: float
+
+
+class PlanCache:
+    """RMスタックごとに、最後に成功したplan結果を保持する。
+
+    plan結果は、スタックにアップロードした構成（Terraformファイルの内容と変数のハッシュ）が
+    一致し、かつTTL内の場合にのみ再利用する。apply / destroy でインフラの状態が変わった場合は
+    :meth:`invalidate` で破棄する。TTLが0以下の場合はキャッシュしない。
+    """
+
+    def __init__(self, ttl: float = DEFAULT_PLAN_CACHE_TTL, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: dict[str, _PlanEntry] = {}
+        self._metrics = PlanCacheMetrics()
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュが有効かどうか。"""
+        return self._ttl > 0
+
+    @property
+    def metrics(self) -> PlanCacheMetrics:
+        """キャッシュの統計情報。"""
+        return self._metrics.model_copy(update={"entries": len(self._entries)})
+
+    def get(self, stack_id: str, config_hash: str) -> TerraformResult | None:
+        """スタック構成に一致する有効なplan結果を返す。無い場合はNone。"""
+        entry = self._entries.get(stack_id)
+        if entry is not None and entry.expires_at <= self._clock():
+            del self._entries[stack_id]
+            entry = None
+        if entry is None or entry.config_hash != config_hash:
+            self._metrics.misses += 1
+            return None
+        self._metrics.hits += 1
+        return entry.result.model_copy(update={"cached": True})
+
+    def put(self, stack_id: str, config_hash: str, result: TerraformResult) -> None:
+        """成功したplan結果を保存する。"""
+        if not self.enabled or not result.success:
+            return
+        self._entries[stack_id] = _PlanEntry(config_hash, result, self._clock() + self._ttl)
+
+    def invalidate(self, stack_id: str) -> None:
+        """スタックのplan結果を破棄する。"""
+        self._entries.pop(stack_id, None)
@@ -0,0 +1,82 @@
+"""Resource Managerジョブのログを逐次取得する。"""
+
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+# 1回のget_job_logs呼び出しで取得するログ件数
+_LOG_PAGE_LIMIT = 500
+
+# TerraformResultに残すログの行数（これより前の行は破棄する）
+DEFAULT_LOG_TAIL_LINES = 2000
+
+
+class RMJobLogStream:
+    """RMジョブのログを前回取得した位置から読み進める。
+
+    ``get_job_logs`` をタイムスタンプの昇順・ページ単位で呼び出し、前回までに取得した
+    エントリより後のものだけを返す。同じタイムスタンプのエントリは件数で重複を除く。
+    取得したログは末尾 ``tail_lines`` 行だけを保持するため、ログ全体をメモリに載せない。
+    """
+
+    def __init__(self, client: Any, job_id: str, *, tail_lines: int = DEFAULT_LOG_TAIL_LINES) -> None:
+        self._client = client
+        self._job_id = job_id
+        self._tail: deque[str] = deque(maxlen=max(tail_lines, 1))
+        self._line_count = 0
+        self._last_timestamp: datetime | None = None
+        self._seen_at_last_timestamp = 0
+
+    @property
+    def line_count(self) -> int:
+        """これまでに取得したログの行数。"""
+        return self._line_count
+
+    @property
+    def text(self) -> str:
+        """保持しているログ末尾のテキスト。破棄した行がある場合は先頭にその行数を記す。"""
+        omitted = self._line_count - len(self._tail)
+        lines = list(self._tail)
+        if omitted:
+            lines.insert(0, f"... ({omitted} earlier log lines omitted)")
+        return "\n".join(lines)
+
+    async def fetch(self) -> list[str]:
+        """前回の取得以降に追加されたログを取得する。
+
+        Returns:
+            新しいログの行（古い順）。
+        """
+        new_lines: list[str] = []
+        since = self._last_timestamp
+        skip = self._seen_at_last_timestamp
+        page: str | None = None
+        while True:
+            kwargs: dict[str, Any] = {"sort_order": "ASC", "limit": _LOG_PAGE_LIMIT}
+            if since is not None:
+                kwargs["timestamp_greater_than_or_equal_to"] = since
+            if page is not None:
+                kwargs["page"] = page
+            response = await asyncio.to_thread(self._client.get_job_logs, self._job_id, **kwargs)
+            for entry in response.data:
+                if since is not None and entry.timestamp == since and skip > 0:
+                    skip -= 1
+                    continue
+                self._record(entry)
+                new_lines.extend((entry.message or "").splitlines() or [""])
+            if not response.has_next_page:
+                break
+            page = response.next_page
+
+        self._tail.extend(new_lines)
+        self._line_count += len(new_lines)
+        return new_lines
+
+    def _record(self, entry: Any) -> None:
+        """取得済み位置（最後のタイムスタンプとその件数）を更新する。"""
+        if entry.timestamp == self._last_timestamp:
+            self._seen_at_last_timestamp += 1
+        else:
+            self._last_timestamp = entry.timestamp
+            self._seen_at_last_timestamp = 1
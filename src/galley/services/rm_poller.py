@@ -0,0 +1,231 @@
+"""Resource Managerジョブの状態を共有ポーリングする。"""
+
+import asyncio
+import contextlib
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from galley.models.infra import RMPollerMetrics
+
+logger = logging.getLogger(__name__)
+
+# ジョブの終了状態
+TERMINAL_JOB_STATES = frozenset({"SUCCEEDED", "FAILED", "CANCELED"})
+
+# ポーリング間隔のデフォルト設定（秒）
+DEFAULT_POLL_INITIAL_INTERVAL = 2.0
+DEFAULT_POLL_MAX_INTERVAL = 15.0
+DEFAULT_POLL_BACKOFF = 1.5
+
+# list_jobsで一度に取得するジョブ数（ここに含まれないジョブはget_jobで個別に取得する）
+_LIST_JOBS_LIMIT = 100
+
+# 連続して状態取得に失敗した場合に待機側へエラーを返すまでの回数
+_MAX_CONSECUTIVE_ERRORS = 3
+
+
+@dataclass
+class _TrackedJob:
+    """ポーリング中のジョブ。"""
+
+    job_id: str
+    compartment_id: str | None
+    future: asyncio.Future[Any]
+    interval: float
+    next_poll_at: float
+    waiters: int = 0
+    errors: int = 0
+
+
+class RMJobPoller:
+    """実行中のRMジョブの状態確認を1つのバックグラウンドタスクにまとめる。
+
+    待機中のジョブは次回ポーリング時刻が来たものをまとめて確認する。同じコンパートメントの
+    ジョブが複数ある場合は ``list_jobs`` 1回で状態を取得し、1件だけの場合や一覧に含まれない
+    ジョブは ``get_job`` で取得する。ポーリング間隔はジョブごとに初期間隔から最大間隔まで
+    伸ばしていくため、短いジョブは早く検知し、長いジョブではAPI呼び出しを抑えられる。
+
+    待機するジョブが無くなるとバックグラウンドタスクは終了し、次の待機で再開する。
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        *,
+        initial_interval: float = DEFAULT_POLL_INITIAL_INTERVAL,
+        max_interval: float = DEFAULT_POLL_MAX_INTERVAL,
+        backoff: float = DEFAULT_POLL_BACKOFF,
+    ) -> None:
+        self._client_factory = client_factory
+        self._initial_interval = initial_interval
+        self._max_interval = max(max_interval, initial_interval)
+        self._backoff = max(backoff, 1.0)
+        self._jobs: dict[str, _TrackedJob] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._metrics = RMPollerMetrics()
+        self._detection_latency_total = 0.0
+
+    @property
+    def metrics(self) -> RMPollerMetrics:
+        """ポーリングの統計情報。"""
+        detected = self._metrics.detection_count
+        return self._metrics.model_copy(
+            update={
+                "in_flight": len(self._jobs),
+                "detection_latency_avg_seconds": self._detection_latency_total / detected if detected else 0.0,
+            }
+        )
+
+    async def wait(self, job_id: str, *, compartment_id: str | None = None, timeout: float | None = None) -> Any:
+        """ジョブが終了状態になるまで待ち、最後に取得したジョブ情報を返す。
+
+        同じジョブを複数の呼び出し元が待つ場合はポーリングを共有する。
+
+        Args:
+            job_id: ジョブOCID。
+            compartment_id: ジョブのコンパートメントOCID。指定するとlist_jobsでまとめて確認できる。
+            timeout: 待機の上限（秒）。Noneの場合は無制限。
+
+        Returns:
+            ジョブ情報（``lifecycle_state`` を持つSDKのJobまたはJobSummary）。
+
+        Raises:
+            TimeoutError: timeout内にジョブが終了しなかった場合。
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            loop = asyncio.get_running_loop()
+            job = _TrackedJob(
+                job_id=job_id,
+                compartment_id=compartment_id,
+                future=loop.create_future(),
+                interval=self._initial_interval,
+                next_poll_at=loop.time() + self._initial_interval,
+            )
+            self._jobs[job_id] = job
+            self._metrics.jobs_tracked += 1
+            self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        job.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(job.future), timeout)
+        finally:
+            job.waiters -= 1
+            if job.waiters == 0 and not job.future.done():
+                # 待機者がいなくなったジョブは追跡をやめる
+                self._jobs.pop(job_id, None)
+                job.future.cancel()
+
+    async def close(self) -> None:
+        """バックグラウンドタスクを停止し、待機中のジョブをキャンセルする。"""
+        for job in self._jobs.values():
+            job.future.cancel()
+        self._jobs.clear()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._jobs:
+            now = loop.time()
+            due = [job for job in self._jobs.values() if job.next_poll_at <= now]
+            if due:
+                await self._poll(due)
+                continue
+            self._wakeup.clear()
+            delay = min(job.next_poll_at for job in self._jobs.values()) - now
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+
+    async def _call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        self._metrics.api_calls += 1
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def _fetch_states(self, due: list[_TrackedJob]) -> dict[str, Any]:
+        """ジョブの状態を取得する。取得に失敗したジョブは例外を値として返す。"""
+        client = self._client_factory()
+        results: dict[str, Any] = {}
+
+        groups: dict[str | None, list[_TrackedJob]] = defaultdict(list)
+        for job in due:
+            groups[job.compartment_id].append(job)
+        for compartment_id, jobs in groups.items():
+            if compartment_id is None or len(jobs) < 2:
+                continue
+            try:
+                response = await self._call(
+                    client.list_jobs,
+                    compartment_id=compartment_id,
+                    sort_by="TIMECREATED",
+                    sort_order="DESC",
+                    limit=_LIST_JOBS_LIMIT,
+                )
+            except Exception:
+                logger.warning("Failed to list Resource Manager jobs in %s", compartment_id, exc_info=True)
+                continue
+            wanted = {job.job_id for job in jobs}
+            for summary in response.data:
+                if summary.id in wanted:
+                    results[summary.id] = summary
+
+        remaining = [job for job in due if job.job_id not in results]
+        responses = await asyncio.gather(
+            *(self._call(client.get_job, job.job_id) for job in remaining), return_exceptions=True
+        )
+        for job, response in zip(remaining, responses, strict=True):
+            results[job.job_id] = response if isinstance(response, BaseException) else response.data
+        return results
+
+    async def _poll(self, due: list[_TrackedJob]) -> None:
+        """次回ポーリング時刻が来たジョブの状態をまとめて確認する。"""
+        self._metrics.polls += 1
+        try:
+            states = await self._fetch_states(due)
+        except Exception as e:
+            states = dict.fromkeys((job.job_id for job in due), e)
+
+        now = asyncio.get_running_loop().time()
+        for job in due:
+            if self._jobs.get(job.job_id) is not job:
+                continue  # 待機者がいなくなった
+            state = states[job.job_id]
+            if isinstance(state, BaseException):
+                self._metrics.poll_errors += 1
+                job.errors += 1
+                if job.errors >= _MAX_CONSECUTIVE_ERRORS:
+                    del self._jobs[job.job_id]
+                    job.future.set_exception(state)
+                    continue
+            elif state.lifecycle_state in TERMINAL_JOB_STATES:
+                del self._jobs[job.job_id]
+                self._record_completion(job, state)
+                job.future.set_result(state)
+                continue
+            else:
+                job.errors = 0
+            job.interval = min(job.interval * self._backoff, self._max_interval)
+            job.next_poll_at = now + job.interval
+
+    def _record_completion(self, job: _TrackedJob, state: Any) -> None:
+        """ジョブ終了から検知までの遅延を記録する。"""
+        self._metrics.jobs_completed += 1
+        finished = getattr(state, "time_finished", None)
+        if not isinstance(finished, datetime):
+            return
+        if finished.tzinfo is None:
+            finished = finished.replace(tzinfo=UTC)
+        latency = max((datetime.now(UTC) - finished).total_seconds(), 0.0)
+        self._metrics.detection_count += 1
+        self._detection_latency_total += latency
+        self._metrics.detection_latency_max_seconds = max(self._metrics.detection_latency_max_seconds, latency)
+        logger.debug("Detected completion of job %s %.1fs after it finished", job.job_id, latency)
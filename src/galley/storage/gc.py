@@ -0,0 +1,202 @@
+"""セッションデータのガベージコレクション。"""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import UTC, datetime, timedelta
+
+from galley.models.errors import SessionNotFoundError, StorageError
+from galley.models.session import Session, SessionStatus
+from galley.models.storage import GCReport
+from galley.storage.io import disk_usage, remove_tree
+from galley.storage.service import StorageService
+from galley.storage.snapshots import SNAPSHOTS_DIRNAME, SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# GCのデフォルト設定
+DEFAULT_GC_INTERVAL = 3600.0  # 1時間
+DEFAULT_GC_BATCH_SIZE = 50
+
+
+class SessionGarbageCollector:
+    """保持ポリシーに従ってセッションデータを削除するバックグラウンドタスク。
+
+    保持ポリシー:
+        - 保持期間: 対象ステータスのセッションのうち、最終更新から指定日数を過ぎたものを削除する。
+        - 容量上限: データディレクトリの合計サイズが上限を超えた場合、対象ステータスの指定順に
+          最終更新の古いセッションから削除する。
+        - スナップショット数: セッションごとに新しいスナップショットを指定件数だけ残す。
+
+    セッションは最終更新の古い順に一度ずつ、キャッシュを変更せずに読み込む。処理は小さなバッチ単位で行い、
+    ファイル操作はスレッドで実行するためイベントループをブロックしない。
+
+    次のセッションは削除しない:
+        - ロック中（操作中）のセッション。
+        - ``busy_checks`` のいずれかがTrueを返すセッション（ジョブ・Terraform操作の実行中、デプロイ済み等）。
+        - RMスタックを作成済みのセッション（削除するとスタックの参照が失われる）。
+    """
+
+    def __init__(
+        self,
+        storage: StorageService,
+        *,
+        retention_days: float = 0.0,
+        retention_statuses: Sequence[SessionStatus] = ("completed",),
+        max_total_bytes: int = 0,
+        snapshot_retention: int = 0,
+        interval: float = DEFAULT_GC_INTERVAL,
+        batch_size: int = DEFAULT_GC_BATCH_SIZE,
+        busy_checks: Sequence[Callable[[str], bool]] = (),
+    ) -> None:
+        self._storage = storage
+        self._retention_days = retention_days
+        self._retention_statuses = list(retention_statuses)
+        self._max_total_bytes = max_total_bytes
+        self._snapshot_retention = snapshot_retention
+        self._interval = interval
+        self._batch_size = max(batch_size, 1)
+        # セッションIDを受け取り、使用中（削除してはならない）ならTrueを返す関数
+        self._busy_checks = list(busy_checks)
+        self._task: asyncio.Task[None] | None = None
+        self._last_report: GCReport | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """いずれかの保持ポリシーが有効かどうか。"""
+        return self._interval > 0 and (
+            self._retention_days > 0 or self._max_total_bytes > 0 or self._snapshot_retention > 0
+        )
+
+    @property
+    def last_report(self) -> GCReport | None:
+        """直近のGC実行結果。"""
+        return self._last_report
+
+    def start(self) -> None:
+        """バックグラウンドでの定期実行を開始する。保持ポリシーが無効な場合は何もしない。"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """バックグラウンドタスクを停止する。"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.collect()
+            except Exception:
+                logger.exception("Session garbage collection failed")
+            await asyncio.sleep(self._interval)
+
+    async def collect(self) -> GCReport:
+        """保持ポリシーを1回適用する。
+
+        Returns:
+            削除したセッション・スナップショットと解放したバイト数を含む実行結果。
+        """
+        report = GCReport()
+        if self._retention_days > 0:
+            await self._collect_expired(report)
+        if self._snapshot_retention > 0:
+            await self._collect_snapshots(report)
+        if self._max_total_bytes > 0:
+            await self._collect_over_budget(report)
+        report.finished_at = datetime.now(UTC)
+        self._last_report = report
+        logger.info(
+            "Session GC reclaimed %d bytes (%d sessions, %d snapshots deleted, "
+            "%d locked and %d in-use sessions skipped)",
+            report.reclaimed_bytes,
+            len(report.deleted_sessions),
+            report.pruned_snapshots,
+            report.skipped_locked,
+            report.skipped_in_use,
+        )
+        return report
+
+    async def _scan(self) -> AsyncIterator[Session]:
+        """セッションを最終更新の古い順に一度ずつ読み込む（キャッシュは変更しない）。"""
+        session_ids = await self._storage.list_sessions_by_age()
+        for start in range(0, len(session_ids), self._batch_size):
+            for session_id in session_ids[start : start + self._batch_size]:
+                try:
+                    yield await self._storage.peek_session(session_id)
+                except (SessionNotFoundError, StorageError, ValueError):
+                    continue
+            await asyncio.sleep(0)
+
+    async def _delete_session(self, session_id: str, report: GCReport) -> bool:
+        """ロック中・使用中でなければセッションを削除する。"""
+        lock = self._storage.session_lock(session_id)
+        if lock.locked():
+            report.skipped_locked += 1
+            return False
+        async with lock:
+            # 走査後にジョブの投入やRMスタックの作成が行われている場合があるため、削除の直前に確認する
+            try:
+                session = await self._storage.peek_session(session_id)
+            except SessionNotFoundError:
+                return False
+            if session.rm_stack_id is not None or any(check(session_id) for check in self._busy_checks):
+                report.skipped_in_use += 1
+                return False
+            session_dir = self._storage.get_session_dir(session_id)
+            reclaimed = await self._storage.run_io(remove_tree, session_dir)
+            with contextlib.suppress(SessionNotFoundError):
+                await self._storage.delete_session(session_id)
+        report.deleted_sessions.append(session_id)
+        report.reclaimed_bytes += reclaimed
+        return True
+
+    async def _collect_expired(self, report: GCReport) -> None:
+        """保持期間を過ぎたセッションを削除する。"""
+        cutoff = datetime.now(UTC) - timedelta(days=self._retention_days)
+        statuses = set(self._retention_statuses)
+        async for session in self._scan():
+            if session.status in statuses and session.updated_at < cutoff:
+                await self._delete_session(session.id, report)
+
+    async def _collect_snapshots(self, report: GCReport) -> None:
+        """セッションごとに古いスナップショットを削除する。"""
+        offset = 0
+        while True:
+            session_ids = await self._storage.list_sessions(limit=self._batch_size, offset=offset)
+            for session_id in session_ids:
+                lock = self._storage.session_lock(session_id)
+                if lock.locked():
+                    report.skipped_locked += 1
+                    continue
+                async with lock:
+                    store = SnapshotStore(self._storage.get_session_dir(session_id) / SNAPSHOTS_DIRNAME)
+                    pruned, reclaimed = await self._storage.run_io(store.prune, self._snapshot_retention)
+                report.pruned_snapshots += pruned
+                report.reclaimed_bytes += reclaimed
+            offset += len(session_ids)
+            await asyncio.sleep(0)
+            if len(session_ids) < self._batch_size:
+                break
+
+    async def _collect_over_budget(self, report: GCReport) -> None:
+        """データディレクトリの合計サイズが上限以下になるまで古いセッションを削除する。"""
+        total = await self._storage.run_io(disk_usage, self._storage.data_dir)
+        if total > self._max_total_bytes:
+            candidates: dict[SessionStatus, list[str]] = {status: [] for status in self._retention_statuses}
+            async for session in self._scan():
+                if session.status in candidates:
+                    candidates[session.status].append(session.id)
+            for status in self._retention_statuses:
+                for session_id in candidates[status]:
+                    if total <= self._max_total_bytes:
+                        break
+                    before = report.reclaimed_bytes
+                    if await self._delete_session(session_id, report):
+                        total -= report.reclaimed_bytes - before
+        report.total_bytes = total
@@ -0,0 +1,112 @@
+"""ブロッキングなファイルI/O用の有界スレッドプール。"""
+
+import asyncio
+import contextlib
+import functools
+import os
+import shutil
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+# I/Oスレッドプールのデフォルト設定
+DEFAULT_IO_WORKERS = 4
+DEFAULT_IO_QUEUE_DEPTH = 64
+
+_T = TypeVar("_T")
+
+
+class BoundedIOExecutor:
+    """同時実行数と待ち行列の長さに上限を持つI/O用スレッドプール。
+
+    ディスクI/Oをイベントループから切り離して実行する。実行中と待機中の処理の合計が
+    ``max_workers + queue_depth`` に達している間は、呼び出し側のコルーチンが空きを待つ
+    （イベントループはブロックしない）。
+
+    スレッドプールは最初の処理の投入時に起動し、``shutdown`` 後に処理を投入すると起動し直す。
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_IO_WORKERS, queue_depth: int = DEFAULT_IO_QUEUE_DEPTH) -> None:
+        self._max_workers = max(max_workers, 1)
+        self._queue_depth = max(queue_depth, 0)
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(self._max_workers + self._queue_depth)
+        self._pending = 0
+
+    @property
+    def max_workers(self) -> int:
+        """ワーカースレッド数。"""
+        return self._max_workers
+
+    @property
+    def queue_depth(self) -> int:
+        """ワーカーの空きを待てる処理数の上限。"""
+        return self._queue_depth
+
+    @property
+    def pending(self) -> int:
+        """実行中・待機中の処理数。"""
+        return self._pending
+
+    async def run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """関数をI/Oスレッドで実行し、結果を返す。"""
+        await self._slots.acquire()
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+
+        def _release(_: Future[_T]) -> None:
+            # 呼び出し側がキャンセルされても、スレッドでの処理が終わるまで枠は解放しない
+            with contextlib.suppress(RuntimeError):  # イベントループ終了後
+                loop.call_soon_threadsafe(self._release)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="galley-io")
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(_release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        self._pending -= 1
+        self._slots.release()
+
+    async def shutdown(self) -> None:
+        """スレッドプールを停止する。
+
+        実行中・待機中の処理の完了は別スレッドで待ち、イベントループはブロックしない。
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True)
+
+
+def write_text_file(path: Path, content: str) -> None:
+    """親ディレクトリを作成してテキストファイルを書き込む。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def disk_usage(path: Path) -> int:
+    """ディレクトリ（またはファイル）の合計サイズを返す。シンボリックリンクは辿らない。"""
+    try:
+        if not path.is_dir() or path.is_symlink():
+            return path.lstat().st_size
+    except FileNotFoundError:
+        return 0
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            with contextlib.suppress(FileNotFoundError):
+                total += os.lstat(os.path.join(root, name)).st_size
+    return total
+
+
+def remove_tree(path: Path) -> int:
+    """ディレクトリを削除し、解放したバイト数を返す。"""
+    size = disk_usage(path)
+    shutil.rmtree(path, ignore_errors=True)
+    return size
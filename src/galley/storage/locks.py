@@ -0,0 +1,63 @@
+"""セッション単位の排他制御。"""
+
+import asyncio
+import weakref
+from collections.abc import Callable
+from types import TracebackType
+
+
+class SessionLockManager:
+    """セッション単位のasyncio.Lockを払い出す。
+
+    ロックは弱参照で保持するため、保持・待機しているタスクがなくなったロックは
+    自動的に破棄される（セッション数に応じてロックが増え続けることはない）。
+    """
+
+    def __init__(self) -> None:
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    def get(self, session_id: str) -> asyncio.Lock:
+        """セッションのロックを返す。使用中のロックがなければ新規作成する。"""
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[session_id] = lock
+        return lock
+
+    def locked(self, session_id: str) -> bool:
+        """セッションのロックが保持されているかどうか。ロックは新規作成しない。"""
+        lock = self._locks.get(session_id)
+        return lock is not None and lock.locked()
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+class SessionLock:
+    """``async with`` で保持するセッションのロック。
+
+    保持中に例外が送出された場合は、ロックを解放する前に ``on_error`` を呼ぶ。
+    """
+
+    def __init__(self, lock: asyncio.Lock, on_error: Callable[[], None]) -> None:
+        self._lock = lock
+        self._on_error = on_error
+
+    def locked(self) -> bool:
+        """ロックが保持されているかどうか。"""
+        return self._lock.locked()
+
+    async def __aenter__(self) -> None:
+        await self._lock.acquire()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        try:
+            if exc_type is not None:
+                self._on_error()
+        finally:
+            self._lock.release()
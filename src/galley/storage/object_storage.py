@@ -0,0 +1,346 @@
+"""OCI Object Storageをバックエンドとするストレージサービス。"""
+
+import asyncio
+import contextlib
+from pathlib import Path
+from typing import Any
+
+import oci
+
+from galley.models.errors import JobNotFoundError, SessionNotFoundError, StorageError
+from galley.models.jobs import Job, JobStatus
+from galley.models.session import Answer, Session
+from galley.storage.oci_client import OCIClientFactory
+from galley.storage.service import StorageService
+
+# セッションオブジェクトのキープレフィックス
+_SESSIONS_PREFIX = "sessions/"
+
+# ジョブオブジェクトのキープレフィックス
+_JOBS_PREFIX = "jobs/"
+
+# ローカルキャッシュに保存するETagのファイル名（session.json / answers.log）
+_ETAG_FILE = ".session.etag"
+_JOURNAL_ETAG_FILE = ".answers.etag"
+
+
+class ObjectStorageService(StorageService):
+    """OCI Object Storageにセッションを永続化するデータ永続化層。
+
+    セッションは ``sessions/{session_id}/session.json``（回答ジャーナルは
+    ``sessions/{session_id}/answers.log``）として保存する。ローカルのデータディレクトリは
+    リードスルーキャッシュ兼作業ディレクトリ（terraform/app等）として使い続ける。
+
+    書き込み（session.json・回答ジャーナルとも）はETagによる条件付きPUTで行い、別プロセスによる
+    更新を検知した場合はローカルキャッシュを破棄してStorageErrorを送出する（次回の読み込みで最新を取得する）。
+    SDKクライアントは1つを使い回し、HTTPコネクションプールを再利用する。
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        *,
+        namespace: str,
+        bucket_name: str,
+        region: str = "",
+        client: Any | None = None,
+        client_factory: OCIClientFactory | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(data_dir, **kwargs)
+        if not namespace or not bucket_name:
+            raise StorageError("Object Storage backend requires bucket namespace and bucket name")
+        self._namespace = namespace
+        self._bucket_name = bucket_name
+        self._region = region
+        # ObjectStorageClient（遅延初期化）
+        self._client = client
+        self._client_factory = client_factory
+
+    def _get_client(self) -> Any:
+        """ObjectStorageClientを遅延初期化して返す。"""
+        if self._client is None:
+            factory = self._client_factory or OCIClientFactory()
+            self._client = factory.client(oci.object_storage.ObjectStorageClient, self._region or None)
+        return self._client
+
+    @staticmethod
+    def _object_name(session_id: str, filename: str) -> str:
+        return f"{_SESSIONS_PREFIX}{session_id}/{filename}"
+
+    def _etag_file(self, session_id: str, filename: str = _ETAG_FILE) -> Path:
+        return self._session_dir(session_id) / filename
+
+    def _read_etag(self, session_id: str, filename: str = _ETAG_FILE) -> str | None:
+        try:
+            return self._etag_file(session_id, filename).read_text(encoding="utf-8").strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write_etag(self, session_id: str, etag: str | None, filename: str = _ETAG_FILE) -> None:
+        etag_file = self._etag_file(session_id, filename)
+        if etag:
+            etag_file.write_text(etag, encoding="utf-8")
+        else:
+            etag_file.unlink(missing_ok=True)
+
+    def _discard_local(self, session_id: str) -> None:
+        """ローカルキャッシュ（session.json / ジャーナル / ETag）を破棄する。"""
+        self.invalidate_cache(session_id)
+        self._session_file(session_id).unlink(missing_ok=True)
+        self._journal_file(session_id).unlink(missing_ok=True)
+        self._etag_file(session_id).unlink(missing_ok=True)
+        self._etag_file(session_id, _JOURNAL_ETAG_FILE).unlink(missing_ok=True)
+
+    async def _write_error(self, session_id: str, what: str, error: oci.exceptions.ServiceError) -> StorageError:
+        """条件付き書き込みの失敗をStorageErrorに変換する。競合時はローカルキャッシュを破棄する。"""
+        if error.status in (409, 412):
+            await self.run_io(self._discard_local, session_id)
+            return StorageError(f"{what} was modified by another writer. Reload the session and retry.")
+        return StorageError(f"Failed to save {what[0].lower()}{what[1:]}: {error.message}")
+
+    async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """SDKのブロッキング呼び出しをスレッドで実行する。"""
+        client = self._get_client()
+        return await asyncio.to_thread(getattr(client, method), self._namespace, self._bucket_name, *args, **kwargs)
+
+    async def _get_object(self, object_name: str) -> tuple[bytes, str | None] | None:
+        """オブジェクトを取得する。存在しない場合はNoneを返す。"""
+        try:
+            response = await self._call("get_object", object_name)
+        except oci.exceptions.ServiceError as e:
+            if e.status == 404:
+                return None
+            raise StorageError(f"Failed to get object {object_name}: {e.message}") from e
+        return response.data.content, response.headers.get("etag")
+
+    async def _delete_object(self, object_name: str, *, if_match: str | None = None) -> bool:
+        """オブジェクトを削除する。存在しない場合は何もしない。
+
+        Args:
+            object_name: オブジェクト名。
+            if_match: 指定した場合は、このETagの版である場合のみ削除する。
+
+        Returns:
+            ``if_match`` と異なる版に更新されていたため削除しなかった場合はFalse。
+        """
+        kwargs = {"if_match": if_match} if if_match else {}
+        try:
+            await self._call("delete_object", object_name, **kwargs)
+        except oci.exceptions.ServiceError as e:
+            if e.status == 412:
+                return False
+            if e.status != 404:
+                raise StorageError(f"Failed to delete object {object_name}: {e.message}") from e
+        return True
+
+    async def _fetch_remote(self, session_id: str) -> None:
+        """リモートのセッションとジャーナルをローカルキャッシュに取り込む。
+
+        Raises:
+            SessionNotFoundError: リモートにもセッションが存在しない場合。
+        """
+        fetched = await self._get_object(self._object_name(session_id, "session.json"))
+        if fetched is None:
+            raise SessionNotFoundError(session_id)
+        payload, etag = fetched
+        journal = await self._get_object(self._object_name(session_id, "answers.log"))
+
+        self.invalidate_cache(session_id)
+        await self.run_io(self._store_fetched, session_id, payload, etag, journal)
+
+    def _store_fetched(
+        self, session_id: str, payload: bytes, etag: str | None, journal: tuple[bytes, str | None] | None
+    ) -> None:
+        """取得したセッションとジャーナルをローカルに書き込む（I/Oスレッドで実行）。"""
+        self._session_dir(session_id).mkdir(parents=True, exist_ok=True)
+        self._atomic_write(self._session_file(session_id), payload)
+        if journal is not None:
+            self._atomic_write(self._journal_file(session_id), journal[0])
+        else:
+            self._journal_file(session_id).unlink(missing_ok=True)
+        self._write_etag(session_id, etag)
+        self._write_etag(session_id, journal[1] if journal else None, _JOURNAL_ETAG_FILE)
+
+    async def save_session(self, session: Session) -> None:
+        """セッションをObject Storageに条件付きで書き込み、ローカルキャッシュも更新する。
+
+        Raises:
+            StorageError: 別プロセスによる更新を検知した場合、またはAPI呼び出しに失敗した場合。
+        """
+        session_id = session.id
+        self._session_dir(session_id)  # セッションIDの検証
+        payload = await self.run_io(self._serializer.dumps, session)
+        etag = await self.run_io(self._read_etag, session_id)
+        # 既知のETagがあればその版への上書きのみ、なければ新規作成のみ許可する
+        conditions = {"if_match": etag} if etag else {"if_none_match": "*"}
+        try:
+            response = await self._call(
+                "put_object", self._object_name(session_id, "session.json"), payload, **conditions
+            )
+        except oci.exceptions.ServiceError as e:
+            raise await self._write_error(session_id, f"Session {session_id}", e) from e
+
+        # ジャーナルはsession.jsonへ畳み込まれたのでリモートからも削除する。読み込んだ版のジャーナルのみ削除し、
+        # その後に別プロセスが追記していた場合は残して、次回の読み込みで最新を取得する
+        journal_etag = await self.run_io(self._read_etag, session_id, _JOURNAL_ETAG_FILE)
+        if journal_etag and not await self._delete_object(
+            self._object_name(session_id, "answers.log"), if_match=journal_etag
+        ):
+            await self.run_io(self._discard_local, session_id)
+            return
+        await self._write_local_session(session, payload)
+        await self.run_io(self._write_etag, session_id, response.headers.get("etag"))
+        await self.run_io(self._write_etag, session_id, None, _JOURNAL_ETAG_FILE)
+
+    async def load_session(self, session_id: str) -> Session:
+        """セッションを読み込む。ローカルキャッシュに無い場合はObject Storageから取得する。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+        """
+        try:
+            return await super().load_session(session_id)
+        except SessionNotFoundError:
+            await self._fetch_remote(session_id)
+        return await super().load_session(session_id)
+
+    async def peek_session(self, session_id: str) -> Session:
+        """キャッシュを変更せずにセッションを読み込む。ローカルに無い場合はObject Storageから取得する。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+        """
+        try:
+            return await super().peek_session(session_id)
+        except SessionNotFoundError:
+            await self._fetch_remote(session_id)
+        return await super().peek_session(session_id)
+
+    async def append_answers(self, session_id: str, answers: list[Answer]) -> None:
+        """回答をローカルジャーナルに追記し、ジャーナルオブジェクトを条件付きでアップロードする。
+
+        Object Storageは追記に対応しないため、ジャーナル全体（閾値サイズ以下）を再アップロードする。
+        session.json本体は書き直さない。読み込んだ版以降に別プロセスがジャーナルを更新していた場合は
+        上書きせず、ローカルキャッシュを破棄してStorageErrorを送出する。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+            StorageError: 別プロセスによる更新を検知した場合、またはアップロードに失敗した場合。
+        """
+        try:
+            await super().append_answers(session_id, answers)
+        except SessionNotFoundError:
+            await self._fetch_remote(session_id)
+            await super().append_answers(session_id, answers)
+
+        try:
+            journal = await self.run_io(self._journal_file(session_id).read_bytes)
+        except FileNotFoundError:
+            # 閾値到達でsession.jsonへ畳み込み済み
+            return
+        etag = await self.run_io(self._read_etag, session_id, _JOURNAL_ETAG_FILE)
+        conditions = {"if_match": etag} if etag else {"if_none_match": "*"}
+        try:
+            response = await self._call(
+                "put_object", self._object_name(session_id, "answers.log"), journal, **conditions
+            )
+        except oci.exceptions.ServiceError as e:
+            raise await self._write_error(session_id, f"Answer journal for session {session_id}", e) from e
+        await self.run_io(self._write_etag, session_id, response.headers.get("etag"), _JOURNAL_ETAG_FILE)
+
+    async def delete_session(self, session_id: str) -> None:
+        """セッションをObject Storageとローカルキャッシュから削除する。"""
+        self._session_dir(session_id)  # セッションIDの検証
+        for filename in ("answers.log", "session.json"):
+            await self._delete_object(self._object_name(session_id, filename))
+        await super().delete_session(session_id)
+
+    async def list_sessions(self, limit: int | None = None, offset: int = 0) -> list[str]:
+        """Object Storageに保存されているセッションIDの一覧をID順に返す。
+
+        Args:
+            limit: 返す最大件数。Noneの場合は全件。
+            offset: 先頭から読み飛ばす件数。
+        """
+        session_ids: list[str] = []
+        start: str | None = None
+        while True:
+            kwargs: dict[str, Any] = {"prefix": _SESSIONS_PREFIX, "delimiter": "/", "fields": "name"}
+            if start:
+                kwargs["start"] = start
+            try:
+                response = await self._call("list_objects", **kwargs)
+            except oci.exceptions.ServiceError as e:
+                raise StorageError(f"Failed to list sessions: {e.message}") from e
+            for prefix in response.data.prefixes or []:
+                session_id = prefix[len(_SESSIONS_PREFIX) :].rstrip("/")
+                if session_id:
+                    session_ids.append(session_id)
+            start = response.data.next_start_with
+            if not start or (limit is not None and len(session_ids) >= offset + limit):
+                return self._paginate(session_ids, limit, offset)
+
+    async def list_sessions_by_age(self) -> list[str]:
+        """Object Storageに保存されているセッションIDを最終更新の古い順に返す。
+
+        ローカルキャッシュに無いセッションは更新日時が分からないため先頭に並べ、
+        残りはローカルファイルの更新日時順に並べる。
+        """
+        remote = await self.list_sessions()
+        remote_ids = set(remote)
+        local = [session_id for session_id in await super().list_sessions_by_age() if session_id in remote_ids]
+        cached = set(local)
+        return [session_id for session_id in remote if session_id not in cached] + local
+
+    async def save_job(self, job: Job) -> None:
+        """ジョブをObject Storageとローカルに保存する（サーバー再起動後も参照できるようにする）。"""
+        payload = job.model_dump_json().encode("utf-8")
+        try:
+            await self._call("put_object", f"{_JOBS_PREFIX}{job.id}.json", payload)
+        except oci.exceptions.ServiceError as e:
+            raise StorageError(f"Failed to save job {job.id}: {e.message}") from e
+        await self.run_io(self._write_job_file, job.id, payload)
+
+    async def _fetch_job(self, object_name: str) -> Job | None:
+        fetched = await self._get_object(object_name)
+        if fetched is None:
+            return None
+        job = Job.model_validate_json(fetched[0])
+        await self.run_io(self._write_job_file, job.id, fetched[0])
+        return job
+
+    async def load_job(self, job_id: str) -> Job:
+        """ジョブを読み込む。ローカルに無い場合はObject Storageから取得する。
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合。
+        """
+        self._job_file(job_id)  # ジョブIDの検証
+        with contextlib.suppress(JobNotFoundError):
+            return await super().load_job(job_id)
+        job = await self._fetch_job(f"{_JOBS_PREFIX}{job_id}.json")
+        if job is None:
+            raise JobNotFoundError(job_id)
+        return job
+
+    async def list_jobs(self, *, session_id: str | None = None, statuses: set[JobStatus] | None = None) -> list[Job]:
+        """ジョブを作成日時の古い順に返す。ローカルに無いジョブはObject Storageから取得する。"""
+        local = {job.id for job in await super().list_jobs()}
+        start: str | None = None
+        while True:
+            kwargs: dict[str, Any] = {"prefix": _JOBS_PREFIX, "fields": "name"}
+            if start:
+                kwargs["start"] = start
+            try:
+                response = await self._call("list_objects", **kwargs)
+            except oci.exceptions.ServiceError as e:
+                raise StorageError(f"Failed to list jobs: {e.message}") from e
+            for obj in response.data.objects or []:
+                job_id = obj.name[len(_JOBS_PREFIX) :].removesuffix(".json")
+                if job_id and job_id not in local:
+                    await self._fetch_job(obj.name)
+            start = response.data.next_start_with
+            if not start:
+                break
+        return await super().list_jobs(session_id=session_id, statuses=statuses)
@@ -0,0 +1,110 @@
+"""OCI SDKの認証情報とクライアントを共有するファクトリ。"""
+
+import os
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
+
+import oci
+
+ClientT = TypeVar("ClientT")
+
+# 署名者（Signer）を生成する関数
+SignerProvider = Callable[[], Any]
+
+
+class OCIClientFactory:
+    """プロセス内で使うOCI SDKの認証情報とクライアントを一元管理する。
+
+    認証方式は次の順序で選択する。
+
+    1. Resource Principal（環境変数 ``OCI_RESOURCE_PRINCIPAL_VERSION`` が設定されている場合）
+    2. API Key認証（``~/.oci/config`` のデフォルトプロファイル）
+
+    署名者は初回に1度だけ生成して全クライアントで共有し、秘密鍵の読み込みやトークン取得を
+    リクエストごとに繰り返さない。Resource Principalのセッショントークンはクライアントの
+    取得時に有効期限を確認し、期限が近い場合に更新する（更新は共有している署名者に反映される）。
+    クライアントはクライアントクラスとリージョンの組ごとに1つ生成して使い回し、
+    HTTPコネクションプールを再利用する。
+
+    ``region`` を指定した場合は認証情報のリージョンの代わりに既定のリージョンとして使う。
+    ``signer_provider`` を指定した場合は認証情報を読み込まず、その署名者を使う（テスト用）。
+    """
+
+    def __init__(self, *, region: str = "", signer_provider: SignerProvider | None = None) -> None:
+        self._region = region
+        self._signer_provider = signer_provider
+        self._lock = threading.Lock()
+        self._config: dict[str, Any] | None = None
+        self._signer: Any = None
+        self._clients: dict[tuple[type[Any], str], Any] = {}
+
+    def _load(self) -> None:
+        """認証情報と署名者を読み込む（初回のみ）。"""
+        if self._config is not None:
+            return
+        if self._signer_provider is not None:
+            signer = self._signer_provider()
+            config: dict[str, Any] = {"region": getattr(signer, "region", "")}
+        elif os.environ.get("OCI_RESOURCE_PRINCIPAL_VERSION"):
+            signer = oci.auth.signers.get_resource_principals_signer()
+            config = {"region": signer.region, "tenancy": signer.tenancy_id}
+        else:
+            config = oci.config.from_file()
+            signer = oci.signer.Signer(
+                tenancy=config["tenancy"],
+                user=config["user"],
+                fingerprint=config["fingerprint"],
+                private_key_file_location=config.get("key_file"),
+                pass_phrase=oci.config.get_config_value_or_default(config, "pass_phrase"),
+                private_key_content=config.get("key_content"),
+            )
+        if self._region:
+            config["region"] = self._region
+        self._signer = signer
+        self._config = config
+
+    @property
+    def signer(self) -> Any:
+        """共有の署名者。セッショントークンを使う署名者は期限が近ければ更新してから返す。"""
+        with self._lock:
+            self._load()
+            signer = self._signer
+        if callable(getattr(signer, "get_security_token", None)):
+            # 有効なトークンがあればそのまま返し、期限切れ間近の場合のみ再取得する
+            signer.get_security_token()
+        return signer
+
+    @property
+    def tenancy_id(self) -> str:
+        """認証に使っているテナンシーのOCID。"""
+        with self._lock:
+            self._load()
+            assert self._config is not None
+            tenancy = self._config.get("tenancy") or getattr(self._signer, "tenancy_id", "")
+        return str(tenancy or "")
+
+    def client(self, client_class: type[ClientT], region: str | None = None) -> ClientT:
+        """クライアントクラス・リージョンごとに共有のクライアントを返す。
+
+        Args:
+            client_class: SDKのクライアントクラス（例: ``oci.resource_manager.ResourceManagerClient``）。
+            region: リージョン。Noneまたは空の場合は既定のリージョン。
+
+        Raises:
+            oci.exceptions.ConfigFileNotFound: API Key認証の設定ファイルが無い場合。
+        """
+        signer = self.signer
+        with self._lock:
+            assert self._config is not None
+            target_region = region or str(self._config.get("region") or "")
+            key = (client_class, target_region)
+            client = self._clients.get(key)
+            if client is None:
+                config = {**self._config, "region": target_region} if target_region else dict(self._config)
+                client = cast(Any, client_class)(config, signer=signer)
+                self._clients[key] = client
+            return cast(ClientT, client)
+
+    def __call__(self, client_class: type[ClientT], region: str | None = None) -> ClientT:
+        return self.client(client_class, region)
@@ -0,0 +1,134 @@
+"""セッションのシリアライズ方式（プラグイン）。
+
+既定はコンパクトJSON。orjson / msgpack がインストールされている場合はそれらも選択できる。
+読み込み時はデータ先頭バイトから形式を自動判定するため、保存方式を切り替えても
+既存のセッションファイル（インデント付きJSONを含む）はそのまま読み込める。
+"""
+
+import importlib
+from abc import ABC, abstractmethod
+from types import ModuleType
+
+from galley.models.errors import StorageError
+from galley.models.session import Session
+
+# JSONとみなす先頭バイト（空白類を除いた最初の文字が "{"）
+_JSON_WHITESPACE = b" \t\r\n"
+
+
+def _import_optional(module_name: str, serializer_name: str) -> ModuleType:
+    """オプション依存モジュールをインポートする。
+
+    Raises:
+        StorageError: モジュールがインストールされていない場合。
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        raise StorageError(
+            f"Session serializer '{serializer_name}' requires the '{module_name}' package. "
+            f"Install it with: pip install {module_name}"
+        ) from None
+
+
+class SessionSerializer(ABC):
+    """セッションのシリアライズ方式の基底クラス。"""
+
+    name: str = ""
+
+    @abstractmethod
+    def dumps(self, session: Session) -> bytes:
+        """セッションをバイト列に変換する。"""
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Session:
+        """バイト列からセッションを復元する。"""
+
+
+class JsonSessionSerializer(SessionSerializer):
+    """pydantic標準のコンパクトJSONシリアライザ。"""
+
+    name = "json"
+
+    def dumps(self, session: Session) -> bytes:
+        return session.model_dump_json().encode("utf-8")
+
+    def loads(self, data: bytes) -> Session:
+        return Session.model_validate_json(data)
+
+
+class OrjsonSessionSerializer(SessionSerializer):
+    """orjsonを利用するJSONシリアライザ。出力は通常のJSONと互換。"""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        self._orjson = _import_optional("orjson", self.name)
+
+    def dumps(self, session: Session) -> bytes:
+        data: bytes = self._orjson.dumps(session.model_dump())
+        return data
+
+    def loads(self, data: bytes) -> Session:
+        return Session.model_validate(self._orjson.loads(data))
+
+
+class MsgpackSessionSerializer(SessionSerializer):
+    """msgpackを利用するバイナリシリアライザ。"""
+
+    name = "msgpack"
+
+    def __init__(self) -> None:
+        self._msgpack = _import_optional("msgpack", self.name)
+
+    def dumps(self, session: Session) -> bytes:
+        data: bytes = self._msgpack.packb(session.model_dump(mode="json"), use_bin_type=True)
+        return data
+
+    def loads(self, data: bytes) -> Session:
+        return Session.model_validate(self._msgpack.unpackb(data, raw=False))
+
+
+_SERIALIZERS: dict[str, type[SessionSerializer]] = {
+    JsonSessionSerializer.name: JsonSessionSerializer,
+    OrjsonSessionSerializer.name: OrjsonSessionSerializer,
+    MsgpackSessionSerializer.name: MsgpackSessionSerializer,
+}
+
+
+def get_serializer(name: str) -> SessionSerializer:
+    """名前に対応するシリアライザを返す。
+
+    Args:
+        name: シリアライザ名（"json" / "orjson" / "msgpack"）。
+
+    Returns:
+        シリアライザのインスタンス。
+
+    Raises:
+        StorageError: 未知の名前、またはオプション依存が未インストールの場合。
+    """
+    serializer_cls = _SERIALIZERS.get(name)
+    if serializer_cls is None:
+        raise StorageError(f"Unknown session serializer: {name}. Available: {', '.join(sorted(_SERIALIZERS))}")
+    return serializer_cls()
+
+
+def is_json_payload(data: bytes) -> bool:
+    """データがJSON形式かどうかを先頭バイトで判定する。"""
+    return data.lstrip(_JSON_WHITESPACE)[:1] == b"{"
+
+
+def load_session_payload(data: bytes) -> Session:
+    """形式を自動判定してセッションを復元する。
+
+    JSON（インデント有無・orjson出力を問わない）とmsgpackに対応する。
+
+    Raises:
+        StorageError: 形式を判定できない、または必要な依存が未インストールの場合。
+    """
+    if is_json_payload(data):
+        return Session.model_validate_json(data)
+    if not data:
+        raise StorageError("Session payload is empty")
+    return get_serializer(MsgpackSessionSerializer.name).loads(data)
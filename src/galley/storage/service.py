@@ -1,11 +1,50 @@
 """ローカルファイルシステムベースのストレージサービス。"""
 
-import json
+import asyncio
+import contextlib
+import os
 import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
+from typing import Any, TypeVar
 
-from galley.models.errors import SessionNotFoundError, StorageError
-from galley.models.session import Session
+from galley.models.errors import JobNotFoundError, SessionNotFoundError, StorageError
+from galley.models.jobs import Job, JobStatus
+from galley.models.session import Answer, Session, SessionStatus
+from galley.storage.io import DEFAULT_IO_QUEUE_DEPTH, DEFAULT_IO_WORKERS, BoundedIOExecutor
+from galley.storage.locks import SessionLock, SessionLockManager
+from galley.storage.serializers import JsonSessionSerializer, SessionSerializer, load_session_payload
+
+# セッションキャッシュのデフォルト設定
+DEFAULT_SESSION_CACHE_SIZE = 128
+DEFAULT_SESSION_CACHE_TTL = 300.0  # 5分
+
+# 回答ジャーナルをsession.jsonへ畳み込むサイズ閾値（バイト）
+DEFAULT_JOURNAL_MAX_BYTES = 64 * 1024
+
+# キャッシュ検証用シグネチャ: (session.json mtime_ns, size, answers.log mtime_ns, size)
+_Signature = tuple[int, int, int, int]
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class _CacheEntry:
+    """セッションキャッシュのエントリ。
+
+    復元済み（ジャーナル適用済み）のSessionを保持し、ヒット時はそのまま返す。
+    大きなセッションではdeep copyやバイト列からの再構築も復元（``load_session_payload``）と
+    同程度に遅いため、コピーは作らない。
+    """
+
+    session: Session
+    signature: _Signature
+    cached_at: float
 
 
 class StorageService:
@@ -13,11 +52,67 @@ class StorageService:
 
     MVP段階ではローカルファイルシステムに保存する。
     将来的にOCI Object Storage実装に切り替え可能な設計。
+
+    読み込んだセッションはプロセス内のLRUキャッシュに保持する（書き込みはwrite-through）。
+    ヒット時はファイルの読み込み・解析を行わず、キャッシュ中のSessionをそのまま返すため、
+    同じセッションの読み込みは同じオブジェクトを共有する。セッションを変更する処理は
+    :meth:`session_lock` を保持して変更から保存までを行い、途中で例外が送出された場合は
+    保存されなかった変更が残らないようキャッシュを破棄する。
+    キャッシュはファイルのmtime・サイズで検証するため、プロセス外からの変更も反映される。
+
+    セッションファイルは一時ファイルへの書き込み→renameで原子的に置き換えるため、
+    書き込み途中でプロセスが停止しても壊れたファイルは残らない。
+
+    ヒアリング回答は追記専用ジャーナル（answers.log、1行1回答のJSON Lines）に書き込み、
+    読み込み時にsession.jsonへ重ねて適用する。ジャーナルはsave_session時、
+    または閾値サイズに達した時点でsession.jsonへ畳み込まれる。
+
+    ファイルの読み書きは有界のI/Oスレッドプールで実行し、イベントループをブロックしない。
+    サービス層のディスク操作も ``run_io`` で同じスレッドプールを使う。
     """
 
-    def __init__(self, data_dir: Path) -> None:
+    def __init__(
+        self,
+        data_dir: Path,
+        *,
+        cache_size: int = DEFAULT_SESSION_CACHE_SIZE,
+        cache_ttl: float = DEFAULT_SESSION_CACHE_TTL,
+        serializer: SessionSerializer | None = None,
+        fsync: bool = True,
+        journal_max_bytes: int = DEFAULT_JOURNAL_MAX_BYTES,
+        io_workers: int = DEFAULT_IO_WORKERS,
+        io_queue_depth: int = DEFAULT_IO_QUEUE_DEPTH,
+    ) -> None:
         self._data_dir = data_dir
         self._sessions_dir = data_dir / "sessions"
+        self._jobs_dir = data_dir / "jobs"
+        self._serializer = serializer or JsonSessionSerializer()
+        self._fsync = fsync
+        self._journal_max_bytes = journal_max_bytes
+        # session_id → キャッシュエントリ（末尾が最近使用）。cache_size <= 0 でキャッシュ無効
+        self._cache: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._locks = SessionLockManager()
+        self._io = BoundedIOExecutor(max_workers=io_workers, queue_depth=io_queue_depth)
+
+    @property
+    def data_dir(self) -> Path:
+        """データディレクトリのパス。"""
+        return self._data_dir
+
+    @property
+    def io_executor(self) -> BoundedIOExecutor:
+        """ディスクI/O用のスレッドプール。"""
+        return self._io
+
+    async def run_io(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """ブロッキングなディスク操作をI/Oスレッドプールで実行する。"""
+        return await self._io.run(func, *args, **kwargs)
+
+    async def close(self) -> None:
+        """I/Oスレッドプールを停止する。以降の読み書きでは起動し直す。"""
+        await self._io.shutdown()
 
     def _session_dir(self, session_id: str) -> Path:
         # ディレクトリトラバーサル防止
@@ -29,16 +124,137 @@ class StorageService:
     def _session_file(self, session_id: str) -> Path:
         return self._session_dir(session_id) / "session.json"
 
+    def _journal_file(self, session_id: str) -> Path:
+        return self._session_dir(session_id) / "answers.log"
+
     def get_session_dir(self, session_id: str) -> Path:
         """セッションのデータディレクトリパスを返す。"""
         return self._session_dir(session_id)
 
+    def session_lock(self, session_id: str) -> SessionLock:
+        """セッションの読み込み→更新→保存を直列化するためのロックを返す。
+
+        セッションを変更するサービスのメソッドはこのロックを保持した状態で
+        読み込みから保存までを行う（同一セッションへの同時更新が失われないようにする）。
+        ロックの保持中に例外が送出された場合は、キャッシュ中のセッション（変更途中の可能性がある）を破棄する。
+        """
+        return SessionLock(self._locks.get(session_id), lambda: self.invalidate_cache(session_id))
+
+    def _signature(self, session_id: str) -> _Signature:
+        """キャッシュ検証用のシグネチャ（session.jsonとジャーナルのmtime_ns, size）を返す。
+
+        Raises:
+            FileNotFoundError: session.jsonが存在しない場合。
+        """
+        st = self._session_file(session_id).stat()
+        try:
+            jst = self._journal_file(session_id).stat()
+        except FileNotFoundError:
+            return (st.st_mtime_ns, st.st_size, 0, 0)
+        return (st.st_mtime_ns, st.st_size, jst.st_mtime_ns, jst.st_size)
+
+    def _cached_signature(self, session_id: str) -> _Signature | None:
+        """TTLが有効なキャッシュエントリのシグネチャを返す（期限切れのエントリは破棄する）。"""
+        entry = self._cache.get(session_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.cached_at > self._cache_ttl:
+            del self._cache[session_id]
+            return None
+        return entry.signature
+
+    def _cache_get(self, session_id: str, signature: _Signature) -> _CacheEntry | None:
+        """シグネチャとTTLが有効なキャッシュエントリを返す。"""
+        entry = self._cache.get(session_id)
+        if entry is None:
+            return None
+        if entry.signature != signature or time.monotonic() - entry.cached_at > self._cache_ttl:
+            del self._cache[session_id]
+            return None
+        self._cache.move_to_end(session_id)
+        return entry
+
+    def _cache_put(self, session_id: str, session: Session, signature: _Signature) -> None:
+        """セッションをキャッシュに格納し、上限を超えた古いエントリを追い出す。"""
+        if self._cache_size <= 0:
+            return
+        self._cache[session_id] = _CacheEntry(session=session, signature=signature, cached_at=time.monotonic())
+        self._cache.move_to_end(session_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    @classmethod
+    def _restore(cls, payload: bytes, journal: bytes) -> Session:
+        """シリアライズ済みのセッションを復元し、ジャーナルの回答を適用する。"""
+        session = load_session_payload(payload)
+        if journal:
+            cls._apply_answers(session, cls._parse_journal(journal))
+        return session
+
+    def invalidate_cache(self, session_id: str | None = None) -> None:
+        """セッションキャッシュを破棄する。
+
+        Args:
+            session_id: 対象セッションID。Noneの場合は全エントリを破棄する。
+        """
+        if session_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(session_id, None)
+
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        """同一ディレクトリの一時ファイルに書き込んでからrenameで置き換える。
+
+        fsync有効時はファイル内容とディレクトリエントリの両方をディスクに同期する。
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                if self._fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_name)
+            raise
+        if self._fsync:
+            self._fsync_dir(path.parent)
+
+    @staticmethod
+    def _fsync_dir(directory: Path) -> None:
+        """rename結果を永続化するためディレクトリをfsyncする（非対応環境では何もしない）。"""
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def _write_local_files(self, session_id: str, payload: bytes) -> _Signature:
+        """シリアライズ済みのセッションを書き込み、書き込み後のシグネチャを返す（I/Oスレッドで実行）。"""
+        self._session_dir(session_id).mkdir(parents=True, exist_ok=True)
+        self._atomic_write(self._session_file(session_id), payload)
+        # 読み込み時に適用済みのジャーナルはsession.jsonへ畳み込まれたので破棄する
+        self._journal_file(session_id).unlink(missing_ok=True)
+        return self._signature(session_id)
+
+    async def _write_local_session(self, session: Session, payload: bytes) -> None:
+        """シリアライズ済みのセッションをローカルに書き込み、キャッシュを更新する。"""
+        self._session_dir(session.id)  # セッションIDの検証
+        self._cache.pop(session.id, None)
+        signature = await self._io.run(self._write_local_files, session.id, payload)
+        self._cache_put(session.id, session, signature)
+
     async def save_session(self, session: Session) -> None:
         """セッションをファイルシステムに保存する。"""
-        session_dir = self._session_dir(session.id)
-        session_dir.mkdir(parents=True, exist_ok=True)
-        session_file = self._session_file(session.id)
-        session_file.write_text(session.model_dump_json(indent=2), encoding="utf-8")
+        payload = await self._io.run(self._serializer.dumps, session)
+        await self._write_local_session(session, payload)
 
     async def load_session(self, session_id: str) -> Session:
         """セッションをファイルシステムから読み込む。
@@ -46,20 +262,283 @@ class StorageService:
         Raises:
             SessionNotFoundError: セッションが存在しない場合。
         """
-        session_file = self._session_file(session_id)
-        if not session_file.exists():
-            raise SessionNotFoundError(session_id)
-        data = json.loads(session_file.read_text(encoding="utf-8"))
-        return Session.model_validate(data)
+        known = self._cached_signature(session_id)
+        try:
+            signature, session = await self._io.run(self._read_if_changed, session_id, known)
+            if session is None:
+                # キャッシュヒット時はファイルを読まずにキャッシュ中のセッションを返す
+                entry = self._cache_get(session_id, signature)
+                if entry is not None:
+                    return entry.session
+                # 読み込み中にキャッシュが入れ替わった
+                signature, session = await self._io.run(self._read_if_changed, session_id, None)
+        except FileNotFoundError:
+            self._cache.pop(session_id, None)
+            raise SessionNotFoundError(session_id) from None
+        assert session is not None
+        self._cache_put(session_id, session, signature)
+        return session
+
+    async def peek_session(self, session_id: str) -> Session:
+        """キャッシュの内容・LRU順序を変更せずにセッションを読み込む。
+
+        GCのように全セッションを一度ずつ走査する処理が、利用中のセッションをキャッシュから
+        追い出さないために使う。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+        """
+        entry = self._cache.get(session_id)
+        try:
+            signature, session = await self._io.run(
+                self._read_if_changed, session_id, entry.signature if entry is not None else None
+            )
+            if session is None:
+                if entry is not None and entry.signature == signature:
+                    return entry.session
+                signature, session = await self._io.run(self._read_if_changed, session_id, None)
+        except FileNotFoundError:
+            raise SessionNotFoundError(session_id) from None
+        assert session is not None
+        return session
+
+    def _read_if_changed(self, session_id: str, known: _Signature | None) -> tuple[_Signature, Session | None]:
+        """シグネチャを取得し、``known`` と異なる場合のみセッションを読み込む（I/Oスレッドで実行）。
+
+        Returns:
+            現在のシグネチャと、読み込んだセッション（``known`` と一致した場合はNone）。
+
+        Raises:
+            FileNotFoundError: session.jsonが存在しない場合。
+        """
+        signature = self._signature(session_id)
+        if signature == known:
+            return signature, None
+        return signature, self._read_local_session(session_id, signature[3] > 0)
+
+    def _read_local_session(self, session_id: str, has_journal: bool) -> Session:
+        """session.jsonを読み込み、回答ジャーナルを適用する（I/Oスレッドで実行）。"""
+        payload = self._session_file(session_id).read_bytes()
+        journal = self._read_journal(session_id) if has_journal else b""
+        return self._restore(payload, journal)
+
+    def _read_journal(self, session_id: str) -> bytes:
+        """回答ジャーナルのバイト列を読み込む。存在しない場合は空。"""
+        try:
+            return self._journal_file(session_id).read_bytes()
+        except FileNotFoundError:
+            return b""
+
+    @staticmethod
+    def _parse_journal(raw: bytes) -> list[Answer]:
+        """回答ジャーナルを解析する。書き込み途中で途切れた行は無視する。"""
+        answers: list[Answer] = []
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                answers.append(Answer.model_validate_json(line))
+            except ValueError:
+                continue
+        return answers
+
+    @staticmethod
+    def _apply_answers(session: Session, answers: list[Answer]) -> None:
+        """回答をセッションに適用する（同一質問IDは後勝ち）。"""
+        for answer in answers:
+            session.answers[answer.question_id] = answer
+            if answer.answered_at > session.updated_at:
+                session.updated_at = answer.answered_at
+
+    async def append_answers(self, session_id: str, answers: list[Answer]) -> None:
+        """回答をセッションの追記専用ジャーナルに書き込む。
+
+        session.json全体を書き直さないため、保存コストはセッションの大きさに依存しない。
+        ジャーナルが閾値サイズに達した場合はsession.jsonへ畳み込む。
+
+        Args:
+            session_id: セッションID。
+            answers: 追記する回答のリスト。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+        """
+        payload = b"".join(answer.model_dump_json().encode("utf-8") + b"\n" for answer in answers)
+        try:
+            before, after = await self._io.run(self._append_journal, session_id, payload)
+        except FileNotFoundError:
+            self._cache.pop(session_id, None)
+            raise SessionNotFoundError(session_id) from None
+
+        # 追記前のキャッシュが有効ならジャーナルを再読込せずにキャッシュ中のセッションへ反映する
+        entry = self._cache.get(session_id)
+        if entry is not None and entry.signature == before:
+            self._apply_answers(entry.session, answers)
+            entry.signature = after
+        else:
+            self._cache.pop(session_id, None)
+
+        if after[3] >= self._journal_max_bytes:
+            await self.compact_journal(session_id)
+
+    def _append_journal(self, session_id: str, payload: bytes) -> tuple[_Signature, _Signature]:
+        """ジャーナルに追記し、追記前後のシグネチャを返す（I/Oスレッドで実行）。
+
+        Raises:
+            FileNotFoundError: session.jsonが存在しない場合。
+        """
+        before = self._signature(session_id)
+        with open(self._journal_file(session_id), "ab") as f:
+            f.write(payload)
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+        return before, self._signature(session_id)
+
+    async def compact_journal(self, session_id: str) -> None:
+        """回答ジャーナルをsession.jsonへ畳み込む。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+        """
+        session = await self.load_session(session_id)
+        await self.save_session(session)
 
     async def delete_session(self, session_id: str) -> None:
         """セッションをファイルシステムから削除する。"""
         session_dir = self._session_dir(session_id)
-        if session_dir.exists():
-            shutil.rmtree(session_dir)
+        self._cache.pop(session_id, None)
+        await self._io.run(shutil.rmtree, session_dir, ignore_errors=True)
+
+    @staticmethod
+    def _paginate(items: list[str], limit: int | None, offset: int) -> list[str]:
+        """リストにoffset/limitを適用する。"""
+        end = None if limit is None else offset + limit
+        return items[offset:end]
 
-    async def list_sessions(self) -> list[str]:
-        """保存されているセッションIDの一覧を返す。"""
+    async def list_sessions(self, limit: int | None = None, offset: int = 0) -> list[str]:
+        """保存されているセッションIDの一覧をID順に返す。
+
+        Args:
+            limit: 返す最大件数。Noneの場合は全件。
+            offset: 先頭から読み飛ばす件数。
+        """
+        session_ids = await self._io.run(self._list_session_dirs)
+        return self._paginate(session_ids, limit, offset)
+
+    def _list_session_dirs(self) -> list[str]:
         if not self._sessions_dir.exists():
             return []
-        return [d.name for d in self._sessions_dir.iterdir() if d.is_dir()]
+        return sorted(d.name for d in self._sessions_dir.iterdir() if d.is_dir())
+
+    async def list_sessions_by_age(self) -> list[str]:
+        """セッションIDを最終更新の古い順に返す。セッションは読み込まない。
+
+        ファイルシステム実装はsession.jsonと回答ジャーナルの更新日時（mtime）で並べる。
+        """
+        return await self._io.run(self._list_session_dirs_by_mtime)
+
+    def _list_session_dirs_by_mtime(self) -> list[str]:
+        entries: list[tuple[int, str]] = []
+        for session_id in self._list_session_dirs():
+            mtime = 0
+            for path in (self._session_file(session_id), self._journal_file(session_id)):
+                with contextlib.suppress(FileNotFoundError):
+                    mtime = max(mtime, path.stat().st_mtime_ns)
+            entries.append((mtime, session_id))
+        entries.sort()
+        return [session_id for _, session_id in entries]
+
+    async def find_sessions(
+        self,
+        *,
+        status: SessionStatus | None = None,
+        created_before: datetime | None = None,
+        updated_before: datetime | None = None,
+        rm_stack_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[str]:
+        """条件に一致するセッションIDを更新日時の古い順に返す。
+
+        ファイルシステム実装は全セッションを読み込んで絞り込む（1件ごとにイベントループへ制御を返す）。
+
+        Args:
+            status: セッションステータス。
+            created_before: この日時より前に作成されたセッションに限定する。
+            updated_before: この日時より前に最終更新されたセッションに限定する。
+            rm_stack_id: Resource Manager スタックID。
+            limit: 返す最大件数。Noneの場合は全件。
+            offset: 先頭から読み飛ばす件数。
+        """
+        matched: list[Session] = []
+        for session_id in await self.list_sessions():
+            await asyncio.sleep(0)
+            try:
+                session = await self.load_session(session_id)
+            except (SessionNotFoundError, StorageError, ValueError):
+                continue
+            if status is not None and session.status != status:
+                continue
+            if created_before is not None and session.created_at >= created_before:
+                continue
+            if updated_before is not None and session.updated_at >= updated_before:
+                continue
+            if rm_stack_id is not None and session.rm_stack_id != rm_stack_id:
+                continue
+            matched.append(session)
+        matched.sort(key=lambda s: (s.updated_at, s.id))
+        return self._paginate([s.id for s in matched], limit, offset)
+
+    def _job_file(self, job_id: str) -> Path:
+        # ディレクトリトラバーサル防止
+        safe_id = Path(job_id).name
+        if safe_id != job_id or not safe_id:
+            raise JobNotFoundError(job_id)
+        return self._jobs_dir / f"{safe_id}.json"
+
+    def _write_job_file(self, job_id: str, payload: bytes) -> None:
+        self._jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._atomic_write(self._job_file(job_id), payload)
+
+    async def save_job(self, job: Job) -> None:
+        """ジョブを保存する。"""
+        await self._io.run(self._write_job_file, job.id, job.model_dump_json().encode("utf-8"))
+
+    async def load_job(self, job_id: str) -> Job:
+        """ジョブを読み込む。
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合。
+        """
+        try:
+            data = await self._io.run(self._job_file(job_id).read_bytes)
+        except FileNotFoundError:
+            raise JobNotFoundError(job_id) from None
+        return Job.model_validate_json(data)
+
+    def _read_job_files(self) -> list[Job]:
+        if not self._jobs_dir.exists():
+            return []
+        jobs: list[Job] = []
+        for path in self._jobs_dir.glob("*.json"):
+            try:
+                jobs.append(Job.model_validate_json(path.read_bytes()))
+            except (FileNotFoundError, ValueError):
+                continue
+        return jobs
+
+    async def list_jobs(self, *, session_id: str | None = None, statuses: set[JobStatus] | None = None) -> list[Job]:
+        """ジョブを作成日時の古い順に返す。
+
+        Args:
+            session_id: セッションIDで絞り込む。
+            statuses: ステータスで絞り込む。
+        """
+        jobs = await self._io.run(self._read_job_files)
+        if session_id is not None:
+            jobs = [job for job in jobs if job.session_id == session_id]
+        if statuses is not None:
+            jobs = [job for job in jobs if job.status in statuses]
+        jobs.sort(key=lambda job: (job.created_at, job.id))
+        return jobs
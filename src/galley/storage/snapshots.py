@@ -0,0 +1,282 @@
+"""アプリケーションコードのコンテンツアドレス型スナップショットストア。"""
+
+import contextlib
+import hashlib
+import os
+import re
+import shutil
+import stat
+import tempfile
+import uuid
+from pathlib import Path
+
+from galley.models.app import AppSnapshot, SnapshotFile, SnapshotInfo
+from galley.models.errors import SnapshotNotFoundError
+from galley.storage.io import remove_tree
+
+# スナップショットを格納するセッション配下のディレクトリ名
+SNAPSHOTS_DIRNAME = "snapshots"
+
+# ブロブを格納するディレクトリ名（スナップショットディレクトリ配下）
+_OBJECTS_DIRNAME = ".objects"
+
+# マニフェストファイルの拡張子
+_MANIFEST_SUFFIX = ".json"
+
+_SNAPSHOT_ID_PATTERN = re.compile(r"^[0-9a-f]{8,32}$")
+
+# ファイルコピー・ハッシュ計算の読み込み単位
+_CHUNK_SIZE = 1024 * 1024
+
+# 直前のスナップショット作成時刻からこの範囲内に更新されたファイルは、
+# サイズと更新時刻が一致してもハッシュを再計算する（更新時刻の粒度による取りこぼし対策）
+_RACY_WINDOW_NS = 1_000_000_000
+
+
+def _iter_files(directory: Path) -> list[tuple[str, os.stat_result]]:
+    """ディレクトリ配下の通常ファイルを相対パス（POSIX形式）順に列挙する。"""
+    entries: list[tuple[str, os.stat_result]] = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                entries.append((Path(path).relative_to(directory).as_posix(), st))
+    return entries
+
+
+class SnapshotStore:
+    """アプリケーションコードのスナップショットを重複排除して保存する。
+
+    ファイル内容はSHA-256をキーとするブロブとして一度だけ保存し、スナップショット自体は
+    パスとブロブの対応を記録した小さなマニフェスト（``{snapshot_id}.json``）とする。
+    直前のスナップショットとサイズ・更新時刻が一致するファイルはハッシュ計算を省略するため、
+    作成コストとディスク使用量の増加はおおむね変更されたファイルの分だけになる。
+
+    メソッドはブロッキングなファイルI/Oを行うため、I/Oスレッドで実行すること。
+    同一ストアへの同時操作はセッションロックで直列化する前提とする。
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._objects_dir = root / _OBJECTS_DIRNAME
+
+    @property
+    def root(self) -> Path:
+        """スナップショットディレクトリ。"""
+        return self._root
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        if not _SNAPSHOT_ID_PATTERN.match(snapshot_id):
+            raise SnapshotNotFoundError(snapshot_id)
+        return self._root / f"{snapshot_id}{_MANIFEST_SUFFIX}"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._objects_dir / digest[:2] / digest[2:]
+
+    def _manifest_files(self) -> list[Path]:
+        """マニフェストファイルを作成日時の新しい順に返す。"""
+        try:
+            manifests = [p for p in self._root.iterdir() if p.suffix == _MANIFEST_SUFFIX and p.is_file()]
+        except FileNotFoundError:
+            return []
+        manifests.sort(key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        return manifests
+
+    @staticmethod
+    def _read_manifest(path: Path) -> AppSnapshot:
+        return AppSnapshot.model_validate_json(path.read_bytes())
+
+    @staticmethod
+    def _info(snapshot: AppSnapshot) -> SnapshotInfo:
+        return SnapshotInfo(
+            snapshot_id=snapshot.snapshot_id,
+            created_at=snapshot.created_at,
+            file_count=len(snapshot.files),
+            total_bytes=sum(f.size for f in snapshot.files.values()),
+        )
+
+    def latest(self) -> AppSnapshot | None:
+        """最新のスナップショットを返す。存在しない場合はNone。"""
+        manifests = self._manifest_files()
+        return self._read_manifest(manifests[0]) if manifests else None
+
+    def get(self, snapshot_id: str) -> AppSnapshot:
+        """スナップショットのマニフェストを返す。
+
+        Raises:
+            SnapshotNotFoundError: スナップショットが存在しない場合。
+        """
+        path = self._manifest_path(snapshot_id)
+        try:
+            return self._read_manifest(path)
+        except FileNotFoundError:
+            raise SnapshotNotFoundError(snapshot_id) from None
+
+    def list_snapshots(self) -> list[SnapshotInfo]:
+        """スナップショットの一覧を作成日時の新しい順に返す。"""
+        snapshots = [self._read_manifest(p) for p in self._manifest_files()]
+        snapshots.sort(key=lambda s: s.created_at, reverse=True)
+        return [self._info(s) for s in snapshots]
+
+    def _store_blob(self, path: Path) -> str:
+        """ファイルをハッシュしながら一時ファイルにコピーし、未保存であればブロブとして確定する。"""
+        self._objects_dir.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(dir=self._objects_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as dst, path.open("rb") as src:
+                while chunk := src.read(_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    dst.write(chunk)
+            digest = hasher.hexdigest()
+            blob = self._blob_path(digest)
+            if blob.exists():
+                os.unlink(tmp_name)
+            else:
+                blob.parent.mkdir(exist_ok=True)
+                os.replace(tmp_name, blob)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_name)
+            raise
+        return digest
+
+    def create(self, source_dir: Path) -> SnapshotInfo:
+        """ディレクトリのスナップショットを作成する。
+
+        Args:
+            source_dir: スナップショット対象のディレクトリ。
+
+        Returns:
+            作成したスナップショットの概要。
+        """
+        previous = self.latest()
+        known = previous.files if previous else {}
+        trusted_before = int(previous.created_at.timestamp() * 1_000_000_000) - _RACY_WINDOW_NS if previous else 0
+
+        files: dict[str, SnapshotFile] = {}
+        for relpath, st in _iter_files(source_dir):
+            entry = known.get(relpath)
+            if (
+                entry is not None
+                and entry.size == st.st_size
+                and entry.mtime_ns == st.st_mtime_ns
+                and st.st_mtime_ns < trusted_before
+                and self._blob_path(entry.digest).exists()
+            ):
+                digest = entry.digest
+            else:
+                digest = self._store_blob(source_dir / relpath)
+            files[relpath] = SnapshotFile(
+                digest=digest, size=st.st_size, mode=stat.S_IMODE(st.st_mode), mtime_ns=st.st_mtime_ns
+            )
+
+        snapshot = AppSnapshot(snapshot_id=uuid.uuid4().hex[:8], files=files)
+        manifest = self._manifest_path(snapshot.snapshot_id)
+        self._root.mkdir(parents=True, exist_ok=True)
+        tmp = manifest.with_name(f".{manifest.name}.tmp")
+        tmp.write_text(snapshot.model_dump_json(), encoding="utf-8")
+        os.replace(tmp, manifest)
+        return self._info(snapshot)
+
+    def restore(self, snapshot_id: str, target_dir: Path, current: AppSnapshot | None = None) -> AppSnapshot:
+        """スナップショットの内容でディレクトリを置き換える。
+
+        スナップショットに含まれないファイルは削除する。
+
+        Args:
+            snapshot_id: 復元するスナップショットのID。
+            target_dir: 復元先のディレクトリ。
+            current: 復元先の現在の内容を記録したスナップショット。指定した場合、
+                内容が一致するファイルは書き直さない。
+
+        Returns:
+            復元したスナップショットのマニフェスト。
+
+        Raises:
+            SnapshotNotFoundError: スナップショットが存在しない場合。
+        """
+        snapshot = self.get(snapshot_id)
+        unchanged = current.files if current else {}
+        existing = dict(_iter_files(target_dir)) if target_dir.exists() else {}
+
+        for relpath, entry in snapshot.files.items():
+            dest = target_dir / relpath
+            st = existing.get(relpath)
+            known = unchanged.get(relpath)
+            if (
+                st is not None
+                and known is not None
+                and known.digest == entry.digest
+                and known.size == st.st_size
+                and known.mtime_ns == st.st_mtime_ns
+            ):
+                if stat.S_IMODE(st.st_mode) != entry.mode:
+                    os.chmod(dest, entry.mode)
+                continue
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(f".{dest.name}.restore-tmp")
+            shutil.copyfile(self._blob_path(entry.digest), tmp)
+            os.chmod(tmp, entry.mode)
+            os.replace(tmp, dest)
+
+        for relpath in existing.keys() - snapshot.files.keys():
+            (target_dir / relpath).unlink(missing_ok=True)
+        # 空になったディレクトリを深い順に削除する
+        for root, _dirs, _files in sorted(os.walk(target_dir), key=lambda w: w[0], reverse=True):
+            if root != str(target_dir):
+                with contextlib.suppress(OSError):
+                    os.rmdir(root)
+        return snapshot
+
+    def prune(self, keep: int) -> tuple[int, int]:
+        """新しい順にkeep件を残してスナップショットを削除し、参照されなくなったブロブを削除する。
+
+        以前の形式（ディレクトリ単位の完全コピー）のスナップショットも件数に含めて削除対象とする。
+
+        Returns:
+            (削除件数, 解放したバイト数) のタプル。
+        """
+        try:
+            entries = [p for p in self._root.iterdir() if not p.name.startswith(".")]
+        except FileNotFoundError:
+            return 0, 0
+        entries = [p for p in entries if p.is_dir() or p.suffix == _MANIFEST_SUFFIX]
+        if len(entries) <= keep:
+            return 0, 0
+        entries.sort(key=self._entry_created_at, reverse=True)
+
+        reclaimed = 0
+        for entry in entries[keep:]:
+            if entry.is_dir():
+                reclaimed += remove_tree(entry)
+            else:
+                reclaimed += entry.stat().st_size
+                entry.unlink()
+        return len(entries) - keep, reclaimed + self._sweep_blobs()
+
+    def _entry_created_at(self, entry: Path) -> float:
+        """スナップショット（マニフェストまたは以前の形式のディレクトリ）の作成時刻。"""
+        if entry.is_dir():
+            return entry.stat().st_mtime
+        return self._read_manifest(entry).created_at.timestamp()
+
+    def _sweep_blobs(self) -> int:
+        """どのマニフェストからも参照されていないブロブを削除し、解放したバイト数を返す。"""
+        if not self._objects_dir.exists():
+            return 0
+        referenced = {f.digest for p in self._manifest_files() for f in self._read_manifest(p).files.values()}
+        reclaimed = 0
+        for prefix_dir in self._objects_dir.iterdir():
+            if not prefix_dir.is_dir():
+                continue
+            for blob in prefix_dir.iterdir():
+                if prefix_dir.name + blob.name not in referenced:
+                    reclaimed += blob.stat().st_size
+                    blob.unlink()
+        return reclaimed
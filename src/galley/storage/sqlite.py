@@ -0,0 +1,387 @@
+"""SQLiteをバックエンドとするストレージサービス。"""
+
+import asyncio
+import functools
+import sqlite3
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+from galley.models.errors import SessionNotFoundError, StorageError
+from galley.models.session import Answer, Session, SessionStatus
+from galley.storage.serializers import load_session_payload
+from galley.storage.service import StorageService
+
+# データベース接続プール（スレッド数）のデフォルト
+DEFAULT_SQLITE_POOL_SIZE = 4
+
+# ロック競合時の待機時間（ミリ秒）
+_BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    rm_stack_id TEXT,
+    version INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_status_updated ON sessions (status, updated_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_status_created ON sessions (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions (created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_rm_stack ON sessions (rm_stack_id);
+CREATE TABLE IF NOT EXISTS answer_journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_answer_journal_session ON answer_journal (session_id, seq);
+"""
+
+_T = TypeVar("_T")
+
+
+class SQLiteStorageService(StorageService):
+    """SQLiteにセッションを永続化するデータ永続化層。
+
+    セッション本体はシリアライズ済みのBLOBとして保存し、一覧・検索に使う
+    status / created_at / updated_at / rm_stack_id はインデックス付きのカラムに持つ。
+    データベースはWALモードで開き、スレッドごとの接続をスレッドプール上で使い回す
+    （イベントループはブロックしない）。
+
+    回答はanswer_journalテーブルに追記し、読み込み時にセッションへ重ねて適用する。
+    Terraform・アプリケーション等の作業ファイルは従来どおりデータディレクトリ配下に置く。
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        *,
+        db_path: Path | None = None,
+        pool_size: int = DEFAULT_SQLITE_POOL_SIZE,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(data_dir, **kwargs)
+        self._db_path = db_path or data_dir / "sessions.db"
+        self._pool_size = max(pool_size, 1)
+        self._executor: ThreadPoolExecutor | None = None
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._initialize()
+
+    def _connect(self) -> sqlite3.Connection:
+        """WALモードの接続を作成する。トランザクションは明示的に開始する。"""
+        conn = sqlite3.connect(self._db_path, isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        # WALではNORMALでもDBは壊れない（fsync有効時はコミットごとに同期する）
+        conn.execute(f"PRAGMA synchronous = {'FULL' if self._fsync else 'NORMAL'}")
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """実行中スレッド専用の接続を返す。"""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _initialize(self) -> None:
+        """スキーマを作成し、初回はファイルシステム上の既存セッションを取り込む。"""
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+            if conn.execute("SELECT 1 FROM sessions LIMIT 1").fetchone() is None:
+                self._import_file_sessions(conn)
+        finally:
+            conn.close()
+
+    def _import_file_sessions(self, conn: sqlite3.Connection) -> None:
+        """ローカルファイル形式（session.json + answers.log）のセッションを取り込む。"""
+        if not self._sessions_dir.exists():
+            return
+        rows: list[tuple[Any, ...]] = []
+        for session_file in self._sessions_dir.glob("*/session.json"):
+            session_id = session_file.parent.name
+            try:
+                session = load_session_payload(session_file.read_bytes())
+            except (StorageError, ValueError):
+                continue
+            self._apply_answers(session, self._parse_journal(self._read_journal(session_id)))
+            rows.append(self._row(session, self._serializer.dumps(session)))
+        if rows:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR IGNORE INTO sessions (id, status, created_at, updated_at, rm_stack_id, version, data) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+
+    async def _run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """DB処理をスレッドプールで実行する（停止後は起動し直す）。"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._pool_size, thread_name_prefix="galley-sqlite")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def close(self) -> None:
+        """スレッドプールを停止し、すべての接続を閉じる。
+
+        実行中のDB処理の完了と接続のクローズは別スレッドで待ち、イベントループはブロックしない。
+        """
+        await super().close()
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(self._close_connections, executor)
+
+    def _close_connections(self, executor: ThreadPoolExecutor | None) -> None:
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    @staticmethod
+    def _row(session: Session, payload: bytes) -> tuple[Any, ...]:
+        return (
+            session.id,
+            session.status,
+            session.created_at.timestamp(),
+            session.updated_at.timestamp(),
+            session.rm_stack_id,
+            payload,
+        )
+
+    @staticmethod
+    def _signature_of(version: int) -> tuple[int, int, int, int]:
+        return (version, 0, 0, 0)
+
+    # --- 同期DB処理（スレッドプール上で実行） ---
+
+    def _write_session(self, row: tuple[Any, ...]) -> int:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (version,) = conn.execute(
+                "INSERT INTO sessions (id, status, created_at, updated_at, rm_stack_id, version, data) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT (id) DO UPDATE SET status = excluded.status, created_at = excluded.created_at, "
+                "updated_at = excluded.updated_at, rm_stack_id = excluded.rm_stack_id, "
+                "version = sessions.version + 1, data = excluded.data "
+                "RETURNING version",
+                row,
+            ).fetchone()
+            # ジャーナルは保存するセッションへ畳み込まれている
+            conn.execute("DELETE FROM answer_journal WHERE session_id = ?", (row[0],))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return int(version)
+
+    def _read_version(self, session_id: str) -> int | None:
+        row = self._connection().execute("SELECT version FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return None if row is None else int(row[0])
+
+    def _read_session(self, session_id: str) -> tuple[int, bytes, list[bytes]] | None:
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute("SELECT version, data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            journal = conn.execute(
+                "SELECT payload FROM answer_journal WHERE session_id = ? ORDER BY seq", (session_id,)
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        return int(row[0]), bytes(row[1]), [bytes(r[0]) for r in journal]
+
+    def _write_answers(self, session_id: str, answers: list[Answer]) -> tuple[int, int] | None:
+        conn = self._connection()
+        latest = max(answer.answered_at for answer in answers).timestamp()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "UPDATE sessions SET updated_at = max(updated_at, ?), version = version + 1 "
+                "WHERE id = ? RETURNING version",
+                (latest, session_id),
+            ).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            conn.executemany(
+                "INSERT INTO answer_journal (session_id, payload) VALUES (?, ?)",
+                [(session_id, answer.model_dump_json().encode("utf-8")) for answer in answers],
+            )
+            (journal_bytes,) = conn.execute(
+                "SELECT coalesce(sum(length(payload)), 0) FROM answer_journal WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return int(row[0]), int(journal_bytes)
+
+    def _delete_rows(self, session_id: str) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM answer_journal WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _query_ids(self, sql: str, params: list[Any]) -> list[str]:
+        return [row[0] for row in self._connection().execute(sql, params).fetchall()]
+
+    # --- StorageService API ---
+
+    async def save_session(self, session: Session) -> None:
+        """セッションをデータベースに保存する。"""
+        self._session_dir(session.id)  # セッションIDの検証
+        payload = await self._run(self._serializer.dumps, session)
+        row = self._row(session, payload)
+        self._cache.pop(session.id, None)
+        version = await self._run(self._write_session, row)
+        self._cache_put(session.id, session, self._signature_of(version))
+
+    async def load_session(self, session_id: str) -> Session:
+        """セッションをデータベースから読み込む。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+        """
+        self._session_dir(session_id)  # セッションIDの検証
+        version = await self._run(self._read_version, session_id)
+        if version is None:
+            self._cache.pop(session_id, None)
+            raise SessionNotFoundError(session_id)
+        entry = self._cache_get(session_id, self._signature_of(version))
+        if entry is not None:
+            return entry.session
+
+        result = await self._run(self._read_session, session_id)
+        if result is None:
+            self._cache.pop(session_id, None)
+            raise SessionNotFoundError(session_id)
+        version, payload, journal = result
+        journal_bytes = b"".join(line + b"\n" for line in journal)
+        session = await self._run(self._restore, payload, journal_bytes)
+        self._cache_put(session_id, session, self._signature_of(version))
+        return session
+
+    async def peek_session(self, session_id: str) -> Session:
+        """キャッシュを変更せずにセッションをデータベースから読み込む。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+        """
+        self._session_dir(session_id)  # セッションIDの検証
+        result = await self._run(self._read_session, session_id)
+        if result is None:
+            raise SessionNotFoundError(session_id)
+        _, payload, journal = result
+        return await self._run(self._restore, payload, b"".join(line + b"\n" for line in journal))
+
+    async def append_answers(self, session_id: str, answers: list[Answer]) -> None:
+        """回答をanswer_journalテーブルに追記する。
+
+        セッション本体のBLOBは書き直さない。ジャーナルが閾値サイズに達した場合は畳み込む。
+
+        Raises:
+            SessionNotFoundError: セッションが存在しない場合。
+        """
+        self._session_dir(session_id)  # セッションIDの検証
+        if not answers:
+            return
+        result = await self._run(self._write_answers, session_id, answers)
+        if result is None:
+            self._cache.pop(session_id, None)
+            raise SessionNotFoundError(session_id)
+        version, journal_bytes = result
+
+        # 直前の版をキャッシュしていればジャーナルを読み直さずにキャッシュ中のセッションへ反映する
+        entry = self._cache.get(session_id)
+        if entry is not None and entry.signature == self._signature_of(version - 1):
+            self._apply_answers(entry.session, answers)
+            entry.signature = self._signature_of(version)
+        else:
+            self._cache.pop(session_id, None)
+
+        if journal_bytes >= self._journal_max_bytes:
+            await self.compact_journal(session_id)
+
+    async def delete_session(self, session_id: str) -> None:
+        """セッションをデータベースと作業ディレクトリから削除する。"""
+        self._session_dir(session_id)  # セッションIDの検証
+        await self._run(self._delete_rows, session_id)
+        await super().delete_session(session_id)
+
+    async def list_sessions(self, limit: int | None = None, offset: int = 0) -> list[str]:
+        """保存されているセッションIDの一覧をID順に返す。
+
+        Args:
+            limit: 返す最大件数。Noneの場合は全件。
+            offset: 先頭から読み飛ばす件数。
+        """
+        return await self._run(
+            self._query_ids,
+            "SELECT id FROM sessions ORDER BY id LIMIT ? OFFSET ?",
+            [-1 if limit is None else limit, offset],
+        )
+
+    async def list_sessions_by_age(self) -> list[str]:
+        """セッションIDを更新日時の古い順に返す（インデックスで並べ、セッションは読み込まない）。"""
+        return await self._run(self._query_ids, "SELECT id FROM sessions ORDER BY updated_at, id", [])
+
+    async def find_sessions(
+        self,
+        *,
+        status: SessionStatus | None = None,
+        created_before: datetime | None = None,
+        updated_before: datetime | None = None,
+        rm_stack_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[str]:
+        """条件に一致するセッションIDを更新日時の古い順に返す（インデックスで絞り込む）。
+
+        Args:
+            status: セッションステータス。
+            created_before: この日時より前に作成されたセッションに限定する。
+            updated_before: この日時より前に最終更新されたセッションに限定する。
+            rm_stack_id: Resource Manager スタックID。
+            limit: 返す最大件数。Noneの場合は全件。
+            offset: 先頭から読み飛ばす件数。
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(created_before.timestamp())
+        if updated_before is not None:
+            clauses.append("updated_at < ?")
+            params.append(updated_before.timestamp())
+        if rm_stack_id is not None:
+            clauses.append("rm_stack_id = ?")
+            params.append(rm_stack_id)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        sql = f"SELECT id FROM sessions {where}ORDER BY updated_at, id LIMIT ? OFFSET ?"
+        return await self._run(self._query_ids, sql, [*params, -1 if limit is None else limit, offset])
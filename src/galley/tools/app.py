@@ -69,6 +69,39 @@ def register_app_tools(mcp: FastMCP, app_service: AppService) -> None:
         except (GalleyError, ValueError) as e:
             return {"error": type(e).__name__, "message": str(e)}
 
+    @mcp.tool()
+    async def list_snapshots(session_id: str) -> dict[str, Any]:
+        """アプリケーションコードのスナップショット一覧を取得する。
+
+        update_app_code / restore_snapshot の実行前に自動保存されたスナップショットを
+        新しい順に返します。
+
+        Args:
+            session_id: セッションID。
+        """
+        try:
+            snapshots = await app_service.list_snapshots(session_id)
+            return {"snapshots": [s.model_dump() for s in snapshots]}
+        except GalleyError as e:
+            return {"error": type(e).__name__, "message": str(e)}
+
+    @mcp.tool()
+    async def restore_snapshot(session_id: str, snapshot_id: str) -> dict[str, Any]:
+        """アプリケーションコードをスナップショットの状態に戻す。
+
+        復元前の状態は新しいスナップショットとして保存されるため、
+        そのIDを指定して再度復元すれば元に戻せます。
+
+        Args:
+            session_id: セッションID。
+            snapshot_id: 復元するスナップショットのID（list_snapshotsで取得）。
+        """
+        try:
+            result = await app_service.restore_snapshot(session_id, snapshot_id)
+            return dict(result)
+        except GalleyError as e:
+            return {"error": type(e).__name__, "message": str(e)}
+
     @mcp.tool()
     async def build_and_deploy(
         session_id: str,
@@ -85,6 +118,10 @@ def register_app_tools(mcp: FastMCP, app_service: AppService) -> None:
         image_uriを省略した場合、Build Instanceでイメージをビルドし
         OCIRにプッシュしてからデプロイします。
 
+        ビルド・デプロイはジョブとして非同期で実行され、このツールはジョブ情報を
+        すぐに返します。結果は wait_job / get_job で取得してください（result に
+        DeployResult のJSON表現が入ります）。
+
         Args:
             session_id: セッションID。
             cluster_id: OKEクラスタのOCID。
@@ -92,8 +129,8 @@ def register_app_tools(mcp: FastMCP, app_service: AppService) -> None:
             namespace: K8s名前空間（デフォルト: default）。
         """
         try:
-            result = await app_service.build_and_deploy(session_id, cluster_id, image_uri, namespace)
-            return result.model_dump()
+            job = await app_service.submit_build_and_deploy(session_id, cluster_id, image_uri, namespace)
+            return job.model_dump()
         except (GalleyError, ValueError, RuntimeError) as e:
             return {"error": type(e).__name__, "message": str(e)}
 
@@ -105,17 +105,61 @@ def register_design_tools(mcp: FastMCP, design_service: DesignService) -> None:
             return {"error": type(e).__name__, "message": str(e)}
 
     @mcp.tool()
-    async def validate_architecture(session_id: str) -> dict[str, Any]:
+    async def patch_architecture(
+        session_id: str,
+        operations: list[dict[str, Any]],
+        validate: bool = False,
+    ) -> dict[str, Any]:
+        """複数のコンポーネント・接続の変更を1回でまとめて適用する。
+
+        add_component / remove_component / configure_component を繰り返し呼ぶ代わりに使います。
+        操作は先頭から順に適用され、いずれかが失敗した場合は何も変更されません。
+
+        Args:
+            session_id: セッションID。
+            operations: 操作のリスト。各要素は "op" で種別を指定する:
+                {"op": "add", "service_type": str, "display_name": str, "config": dict, "id": str}
+                （idは任意。"vcn-1" のような仮IDを付けると後続の操作から参照できる。仮IDは重複不可）、
+                {"op": "remove", "component_id": str}、
+                {"op": "configure", "component_id": str, "config": dict}、
+                {"op": "connect", "source_id": str, "target_id": str, "connection_type": str, "description": str}、
+                {"op": "disconnect", "source_id": str, "target_id": str, "connection_type": str}
+                （disconnectのconnection_typeは任意）。
+            validate: Trueの場合は適用後に続けてvalidate_architectureと同じ検証を行い、結果を含めて返す
+                （アーキテクチャが無く検証できない場合はnull）。
+        """
+        try:
+            patched = await design_service.patch_architecture(session_id, operations, validate=validate)
+            response: dict[str, Any] = {"results": patched.results}
+            if validate:
+                validation = patched.validation
+                response["validation"] = (
+                    None
+                    if validation is None
+                    else {
+                        "results": [r.model_dump() for r in validation],
+                        "error_count": sum(1 for r in validation if r.severity == "error"),
+                        "warning_count": sum(1 for r in validation if r.severity == "warning"),
+                    }
+                )
+            return response
+        except GalleyError as e:
+            return {"error": type(e).__name__, "message": str(e)}
+
+    @mcp.tool()
+    async def validate_architecture(session_id: str, full: bool = False) -> dict[str, Any]:
         """アーキテクチャ構成をバリデーションルールに基づいて検証する。
 
         OCI固有の制約やベストプラクティスに基づいて構成を検証し、
         問題点と推奨事項のリストを返します。
+        前回の検証以降に変更されたコンポーネントと接続だけを検証し直します。
 
         Args:
             session_id: セッションID。
+            full: Trueの場合は前回の結果を使わず、構成全体を検証し直す。
         """
         try:
-            results = await design_service.validate_architecture(session_id)
+            results = await design_service.validate_architecture(session_id, full=full)
             error_count = sum(1 for r in results if r.severity == "error")
             warning_count = sum(1 for r in results if r.severity == "warning")
             return {
@@ -16,21 +16,27 @@ def register_infra_tools(mcp: FastMCP, infra_service: InfraService) -> None:
         session_id: str,
         terraform_dir: str,
         variables: dict[str, str] | None = None,
+        force: bool = False,
     ) -> dict[str, Any]:
         """OCI Resource Manager経由でTerraform planを実行する。
 
         Terraformファイルをzip化してRMスタックにアップロードし、
-        Planジョブを実行して結果を返します。
+        Planジョブを実行します。ジョブは非同期で実行され、このツールはジョブ情報を
+        すぐに返します。結果は wait_job / get_job で取得してください（result に
+        TerraformResult のJSON表現が入ります）。
         RM自動入力変数（region, compartment_ocid等）はvariablesから自動除外されます。
+        Terraformファイルと変数が前回成功したplanから変わっていない場合は、Planジョブを
+        実行せずに前回の結果を返します（result の cached が true になります）。
 
         Args:
             session_id: セッションID。
             terraform_dir: Terraformファイルが格納されたディレクトリパス。
             variables: Terraform変数。RM自動入力変数は自動除外される。
+            force: trueの場合は前回の結果を使わずにPlanジョブを実行する（デフォルト: false）。
         """
         try:
-            result = await infra_service.run_terraform_plan(session_id, terraform_dir, variables)
-            return result.model_dump()
+            job = await infra_service.submit_terraform_job("plan", session_id, terraform_dir, variables, force=force)
+            return job.model_dump()
         except (GalleyError, ValueError) as e:
             return {"error": type(e).__name__, "message": str(e)}
 
@@ -43,7 +49,8 @@ def register_infra_tools(mcp: FastMCP, infra_service: InfraService) -> None:
         """OCI Resource Manager経由でTerraform applyを実行する。
 
         RMスタックを更新し、Applyジョブ（自動承認）を実行して
-        OCIリソースをプロビジョニングします。
+        OCIリソースをプロビジョニングします。ジョブは非同期で実行され、このツールは
+        ジョブ情報をすぐに返します。結果は wait_job / get_job で取得してください。
 
         Args:
             session_id: セッションID。
@@ -51,8 +58,8 @@ def register_infra_tools(mcp: FastMCP, infra_service: InfraService) -> None:
             variables: Terraform変数。RM自動入力変数は自動除外される。
         """
         try:
-            result = await infra_service.run_terraform_apply(session_id, terraform_dir, variables)
-            return result.model_dump()
+            job = await infra_service.submit_terraform_job("apply", session_id, terraform_dir, variables)
+            return job.model_dump()
         except (GalleyError, ValueError) as e:
             return {"error": type(e).__name__, "message": str(e)}
 
@@ -65,7 +72,8 @@ def register_infra_tools(mcp: FastMCP, infra_service: InfraService) -> None:
         """OCI Resource Manager経由でTerraform destroyを実行する。
 
         RMスタックのDestroyジョブ（自動承認）を実行し、
-        プロビジョニング済みのOCIリソースをクリーンアップします。
+        プロビジョニング済みのOCIリソースをクリーンアップします。ジョブは非同期で実行され、
+        このツールはジョブ情報をすぐに返します。結果は wait_job / get_job で取得してください。
 
         Args:
             session_id: セッションID。
@@ -73,8 +81,8 @@ def register_infra_tools(mcp: FastMCP, infra_service: InfraService) -> None:
             variables: Terraform変数。RM自動入力変数は自動除外される。
         """
         try:
-            result = await infra_service.run_terraform_destroy(session_id, terraform_dir, variables)
-            return result.model_dump()
+            job = await infra_service.submit_terraform_job("destroy", session_id, terraform_dir, variables)
+            return job.model_dump()
         except (GalleyError, ValueError) as e:
             return {"error": type(e).__name__, "message": str(e)}
 
@@ -102,11 +110,13 @@ def register_infra_tools(mcp: FastMCP, infra_service: InfraService) -> None:
             return {"error": type(e).__name__, "message": str(e)}
 
     @mcp.tool()
-    async def run_oci_cli(command: str) -> dict[str, Any]:
+    async def run_oci_cli(command: str, force: bool = False) -> dict[str, Any]:
         """OCI CLIコマンドを実行する。
 
         OCI CLIコマンドを実行し、結果を返します。
         セキュリティのため、許可されたサービスコマンドのみ実行可能です。
+        読み取り系のコマンド（list / get）は一定時間結果をキャッシュし、キャッシュから返した
+        場合は cached が true になります。最新の状態が必要な場合は force=True を指定してください。
 
         認証方式:
         - Container Instance: Resource Principal（自動設定）
@@ -114,13 +124,50 @@ def register_infra_tools(mcp: FastMCP, infra_service: InfraService) -> None:
 
         Args:
             command: OCI CLIコマンド文字列（例: "oci compute instance list --compartment-id ..."）。
+            force: Trueの場合はキャッシュを使わずにコマンドを実行する。
         """
         try:
-            result = await infra_service.run_oci_cli(command)
+            result = await infra_service.run_oci_cli(command, force=force)
             return result.model_dump()
         except GalleyError as e:
             return {"error": type(e).__name__, "message": str(e)}
 
+    @mcp.tool()
+    async def run_oci_cli_batch(commands: list[str], force: bool = False) -> dict[str, Any]:
+        """複数のOCI CLIコマンドをまとめて同時に実行する。
+
+        互いに依存しない参照系のコマンド（可用性ドメイン・シェイプ・イメージの一覧等）を
+        1回の呼び出しで実行できます。各コマンドは run_oci_cli と同じホワイトリストで検証され、
+        結果は入力と同じ順序で、コマンドごとの実行時間（duration_seconds）とともに返します。
+        許可されないコマンドはそのコマンドの結果に error が設定され、他のコマンドは実行されます。
+
+        Args:
+            commands: OCI CLIコマンド文字列のリスト（最大50件）。
+            force: Trueの場合はキャッシュを使わずにコマンドを実行する。
+        """
+        try:
+            items = await infra_service.run_oci_cli_batch(commands, force=force)
+            return {"results": [item.model_dump() for item in items]}
+        except (GalleyError, ValueError) as e:
+            return {"error": type(e).__name__, "message": str(e)}
+
+    @mcp.tool()
+    async def get_oci_cli_cache_stats() -> dict[str, Any]:
+        """読み取り系OCI CLIコマンドの結果キャッシュの統計情報を取得する。
+
+        ヒット・ミス件数、force指定による回避回数、件数上限による破棄件数、
+        変更系コマンドの実行による破棄件数、現在のキャッシュ件数を返します。
+        """
+        return infra_service.cli_cache.metrics.model_dump()
+
+    @mcp.tool()
+    async def get_plan_cache_stats() -> dict[str, Any]:
+        """Terraform plan結果のキャッシュの統計情報を取得する。
+
+        ヒット・ミス件数と、現在キャッシュしているplan結果の件数を返します。
+        """
+        return infra_service.plan_cache.metrics.model_dump()
+
     @mcp.tool()
     async def get_rm_job_status(job_id: str) -> dict[str, Any]:
         """Resource Managerジョブの状態とログを取得する。
@@ -0,0 +1,81 @@
+"""ジョブ管理のMCPツール定義。"""
+
+from typing import Any
+
+from fastmcp import Context, FastMCP
+
+from galley.models.errors import GalleyError
+from galley.models.jobs import Job
+from galley.services.jobs import JobService
+
+
+def register_job_tools(mcp: FastMCP, job_service: JobService) -> None:
+    """ジョブ関連のMCPツールを登録する。"""
+
+    @mcp.tool()
+    async def get_job(job_id: str) -> dict[str, Any]:
+        """ジョブの状態と結果を取得する。
+
+        run_terraform_plan / run_terraform_apply / run_terraform_destroy /
+        build_and_deploy が返したジョブの現在の状態を返します。
+        status が succeeded / failed / canceled になると result に実行結果が入ります。
+
+        Args:
+            job_id: ジョブID。
+        """
+        try:
+            job = await job_service.get(job_id)
+            return job.model_dump()
+        except GalleyError as e:
+            return {"error": type(e).__name__, "message": str(e)}
+
+    @mcp.tool()
+    async def wait_job(job_id: str, ctx: Context, timeout_seconds: float = 30.0) -> dict[str, Any]:
+        """ジョブの完了を待って状態と結果を取得する。
+
+        最大 timeout_seconds 秒（上限300秒）待ち、その時点のジョブ情報を返します。
+        完了していない場合（status が queued / running）は再度呼び出してください。
+        待機中はResource Managerジョブのログを進捗通知として逐次送信します。
+
+        Args:
+            job_id: ジョブID。
+            timeout_seconds: 待機する最大秒数（デフォルト: 30）。
+        """
+
+        async def report(job: Job, lines: list[str]) -> None:
+            await ctx.report_progress(progress=job.progress_lines, message="\n".join(lines))
+
+        try:
+            job = await job_service.wait(job_id, timeout_seconds, on_progress=report)
+            return job.model_dump()
+        except GalleyError as e:
+            return {"error": type(e).__name__, "message": str(e)}
+
+    @mcp.tool()
+    async def cancel_job(job_id: str) -> dict[str, Any]:
+        """ジョブをキャンセルする。
+
+        実行中のResource Managerジョブもキャンセルします。
+        完了済みのジョブはそのままの状態を返します。
+
+        Args:
+            job_id: ジョブID。
+        """
+        try:
+            job = await job_service.cancel(job_id)
+            return job.model_dump()
+        except GalleyError as e:
+            return {"error": type(e).__name__, "message": str(e)}
+
+    @mcp.tool()
+    async def list_jobs(session_id: str) -> dict[str, Any]:
+        """セッションのジョブ一覧を取得する。
+
+        Args:
+            session_id: セッションID。
+        """
+        try:
+            jobs = await job_service.list_jobs(session_id)
+            return {"jobs": [job.model_dump() for job in jobs]}
+        except GalleyError as e:
+            return {"error": type(e).__name__, "message": str(e)}
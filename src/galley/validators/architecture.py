@@ -1,6 +1,11 @@
 """アーキテクチャバリデーションロジック。"""
 
+import hashlib
+import json
 import re
+from collections import Counter
+from collections.abc import Collection
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -8,17 +13,133 @@ import yaml
 
 from galley.models.architecture import Architecture, Component
 from galley.models.validation import ValidationResult, ValidationRule
+from galley.validators.graph import ArchitectureGraph
 
 # OCI APIリソース名にスペースを許容しないサービスタイプ
 _NAME_STRICT_SERVICES: set[str] = {"nosql", "objectstorage", "streaming"}
 
+# コードベースのルールのID
+_NAMING_RULE_ID = "naming-convention"
+_PLACEMENT_RULE_ID = "public-resource-private-subnet"
+
+# publicリソースの判定ルール（private判定に使う設定キーと値）
+_PUBLIC_SERVICES: dict[str, dict[str, str]] = {
+    "loadbalancer": {"config_key": "is_private", "private_value": "true"},
+    "apigateway": {"config_key": "endpoint_type", "private_value": "private"},
+}
+
+# アーキテクチャ全体の構造に依存する要件（差分検証でも常に評価し直す）
+_GRAPH_REQUIREMENTS = ("same_vcn", "deployed_in", "reachable_from")
+# 対象コンポーネントの接続数に関する要件
+_DEGREE_REQUIREMENTS = ("incoming", "outgoing")
+
+# (source_service, target_service, connection_type) → 該当するルール（読み込み順とルールの組）。
+# connection_typeを条件に持たないルールはNoneのバケットに入る
+RuleIndex = dict[tuple[str, str, str | None], list[tuple[int, ValidationRule]]]
+
+# service → コンポーネント単位のルール（読み込み順とルールの組）
+ComponentRuleIndex = dict[str, list[tuple[int, ValidationRule]]]
+
+
+def compile_rules(rules: list[ValidationRule]) -> RuleIndex:
+    """接続ベースのルールをサービスタイプと接続種別で引けるインデックスに変換する。
+
+    ``condition`` に ``source_service`` と ``target_service`` の両方を持たないルールは対象外。
+
+    Args:
+        rules: 読み込み済みのバリデーションルール。
+
+    Returns:
+        ルールのインデックス。
+    """
+    index: RuleIndex = {}
+    for order, rule in enumerate(rules):
+        source_service = rule.condition.get("source_service")
+        target_service = rule.condition.get("target_service")
+        if source_service is None or target_service is None:
+            continue
+        key = (source_service, target_service, rule.condition.get("connection_type"))
+        index.setdefault(key, []).append((order, rule))
+    return index
+
+
+def compile_component_rules(rules: list[ValidationRule]) -> ComponentRuleIndex:
+    """コンポーネント単位のルール（``condition.service`` を持つルール）をサービス種別で引けるようにする。
+
+    ``source_service`` / ``target_service`` を持つルールは接続ベースのルールとして扱うため対象外。
+
+    Args:
+        rules: 読み込み済みのバリデーションルール。
+
+    Returns:
+        ルールのインデックス。
+    """
+    index: ComponentRuleIndex = {}
+    for order, rule in enumerate(rules):
+        service = rule.condition.get("service")
+        if service is None or "source_service" in rule.condition or "target_service" in rule.condition:
+            continue
+        index.setdefault(service, []).append((order, rule))
+    return index
+
+
+@dataclass
+class _ReusableResults:
+    """差分検証で再利用できる前回の検証結果。"""
+
+    dirty: set[str]
+    # 結果を再利用できる接続（source_id, target_id）。変更されたコンポーネントに接続するものと、
+    # 同じ組の接続が複数あり結果を接続ごとに振り分けられないものは除く
+    pairs: set[tuple[str, str]]
+    connection_results: dict[tuple[str, str], list[ValidationResult]]
+    component_results: dict[str, list[ValidationResult]]
+    naming_results: dict[str, list[ValidationResult]]
+
+    @classmethod
+    def build(
+        cls,
+        architecture: Architecture,
+        previous: list[ValidationResult],
+        dirty_component_ids: Collection[str],
+    ) -> "_ReusableResults":
+        dirty = set(dirty_component_ids)
+        pair_counts = Counter((c.source_id, c.target_id) for c in architecture.connections)
+        pairs = {
+            pair for pair, count in pair_counts.items() if count == 1 and pair[0] not in dirty and pair[1] not in dirty
+        }
+        connection_results: dict[tuple[str, str], list[ValidationResult]] = {}
+        component_results: dict[str, list[ValidationResult]] = {}
+        naming_results: dict[str, list[ValidationResult]] = {}
+        for result in previous:
+            if result.rule_id == _NAMING_RULE_ID:
+                naming_results.setdefault(result.affected_components[0], []).append(result)
+            elif len(result.affected_components) == 2:
+                pair = (result.affected_components[0], result.affected_components[1])
+                connection_results.setdefault(pair, []).append(result)
+            elif len(result.affected_components) == 1:
+                component_results.setdefault(result.affected_components[0], []).append(result)
+        return cls(dirty, pairs, connection_results, component_results, naming_results)
+
 
 class ArchitectureValidator:
-    """バリデーションルールに基づくアーキテクチャ検証を行う。"""
+    """バリデーションルールに基づくアーキテクチャ検証を行う。
+
+    YAMLのルールは初回の検証時に読み込み、(source_service, target_service, connection_type)を
+    キーとするインデックスにまとめる。検証時は接続ごとに該当するバケットのルールだけを適用し、
+    コードベースのチェックも含めてアーキテクチャを1回走査する。グラフ述語（同一VCN・配置先・
+    到達可能性・接続数）を使うルールがある場合は、検証ごとに ``ArchitectureGraph`` を1回構築する。
+    """
 
     def __init__(self, config_dir: Path) -> None:
         self._config_dir = config_dir
         self._rules: list[ValidationRule] | None = None
+        self._rule_index: RuleIndex | None = None
+        self._component_rule_index: ComponentRuleIndex = {}
+        self._rule_order: dict[str, int] = {}
+        # アーキテクチャ全体の構造に依存する要件を持つルールの順番
+        self._graph_rule_orders: set[int] = set()
+        self._needs_graph = False
+        self._rules_digest: str | None = None
 
     def _load_rules(self) -> list[ValidationRule]:
         """バリデーションルールをYAMLファイルから読み込む。"""
@@ -41,169 +162,274 @@ class ArchitectureValidator:
         self._rules = rules
         return rules
 
-    def validate(self, architecture: Architecture) -> list[ValidationResult]:
+    def _load_rule_index(self) -> RuleIndex:
+        """ルールのインデックスを返す（初回のみ構築）。"""
+        if self._rule_index is None:
+            rules = self._load_rules()
+            self._rule_index = compile_rules(rules)
+            self._component_rule_index = compile_component_rules(rules)
+            self._rule_order = {rule.id: order for order, rule in enumerate(rules)}
+            self._graph_rule_orders = {
+                order for order, rule in enumerate(rules) if any(k in rule.requirement for k in _GRAPH_REQUIREMENTS)
+            }
+            self._needs_graph = any(
+                k in rule.requirement for rule in rules for k in _GRAPH_REQUIREMENTS + _DEGREE_REQUIREMENTS
+            )
+        return self._rule_index
+
+    @property
+    def rules_digest(self) -> str:
+        """読み込んだバリデーションルールのダイジェスト。ルールが変わると値が変わる。"""
+        if self._rules_digest is None:
+            payload = json.dumps([r.model_dump() for r in self._load_rules()], sort_keys=True, default=str)
+            self._rules_digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return self._rules_digest
+
+    def validate(
+        self,
+        architecture: Architecture,
+        *,
+        previous: list[ValidationResult] | None = None,
+        dirty_component_ids: Collection[str] = (),
+    ) -> list[ValidationResult]:
         """アーキテクチャ構成をバリデーションルールに基づいて検証する。
 
+        ``previous`` を指定すると差分検証を行う。``dirty_component_ids`` のコンポーネントと、
+        それらに接続する接続だけを検証し直し、それ以外は ``previous`` の結果を使う。
+        ``previous`` の検証以降に変更（追加・削除・設定変更、接続の追加・削除）された
+        コンポーネントがすべて ``dirty_component_ids`` に含まれていれば、結果は順序を含めて
+        全体の検証と一致する。
+
         Args:
             architecture: 検証対象のアーキテクチャ。
+            previous: 同じルールで検証した前回の結果。Noneの場合は全体を検証する。
+            dirty_component_ids: 前回の検証以降に変更されたコンポーネントのID。
 
         Returns:
             検出された問題のリスト。問題がない場合は空リスト。
+            YAMLのルールによる結果（ルールの読み込み順）、命名規則、サブネット配置の順に並ぶ。
         """
-        rules = self._load_rules()
-        results: list[ValidationResult] = []
-
+        rule_index = self._load_rule_index()
+        component_rule_index = self._component_rule_index
+        graph_rules = self._graph_rule_orders
         component_map = {c.id: c for c in architecture.components}
+        graph = ArchitectureGraph(architecture) if self._needs_graph else None
+        reuse = _ReusableResults.build(architecture, previous, dirty_component_ids) if previous is not None else None
 
-        for rule in rules:
-            rule_results = self._apply_rule(rule, architecture, component_map)
-            results.extend(rule_results)
-
-        # コンポーネント単体のバリデーション（コードベースのルール）
-        results.extend(self._check_naming_rules(architecture))
-        results.extend(self._check_subnet_placement(architecture))
-
-        return results
-
-    def _apply_rule(
-        self,
-        rule: ValidationRule,
-        architecture: Architecture,
-        component_map: dict[str, Any],
-    ) -> list[ValidationResult]:
-        """単一のバリデーションルールを適用する。"""
-        results: list[ValidationResult] = []
-        source_service = rule.condition.get("source_service")
-        target_service = rule.condition.get("target_service")
-
-        if source_service is None or target_service is None:
-            return results
+        # ルールごとの結果（読み込み順に並べるため、ルールの順番をキーにする）
+        rule_results: dict[int, list[ValidationResult]] = {}
+        naming_results: list[ValidationResult] = []
+        placement_results: list[ValidationResult] = []
 
-        # 接続ベースのルール: 該当するConnectionを検索
         for connection in architecture.connections:
+            # 変更されていない接続は前回の結果を使う（両端が変更されていなければ存在も前回と同じ）。
+            # アーキテクチャ全体の構造に依存するルールだけは評価し直す
+            reusable = reuse is not None and (connection.source_id, connection.target_id) in reuse.pairs
+            if reuse is not None and reusable:
+                for result in reuse.connection_results.get((connection.source_id, connection.target_id), ()):
+                    if result.rule_id == _PLACEMENT_RULE_ID:
+                        placement_results.append(result)
+                    elif (order := self._rule_order.get(result.rule_id)) is not None and order not in graph_rules:
+                        rule_results.setdefault(order, []).append(result)
+                if not graph_rules:
+                    continue
+
             source = component_map.get(connection.source_id)
             target = component_map.get(connection.target_id)
             if source is None or target is None:
                 continue
 
-            if source.service_type != source_service or target.service_type != target_service:
-                continue
-
-            # ルールの要件チェック
-            violation = self._check_requirement(rule, target)
-            if violation:
-                results.append(
-                    ValidationResult(
-                        severity=rule.severity,
-                        rule_id=rule.id,
-                        message=rule.description,
-                        affected_components=[connection.source_id, connection.target_id],
-                        recommendation=rule.recommendation,
+            for connection_type in (None, connection.connection_type):
+                bucket = rule_index.get((source.service_type, target.service_type, connection_type))
+                if not bucket:
+                    continue
+                for order, rule in bucket:
+                    if reusable and order not in graph_rules:
+                        continue
+                    if self._check_requirement(rule, target, source=source, graph=graph):
+                        rule_results.setdefault(order, []).append(
+                            ValidationResult(
+                                severity=rule.severity,
+                                rule_id=rule.id,
+                                message=rule.description,
+                                affected_components=[connection.source_id, connection.target_id],
+                                recommendation=rule.recommendation,
+                            )
+                        )
+
+            if not reusable and connection.connection_type == "deployed_in":
+                violation = self._check_subnet_placement(source, target)
+                if violation is not None:
+                    placement_results.append(violation)
+
+        # コンポーネント単位のルールとコンポーネント単体のバリデーション（コードベースのルール）
+        for comp in architecture.components:
+            reusable = reuse is not None and comp.id not in reuse.dirty
+            if reuse is not None and reusable:
+                for result in reuse.component_results.get(comp.id, ()):
+                    if (order := self._rule_order.get(result.rule_id)) is not None and order not in graph_rules:
+                        rule_results.setdefault(order, []).append(result)
+                naming_results.extend(reuse.naming_results.get(comp.id, ()))
+
+            for order, rule in component_rule_index.get(comp.service_type, ()):
+                if reusable and order not in graph_rules:
+                    continue
+                if self._check_requirement(rule, comp, graph=graph):
+                    rule_results.setdefault(order, []).append(
+                        ValidationResult(
+                            severity=rule.severity,
+                            rule_id=rule.id,
+                            message=f"{comp.display_name} ({comp.service_type}): {rule.description}",
+                            affected_components=[comp.id],
+                            recommendation=rule.recommendation,
+                        )
                     )
-                )
+
+            if not reusable:
+                violation = self._check_component_name(comp)
+                if violation is not None:
+                    naming_results.append(violation)
+
+        results: list[ValidationResult] = []
+        for order in sorted(rule_results):
+            results.extend(rule_results[order])
+        results.extend(naming_results)
+        results.extend(placement_results)
 
         return results
 
-    def _check_requirement(self, rule: ValidationRule, target: Any) -> bool:
+    def _check_requirement(
+        self,
+        rule: ValidationRule,
+        target: Any,
+        *,
+        source: Component | None = None,
+        graph: ArchitectureGraph | None = None,
+    ) -> bool:
         """ルールの要件が満たされていないかチェックする。
 
+        接続ベースのルールでは接続先（target）、コンポーネント単位のルールではそのコンポーネントを
+        対象に要件を評価する。グラフ述語は ``graph`` を指定した場合のみ評価する。
+
+        Args:
+            rule: バリデーションルール。
+            target: 要件を評価する対象のコンポーネント。
+            source: 接続ベースのルールの場合は接続元のコンポーネント。
+            graph: 検証対象のアーキテクチャグラフ。
+
         Returns:
             True: 違反がある（要件が満たされていない）
             False: 問題なし（要件が満たされている）
         """
         requirement = rule.requirement
 
-        # target_config チェック: ターゲットコンポーネントの設定値を検証
-        target_config_req = requirement.get("target_config")
-        if target_config_req is not None:
-            for key, expected_value in target_config_req.items():
-                actual_value = target.config.get(key)
-                if actual_value != expected_value:
-                    return True
+        # target_config / config チェック: 対象コンポーネントの設定値を検証
+        for config_key in ("target_config", "config"):
+            config_req = requirement.get(config_key)
+            if config_req is not None:
+                for key, expected_value in config_req.items():
+                    actual_value = target.config.get(key)
+                    if actual_value != expected_value:
+                        return True
+
+        if graph is None:
+            return False
+
+        # same_vcn: 接続元と接続先の配置先VCNが異なる（どちらも配置先が判明している場合のみ判定）
+        if requirement.get("same_vcn") and source is not None:
+            source_vcn = graph.vcn_of(source.id)
+            target_vcn = graph.vcn_of(target.id)
+            if source_vcn is not None and target_vcn is not None and source_vcn != target_vcn:
+                return True
+
+        # deployed_in: 指定サービス種別のコンポーネントの中に（推移的に）配置されている
+        deployed_in = requirement.get("deployed_in")
+        if deployed_in is not None and not graph.is_deployed_in(target.id, deployed_in):
+            return True
+
+        # reachable_from: 指定サービス種別のコンポーネントから接続をたどって到達できる
+        reachable_from = requirement.get("reachable_from")
+        if reachable_from is not None and not graph.is_reachable_from(target.id, reachable_from):
+            return True
+
+        # incoming / outgoing: 接続数（相手側のサービス種別・接続種別で絞り込み可能）の下限・上限
+        for direction in _DEGREE_REQUIREMENTS:
+            spec = requirement.get(direction)
+            if spec is None:
+                continue
+            count = graph.degree(
+                target.id,
+                direction=direction,
+                service_type=spec.get("service"),
+                connection_type=spec.get("connection_type"),
+            )
+            if count < spec.get("min", 0) or ("max" in spec and count > spec["max"]):
+                return True
 
         return False
 
     @staticmethod
-    def _check_naming_rules(architecture: Architecture) -> list[ValidationResult]:
+    def _check_component_name(comp: Component) -> ValidationResult | None:
         """コンポーネント名のOCI命名規則チェック。
 
         スペースを含む名前のnosql/objectstorage/streamingコンポーネントを検出する。
+
+        Returns:
+            違反がある場合は検証結果。問題がない場合はNone。
         """
-        results: list[ValidationResult] = []
-        for comp in architecture.components:
-            if comp.service_type in _NAME_STRICT_SERVICES and (
-                " " in comp.display_name or not re.match(r"^[a-zA-Z0-9_-]+$", comp.display_name)
-            ):
-                results.append(
-                    ValidationResult(
-                        severity="warning",
-                        rule_id="naming-convention",
-                        message=(
-                            f"{comp.display_name} ({comp.service_type}): "
-                            "OCI APIリソース名に使用できない文字が含まれています"
-                        ),
-                        affected_components=[comp.id],
-                        recommendation=(
-                            "display_nameには英数字、アンダースコア、ハイフンのみを使用してください。"
-                            "IaC生成時にはサニタイズされますが、意図した名前と異なる可能性があります。"
-                        ),
-                    )
-                )
-        return results
+        if comp.service_type not in _NAME_STRICT_SERVICES:
+            return None
+        if " " not in comp.display_name and re.match(r"^[a-zA-Z0-9_-]+$", comp.display_name):
+            return None
+        return ValidationResult(
+            severity="warning",
+            rule_id=_NAMING_RULE_ID,
+            message=f"{comp.display_name} ({comp.service_type}): OCI APIリソース名に使用できない文字が含まれています",
+            affected_components=[comp.id],
+            recommendation=(
+                "display_nameには英数字、アンダースコア、ハイフンのみを使用してください。"
+                "IaC生成時にはサニタイズされますが、意図した名前と異なる可能性があります。"
+            ),
+        )
 
     @staticmethod
-    def _check_subnet_placement(architecture: Architecture) -> list[ValidationResult]:
+    def _check_subnet_placement(source: Component, target: Component) -> ValidationResult | None:
         """publicリソースのサブネット配置整合性チェック。
 
-        deployed_in接続を持つpublicリソースがprivateサブネットに配置されていないか検出する。
-        """
-        results: list[ValidationResult] = []
-        component_map: dict[str, Component] = {c.id: c for c in architecture.components}
+        deployed_in接続のsource（publicリソース）がprivateサブネットに配置されていないか検出する。
 
-        # publicリソースの判定ルール
-        _PUBLIC_SERVICES: dict[str, dict[str, str]] = {
-            "loadbalancer": {"config_key": "is_private", "private_value": "true"},
-            "apigateway": {"config_key": "endpoint_type", "private_value": "private"},
-        }
-
-        for conn in architecture.connections:
-            if conn.connection_type != "deployed_in":
-                continue
-
-            source = component_map.get(conn.source_id)
-            target = component_map.get(conn.target_id)
-            if source is None or target is None:
-                continue
-
-            # source が publicリソースで、target が private subnet の場合
-            if target.service_type != "subnet":
-                continue
-
-            is_private_subnet = str(target.config.get("prohibit_public_ip", "false")).lower() == "true"
-            if not is_private_subnet:
-                continue
-
-            rule = _PUBLIC_SERVICES.get(source.service_type)
-            if rule is None:
-                continue
-
-            config_val = str(source.config.get(rule["config_key"], "")).lower()
-            is_private_resource = config_val == rule["private_value"]
-            if not is_private_resource:
-                results.append(
-                    ValidationResult(
-                        severity="error",
-                        rule_id="public-resource-private-subnet",
-                        message=(
-                            f"{source.display_name} ({source.service_type}): "
-                            f"パブリックリソースがプライベートサブネット({target.display_name})に配置されています"
-                        ),
-                        affected_components=[conn.source_id, conn.target_id],
-                        recommendation=(
-                            "パブリックリソース（Public LB, Public API Gateway等）は"
-                            "パブリックサブネットに配置してください"
-                        ),
-                    )
-                )
+        Args:
+            source: deployed_in接続の配置元コンポーネント。
+            target: deployed_in接続の配置先コンポーネント。
 
-        return results
+        Returns:
+            違反がある場合は検証結果。問題がない場合はNone。
+        """
+        # source が publicリソースで、target が private subnet の場合
+        if target.service_type != "subnet":
+            return None
+
+        is_private_subnet = str(target.config.get("prohibit_public_ip", "false")).lower() == "true"
+        if not is_private_subnet:
+            return None
+
+        rule = _PUBLIC_SERVICES.get(source.service_type)
+        if rule is None:
+            return None
+
+        config_val = str(source.config.get(rule["config_key"], "")).lower()
+        if config_val == rule["private_value"]:
+            return None
+
+        return ValidationResult(
+            severity="error",
+            rule_id=_PLACEMENT_RULE_ID,
+            message=(
+                f"{source.display_name} ({source.service_type}): "
+                f"パブリックリソースがプライベートサブネット({target.display_name})に配置されています"
+            ),
+            affected_components=[source.id, target.id],
+            recommendation=(
+                "パブリックリソース（Public LB, Public API Gateway等）はパブリックサブネットに配置してください"
+            ),
+        )
@@ -0,0 +1,188 @@
+"""バリデーションルールのグラフ述語を評価するためのアーキテクチャグラフ。"""
+
+from collections import deque
+
+from galley.models.architecture import Architecture, Component, Connection
+
+# 配置（包含）関係を表す接続種別。source が target の中に配置される
+CONTAINMENT_CONNECTION_TYPE = "deployed_in"
+
+
+class ArchitectureGraph:
+    """アーキテクチャのコンポーネントと接続をグラフとして扱う。
+
+    検証のたびに1回構築し、隣接リスト（接続元・接続先ごと）と配置関係（deployed_in）の
+    親リストを持つ。サービス種別ごとの配置先と到達可能集合は初回の問い合わせ時に
+    全コンポーネント分を計算してメモ化するため、全コンポーネントに問い合わせてもコンポーネント数と
+    接続数に対してほぼ線形の時間で済む。
+
+    参照先のコンポーネントが存在しない接続は無視する。
+    """
+
+    def __init__(self, architecture: Architecture) -> None:
+        self._components: dict[str, Component] = {c.id: c for c in architecture.components}
+        self._outgoing: dict[str, list[Connection]] = {}
+        self._incoming: dict[str, list[Connection]] = {}
+        self._parents: dict[str, list[str]] = {}
+        self._by_service: dict[str, list[str]] = {}
+        for comp in architecture.components:
+            self._by_service.setdefault(comp.service_type, []).append(comp.id)
+        for conn in architecture.connections:
+            if conn.source_id not in self._components or conn.target_id not in self._components:
+                continue
+            self._outgoing.setdefault(conn.source_id, []).append(conn)
+            self._incoming.setdefault(conn.target_id, []).append(conn)
+            if conn.connection_type == CONTAINMENT_CONNECTION_TYPE:
+                self._parents.setdefault(conn.source_id, []).append(conn.target_id)
+        self._containers: dict[str, dict[str, frozenset[str]]] = {}
+        self._containment_order: list[list[str]] | None = None
+        self._reachable: dict[str, frozenset[str]] = {}
+
+    def containers(self, component_id: str, service_type: str) -> frozenset[str]:
+        """コンポーネントの配置先（deployed_inを推移的にたどった先）のうち、指定サービス種別のIDを返す。
+
+        結果はサービス種別ごとに全コンポーネント分をまとめて求めてメモ化する。配置関係の強連結成分を
+        配置先の側から順に処理し、各成分は配置先の成分の結果を合わせて求めるため、配置関係の数に
+        ほぼ比例する時間で済む。配置関係が循環している場合、循環上のコンポーネントは互いを
+        配置先とみなす（自身は含めない）。
+        """
+        memo = self._containers.get(service_type)
+        if memo is None:
+            memo = self._containers_of_service(service_type)
+            self._containers[service_type] = memo
+        return memo.get(component_id, frozenset())
+
+    def _containers_of_service(self, service_type: str) -> dict[str, frozenset[str]]:
+        """配置関係を持つ全コンポーネントについて、指定サービス種別の配置先を求める。"""
+        components = self._containment_components()
+        component_of = {node: number for number, members in enumerate(components) for node in members}
+        reached: list[frozenset[str]] = []
+        memo: dict[str, frozenset[str]] = {}
+        for number, members in enumerate(components):
+            # 配置先の成分は先に処理済み（同じ成分内の配置先はメンバーとして直接加える）
+            result: set[str] = set()
+            for node in members:
+                for parent in self._parents.get(node, []):
+                    if self._components[parent].service_type == service_type:
+                        result.add(parent)
+                    if component_of[parent] != number:
+                        result |= reached[component_of[parent]]
+            reached.append(frozenset(result))
+            for node in members:
+                memo[node] = reached[number] - {node} if node in result else reached[number]
+        return memo
+
+    def _containment_components(self) -> list[list[str]]:
+        """配置関係の強連結成分を、配置先の成分が先に来る順に返す（Tarjan法。深い配置関係でも再帰しない）。"""
+        if self._containment_order is not None:
+            return self._containment_order
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        components: list[list[str]] = []
+        for root in self._parents:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._parents.get(root, [])))]
+            while work:
+                node, parents = work[-1]
+                for parent in parents:
+                    if parent not in index:
+                        index[parent] = low[parent] = len(index)
+                        stack.append(parent)
+                        on_stack.add(parent)
+                        work.append((parent, iter(self._parents.get(parent, []))))
+                        break
+                    if parent in on_stack:
+                        low[node] = min(low[node], index[parent])
+                else:
+                    work.pop()
+                    if work:
+                        child = work[-1][0]
+                        low[child] = min(low[child], low[node])
+                    if low[node] == index[node]:
+                        members: list[str] = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            members.append(member)
+                            if member == node:
+                                break
+                        components.append(members)
+        self._containment_order = components
+        return components
+
+    def is_deployed_in(self, component_id: str, service_type: str) -> bool:
+        """コンポーネントが指定サービス種別のコンポーネントの中に（推移的に）配置されているか。"""
+        return bool(self.containers(component_id, service_type))
+
+    def vcn_of(self, component_id: str) -> str | None:
+        """コンポーネントが配置されているVCNのIDを返す。
+
+        コンポーネント自身がVCNの場合はそのID。配置先のVCNが無い、または複数ある場合はNone。
+        """
+        comp = self._components.get(component_id)
+        if comp is None:
+            return None
+        if comp.service_type == "vcn":
+            return component_id
+        vcns = self.containers(component_id, "vcn")
+        return next(iter(vcns)) if len(vcns) == 1 else None
+
+    def is_reachable_from(self, component_id: str, service_type: str) -> bool:
+        """指定サービス種別のいずれかのコンポーネントから、接続をたどって到達できるか。
+
+        接続は接続元から接続先への向きにたどり、配置関係（deployed_in）は通信経路ではないため除く。
+        起点のコンポーネント自身は、接続をたどって戻ってこない限り到達済みとしない。
+        """
+        reachable = self._reachable.get(service_type)
+        if reachable is None:
+            reachable = self._reachable_from_service(service_type)
+            self._reachable[service_type] = reachable
+        return component_id in reachable
+
+    def _reachable_from_service(self, service_type: str) -> frozenset[str]:
+        """指定サービス種別の全コンポーネントを起点に幅優先探索する（接続数に比例）。"""
+        visited: set[str] = set()
+        queue: deque[str] = deque(self._by_service.get(service_type, []))
+        while queue:
+            node = queue.popleft()
+            for conn in self._outgoing.get(node, []):
+                if conn.connection_type == CONTAINMENT_CONNECTION_TYPE or conn.target_id in visited:
+                    continue
+                visited.add(conn.target_id)
+                queue.append(conn.target_id)
+        return frozenset(visited)
+
+    def degree(
+        self,
+        component_id: str,
+        *,
+        direction: str,
+        service_type: str | None = None,
+        connection_type: str | None = None,
+    ) -> int:
+        """コンポーネントの接続数を返す。
+
+        Args:
+            component_id: コンポーネントID。
+            direction: ``incoming``（接続先として）または ``outgoing``（接続元として）。
+            service_type: 指定した場合、相手側がこのサービス種別の接続のみ数える。
+            connection_type: 指定した場合、この接続種別の接続のみ数える。
+        """
+        incoming = direction == "incoming"
+        connections = (self._incoming if incoming else self._outgoing).get(component_id, [])
+        count = 0
+        for conn in connections:
+            if connection_type is not None and conn.connection_type != connection_type:
+                continue
+            if service_type is not None:
+                other = conn.source_id if incoming else conn.target_id
+                if self._components[other].service_type != service_type:
+                    continue
+            count += 1
+        return count
@@ -0,0 +1,115 @@
+"""アーキテクチャの一括編集のベンチマーク。
+
+コンポーネント数の異なるアーキテクチャについて、設定変更・削除・追加を繰り返す一括編集を、
+コンポーネントと接続のリストを毎回走査する方式（索引化前の実装相当）と、
+``Architecture`` のIDの索引を使うメソッドで比較する。
+あわせて、リストの長さに比例する削除のコストを索引による参照と並べて記録する。
+
+実行: ``pytest tests/benchmarks/test_architecture_edits.py -s``
+"""
+
+import random
+import time
+
+import pytest
+
+from galley.models.architecture import Architecture, Component, Connection
+
+pytestmark = pytest.mark.benchmark
+
+_EDIT_COUNT = 1000
+
+
+def _architecture(component_count: int) -> Architecture:
+    rng = random.Random(0)
+    components = [Component(id=f"c-{i}", service_type="compute", display_name=f"c-{i}") for i in range(component_count)]
+    connections = [
+        Connection(
+            source_id=f"c-{i}",
+            target_id=f"c-{rng.randrange(component_count)}",
+            connection_type="public",
+            description="",
+        )
+        for i in range(component_count)
+    ]
+    return Architecture(session_id="bench", components=components, connections=connections)
+
+
+def _edits(component_count: int) -> list[tuple[str, str]]:
+    """設定変更・削除・追加を順に繰り返す編集操作の列。"""
+    rng = random.Random(1)
+    ids = rng.sample(range(component_count), _EDIT_COUNT)
+    ops = ["configure", "remove", "add"]
+    return [(ops[i % 3], f"c-{ids[i]}" if i % 3 != 2 else f"new-{i}") for i in range(_EDIT_COUNT)]
+
+
+def _apply_scanning(arch: Architecture, edits: list[tuple[str, str]]) -> None:
+    for op, component_id in edits:
+        if op == "configure":
+            for component in arch.components:
+                if component.id == component_id:
+                    component.config["edited"] = True
+                    break
+        elif op == "remove":
+            arch.components = [c for c in arch.components if c.id != component_id]
+            arch.connections = [
+                c for c in arch.connections if c.source_id != component_id and c.target_id != component_id
+            ]
+        else:
+            arch.components.append(Component(id=component_id, service_type="adb", display_name=component_id))
+
+
+def _apply_indexed(arch: Architecture, edits: list[tuple[str, str]]) -> None:
+    for op, component_id in edits:
+        if op == "configure":
+            component = arch.get_component(component_id)
+            if component is not None:
+                component.config["edited"] = True
+        elif op == "remove":
+            arch.remove_component(component_id)
+        else:
+            arch.add_component(Component(id=component_id, service_type="adb", display_name=component_id))
+
+
+@pytest.mark.parametrize("component_count", [1000, 10000])
+def test_bulk_edits(component_count: int) -> None:
+    edits = _edits(component_count)
+
+    scanning = _architecture(component_count)
+    start = time.perf_counter()
+    _apply_scanning(scanning, edits)
+    scanning_ms = (time.perf_counter() - start) * 1000
+
+    indexed = _architecture(component_count)
+    start = time.perf_counter()
+    _apply_indexed(indexed, edits)
+    indexed_ms = (time.perf_counter() - start) * 1000
+
+    print(
+        f"\nbulk edits ({_EDIT_COUNT} edits, {component_count} components): "
+        f"scanning={scanning_ms:.1f}ms indexed={indexed_ms:.1f}ms"
+    )
+    assert indexed.components == scanning.components
+    assert indexed.connections == scanning.connections
+    assert indexed_ms < scanning_ms
+
+
+@pytest.mark.parametrize("component_count", [1000, 10000])
+def test_removal_cost_grows_with_list_length(component_count: int) -> None:
+    # 削除はリスト上の位置を探すため O(n)。索引による参照との差を記録する
+    arch = _architecture(component_count)
+    ids = [f"c-{i}" for i in random.Random(2).sample(range(component_count), 100)]
+    arch.get_component(ids[0])  # 索引の構築を計測から除く
+
+    start = time.perf_counter()
+    for component_id in ids:
+        arch.get_component(component_id)
+    lookup_us = (time.perf_counter() - start) * 1e6 / len(ids)
+
+    start = time.perf_counter()
+    for component_id in ids:
+        arch.remove_component(component_id)
+    remove_us = (time.perf_counter() - start) * 1e6 / len(ids)
+
+    print(f"\nper-operation cost ({component_count} components): lookup={lookup_us:.1f}us remove={remove_us:.1f}us")
+    assert len(arch.components) == component_count - len(ids)
@@ -0,0 +1,95 @@
+"""Terraform生成（export_iac）のベンチマーク。
+
+コンポーネント数の異なるアーキテクチャについて、初回の生成（全コンポーネントのレンダリングと
+全ファイルの書き出し）と、変更なしでの再生成・1コンポーネントのみ変更した再生成にかかる時間を比較する。
+2回目以降はレンダリング済みのHCLを再利用し、内容の変わらないファイルは書き込まない。
+
+あわせて、レンダリング結果へのローカル参照の置換を参照ごとの ``str.replace`` と1回の正規表現置換で比較する。
+
+実行: ``pytest tests/benchmarks/test_export_iac.py -s``
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from galley.models.architecture import Architecture, Component
+from galley.models.session import Session
+from galley.services.design import DesignService, _substitute_references
+from galley.storage.service import StorageService
+
+pytestmark = pytest.mark.benchmark
+
+_SERVICE_TYPES = ["compute", "objectstorage", "adb", "functions", "streaming"]
+
+_ITERATIONS = 2000
+
+_REFS = {
+    "var.vcn_id": "oci_core_vcn.vcn.id",
+    "var.subnet_id": "oci_core_subnet.vcn_public_subnet.id",
+    "var.node_subnet_id": "oci_core_subnet.vcn_private_subnet.id",
+    "var.gateway_id": "oci_core_internet_gateway.vcn_igw.id",
+    "var.route_table_id": "oci_core_route_table.vcn_public_rt.id",
+    "var.security_list_id": "oci_core_security_list.vcn_public_sl.id",
+    "var.service_gateway_id": "oci_core_service_gateway.vcn_sgw.id",
+}
+
+
+async def _create_session(storage: StorageService, component_count: int) -> Session:
+    session = Session(id=f"bench-{component_count}", status="completed")
+    components = [Component(service_type="vcn", display_name="vcn", config={"cidr_block": "10.0.0.0/16"})]
+    components += [
+        Component(service_type=_SERVICE_TYPES[i % len(_SERVICE_TYPES)], display_name=f"component-{i}")
+        for i in range(component_count - 1)
+    ]
+    session.architecture = Architecture(session_id=session.id, components=components)
+    await storage.save_session(session)
+    return session
+
+
+async def _export_ms(design_service: DesignService, session_id: str) -> float:
+    start = time.perf_counter()
+    await design_service.export_iac(session_id)
+    return (time.perf_counter() - start) * 1000
+
+
+@pytest.mark.parametrize("component_count", [10, 100, 1000])
+async def test_export_iac(tmp_path: Path, config_dir: Path, component_count: int) -> None:
+    storage = StorageService(tmp_path, fsync=False)
+    design_service = DesignService(storage=storage, config_dir=config_dir)
+    session = await _create_session(storage, component_count)
+
+    cold_ms = await _export_ms(design_service, session.id)
+    warm_ms = await _export_ms(design_service, session.id)
+
+    changed = session.architecture.components[1] if session.architecture else None
+    assert changed is not None
+    await design_service.configure_component(session.id, changed.id, {"display_name_suffix": "changed"})
+    incremental_ms = await _export_ms(design_service, session.id)
+
+    print(
+        f"\nexport_iac [{component_count} components]: "
+        f"cold={cold_ms:.1f}ms unchanged={warm_ms:.1f}ms one-changed={incremental_ms:.1f}ms"
+    )
+    assert warm_ms < cold_ms
+
+
+def test_substitute_references(tmp_path: Path, config_dir: Path) -> None:
+    design_service = DesignService(storage=StorageService(tmp_path), config_dir=config_dir)
+    rendered = design_service._render_component_tf(Component(service_type="oke", display_name="oke"))
+
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        replaced = rendered
+        for old_ref, new_ref in _REFS.items():
+            replaced = replaced.replace(old_ref, new_ref)
+    replace_us = (time.perf_counter() - start) / _ITERATIONS * 1_000_000
+
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        substituted = _substitute_references(rendered, _REFS)
+    regex_us = (time.perf_counter() - start) / _ITERATIONS * 1_000_000
+
+    print(f"\nreference substitution (oke, {len(_REFS)} refs): str.replace={replace_us:.1f}us regex={regex_us:.1f}us")
+    assert substituted == replaced
@@ -0,0 +1,80 @@
+"""OCI CLIコマンド実行のベンチマーク。
+
+``run_oci_cli`` の読み取り系コマンドを、コマンドごとにプロセスを起動する方式（OCI CLIと同様に
+毎回Pythonを起動してSDKを読み込む）と、プロセス内でクライアントを使い回す ``OCISDKExecutor`` で
+比較する。API呼び出し先はローカルのObject Storageフェイクサーバー。
+
+実行: ``pytest tests/benchmarks/test_oci_cli_executor.py -s``
+"""
+
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from galley.services.oci_sdk import OCISDKExecutor
+from tests.unit.storage.conftest import FakeObjectStorageServer
+
+pytestmark = pytest.mark.benchmark
+
+_ITERATIONS = 10
+
+# プロセスごとにSDKを読み込み、クライアントを生成して1回だけAPIを呼び出す（OCI CLIの1コマンド相当）
+_SUBPROCESS_SCRIPT = """
+import sys, json, oci
+
+class NoopSigner(oci.auth.signers.SecurityTokenSigner):
+    def __init__(self):
+        pass
+
+    def __call__(self, request, enforce_content_headers=True):
+        return request
+
+client = oci.object_storage.ObjectStorageClient(
+    {}, signer=NoopSigner(), service_endpoint=sys.argv[1], retry_strategy=oci.retry.NoneRetryStrategy()
+)
+response = client.list_objects("testns", "bucket")
+print(json.dumps({"data": oci.util.to_dict(response.data)}))
+"""
+
+
+@pytest.fixture
+def object_storage_server() -> Iterator[FakeObjectStorageServer]:
+    server = FakeObjectStorageServer()
+    server.start()
+    for i in range(20):
+        server.objects[f"object-{i:03d}"] = (b"x", f"etag-{i}")
+    yield server
+    server.stop()
+
+
+async def test_oci_cli_executor(object_storage_server: FakeObjectStorageServer) -> None:
+    client = object_storage_server.create_client()
+
+    def factory(client_class: type[Any], region: str | None) -> Any:
+        return client
+
+    executor = OCISDKExecutor(client_factory=factory)
+    args = ["oci", "os", "object", "list", "--bucket-name", "bucket", "--namespace", "testns"]
+
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        result = await executor.run_cli(args)
+        assert result is not None
+        assert result.success
+    sdk_ms = (time.perf_counter() - start) / _ITERATIONS * 1000
+
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        subprocess.run(
+            [sys.executable, "-c", _SUBPROCESS_SCRIPT, object_storage_server.endpoint],
+            check=True,
+            capture_output=True,
+        )
+    subprocess_ms = (time.perf_counter() - start) / _ITERATIONS * 1000
+
+    print(f"\nrun_oci_cli (os object list): subprocess={subprocess_ms:.1f}ms sdk={sdk_ms:.1f}ms per call")
+    assert sdk_ms < subprocess_ms
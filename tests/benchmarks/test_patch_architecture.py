@@ -0,0 +1,53 @@
+"""アーキテクチャの一括変更（patch_architecture）のベンチマーク。
+
+30コンポーネントの追加と設定変更を、``add_component`` / ``configure_component`` を1件ずつ呼ぶ方式
+（呼び出しごとにセッションを読み込み・保存）と、``patch_architecture`` で1回にまとめる方式で比較する。
+
+実行: ``pytest tests/benchmarks/test_patch_architecture.py -s``
+"""
+
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from galley.services.design import DesignService
+from galley.services.hearing import HearingService
+from galley.storage.service import StorageService
+
+pytestmark = pytest.mark.benchmark
+
+_COMPONENT_COUNT = 30
+
+
+async def _completed_session(storage: StorageService, config_dir: Path) -> str:
+    hearing_service = HearingService(storage=storage, config_dir=config_dir)
+    session = await hearing_service.create_session()
+    await hearing_service.save_answer(session.id, "purpose", "REST API構築")
+    await hearing_service.complete_hearing(session.id)
+    return session.id
+
+
+async def test_patch_architecture(tmp_path: Path, config_dir: Path) -> None:
+    storage = StorageService(tmp_path)
+    design_service = DesignService(storage=storage, config_dir=config_dir)
+
+    session_id = await _completed_session(storage, config_dir)
+    start = time.perf_counter()
+    for i in range(_COMPONENT_COUNT):
+        component = await design_service.add_component(session_id, "compute", f"vm-{i}")
+        await design_service.configure_component(session_id, component.id, {"ocpus": 2})
+    sequential_ms = (time.perf_counter() - start) * 1000
+
+    session_id = await _completed_session(storage, config_dir)
+    operations: list[dict[str, Any]] = []
+    for i in range(_COMPONENT_COUNT):
+        operations.append({"op": "add", "id": f"vm-{i}", "service_type": "compute", "display_name": f"vm-{i}"})
+        operations.append({"op": "configure", "component_id": f"vm-{i}", "config": {"ocpus": 2}})
+    start = time.perf_counter()
+    await design_service.patch_architecture(session_id, operations)
+    patch_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n{_COMPONENT_COUNT} components (add + configure): sequential={sequential_ms:.1f}ms patch={patch_ms:.1f}ms")
+    assert patch_ms < sequential_ms
@@ -0,0 +1,55 @@
+"""セッションキャッシュの読み込みレイテンシのベンチマーク。
+
+大規模アーキテクチャを持つセッションについて、キャッシュ無効（毎回ファイルから読み込み・復元）と
+キャッシュヒット（キャッシュ中のSessionを返す）の ``load_session`` を比較する。
+参考として、キャッシュしたSessionをdeep copyで返す方式のコピー時間も計測する。
+
+実行: ``pytest tests/benchmarks/test_session_cache.py -s``
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from galley.models.session import Answer
+from galley.storage.service import StorageService
+from tests.benchmarks.test_storage_serializers import _build_large_session
+
+pytestmark = pytest.mark.benchmark
+
+
+async def _load_ms(storage: StorageService, session_id: str, iterations: int) -> float:
+    await storage.load_session(session_id)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await storage.load_session(session_id)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+@pytest.mark.parametrize("component_count", [100, 2000])
+async def test_session_cache_load_latency(tmp_path: Path, component_count: int) -> None:
+    session = _build_large_session("bench", component_count)
+    iterations = max(20, 20000 // component_count)
+    uncached = StorageService(tmp_path / "uncached", cache_size=0, fsync=False)
+    cached = StorageService(tmp_path / "cached", fsync=False)
+    for storage in (uncached, cached):
+        await storage.save_session(session)
+        # ジャーナルの回答も適用する
+        await storage.append_answers(session.id, [Answer(question_id=f"j{i}", value=str(i)) for i in range(50)])
+
+    uncached_ms = await _load_ms(uncached, session.id, iterations)
+    cached_ms = await _load_ms(cached, session.id, iterations)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        session.model_copy(deep=True)
+    deep_copy_ms = (time.perf_counter() - start) / iterations * 1000
+
+    print(
+        f"\nload_session [{component_count} components]: uncached={uncached_ms:.2f}ms "
+        f"cached={cached_ms:.2f}ms (deep copy of cached Session: {deep_copy_ms:.2f}ms)"
+    )
+    assert cached_ms < deep_copy_ms
+    # ヒット時はファイルの読み込みに加えて解析・検証も省く
+    assert cached_ms < uncached_ms * 0.5
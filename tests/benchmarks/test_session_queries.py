@@ -0,0 +1,81 @@
+"""セッション一覧・検索のベンチマーク。
+
+ファイルシステム実装（全件読み込み）とSQLite実装（インデックス検索）で、
+「N日より前に更新された完了済みセッション」の検索と一覧のページングにかかる時間を比較する。
+
+実行: ``pytest tests/benchmarks/test_session_queries.py -s``
+"""
+
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from galley.models.session import Session
+from galley.storage.service import StorageService
+from galley.storage.sqlite import SQLiteStorageService
+
+pytestmark = pytest.mark.benchmark
+
+_ITERATIONS = 20
+
+
+def _session(index: int, now: datetime) -> Session:
+    timestamp = now - timedelta(days=index % 90)
+    return Session(
+        id=f"session-{index:06d}",
+        status="completed" if index % 3 == 0 else "in_progress",
+        created_at=timestamp,
+        updated_at=timestamp,
+    )
+
+
+async def _populate(storage: StorageService, count: int) -> None:
+    now = datetime.now(UTC)
+    for i in range(count):
+        await storage.save_session(_session(i, now))
+
+
+async def _measure(storage: StorageService) -> tuple[float, float, int]:
+    """検索と一覧ページングの平均時間（ミリ秒）と検索ヒット件数を返す。"""
+    cutoff = datetime.now(UTC) - timedelta(days=30)
+
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        found = await storage.find_sessions(status="completed", updated_before=cutoff, limit=100)
+    find_ms = (time.perf_counter() - start) / _ITERATIONS * 1000
+
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        await storage.list_sessions(limit=100, offset=500)
+    list_ms = (time.perf_counter() - start) / _ITERATIONS * 1000
+    return find_ms, list_ms, len(found)
+
+
+@pytest.mark.parametrize("session_count", [1000, 100_000])
+async def test_session_queries(tmp_path: Path, session_count: int) -> None:
+    results: dict[str, tuple[float, float, int]] = {}
+
+    sqlite_storage = SQLiteStorageService(tmp_path / "sqlite", fsync=False)
+    try:
+        await _populate(sqlite_storage, session_count)
+        sqlite_storage.invalidate_cache()
+        results["sqlite"] = await _measure(sqlite_storage)
+    finally:
+        await sqlite_storage.close()
+
+    # ファイルシステム実装は全件読み込みになるため小規模でのみ計測する
+    if session_count <= 1000:
+        file_storage = StorageService(tmp_path / "files", fsync=False, cache_size=0)
+        await _populate(file_storage, session_count)
+        results["files"] = await _measure(file_storage)
+
+    print(f"\n[{session_count} sessions]")
+    print(f"{'backend':<8} {'find (ms)':>10} {'list (ms)':>10} {'hits':>6}")
+    for name, (find_ms, list_ms, hits) in results.items():
+        print(f"{name:<8} {find_ms:>10.2f} {list_ms:>10.2f} {hits:>6}")
+
+    assert results["sqlite"][2] == 100
+    if "files" in results:
+        assert results["files"][2] == results["sqlite"][2]
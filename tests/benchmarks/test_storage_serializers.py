@@ -0,0 +1,131 @@
+"""セッション保存・読み込みレイテンシのベンチマーク。
+
+大規模アーキテクチャを持つセッションで、旧方式（インデント付きJSONの直接書き込み）と
+各シリアライザ（原子的書き込み）の保存・読み込み時間を比較する。
+
+実行: ``pytest tests/benchmarks/test_storage_serializers.py -s``
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from galley.models.architecture import Architecture, Component, Connection
+from galley.models.session import Answer, Session
+from galley.storage.serializers import get_serializer
+from galley.storage.service import StorageService
+
+pytestmark = pytest.mark.benchmark
+
+_ITERATIONS = 20
+
+
+def _build_large_session(session_id: str, component_count: int) -> Session:
+    """コンポーネント・接続・バリデーション結果を大量に持つセッションを生成する。"""
+    components = [
+        Component(
+            id=f"comp-{i}",
+            service_type="compute",
+            display_name=f"Compute {i}",
+            config={"shape": "VM.Standard.E4.Flex", "ocpus": i % 8 + 1, "tags": {"env": "bench", "index": str(i)}},
+        )
+        for i in range(component_count)
+    ]
+    connections = [
+        Connection(
+            source_id=f"comp-{i}",
+            target_id=f"comp-{i + 1}",
+            connection_type="private_endpoint",
+            description=f"Connection {i}",
+        )
+        for i in range(component_count - 1)
+    ]
+    validation_results = [
+        {
+            "severity": "warning",
+            "rule_id": "bench-rule",
+            "message": f"Message {i}",
+            "affected_components": [f"comp-{i}"],
+            "recommendation": "none",
+        }
+        for i in range(component_count)
+    ]
+    session = Session(
+        id=session_id,
+        architecture=Architecture(
+            session_id=session_id,
+            components=components,
+            connections=connections,
+            validation_results=validation_results,
+        ),
+    )
+    for i in range(30):
+        session.answers[f"q{i}"] = Answer(question_id=f"q{i}", value=f"answer {i}")
+    return session
+
+
+async def _measure(storage: StorageService, session: Session) -> tuple[float, float, int]:
+    """保存・読み込みの平均時間（ミリ秒）とファイルサイズを返す。"""
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        await storage.save_session(session)
+    save_ms = (time.perf_counter() - start) / _ITERATIONS * 1000
+
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        await storage.load_session(session.id)
+    load_ms = (time.perf_counter() - start) / _ITERATIONS * 1000
+
+    size = (storage.get_session_dir(session.id) / "session.json").stat().st_size
+    return save_ms, load_ms, size
+
+
+async def _measure_legacy(data_dir: Path, session: Session) -> tuple[float, float, int]:
+    """旧実装（indent=2でwrite_text、json.loads + model_validate）の計測。"""
+    session_file = data_dir / "legacy" / "session.json"
+    session_file.parent.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        session_file.write_text(session.model_dump_json(indent=2), encoding="utf-8")
+    save_ms = (time.perf_counter() - start) / _ITERATIONS * 1000
+
+    start = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        Session.model_validate(json.loads(session_file.read_text(encoding="utf-8")))
+    load_ms = (time.perf_counter() - start) / _ITERATIONS * 1000
+
+    return save_ms, load_ms, session_file.stat().st_size
+
+
+@pytest.mark.parametrize("component_count", [100, 1000, 5000])
+async def test_benchmark_session_serializers(tmp_data_dir: Path, component_count: int) -> None:
+    session = _build_large_session("bench", component_count)
+    rows: list[tuple[str, float, float, int]] = []
+
+    rows.append(("legacy(indent=2)", *await _measure_legacy(tmp_data_dir, session)))
+
+    for name in ("json", "orjson", "msgpack"):
+        if name != "json":
+            try:
+                __import__(name)
+            except ImportError:
+                continue
+        for fsync in (True, False):
+            storage = StorageService(
+                data_dir=tmp_data_dir / f"{name}-{fsync}",
+                serializer=get_serializer(name),
+                fsync=fsync,
+                cache_size=0,
+            )
+            save_ms, load_ms, size = await _measure(storage, session)
+            loaded = await storage.load_session(session.id)
+            assert loaded == session
+            rows.append((f"{name}(fsync={fsync})", save_ms, load_ms, size))
+
+    print(f"\n--- components={component_count} ---")
+    print(f"{'serializer':<22}{'save[ms]':>10}{'load[ms]':>10}{'size[KB]':>10}")
+    for label, save_ms, load_ms, size in rows:
+        print(f"{label:<22}{save_ms:>10.2f}{load_ms:>10.2f}{size / 1024:>10.1f}")
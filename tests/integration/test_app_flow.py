@@ -56,6 +56,8 @@ class TestAppToolsRegistration:
             assert "list_templates" in tool_names
             assert "scaffold_from_template" in tool_names
             assert "update_app_code" in tool_names
+            assert "list_snapshots" in tool_names
+            assert "restore_snapshot" in tool_names
             assert "build_and_deploy" in tool_names
             assert "check_app_status" in tool_names
 
@@ -131,6 +133,37 @@ class TestUpdateAppCodeViaMCP:
             assert data["success"] is True
             assert "snapshot_id" in data
 
+    async def test_list_and_restore_snapshot_via_mcp(self, mcp_server: object) -> None:
+        async with Client(mcp_server) as client:  # type: ignore[arg-type]
+            session_id = await _create_session_with_architecture_via_mcp(client)
+            await client.call_tool(
+                "scaffold_from_template",
+                {"session_id": session_id, "template_name": "rest-api-adb"},
+            )
+            update = parse_tool_result(
+                await client.call_tool(
+                    "update_app_code",
+                    {"session_id": session_id, "file_path": "src/routes.py", "new_content": "# Custom\n"},
+                )
+            )
+
+            listed = parse_tool_result(await client.call_tool("list_snapshots", {"session_id": session_id}))
+            assert [s["snapshot_id"] for s in listed["snapshots"]] == [update["snapshot_id"]]
+
+            restored = parse_tool_result(
+                await client.call_tool(
+                    "restore_snapshot",
+                    {"session_id": session_id, "snapshot_id": update["snapshot_id"]},
+                )
+            )
+            assert restored["success"] is True
+            assert restored["backup_snapshot_id"]
+
+            missing = parse_tool_result(
+                await client.call_tool("restore_snapshot", {"session_id": session_id, "snapshot_id": "deadbeef"})
+            )
+            assert missing["error"] == "SnapshotNotFoundError"
+
     async def test_update_protected_file_returns_error(self, mcp_server: object) -> None:
         async with Client(mcp_server) as client:  # type: ignore[arg-type]
             session_id = await _create_session_with_architecture_via_mcp(client)
@@ -174,7 +207,9 @@ class TestBuildAndDeployViaMCP:
                     "image_uri": "ghcr.io/test/app:latest",
                 },
             )
-            data = parse_tool_result(result)
+            job = parse_tool_result(result)
+            waited = parse_tool_result(await client.call_tool("wait_job", {"job_id": job["id"], "timeout_seconds": 60}))
+            data = waited["result"]
             # kubeconfig取得が失敗するが、マニフェストは生成される
             assert data["success"] is False
             assert data["k8s_manifests_dir"] is not None
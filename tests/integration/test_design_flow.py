@@ -144,6 +144,49 @@ class TestDesignFlowViaMCP:
             assert "results" in data
             assert data["error_count"] >= 1
 
+    async def test_patch_architecture_via_mcp(self, mcp_server: object) -> None:
+        async with Client(mcp_server) as client:  # type: ignore[arg-type]
+            session_id = await _create_completed_session_via_mcp(client)
+
+            result = await client.call_tool(
+                "patch_architecture",
+                {
+                    "session_id": session_id,
+                    "operations": [
+                        {"op": "add", "id": "oke-1", "service_type": "oke", "display_name": "OKE"},
+                        {"op": "add", "id": "adb-1", "service_type": "adb", "display_name": "ADB"},
+                        {
+                            "op": "connect",
+                            "source_id": "oke-1",
+                            "target_id": "adb-1",
+                            "connection_type": "public",
+                            "description": "OKE to ADB",
+                        },
+                    ],
+                    "validate": True,
+                },
+            )
+            data = parse_tool_result(result)
+            assert [r["op"] for r in data["results"]] == ["add", "add", "connect"]
+            assert "error_count" in data["validation"]
+
+            result = await client.call_tool(
+                "patch_architecture",
+                {"session_id": session_id, "operations": [{"op": "remove", "component_id": "missing"}]},
+            )
+            data = parse_tool_result(result)
+            assert data["error"] == "PatchOperationError"
+
+    async def test_empty_patch_with_validate_without_architecture_via_mcp(self, mcp_server: object) -> None:
+        async with Client(mcp_server) as client:  # type: ignore[arg-type]
+            session_id = await _create_completed_session_via_mcp(client)
+
+            result = await client.call_tool(
+                "patch_architecture", {"session_id": session_id, "operations": [], "validate": True}
+            )
+            data = parse_tool_result(result)
+            assert data == {"results": [], "validation": None}
+
     async def test_list_available_services_via_mcp(self, mcp_server: object) -> None:
         async with Client(mcp_server) as client:  # type: ignore[arg-type]
             result = await client.call_tool("list_available_services", {})
@@ -283,6 +326,7 @@ class TestDesignFlowViaMCP:
             assert "add_component" in tool_names
             assert "remove_component" in tool_names
             assert "configure_component" in tool_names
+            assert "patch_architecture" in tool_names
             assert "validate_architecture" in tool_names
             assert "list_available_services" in tool_names
             assert "export_summary" in tool_names
@@ -2,12 +2,15 @@
 
 import json
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from fastmcp import Client
 
 from galley.config import ServerConfig
 from galley.server import create_server
+from galley.services.rm_poller import RMJobPoller
+from galley.storage.service import StorageService
 
 
 @pytest.fixture
@@ -116,3 +119,23 @@ class TestHearingFlowViaMCP:
             text = result.messages[0].content.text  # type: ignore[union-attr]
             assert "session_id" in text
             assert "利用者に必ず提示" in text
+
+
+class TestServerLifespan:
+    async def test_lifespan_closes_resources_and_allows_reconnect(self, mcp_server: object) -> None:
+        with (
+            patch.object(StorageService, "close", autospec=True, side_effect=StorageService.close) as storage_close,
+            patch.object(RMJobPoller, "close", autospec=True, side_effect=RMJobPoller.close) as poller_close,
+        ):
+            async with Client(mcp_server) as client:  # type: ignore[arg-type]
+                session_id = parse_tool_result(await client.call_tool("create_session", {}))["session_id"]
+            assert storage_close.call_count == 1
+            assert poller_close.call_count == 1
+
+            # 接続ごとにlifespanが繰り返されても、停止したリソースは次の接続で使える
+            async with Client(mcp_server) as client:  # type: ignore[arg-type]
+                result = await client.call_tool(
+                    "save_answer", {"session_id": session_id, "question_id": "purpose", "value": "REST API構築"}
+                )
+                assert "error" not in parse_tool_result(result)
+            assert storage_close.call_count == 2
@@ -1,13 +1,16 @@
 """インフラフローのMCPプロトコル経由統合テスト。"""
 
+import asyncio
 import json
 from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastmcp import Client
 
 from galley.config import ServerConfig
+from galley.models.infra import TerraformResult
 from galley.server import create_server
 from galley.services.infra import InfraService
 
@@ -49,6 +52,13 @@ async def _create_session_with_architecture_via_mcp(client: Client) -> str:  # t
     return session_id
 
 
+async def _wait_job_result(client: Client, job_id: str) -> dict:  # type: ignore[type-arg]
+    """ジョブの完了を待ち、結果を返す。"""
+    job = parse_tool_result(await client.call_tool("wait_job", {"job_id": job_id, "timeout_seconds": 10}))
+    assert job["status"] in ("succeeded", "failed")
+    return job["result"]  # type: ignore[no-any-return]
+
+
 class TestInfraToolsRegistration:
     async def test_infra_tools_are_registered(self, mcp_server: object) -> None:
         """インフラ系ツールがMCPサーバーに登録されている。"""
@@ -59,8 +69,15 @@ class TestInfraToolsRegistration:
             assert "run_terraform_apply" in tool_names
             assert "run_terraform_destroy" in tool_names
             assert "run_oci_cli" in tool_names
+            assert "get_oci_cli_cache_stats" in tool_names
+            assert "get_plan_cache_stats" in tool_names
+            assert "run_oci_cli_batch" in tool_names
             assert "get_rm_job_status" in tool_names
             assert "update_terraform_file" in tool_names
+            assert "get_job" in tool_names
+            assert "wait_job" in tool_names
+            assert "cancel_job" in tool_names
+            assert "list_jobs" in tool_names
             # 削除されたツールが存在しないこと
             assert "oci_sdk_call" not in tool_names
             assert "create_rm_stack" not in tool_names
@@ -88,16 +105,48 @@ class TestTerraformToolsViaMCP:
                 patch.object(InfraService, "_ensure_rm_stack", new_callable=AsyncMock, return_value="ocid1.stack"),
                 patch.object(InfraService, "_run_rm_job", new_callable=AsyncMock, return_value=plan_result),
             ):
-                result = await client.call_tool(
-                    "run_terraform_plan",
-                    {"session_id": session_id, "terraform_dir": "/tmp/tf"},
+                job = parse_tool_result(
+                    await client.call_tool(
+                        "run_terraform_plan",
+                        {"session_id": session_id, "terraform_dir": "/tmp/tf"},
+                    )
                 )
+                assert job["status"] in ("queued", "running")
+                data = await _wait_job_result(client, job["id"])
 
-            data = parse_tool_result(result)
             assert data["success"] is True
             assert data["command"] == "plan"
             assert data["plan_summary"] is not None
 
+    async def test_plan_cache_stats_via_mcp(self, mcp_server: object) -> None:
+        async with Client(mcp_server) as client:  # type: ignore[arg-type]
+            session_id = await _create_session_with_architecture_via_mcp(client)
+            plan_result = TerraformResult(success=True, command="plan", stdout="", stderr="", exit_code=0)
+
+            async def ensure_rm_stack(self: InfraService, session_id: str, *args: Any) -> str:
+                # スタック構成のハッシュを記録し、plan結果をキャッシュできる状態にする
+                session = await self._storage.load_session(session_id)
+                session.rm_stack_hash = "stack-hash"
+                await self._storage.save_session(session)
+                return "ocid1.stack"
+
+            with (
+                patch.object(InfraService, "_ensure_rm_stack", autospec=True, side_effect=ensure_rm_stack),
+                patch.object(InfraService, "_run_rm_job", new_callable=AsyncMock, return_value=plan_result) as run,
+            ):
+                for _ in range(2):
+                    job = parse_tool_result(
+                        await client.call_tool(
+                            "run_terraform_plan", {"session_id": session_id, "terraform_dir": "/tmp/tf"}
+                        )
+                    )
+                    await _wait_job_result(client, job["id"])
+
+            stats = parse_tool_result(await client.call_tool("get_plan_cache_stats", {}))
+
+        assert run.call_count == 1
+        assert stats == {"hits": 1, "misses": 1, "entries": 1}
+
     async def test_terraform_apply_via_mcp(self, mcp_server: object) -> None:
         async with Client(mcp_server) as client:  # type: ignore[arg-type]
             session_id = await _create_session_with_architecture_via_mcp(client)
@@ -112,12 +161,15 @@ class TestTerraformToolsViaMCP:
                 patch.object(InfraService, "_ensure_rm_stack", new_callable=AsyncMock, return_value="ocid1.stack"),
                 patch.object(InfraService, "_run_rm_job", new_callable=AsyncMock, return_value=apply_result),
             ):
-                result = await client.call_tool(
-                    "run_terraform_apply",
-                    {"session_id": session_id, "terraform_dir": "/tmp/tf"},
+                job = parse_tool_result(
+                    await client.call_tool(
+                        "run_terraform_apply",
+                        {"session_id": session_id, "terraform_dir": "/tmp/tf"},
+                    )
                 )
+                assert job["status"] in ("queued", "running")
+                data = await _wait_job_result(client, job["id"])
 
-            data = parse_tool_result(result)
             assert data["success"] is True
             assert data["command"] == "apply"
 
@@ -135,12 +187,15 @@ class TestTerraformToolsViaMCP:
                 patch.object(InfraService, "_ensure_rm_stack", new_callable=AsyncMock, return_value="ocid1.stack"),
                 patch.object(InfraService, "_run_rm_job", new_callable=AsyncMock, return_value=destroy_result),
             ):
-                result = await client.call_tool(
-                    "run_terraform_destroy",
-                    {"session_id": session_id, "terraform_dir": "/tmp/tf"},
+                job = parse_tool_result(
+                    await client.call_tool(
+                        "run_terraform_destroy",
+                        {"session_id": session_id, "terraform_dir": "/tmp/tf"},
+                    )
                 )
+                assert job["status"] in ("queued", "running")
+                data = await _wait_job_result(client, job["id"])
 
-            data = parse_tool_result(result)
             assert data["success"] is True
             assert data["command"] == "destroy"
 
@@ -163,12 +218,15 @@ class TestTerraformToolsViaMCP:
                 patch.object(InfraService, "_ensure_rm_stack", new_callable=AsyncMock, return_value="ocid1.stack"),
                 patch.object(InfraService, "_run_rm_job", new_callable=AsyncMock, return_value=error_result),
             ):
-                result = await client.call_tool(
-                    "run_terraform_plan",
-                    {"session_id": session_id, "terraform_dir": "/tmp/tf"},
+                job = parse_tool_result(
+                    await client.call_tool(
+                        "run_terraform_plan",
+                        {"session_id": session_id, "terraform_dir": "/tmp/tf"},
+                    )
                 )
+                assert job["status"] in ("queued", "running")
+                data = await _wait_job_result(client, job["id"])
 
-            data = parse_tool_result(result)
             assert data["success"] is False
             assert data["exit_code"] == 1
 
@@ -199,6 +257,37 @@ class TestOciCliViaMCP:
             data = parse_tool_result(result)
             assert data["success"] is True
 
+    async def test_run_oci_cli_cache_stats_via_mcp(self, mcp_server: object) -> None:
+        async with Client(mcp_server) as client:  # type: ignore[arg-type]
+            with patch.object(InfraService, "_run_subprocess", new_callable=AsyncMock) as mock_proc:
+                mock_proc.return_value = (0, '{"data": []}', "")
+                command = {"command": "oci iam availability-domain list"}
+                await client.call_tool("run_oci_cli", command)
+                second = parse_tool_result(await client.call_tool("run_oci_cli", command))
+                forced = parse_tool_result(await client.call_tool("run_oci_cli", {**command, "force": True}))
+
+            stats = parse_tool_result(await client.call_tool("get_oci_cli_cache_stats", {}))
+
+        assert second["cached"] is True
+        assert forced["cached"] is False
+        assert mock_proc.call_count == 2
+        assert stats["hits"] == 1
+        assert stats["bypasses"] == 1
+        assert stats["entries"] == 1
+
+    async def test_run_oci_cli_batch_via_mcp(self, mcp_server: object) -> None:
+        async with Client(mcp_server) as client:  # type: ignore[arg-type]
+            with patch.object(InfraService, "_run_subprocess", new_callable=AsyncMock) as mock_proc:
+                mock_proc.return_value = (0, '{"data": []}', "")
+                result = await client.call_tool(
+                    "run_oci_cli_batch",
+                    {"commands": ["oci iam region list", "oci setup config"]},
+                )
+
+            data = parse_tool_result(result)
+            assert data["results"][0]["result"]["success"] is True
+            assert data["results"][1]["error"] == "CommandNotAllowedError"
+
     async def test_run_oci_cli_disallowed_command(self, mcp_server: object) -> None:
         async with Client(mcp_server) as client:  # type: ignore[arg-type]
             result = await client.call_tool(
@@ -235,3 +324,90 @@ class TestInfraPromptsRegistration:
             text = result.messages[0].content.text  # type: ignore[union-attr]
             assert "test-session-456" in text
             assert "run_terraform_destroy" in text
+
+
+class TestJobToolsViaMCP:
+    async def test_cancel_running_job(self, mcp_server: object) -> None:
+        """実行中のジョブをキャンセルできる。"""
+        async with Client(mcp_server) as client:  # type: ignore[arg-type]
+            session_id = await _create_session_with_architecture_via_mcp(client)
+            started = asyncio.Event()
+
+            async def slow_job(*args: object, **kwargs: object) -> None:
+                started.set()
+                await asyncio.sleep(60)
+
+            with (
+                patch.object(InfraService, "_ensure_rm_stack", new_callable=AsyncMock, return_value="ocid1.stack"),
+                patch.object(InfraService, "_run_rm_job", side_effect=slow_job),
+            ):
+                job = parse_tool_result(
+                    await client.call_tool(
+                        "run_terraform_apply", {"session_id": session_id, "terraform_dir": "/tmp/tf"}
+                    )
+                )
+                await asyncio.wait_for(started.wait(), 5)
+
+                # 実行中は同じセッションに別の操作を投入できない
+                conflict = parse_tool_result(
+                    await client.call_tool("run_terraform_plan", {"session_id": session_id, "terraform_dir": "/tmp/tf"})
+                )
+                assert conflict["error"] == "InfraOperationInProgressError"
+
+                running = parse_tool_result(await client.call_tool("get_job", {"job_id": job["id"]}))
+                assert running["status"] == "running"
+
+                canceled = parse_tool_result(await client.call_tool("cancel_job", {"job_id": job["id"]}))
+                assert canceled["status"] == "canceled"
+
+            listed = parse_tool_result(await client.call_tool("list_jobs", {"session_id": session_id}))
+            assert [j["id"] for j in listed["jobs"]] == [job["id"]]
+
+    async def test_wait_job_streams_progress(self, mcp_server: object) -> None:
+        """wait_jobの待機中にRMジョブのログが進捗通知として届く。"""
+        async with Client(mcp_server) as client:  # type: ignore[arg-type]
+            session_id = await _create_session_with_architecture_via_mcp(client)
+            release = asyncio.Event()
+
+            async def streaming_job(*args: object, on_log: Any = None, **kwargs: object) -> TerraformResult:
+                await on_log(["Initializing provider plugins..."])
+                await release.wait()
+                await on_log(["Apply complete! Resources: 1 added, 0 changed, 0 destroyed."])
+                return TerraformResult(success=True, command="apply", stdout="", stderr="", exit_code=0)
+
+            notifications: list[tuple[float, str | None]] = []
+
+            async def on_progress(progress: float, total: float | None, message: str | None) -> None:
+                notifications.append((progress, message))
+
+            with (
+                patch.object(InfraService, "_ensure_rm_stack", new_callable=AsyncMock, return_value="ocid1.stack"),
+                patch.object(InfraService, "_run_rm_job", side_effect=streaming_job),
+            ):
+                job = parse_tool_result(
+                    await client.call_tool(
+                        "run_terraform_apply", {"session_id": session_id, "terraform_dir": "/tmp/tf"}
+                    )
+                )
+                # 待機開始前のログは通知されず、get_jobの進捗で確認できる
+                running = parse_tool_result(await client.call_tool("get_job", {"job_id": job["id"]}))
+                while running["progress_lines"] == 0:
+                    await asyncio.sleep(0.01)
+                    running = parse_tool_result(await client.call_tool("get_job", {"job_id": job["id"]}))
+                assert running["progress_message"] == "Initializing provider plugins..."
+
+                asyncio.get_running_loop().call_later(0.1, release.set)
+                waited = parse_tool_result(
+                    await client.call_tool(
+                        "wait_job", {"job_id": job["id"], "timeout_seconds": 10}, progress_handler=on_progress
+                    )
+                )
+
+            assert waited["status"] == "succeeded"
+            assert waited["progress_message"] == "Apply complete! Resources: 1 added, 0 changed, 0 destroyed."
+            assert notifications == [(2, "Apply complete! Resources: 1 added, 0 changed, 0 destroyed.")]
+
+    async def test_get_unknown_job(self, mcp_server: object) -> None:
+        async with Client(mcp_server) as client:  # type: ignore[arg-type]
+            result = parse_tool_result(await client.call_tool("get_job", {"job_id": "nonexistent"}))
+            assert result["error"] == "JobNotFoundError"
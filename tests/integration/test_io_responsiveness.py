@@ -0,0 +1,120 @@
+"""重いファイルI/O中のサーバー応答性の統合テスト。"""
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from galley.config import ServerConfig
+from galley.server import create_server
+from galley.services.app import AppService
+
+# テンプレートコピーを遅くする時間（秒）
+_SLOW_IO_SECONDS = 1.5
+# 軽い処理に許容する応答時間（秒）
+_MAX_LIGHT_LATENCY = 0.5
+
+
+@pytest.fixture
+def mcp_server(tmp_path: Path) -> FastMCP:
+    """テスト用MCPサーバー。"""
+    config = ServerConfig(data_dir=tmp_path / "galley-test", config_dir=Path(__file__).parent.parent.parent / "config")
+    return create_server(config)
+
+
+def parse_tool_result(result: object) -> dict:
+    """CallToolResultからJSONデータを抽出する。"""
+    content = result.content  # type: ignore[union-attr]
+    assert len(content) > 0
+    return json.loads(content[0].text)  # type: ignore[union-attr]
+
+
+async def _get_status(app: Any, path: str) -> int:
+    """ASGIアプリにGETリクエストを送り、ステータスコードを返す。"""
+    messages: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    return int(messages[0]["status"])
+
+
+async def _create_session_with_architecture(client: Client) -> str:  # type: ignore[type-arg]
+    result = await client.call_tool("create_session", {})
+    session_id: str = parse_tool_result(result)["session_id"]
+    await client.call_tool("save_answer", {"session_id": session_id, "question_id": "purpose", "value": "REST API"})
+    await client.call_tool("complete_hearing", {"session_id": session_id})
+    await client.call_tool(
+        "save_architecture",
+        {
+            "session_id": session_id,
+            "components": [{"service_type": "oke", "display_name": "OKE"}],
+            "connections": [],
+        },
+    )
+    return session_id
+
+
+class TestResponsivenessDuringHeavyIO:
+    async def test_health_and_light_tools_respond_while_scaffolding(self, mcp_server: FastMCP) -> None:
+        """テンプレートコピー中もヘルスチェックと軽いツールが待たされない。"""
+        started = threading.Event()
+        original = AppService._copy_template
+
+        def slow_copy_template(*args: Any, **kwargs: Any) -> list[str]:
+            started.set()
+            time.sleep(_SLOW_IO_SECONDS)
+            return original(*args, **kwargs)
+
+        http_app = mcp_server.http_app()
+        async with Client(mcp_server) as client:
+            session_id = await _create_session_with_architecture(client)
+            with patch.object(AppService, "_copy_template", staticmethod(slow_copy_template)):
+                scaffold = asyncio.create_task(
+                    client.call_tool(
+                        "scaffold_from_template",
+                        {"session_id": session_id, "template_name": "rest-api-adb"},
+                    )
+                )
+                while not started.is_set():
+                    await asyncio.sleep(0.01)
+
+                begin = time.perf_counter()
+                assert await _get_status(http_app, "/health") == 200
+                health_latency = time.perf_counter() - begin
+
+                begin = time.perf_counter()
+                result = await client.call_tool("create_session", {})
+                tool_latency = time.perf_counter() - begin
+                assert "session_id" in parse_tool_result(result)
+
+                assert not scaffold.done()
+                data = parse_tool_result(await scaffold)
+
+        assert data["template_name"] == "rest-api-adb"
+        assert health_latency < _MAX_LIGHT_LATENCY
+        assert tool_latency < _MAX_LIGHT_LATENCY
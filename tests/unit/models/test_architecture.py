@@ -1,5 +1,9 @@
 """Architectureモデルのユニットテスト。"""
 
+import random
+
+import pytest
+
 from galley.models.architecture import Architecture, Component, Connection
 
 
@@ -54,6 +58,29 @@ class TestArchitecture:
         assert arch.created_at is not None
         assert arch.updated_at is not None
 
+    def test_mark_dirty_records_each_component_once(self) -> None:
+        arch = Architecture(session_id="test-session", validation_results=[])
+        arch.mark_dirty("a", "b")
+        arch.mark_dirty("b", "c")
+        assert arch.dirty_component_ids == ["a", "b", "c"]
+
+        arch.dirty_component_ids = []
+        arch.mark_dirty("a")
+        assert arch.dirty_component_ids == ["a"]
+
+    def test_mark_dirty_after_deserialization(self) -> None:
+        arch = Architecture(session_id="test-session", validation_results=[], dirty_component_ids=["a"])
+        restored = Architecture.model_validate_json(arch.model_dump_json())
+
+        restored.mark_dirty("a", "b")
+
+        assert restored.dirty_component_ids == ["a", "b"]
+
+    def test_mark_dirty_skipped_without_validation_results(self) -> None:
+        arch = Architecture(session_id="test-session")
+        arch.mark_dirty("a", "b")
+        assert arch.dirty_component_ids == []
+
     def test_architecture_with_components(self) -> None:
         comp = Component(service_type="oke", display_name="OKE")
         arch = Architecture(session_id="test-session", components=[comp])
@@ -74,3 +101,174 @@ class TestArchitecture:
         assert restored.session_id == "s1"
         assert len(restored.components) == 1
         assert len(restored.connections) == 1
+
+
+def _indexed_architecture() -> Architecture:
+    components = [Component(id=cid, service_type="compute", display_name=cid) for cid in ("a", "b", "c")]
+    connections = [
+        Connection(source_id="a", target_id="b", connection_type="public", description=""),
+        Connection(source_id="b", target_id="c", connection_type="public", description=""),
+        Connection(source_id="c", target_id="a", connection_type="public", description=""),
+    ]
+    return Architecture(session_id="s1", components=components, connections=connections)
+
+
+class TestArchitectureIndex:
+    def test_get_component_and_connections(self) -> None:
+        arch = _indexed_architecture()
+
+        assert arch.get_component("b") is arch.components[1]
+        assert arch.get_component("missing") is None
+        assert arch.outgoing_connections("a") == [arch.connections[0]]
+        assert arch.incoming_connections("a") == [arch.connections[2]]
+
+    def test_add_and_remove_component_keep_index_consistent(self) -> None:
+        arch = _indexed_architecture()
+        arch.get_component("a")
+
+        arch.add_component(Component(id="d", service_type="adb", display_name="d"))
+        removed = arch.remove_component("b")
+
+        assert [c.id for c in arch.components] == ["a", "c", "d"]
+        assert removed is not None
+        assert [(c.source_id, c.target_id) for c in removed] == [("b", "c"), ("a", "b")]
+        assert [(c.source_id, c.target_id) for c in arch.connections] == [("c", "a")]
+        assert arch.get_component("b") is None
+        assert arch.get_component("d") is arch.components[2]
+        assert arch.outgoing_connections("a") == []
+        assert arch.incoming_connections("c") == []
+
+    def test_remove_missing_component_returns_none(self) -> None:
+        arch = _indexed_architecture()
+
+        assert arch.remove_component("missing") is None
+        assert len(arch.components) == 3
+
+    def test_self_connection_is_removed_once(self) -> None:
+        arch = _indexed_architecture()
+        arch.add_connection(Connection(source_id="a", target_id="a", connection_type="public", description=""))
+
+        removed = arch.remove_component("a")
+
+        assert removed is not None
+        assert len(removed) == 3
+        assert [(c.source_id, c.target_id) for c in arch.connections] == [("b", "c")]
+
+    def test_add_and_remove_connection(self) -> None:
+        arch = _indexed_architecture()
+        conn = Connection(source_id="a", target_id="c", connection_type="private_endpoint", description="")
+
+        arch.add_connection(conn)
+        assert arch.outgoing_connections("a")[-1] is conn
+        assert arch.incoming_connections("c")[-1] is conn
+
+        arch.remove_connection(conn)
+        assert conn not in arch.outgoing_connections("a")
+        assert len(arch.connections) == 3
+
+    def test_index_rebuilds_after_direct_list_changes(self) -> None:
+        arch = _indexed_architecture()
+        arch.get_component("a")
+
+        arch.components = [Component(id="x", service_type="vcn", display_name="x")]
+        assert arch.get_component("a") is None
+        assert arch.get_component("x") is not None
+
+        arch.connections.append(Connection(source_id="x", target_id="x", connection_type="public", description=""))
+        assert len(arch.outgoing_connections("x")) == 1
+
+    def test_remove_after_in_place_replacement_does_not_delete_other_component(self) -> None:
+        arch = _indexed_architecture()
+        arch.get_component("a")
+
+        arch.components[0] = Component(id="x", service_type="vcn", display_name="x")
+
+        assert arch.remove_component("a") is None
+        assert [c.id for c in arch.components] == ["x", "b", "c"]
+        assert arch.get_component("x") is arch.components[0]
+        assert arch.remove_component("x") is not None
+        assert [c.id for c in arch.components] == ["b", "c"]
+
+    def test_connections_after_in_place_replacement(self) -> None:
+        arch = _indexed_architecture()
+        arch.outgoing_connections("a")
+
+        replacement = Connection(source_id="c", target_id="b", connection_type="public", description="")
+        arch.connections[0] = replacement
+
+        assert arch.outgoing_connections("a") == []
+        assert arch.incoming_connections("b") == [replacement]
+        assert [id(c) for c in arch.outgoing_connections("c")] == [id(replacement), id(arch.connections[2])]
+
+    def test_connections_after_append_and_remove(self) -> None:
+        arch = _indexed_architecture()
+        arch.incoming_connections("b")
+
+        added = Connection(source_id="c", target_id="b", connection_type="public", description="")
+        arch.connections.append(added)
+        del arch.connections[0]
+
+        assert arch.incoming_connections("b") == [added]
+        assert arch.outgoing_connections("a") == []
+
+    def test_get_component_after_id_change(self) -> None:
+        arch = _indexed_architecture()
+        arch.get_component("a")
+
+        arch.components[0].id = "renamed"
+
+        assert arch.get_component("a") is None
+        assert arch.get_component("renamed") is arch.components[0]
+
+    def test_index_is_not_serialized_or_copied(self) -> None:
+        arch = _indexed_architecture()
+        arch.get_component("a")
+
+        assert "_index" not in arch.model_dump()
+        copied = arch.model_copy(deep=True)
+        assert copied._index is None
+        assert copied.get_component("a") is copied.components[0]
+        assert copied.get_component("a") is not arch.components[0]
+
+    def test_list_changes_are_tracked_after_copy_and_deserialization(self) -> None:
+        arch = _indexed_architecture()
+        for restored in (arch.model_copy(deep=True), Architecture.model_validate_json(arch.model_dump_json())):
+            restored.get_component("a")
+            restored.components[0] = Component(id="x", service_type="vcn", display_name="x")
+            assert restored.get_component("x") is restored.components[0]
+
+    def test_random_edits_match_list_operations(self) -> None:
+        rng = random.Random(0)
+        arch = Architecture(session_id="s1")
+        expected_components: list[Component] = []
+        expected_connections: list[Connection] = []
+        for step in range(600):
+            op = rng.random()
+            if op < 0.4 or not expected_components:
+                comp = Component(id=f"c-{step}", service_type="compute", display_name=f"c-{step}")
+                arch.add_component(comp)
+                expected_components.append(comp)
+            elif op < 0.7:
+                source, target = rng.choice(expected_components), rng.choice(expected_components)
+                conn = Connection(source_id=source.id, target_id=target.id, connection_type="public", description="")
+                arch.add_connection(conn)
+                expected_connections.append(conn)
+            elif op < 0.85 and expected_connections:
+                conn = rng.choice(expected_connections)
+                arch.remove_connection(conn)
+                expected_connections = [c for c in expected_connections if c is not conn]
+            else:
+                comp = rng.choice(expected_components)
+                arch.remove_component(comp.id)
+                expected_components = [c for c in expected_components if c is not comp]
+                expected_connections = [c for c in expected_connections if comp.id not in (c.source_id, c.target_id)]
+            assert [id(c) for c in arch.components] == [id(c) for c in expected_components]
+            assert [id(c) for c in arch.connections] == [id(c) for c in expected_connections]
+
+    def test_remove_unknown_connection_raises(self) -> None:
+        arch = _indexed_architecture()
+        conn = Connection(source_id="a", target_id="b", connection_type="public", description="")
+
+        with pytest.raises(ValueError):
+            arch.remove_connection(conn)
+        assert len(arch.connections) == 3
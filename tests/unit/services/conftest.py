@@ -0,0 +1,136 @@
+"""サービス層テスト用フィクスチャ。"""
+
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from galley.services.infra import InfraService
+from galley.storage.service import StorageService
+from galley.storage.sqlite import SQLiteStorageService
+
+
+@pytest.fixture(params=["local", "sqlite"])
+async def backend_storage(request: pytest.FixtureRequest, tmp_data_dir: Path) -> AsyncIterator[StorageService]:
+    """各ストレージバックエンドのStorageService（SQLiteはI/Oでイベントループに制御を返す）。"""
+    if request.param == "sqlite":
+        sqlite_storage = SQLiteStorageService(tmp_data_dir, fsync=False, journal_max_bytes=2048)
+        yield sqlite_storage
+        await sqlite_storage.close()
+    else:
+        yield StorageService(tmp_data_dir, fsync=False, journal_max_bytes=2048)
+
+
+class FakeResourceManagerClient:
+    """ジョブ状態をメモリ上で管理するResource Managerクライアントのフェイク。
+
+    各ジョブは状態確認（get_jobまたはlist_jobsへの出現）が ``polls_to_finish`` 回行われると
+    ``final_state`` で終了する。``polls_to_finish`` がNoneの場合は ``finish()`` を呼ぶまで終了しない。
+    ログは ``emit()`` で実行中に追加でき、``get_job_logs`` は ``log_page_size`` 件ずつページングして返す。
+    """
+
+    def __init__(
+        self,
+        *,
+        final_state: str = "SUCCEEDED",
+        logs: str = "",
+        polls_to_finish: int | None = 1,
+        compartment_id: str = "ocid1.compartment.test",
+        log_page_size: int = 100,
+    ) -> None:
+        self.final_state = final_state
+        self.logs = logs
+        self.polls_to_finish = polls_to_finish
+        self.compartment_id = compartment_id
+        self.jobs: dict[str, dict[str, Any]] = {}
+        self.log_entries: dict[str, list[SimpleNamespace]] = {}
+        self.log_page_size = log_page_size
+        self.calls: Counter[str] = Counter()
+        self._polls: Counter[str] = Counter()
+
+    def _observe(self, job_id: str) -> SimpleNamespace:
+        self._polls[job_id] += 1
+        job = self.jobs[job_id]
+        if (
+            job["lifecycle_state"] not in ("SUCCEEDED", "FAILED", "CANCELED")
+            and self.polls_to_finish is not None
+            and self._polls[job_id] >= self.polls_to_finish
+        ):
+            self.finish(job_id, self.final_state, self.logs)
+        return SimpleNamespace(**job)
+
+    def finish(self, job_id: str, state: str = "SUCCEEDED", logs: str = "") -> None:
+        """ジョブを終了状態にする。"""
+        self.emit(job_id, *logs.splitlines())
+        self.jobs[job_id].update(lifecycle_state=state, time_finished=datetime.now(UTC))
+
+    def emit(self, job_id: str, *messages: str) -> None:
+        """ジョブのログを追加する（同じ呼び出しのログは同じタイムスタンプになる）。"""
+        timestamp = datetime.now(UTC)
+        entries = self.log_entries.setdefault(job_id, [])
+        entries.extend(SimpleNamespace(timestamp=timestamp, message=message) for message in messages)
+
+    def create_job(self, details: Any) -> SimpleNamespace:
+        self.calls["create_job"] += 1
+        job_id = f"ocid1.ormjob.test{len(self.jobs) + 1}"
+        self.jobs[job_id] = {
+            "id": job_id,
+            "stack_id": details.stack_id,
+            "compartment_id": self.compartment_id,
+            "operation": details.job_operation_details.operation,
+            "lifecycle_state": "ACCEPTED",
+            "time_finished": None,
+        }
+        return SimpleNamespace(data=SimpleNamespace(**self.jobs[job_id]))
+
+    def get_job(self, job_id: str) -> SimpleNamespace:
+        self.calls["get_job"] += 1
+        return SimpleNamespace(data=self._observe(job_id))
+
+    def list_jobs(self, compartment_id: str, **kwargs: Any) -> SimpleNamespace:
+        self.calls["list_jobs"] += 1
+        job_ids = [job_id for job_id, job in self.jobs.items() if job["compartment_id"] == compartment_id]
+        limit = kwargs.get("limit") or len(job_ids)
+        return SimpleNamespace(data=[self._observe(job_id) for job_id in reversed(job_ids)][:limit])
+
+    def cancel_job(self, job_id: str) -> SimpleNamespace:
+        self.calls["cancel_job"] += 1
+        self.finish(job_id, "CANCELED")
+        return SimpleNamespace(data=None)
+
+    def get_job_logs(self, job_id: str, **kwargs: Any) -> SimpleNamespace:
+        self.calls["get_job_logs"] += 1
+        since = kwargs.get("timestamp_greater_than_or_equal_to")
+        entries = [e for e in self.log_entries.get(job_id, []) if since is None or e.timestamp >= since]
+        start = int(kwargs.get("page") or 0)
+        end = start + min(kwargs.get("limit") or self.log_page_size, self.log_page_size)
+        has_next_page = end < len(entries)
+        return SimpleNamespace(
+            data=entries[start:end], has_next_page=has_next_page, next_page=str(end) if has_next_page else None
+        )
+
+    def get_job_logs_content(self, job_id: str) -> SimpleNamespace:
+        self.calls["get_job_logs_content"] += 1
+        text = "\n".join(e.message for e in self.log_entries.get(job_id, []))
+        return SimpleNamespace(data=SimpleNamespace(text=text))
+
+
+@pytest.fixture
+def fake_rm_client() -> FakeResourceManagerClient:
+    """Resource Managerクライアントのフェイク。"""
+    return FakeResourceManagerClient()
+
+
+@pytest.fixture
+def fast_infra_service(
+    storage: StorageService, config_dir: Path, fake_rm_client: FakeResourceManagerClient
+) -> Iterator[InfraService]:
+    """フェイクのRMクライアントと短いポーリング間隔を使うInfraService。"""
+    service = InfraService(storage=storage, config_dir=config_dir, poll_initial_interval=0.01, poll_max_interval=0.05)
+    with patch.object(service, "_get_rm_client", return_value=fake_rm_client):
+        yield service
@@ -2,7 +2,7 @@
 
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -11,6 +11,8 @@ from galley.models.errors import (
     AppNotScaffoldedError,
     ArchitectureNotFoundError,
     ProtectedFileError,
+    SessionNotFoundError,
+    SnapshotNotFoundError,
     TemplateNotFoundError,
 )
 from galley.services.app import AppService
@@ -136,8 +138,9 @@ class TestUpdateAppCode:
 
         snapshot_id = result["snapshot_id"]
         snapshots_dir = app_service._snapshots_dir(session_id)
-        snapshot_dir = snapshots_dir / str(snapshot_id)
-        assert snapshot_dir.exists()
+        assert (snapshots_dir / f"{snapshot_id}.json").exists()
+        snapshots = await app_service.list_snapshots(session_id)
+        assert [s.snapshot_id for s in snapshots] == [snapshot_id]
 
     async def test_update_rejects_protected_file(
         self, hearing_service: HearingService, app_service: AppService
@@ -182,6 +185,51 @@ class TestUpdateAppCode:
             await app_service.update_app_code(session_id, "/etc/passwd", "evil")
 
 
+class TestSnapshots:
+    async def test_restore_snapshot_reverts_changes(
+        self, hearing_service: HearingService, app_service: AppService
+    ) -> None:
+        session_id = await _create_session_with_architecture(hearing_service)
+        await app_service.scaffold_from_template(session_id, "rest-api-adb", {})
+        routes = app_service._app_dir(session_id) / "src" / "routes.py"
+        original = routes.read_text(encoding="utf-8")
+
+        first = await app_service.update_app_code(session_id, "src/routes.py", "# v1\n")
+        await app_service.update_app_code(session_id, "src/routes.py", "# v2\n")
+
+        result = await app_service.restore_snapshot(session_id, str(first["snapshot_id"]))
+
+        assert result["success"] is True
+        assert routes.read_text(encoding="utf-8") == original
+        # 復元前の状態も保存され、そこから元に戻せる
+        await app_service.restore_snapshot(session_id, str(result["backup_snapshot_id"]))
+        assert routes.read_text(encoding="utf-8") == "# v2\n"
+
+    async def test_list_snapshots_newest_first(self, hearing_service: HearingService, app_service: AppService) -> None:
+        session_id = await _create_session_with_architecture(hearing_service)
+        await app_service.scaffold_from_template(session_id, "rest-api-adb", {})
+        ids = [
+            (await app_service.update_app_code(session_id, "src/routes.py", f"# v{i}\n"))["snapshot_id"]
+            for i in range(3)
+        ]
+
+        snapshots = await app_service.list_snapshots(session_id)
+
+        assert [s.snapshot_id for s in snapshots] == ids[::-1]
+        assert all(s.file_count > 0 for s in snapshots)
+
+    async def test_restore_unknown_snapshot(self, hearing_service: HearingService, app_service: AppService) -> None:
+        session_id = await _create_session_with_architecture(hearing_service)
+        await app_service.scaffold_from_template(session_id, "rest-api-adb", {})
+
+        with pytest.raises(SnapshotNotFoundError):
+            await app_service.restore_snapshot(session_id, "deadbeef")
+
+    async def test_list_snapshots_session_not_found(self, app_service: AppService) -> None:
+        with pytest.raises(SessionNotFoundError):
+            await app_service.list_snapshots("nonexistent")
+
+
 class TestGenerateK8sManifests:
     async def test_generates_deployment_and_service(
         self, hearing_service: HearingService, app_service: AppService
@@ -477,3 +525,51 @@ class TestBuildAndPushImage:
 
         assert result.success is False
         assert "build" in (result.reason or "").lower()
+
+    async def test_build_uses_sdk_executor_when_available(
+        self,
+        hearing_service: HearingService,
+        app_service_with_config: AppService,
+    ) -> None:
+        session_id = await _create_session_with_architecture(hearing_service)
+        await app_service_with_config.scaffold_from_template(session_id, "rest-api-adb", {})
+        sdk = MagicMock(available=True)
+        sdk.put_object = AsyncMock()
+        sdk.create_instance_agent_command = AsyncMock(return_value="ocid1.command.oc1..test")
+        sdk.get_instance_agent_command_execution = AsyncMock(return_value=("SUCCEEDED", 0, "BUILD_SUCCESS"))
+        app_service_with_config._oci_sdk = sdk
+
+        with (
+            patch.object(app_service_with_config, "_run_subprocess", new_callable=AsyncMock) as mock_proc,
+            patch.dict("os.environ", {"GALLEY_WORK_COMPARTMENT_ID": "ocid1.compartment.oc1..test"}),
+        ):
+            image_uri = await app_service_with_config._build_and_push_image(session_id, "test-app")
+
+        assert image_uri.startswith("ap-osaka-1.ocir.io/testnamespace/test-app:")
+        namespace, bucket, object_name, _path = sdk.put_object.call_args[0]
+        assert (namespace, bucket, object_name) == (
+            "testnamespace",
+            "galley-test-bucket",
+            f"builds/{session_id}/app.tar.gz",
+        )
+        assert sdk.create_instance_agent_command.call_args[0][:2] == (
+            "ocid1.compartment.oc1..test",
+            "ocid1.instance.oc1..build-test",
+        )
+        mock_proc.assert_not_called()
+
+    async def test_build_falls_back_to_cli_when_sdk_unavailable(
+        self,
+        hearing_service: HearingService,
+        app_service_with_config: AppService,
+    ) -> None:
+        session_id = await _create_session_with_architecture(hearing_service)
+        await app_service_with_config.scaffold_from_template(session_id, "rest-api-adb", {})
+        app_service_with_config._oci_sdk = MagicMock(available=False)
+
+        with patch.object(app_service_with_config, "_run_subprocess", new_callable=AsyncMock) as mock_proc:
+            mock_proc.return_value = (1, "", "upload failed")
+            with pytest.raises(RuntimeError, match="upload failed"):
+                await app_service_with_config._upload_app_tarball(session_id)
+
+        assert mock_proc.call_args[0][0][-5:-3] == ["--name", f"builds/{session_id}/app.tar.gz"]
@@ -0,0 +1,151 @@
+"""CLIResultCacheのユニットテスト。"""
+
+import pytest
+
+from galley.models.infra import CLIResult
+from galley.services.cli_cache import CLIResultCache, is_read_only
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _ok(stdout: str = '{"data": []}') -> CLIResult:
+    return CLIResult(success=True, stdout=stdout, stderr="", exit_code=0)
+
+
+_LIST = ["oci", "compute", "instance", "list", "--compartment-id", "ocid1.c"]
+
+
+class TestClassification:
+    @pytest.mark.parametrize(
+        "args",
+        [
+            _LIST,
+            ["oci", "iam", "availability-domain", "list"],
+            ["oci", "--auth", "resource_principal", "compute", "image", "get", "--image-id", "ocid1.i"],
+            ["oci", "compute", "instance", "list-vnics", "--instance-id", "ocid1.i"],
+            ["oci", "os", "ns", "get"],
+        ],
+    )
+    def test_read_only_commands(self, args: list[str]) -> None:
+        assert is_read_only(args) is True
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ["oci", "compute", "instance", "launch", "--compartment-id", "ocid1.c"],
+            ["oci", "compute", "instance", "terminate", "--instance-id", "ocid1.i", "--force"],
+            ["oci", "os", "object", "put", "--bucket-name", "b", "--file", "x"],
+            ["oci", "os", "object", "get", "--bucket-name", "b", "--name", "o", "--file", "out"],
+            ["oci", "ce", "cluster", "create-kubeconfig", "--cluster-id", "ocid1.k"],
+            ["oci", "compute"],
+        ],
+    )
+    def test_mutating_or_side_effect_commands(self, args: list[str]) -> None:
+        assert is_read_only(args) is False
+
+
+class TestCLIResultCache:
+    def test_hit_after_put(self) -> None:
+        cache = CLIResultCache()
+        assert cache.get(_LIST) is None
+
+        cache.put(_LIST, _ok())
+        cached = cache.get(_LIST)
+
+        assert cached is not None
+        assert cached.cached is True
+        assert cache.metrics.hits == 1
+        assert cache.metrics.misses == 1
+        assert cache.metrics.entries == 1
+
+    def test_key_normalizes_option_order_and_syntax(self) -> None:
+        cache = CLIResultCache()
+        cache.put(["oci", "compute", "image", "list", "--compartment-id", "ocid1.c", "--all"], _ok())
+
+        assert cache.get(["compute", "image", "list", "--all", "--compartment-id=ocid1.c"]) is not None
+        assert cache.get(["compute", "image", "list", "--all", "-c", "ocid1.c"]) is not None
+        assert cache.get(["compute", "image", "list", "--compartment-id", "ocid1.other", "--all"]) is None
+
+    def test_repeated_options_are_not_cached(self) -> None:
+        cache = CLIResultCache()
+        cache.put(["oci", "compute", "image", "list", "--compartment-id", "ocid1.b"], _ok())
+        repeated = ["oci", "compute", "image", "list", "-c", "ocid1.a", "--compartment-id", "ocid1.b"]
+
+        # CLIは両方の値を受け取るため、最後の値だけを指定したコマンドの結果は使わない
+        assert cache.key(repeated) is None
+        assert cache.get(repeated) is None
+        cache.put(repeated, _ok())
+        assert cache.metrics.entries == 1
+
+    def test_auth_mode_is_part_of_key(self) -> None:
+        cache = CLIResultCache()
+        cache.put(_LIST, _ok())
+
+        assert cache.get(["oci", "--auth", "resource_principal", *_LIST[1:]]) is None
+
+    def test_mutating_and_failed_results_are_not_cached(self) -> None:
+        cache = CLIResultCache()
+        launch = ["oci", "compute", "instance", "launch", "--compartment-id", "ocid1.c"]
+        cache.put(launch, _ok())
+        cache.put(_LIST, CLIResult(success=False, stdout="", stderr="error", exit_code=1))
+
+        assert cache.get(launch) is None
+        assert cache.get(_LIST) is None
+        assert cache.metrics.entries == 0
+
+    def test_per_service_ttl(self) -> None:
+        clock = _Clock()
+        cache = CLIResultCache(60.0, service_ttls={"iam": 600.0, "db": 0.0}, clock=clock)
+        ads = ["oci", "iam", "availability-domain", "list"]
+        databases = ["oci", "db", "autonomous-database", "list", "-c", "ocid1.c"]
+        cache.put(_LIST, _ok())
+        cache.put(ads, _ok())
+        cache.put(databases, _ok())
+
+        clock.now = 120.0
+        assert cache.get(_LIST) is None
+        assert cache.get(ads) is not None
+        assert cache.get(databases) is None
+
+        clock.now = 600.0
+        assert cache.get(ads) is None
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = CLIResultCache(max_entries=2)
+        first, second, third = (["oci", "compute", "image", "get", "--image-id", f"ocid1.image.{i}"] for i in range(3))
+        cache.put(first, _ok())
+        cache.put(second, _ok())
+        assert cache.get(first) is not None
+
+        cache.put(third, _ok())
+
+        assert cache.get(second) is None
+        assert cache.get(first) is not None
+        assert cache.get(third) is not None
+        assert cache.metrics.evictions == 1
+        assert cache.metrics.entries == 2
+
+    def test_invalidate_service(self) -> None:
+        cache = CLIResultCache()
+        ads = ["oci", "iam", "availability-domain", "list"]
+        cache.put(_LIST, _ok())
+        cache.put(ads, _ok())
+
+        cache.invalidate_service("compute")
+
+        assert cache.get(_LIST) is None
+        assert cache.get(ads) is not None
+        assert cache.metrics.invalidations == 1
+
+    def test_disabled_with_zero_max_entries(self) -> None:
+        cache = CLIResultCache(max_entries=0)
+        cache.put(_LIST, _ok())
+
+        assert cache.get(_LIST) is None
+        assert cache.metrics.misses == 0
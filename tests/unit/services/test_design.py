@@ -1,16 +1,23 @@
 """DesignServiceのユニットテスト。"""
 
+import asyncio
+import os
 from pathlib import Path
+from typing import Any
+from unittest.mock import patch
 
 import pytest
 
+from galley.models.architecture import Component
 from galley.models.errors import (
     ArchitectureNotFoundError,
     ComponentNotFoundError,
     HearingNotCompletedError,
+    PatchOperationError,
 )
-from galley.services.design import DesignService
+from galley.services.design import DesignService, _substitute_references
 from galley.services.hearing import HearingService
+from galley.storage.service import StorageService
 
 
 async def _create_completed_session(hearing_service: HearingService) -> str:
@@ -184,6 +191,261 @@ class TestConfigureComponent:
             await design_service.configure_component(session_id, "nonexistent-id", {"key": "val"})
 
 
+class TestPatchArchitecture:
+    async def test_patch_applies_operations_in_order(
+        self, hearing_service: HearingService, design_service: DesignService, storage: StorageService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        existing = await design_service.add_component(session_id, "compute", "VM")
+        await design_service.validate_architecture(session_id)
+
+        patched = await design_service.patch_architecture(
+            session_id,
+            [
+                {"op": "add", "id": "oke-1", "service_type": "oke", "display_name": "OKE"},
+                {"op": "add", "id": "adb-1", "service_type": "adb", "display_name": "ADB"},
+                {"op": "connect", "source_id": "oke-1", "target_id": "adb-1", "connection_type": "private_endpoint"},
+                {"op": "connect", "source_id": existing.id, "target_id": "adb-1", "connection_type": "public"},
+                {"op": "configure", "component_id": "adb-1", "config": {"endpoint_type": "private"}},
+                {"op": "disconnect", "source_id": existing.id, "target_id": "adb-1"},
+                {"op": "remove", "component_id": existing.id},
+            ],
+        )
+
+        results = patched.results
+        assert patched.validation is None
+        assert [r["op"] for r in results] == [
+            "add",
+            "add",
+            "connect",
+            "connect",
+            "configure",
+            "disconnect",
+            "remove",
+        ]
+        oke_id = results[0]["component"]["id"]
+        adb_id = results[1]["component"]["id"]
+        assert results[2]["connection"]["source_id"] == oke_id
+        assert results[4]["component"]["config"] == {"endpoint_type": "private"}
+        assert results[5]["removed_connections"] == 1
+        assert results[6] == {"op": "remove", "component_id": existing.id, "removed_connections": 0}
+
+        session = await storage.load_session(session_id)
+        assert session.architecture is not None
+        assert [c.id for c in session.architecture.components] == [oke_id, adb_id]
+        assert [(c.source_id, c.target_id) for c in session.architecture.connections] == [(oke_id, adb_id)]
+        assert set(session.architecture.dirty_component_ids) == {existing.id, oke_id, adb_id}
+
+    async def test_patch_saves_session_once(
+        self, hearing_service: HearingService, design_service: DesignService, storage: StorageService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        operations = [{"op": "add", "service_type": "compute", "display_name": f"VM{i}"} for i in range(30)]
+
+        with patch.object(storage, "save_session", wraps=storage.save_session) as save_session:
+            patched = await design_service.patch_architecture(session_id, operations)
+
+        assert len(patched.results) == 30
+        assert save_session.call_count == 1
+
+    async def test_failed_operation_applies_nothing(
+        self, hearing_service: HearingService, design_service: DesignService, storage: StorageService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        comp = await design_service.add_component(session_id, "oke", "OKE")
+
+        with pytest.raises(PatchOperationError) as exc_info:
+            await design_service.patch_architecture(
+                session_id,
+                [
+                    {"op": "configure", "component_id": comp.id, "config": {"node_count": 5}},
+                    {"op": "remove", "component_id": "missing"},
+                ],
+            )
+
+        assert exc_info.value.index == 1
+        assert "missing" in str(exc_info.value)
+        session = await storage.load_session(session_id)
+        assert session.architecture is not None
+        assert session.architecture.components[0].config == {}
+
+    async def test_dangling_connection_is_rejected(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+
+        with pytest.raises(PatchOperationError) as exc_info:
+            await design_service.patch_architecture(
+                session_id,
+                [
+                    {"op": "add", "id": "oke-1", "service_type": "oke", "display_name": "OKE"},
+                    {"op": "connect", "source_id": "oke-1", "target_id": "nowhere", "connection_type": "public"},
+                ],
+            )
+
+        assert exc_info.value.index == 1
+
+    async def test_duplicate_temporary_id_is_rejected(
+        self, hearing_service: HearingService, design_service: DesignService, storage: StorageService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+
+        with pytest.raises(PatchOperationError) as exc_info:
+            await design_service.patch_architecture(
+                session_id,
+                [
+                    {"op": "add", "id": "db", "service_type": "adb", "display_name": "ADB"},
+                    {"op": "add", "id": "app", "service_type": "oke", "display_name": "OKE"},
+                    {"op": "add", "id": "db", "service_type": "mysql", "display_name": "MySQL"},
+                    {"op": "connect", "source_id": "app", "target_id": "db", "connection_type": "private_endpoint"},
+                ],
+            )
+
+        assert exc_info.value.index == 2
+        assert "db" in str(exc_info.value)
+        session = await storage.load_session(session_id)
+        assert session.architecture is None
+
+    async def test_connection_to_removed_component_is_dropped(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+
+        patched = await design_service.patch_architecture(
+            session_id,
+            [
+                {"op": "add", "id": "a", "service_type": "oke", "display_name": "A"},
+                {"op": "add", "id": "b", "service_type": "adb", "display_name": "B"},
+                {"op": "connect", "source_id": "a", "target_id": "b", "connection_type": "public"},
+                {"op": "remove", "component_id": "b"},
+            ],
+        )
+
+        assert patched.results[3]["removed_connections"] == 1
+
+    @pytest.mark.parametrize(
+        "operation",
+        [
+            {"op": "rename", "component_id": "x"},
+            {"op": "add", "display_name": "no service type"},
+            {"op": "disconnect", "source_id": "a", "target_id": "b"},
+            {"service_type": "oke"},
+        ],
+    )
+    async def test_invalid_operations_raise(
+        self, hearing_service: HearingService, design_service: DesignService, operation: dict
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+
+        with pytest.raises(PatchOperationError):
+            await design_service.patch_architecture(session_id, [operation])
+
+    async def test_patch_requires_completed_hearing(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session = await hearing_service.create_session()
+
+        with pytest.raises(HearingNotCompletedError):
+            await design_service.patch_architecture(
+                session.id, [{"op": "add", "service_type": "oke", "display_name": "OKE"}]
+            )
+
+    async def test_patch_keeps_incremental_validation_consistent(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        patched = await design_service.patch_architecture(
+            session_id,
+            [
+                {"op": "add", "id": "oke-1", "service_type": "oke", "display_name": "OKE"},
+                {"op": "add", "id": "adb-1", "service_type": "adb", "display_name": "ADB"},
+            ],
+        )
+        oke_id, adb_id = (r["component"]["id"] for r in patched.results)
+        await design_service.validate_architecture(session_id)
+
+        await design_service.patch_architecture(
+            session_id,
+            [
+                {"op": "connect", "source_id": oke_id, "target_id": adb_id, "connection_type": "public"},
+                {"op": "configure", "component_id": adb_id, "config": {"endpoint_type": "public"}},
+            ],
+        )
+
+        incremental = await design_service.validate_architecture(session_id)
+        full = await design_service.validate_architecture(session_id, full=True)
+        assert incremental == full
+        assert any(r.rule_id == "oke-adb-private-endpoint" for r in incremental)
+
+    async def test_patch_with_validate_saves_once_and_records_results(
+        self, hearing_service: HearingService, design_service: DesignService, storage: StorageService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        operations = [
+            {"op": "add", "id": "oke-1", "service_type": "oke", "display_name": "OKE"},
+            {"op": "add", "id": "adb-1", "service_type": "adb", "display_name": "ADB"},
+            {"op": "connect", "source_id": "oke-1", "target_id": "adb-1", "connection_type": "public"},
+            {"op": "configure", "component_id": "adb-1", "config": {"endpoint_type": "public"}},
+        ]
+
+        with (
+            patch.object(storage, "save_session", wraps=storage.save_session) as save_session,
+            patch.object(design_service, "validate_architecture") as validate_architecture,
+        ):
+            patched = await design_service.patch_architecture(session_id, operations, validate=True)
+
+        assert save_session.call_count == 1
+        validate_architecture.assert_not_called()
+        assert patched.validation is not None
+        assert any(r.rule_id == "oke-adb-private-endpoint" for r in patched.validation)
+        session = await storage.load_session(session_id)
+        assert session.architecture is not None
+        assert session.architecture.validation_results == [r.model_dump() for r in patched.validation]
+        assert session.architecture.dirty_component_ids == []
+        assert await design_service.validate_architecture(session_id, full=True) == patched.validation
+
+    async def test_patch_with_validate_holds_session_lock(
+        self, hearing_service: HearingService, design_service: DesignService, storage: StorageService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        original_validate = design_service._validator.validate
+        lock_held: list[bool] = []
+
+        def validate(*args: Any, **kwargs: Any) -> Any:
+            lock_held.append(storage.session_lock(session_id).locked())
+            return original_validate(*args, **kwargs)
+
+        with patch.object(design_service._validator, "validate", side_effect=validate):
+            await design_service.patch_architecture(
+                session_id, [{"op": "add", "service_type": "oke", "display_name": "OKE"}], validate=True
+            )
+
+        assert lock_held == [True]
+
+    async def test_empty_patch_with_validate_on_existing_architecture(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        await design_service.add_component(session_id, "oke", "OKE")
+
+        patched = await design_service.patch_architecture(session_id, [], validate=True)
+
+        assert patched.results == []
+        assert patched.validation == await design_service.validate_architecture(session_id, full=True)
+
+    async def test_empty_patch_with_validate_without_architecture(
+        self, hearing_service: HearingService, design_service: DesignService, storage: StorageService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+
+        patched = await design_service.patch_architecture(session_id, [], validate=True)
+
+        assert patched.results == []
+        assert patched.validation is None
+        session = await storage.load_session(session_id)
+        assert session.architecture is None
+
+
 class TestValidateArchitecture:
     async def test_validate_returns_results(
         self, hearing_service: HearingService, design_service: DesignService
@@ -215,6 +477,95 @@ class TestValidateArchitecture:
         with pytest.raises(ArchitectureNotFoundError):
             await design_service.validate_architecture(session_id)
 
+    async def _save_oke_adb(self, hearing_service: HearingService, design_service: DesignService) -> str:
+        session_id = await _create_completed_session(hearing_service)
+        await design_service.save_architecture(
+            session_id,
+            components=[
+                {"id": "oke-1", "service_type": "oke", "display_name": "OKE"},
+                {"id": "adb-1", "service_type": "adb", "display_name": "ADB", "config": {"endpoint_type": "public"}},
+                {"id": "os-1", "service_type": "objectstorage", "display_name": "my bucket"},
+            ],
+            connections=[
+                {"source_id": "oke-1", "target_id": "adb-1", "connection_type": "public", "description": ""},
+            ],
+        )
+        return session_id
+
+    async def test_mutations_mark_components_dirty(
+        self, hearing_service: HearingService, design_service: DesignService, storage: StorageService
+    ) -> None:
+        session_id = await self._save_oke_adb(hearing_service, design_service)
+        await design_service.validate_architecture(session_id)
+        arch = (await storage.load_session(session_id)).architecture
+        assert arch is not None
+        assert arch.dirty_component_ids == []
+        oke, adb, bucket = arch.components
+
+        await design_service.configure_component(session_id, bucket.id, {"storage_tier": "Archive"})
+        added = await design_service.add_component(session_id, "compute", "VM")
+        await design_service.remove_component(session_id, oke.id)
+
+        arch = (await storage.load_session(session_id)).architecture
+        assert arch is not None
+        assert arch.dirty_component_ids == [bucket.id, added.id, oke.id, adb.id]
+
+    async def test_incremental_validation_matches_full(
+        self, hearing_service: HearingService, design_service: DesignService, storage: StorageService
+    ) -> None:
+        session_id = await self._save_oke_adb(hearing_service, design_service)
+        await design_service.validate_architecture(session_id)
+        session = await storage.load_session(session_id)
+        assert session.architecture is not None
+        adb = session.architecture.components[1]
+
+        await design_service.configure_component(session_id, adb.id, {"endpoint_type": "private"})
+        await design_service.add_component(session_id, "streaming", "my stream")
+        incremental = await design_service.validate_architecture(session_id)
+        full = await design_service.validate_architecture(session_id, full=True)
+
+        assert incremental == full
+        assert [r.rule_id for r in incremental] == ["naming-convention", "naming-convention"]
+
+    async def test_incremental_validation_rechecks_only_dirty_components(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await self._save_oke_adb(hearing_service, design_service)
+        first = await design_service.validate_architecture(session_id)
+        await design_service.add_component(session_id, "compute", "VM")
+
+        validator = design_service._validator
+        with patch.object(validator, "_check_component_name", wraps=validator._check_component_name) as check:
+            results = await design_service.validate_architecture(session_id)
+
+        assert [call.args[0].display_name for call in check.call_args_list] == ["VM"]
+        assert results == first
+
+    async def test_full_validation_ignores_previous_results(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await self._save_oke_adb(hearing_service, design_service)
+        await design_service.validate_architecture(session_id)
+
+        validator = design_service._validator
+        with patch.object(validator, "_check_component_name", wraps=validator._check_component_name) as check:
+            await design_service.validate_architecture(session_id, full=True)
+
+        assert check.call_count == 3
+
+    async def test_changed_rules_trigger_full_validation(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await self._save_oke_adb(hearing_service, design_service)
+        await design_service.validate_architecture(session_id)
+        design_service._validator._rules_digest = "changed"
+
+        validator = design_service._validator
+        with patch.object(validator, "_check_component_name", wraps=validator._check_component_name) as check:
+            await design_service.validate_architecture(session_id)
+
+        assert check.call_count == 3
+
 
 class TestListAvailableServices:
     async def test_list_returns_services(self, design_service: DesignService) -> None:
@@ -682,6 +1033,143 @@ class TestExportIac:
         assert "minimum_bandwidth_in_mbps" in components_tf
         assert "maximum_bandwidth_in_mbps" in components_tf
 
+    async def test_export_iac_reuses_rendered_components(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        await design_service.save_architecture(
+            session_id,
+            components=[
+                {"service_type": "vcn", "display_name": "VCN", "config": {"cidr_block": "10.0.0.0/16"}},
+                {"service_type": "oke", "display_name": "OKE"},
+            ],
+            connections=[],
+        )
+        first = await design_service.export_iac(session_id)
+
+        with patch.object(design_service, "_render_component_tf", wraps=design_service._render_component_tf) as render:
+            second = await design_service.export_iac(session_id)
+
+        render.assert_not_called()
+        assert second["terraform_files"] == first["terraform_files"]
+
+    async def test_export_iac_rerenders_changed_component(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        arch = await design_service.save_architecture(
+            session_id,
+            components=[
+                {"service_type": "oke", "display_name": "OKE"},
+                {"service_type": "adb", "display_name": "ADB", "config": {"workload_type": "OLTP"}},
+            ],
+            connections=[],
+        )
+        await design_service.export_iac(session_id)
+        adb = next(c for c in arch.components if c.service_type == "adb")
+        await design_service.configure_component(session_id, adb.id, {"workload_type": "ADW"})
+
+        with patch.object(design_service, "_render_component_tf", wraps=design_service._render_component_tf) as render:
+            result = await design_service.export_iac(session_id)
+
+        assert [call.args[0].service_type for call in render.call_args_list] == ["adb"]
+        assert '"DW"' in result["terraform_files"]["components.tf"]
+
+    async def test_export_iac_skips_writing_unchanged_files(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        arch = await design_service.save_architecture(
+            session_id,
+            components=[{"service_type": "adb", "display_name": "ADB", "config": {"workload_type": "OLTP"}}],
+            connections=[],
+        )
+        result = await design_service.export_iac(session_id)
+        terraform_dir = Path(result["terraform_dir"])
+        # 更新日時の変化を検出できるよう、書き出し済みファイルの日時を過去に戻す
+        for path in terraform_dir.iterdir():
+            os.utime(path, ns=(0, 0))
+
+        await design_service.configure_component(session_id, arch.components[0].id, {"workload_type": "ADW"})
+        await design_service.export_iac(session_id)
+
+        assert (terraform_dir / "main.tf").stat().st_mtime_ns == 0
+        assert (terraform_dir / "variables.tf").stat().st_mtime_ns == 0
+        assert (terraform_dir / "components.tf").stat().st_mtime_ns != 0
+        assert '"DW"' in (terraform_dir / "components.tf").read_text(encoding="utf-8")
+
+    def test_write_terraform_files_returns_written_files(self, tmp_path: Path) -> None:
+        files = {"main.tf": "a", "variables.tf": "b"}
+
+        assert DesignService._write_terraform_files(tmp_path, files) == ["main.tf", "variables.tf"]
+        assert DesignService._write_terraform_files(tmp_path, {**files, "variables.tf": "c"}) == ["variables.tf"]
+        assert (tmp_path / "variables.tf").read_text(encoding="utf-8") == "c"
+
+    def test_render_cache_is_bounded(self, design_service: DesignService) -> None:
+        with patch("galley.services.design._RENDER_CACHE_MAX_ENTRIES", 2):
+            for i in range(3):
+                comp = Component(service_type="objectstorage", display_name=f"bucket-{i}")
+                design_service._render_component_with_refs(comp, {})
+
+        assert len(design_service._render_cache) == 2
+        assert all("bucket-0" not in key for key in design_service._render_cache)
+
+
+class TestSubstituteReferences:
+    def test_overlapping_names_are_resolved_independently(self) -> None:
+        text = "subnet_id = var.subnet_id\nnode_subnet_id = var.node_subnet_id\n"
+        refs = {
+            "var.subnet_id": "oci_core_subnet.public.id",
+            "var.node_subnet_id": "oci_core_subnet.private.id",
+        }
+
+        result = _substitute_references(text, refs)
+
+        assert result == "subnet_id = oci_core_subnet.public.id\nnode_subnet_id = oci_core_subnet.private.id\n"
+
+    def test_does_not_match_inside_longer_identifier(self) -> None:
+        text = "ids = var.subnet_ids\nid = var.subnet_id"
+
+        result = _substitute_references(text, {"var.subnet_id": "oci_core_subnet.a.id"})
+
+        assert result == "ids = var.subnet_ids\nid = oci_core_subnet.a.id"
+
+    def test_does_not_match_qualified_reference(self) -> None:
+        text = "a = local.var.subnet_id\nb = myvar.subnet_id\nc = [var.subnet_id]"
+
+        result = _substitute_references(text, {"var.subnet_id": "oci_core_subnet.a.id"})
+
+        assert result == "a = local.var.subnet_id\nb = myvar.subnet_id\nc = [oci_core_subnet.a.id]"
+
+    def test_replacement_is_not_substituted_again(self) -> None:
+        refs = {"var.vcn_id": "var.gateway_id", "var.gateway_id": "oci_core_internet_gateway.igw.id"}
+
+        result = _substitute_references("vcn = var.vcn_id\ngw = var.gateway_id", refs)
+
+        assert result == "vcn = var.gateway_id\ngw = oci_core_internet_gateway.igw.id"
+
+    def test_empty_refs_returns_text(self) -> None:
+        assert _substitute_references("id = var.subnet_id", {}) == "id = var.subnet_id"
+
+    async def test_export_iac_oke_resolves_subnet_and_node_subnet(
+        self, hearing_service: HearingService, design_service: DesignService
+    ) -> None:
+        session_id = await _create_completed_session(hearing_service)
+        await design_service.save_architecture(
+            session_id,
+            components=[
+                {"service_type": "vcn", "display_name": "VCN", "config": {"cidr_block": "10.0.0.0/16"}},
+                {"service_type": "oke", "display_name": "OKE"},
+            ],
+            connections=[],
+        )
+        result = await design_service.export_iac(session_id)
+        components_tf = result["terraform_files"]["components.tf"]
+        assert "var.subnet_id" not in components_tf
+        assert "var.node_subnet_id" not in components_tf
+        node_pool = components_tf[components_tf.index("oci_containerengine_node_pool") :]
+        assert "subnet_id           = oci_core_subnet.vcn_private_subnet.id" in node_pool
+
 
 class TestExportIacRmCompatibility:
     async def test_export_iac_no_auth_in_provider(
@@ -1576,3 +2064,37 @@ class TestOutputsTf:
         )
         result = await design_service.export_iac(session_id)
         assert "outputs.tf" not in result["terraform_files"]
+
+
+class TestConcurrentUpdates:
+    async def test_parallel_add_component_loses_nothing(
+        self, backend_storage: StorageService, config_dir: Path
+    ) -> None:
+        hearing_service = HearingService(storage=backend_storage, config_dir=config_dir)
+        design_service = DesignService(storage=backend_storage, config_dir=config_dir)
+        session_id = await _create_completed_session(hearing_service)
+
+        components = await asyncio.gather(
+            *(design_service.add_component(session_id, "compute", f"VM {i}") for i in range(200))
+        )
+
+        backend_storage.invalidate_cache()
+        session = await backend_storage.load_session(session_id)
+        assert session.architecture is not None
+        assert {c.id for c in session.architecture.components} == {c.id for c in components}
+
+    async def test_parallel_configure_component_merges_all_keys(
+        self, backend_storage: StorageService, config_dir: Path
+    ) -> None:
+        hearing_service = HearingService(storage=backend_storage, config_dir=config_dir)
+        design_service = DesignService(storage=backend_storage, config_dir=config_dir)
+        session_id = await _create_completed_session(hearing_service)
+        component = await design_service.add_component(session_id, "compute", "VM")
+
+        await asyncio.gather(
+            *(design_service.configure_component(session_id, component.id, {f"key{i}": i}) for i in range(100))
+        )
+
+        session = await backend_storage.load_session(session_id)
+        assert session.architecture is not None
+        assert len(session.architecture.components[0].config) == 100
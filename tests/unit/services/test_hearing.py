@@ -1,9 +1,14 @@
 """HearingServiceのユニットテスト。"""
 
+import asyncio
+from pathlib import Path
+
 import pytest
 
 from galley.models.errors import HearingAlreadyCompletedError, HearingNotCompletedError
+from galley.models.session import Answer
 from galley.services.hearing import HearingService
+from galley.storage.service import StorageService
 
 
 class TestHearingService:
@@ -111,3 +116,65 @@ class TestHearingService:
         assert "database" in categories
         assert "network" in categories
         assert len(result.constraints) > 0
+
+
+class TestAnswerJournal:
+    async def test_save_answer_appends_to_journal(self, hearing_service: HearingService) -> None:
+        session = await hearing_service.create_session()
+        session_dir = hearing_service._storage.get_session_dir(session.id)
+        session_bytes = (session_dir / "session.json").read_bytes()
+
+        await hearing_service.save_answer(session.id, "purpose", "REST API構築")
+        await hearing_service.save_answers_batch(session.id, [{"question_id": "users", "value": "100人"}])
+
+        assert (session_dir / "session.json").read_bytes() == session_bytes
+        lines = (session_dir / "answers.log").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+
+    async def test_complete_hearing_compacts_journal(self, hearing_service: HearingService) -> None:
+        session = await hearing_service.create_session()
+        await hearing_service.save_answer(session.id, "purpose", "REST API構築")
+        await hearing_service.complete_hearing(session.id)
+
+        session_dir = hearing_service._storage.get_session_dir(session.id)
+        assert not (session_dir / "answers.log").exists()
+        hearing_service._storage.invalidate_cache()
+        loaded = await hearing_service._storage.load_session(session.id)
+        assert loaded.answers["purpose"].value == "REST API構築"
+        assert loaded.status == "completed"
+
+
+class TestConcurrentUpdates:
+    async def test_parallel_save_answer_loses_nothing(self, backend_storage: StorageService, config_dir: Path) -> None:
+        service = HearingService(storage=backend_storage, config_dir=config_dir)
+        session = await service.create_session()
+
+        # ジャーナルの畳み込み（読み込み→保存）も並行して発生する
+        await asyncio.gather(
+            *(service.save_answer(session.id, f"q{i}", f"answer {i}") for i in range(300)),
+            *(service.save_answers_batch(session.id, [{"question_id": f"b{i}", "value": "v"}]) for i in range(50)),
+        )
+
+        backend_storage.invalidate_cache()
+        loaded = await backend_storage.load_session(session.id)
+        assert len(loaded.answers) == 350
+
+    async def test_answer_racing_completion_is_not_lost(
+        self, backend_storage: StorageService, config_dir: Path
+    ) -> None:
+        service = HearingService(storage=backend_storage, config_dir=config_dir)
+        session = await service.create_session()
+
+        results = await asyncio.gather(
+            *(service.save_answer(session.id, f"q{i}", "v") for i in range(50)),
+            service.complete_hearing(session.id),
+            *(service.save_answer(session.id, f"r{i}", "v") for i in range(50)),
+            return_exceptions=True,
+        )
+
+        # 完了前に受け付けた回答はすべて残り、完了後の回答は拒否される
+        accepted = {r.question_id for r in results if isinstance(r, Answer)}
+        rejected = [r for r in results if isinstance(r, HearingAlreadyCompletedError)]
+        assert len(accepted) + len(rejected) == 100
+        loaded = await backend_storage.load_session(session.id)
+        assert set(loaded.answers) == accepted
@@ -1,12 +1,16 @@
 """InfraServiceのユニットテスト。"""
 
+import asyncio
 import base64
 import io
+import os
+import time
 import zipfile
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import oci
 import pytest
 
 from galley.models.errors import (
@@ -14,9 +18,14 @@ from galley.models.errors import (
     CommandNotAllowedError,
     InfraOperationInProgressError,
 )
-from galley.models.infra import TerraformResult
+from galley.models.infra import CLIResult, TerraformResult
+from galley.models.jobs import Job
 from galley.services.hearing import HearingService
-from galley.services.infra import InfraService
+from galley.services.infra import MAX_CLI_BATCH_SIZE, InfraService
+from galley.storage.oci_client import OCIClientFactory
+from galley.storage.service import StorageService
+from tests.unit.services.conftest import FakeResourceManagerClient
+from tests.unit.storage.conftest import FakeSigner
 
 
 async def _create_session_with_architecture(hearing_service: HearingService) -> str:
@@ -99,6 +108,80 @@ class TestRunTerraformPlan:
             await infra_service.run_terraform_plan(session.id, "/tmp/tf")
 
 
+class TestPlanResultCache:
+    @staticmethod
+    async def _prepare(hearing_service: HearingService, stack_hash: str = "hash-a") -> str:
+        """スタック作成済み（アップロード済みの構成ハッシュあり）のセッションを用意する。"""
+        session_id = await _create_session_with_architecture(hearing_service)
+        session = await hearing_service._storage.load_session(session_id)
+        session.rm_stack_id = "ocid1.stack.test"
+        session.rm_stack_hash = stack_hash
+        await hearing_service._storage.save_session(session)
+        return session_id
+
+    async def test_reuses_plan_for_unchanged_stack(
+        self,
+        hearing_service: HearingService,
+        fast_infra_service: InfraService,
+        fake_rm_client: FakeResourceManagerClient,
+    ) -> None:
+        session_id = await self._prepare(hearing_service)
+        fake_rm_client.logs = "Plan: 1 to add, 0 to change, 0 to destroy."
+
+        with patch.object(
+            fast_infra_service, "_ensure_rm_stack", new_callable=AsyncMock, return_value="ocid1.stack.test"
+        ):
+            first = await fast_infra_service.run_terraform_plan(session_id, "/tmp/tf")
+            second = await fast_infra_service.run_terraform_plan(session_id, "/tmp/tf")
+            forced = await fast_infra_service.run_terraform_plan(session_id, "/tmp/tf", force=True)
+
+        assert first.cached is False
+        assert second.cached is True
+        assert second.plan_summary == first.plan_summary
+        assert forced.cached is False
+        assert fake_rm_client.calls["create_job"] == 2
+        assert fast_infra_service.plan_cache.metrics.hits == 1
+        assert fast_infra_service.plan_cache.metrics.misses == 1
+
+    async def test_changed_stack_config_runs_plan(
+        self,
+        hearing_service: HearingService,
+        fast_infra_service: InfraService,
+        fake_rm_client: FakeResourceManagerClient,
+    ) -> None:
+        session_id = await self._prepare(hearing_service)
+
+        with patch.object(
+            fast_infra_service, "_ensure_rm_stack", new_callable=AsyncMock, return_value="ocid1.stack.test"
+        ):
+            await fast_infra_service.run_terraform_plan(session_id, "/tmp/tf")
+            session = await hearing_service._storage.load_session(session_id)
+            session.rm_stack_hash = "hash-b"
+            await hearing_service._storage.save_session(session)
+            result = await fast_infra_service.run_terraform_plan(session_id, "/tmp/tf")
+
+        assert result.cached is False
+        assert fake_rm_client.calls["create_job"] == 2
+
+    async def test_apply_invalidates_plan(
+        self,
+        hearing_service: HearingService,
+        fast_infra_service: InfraService,
+        fake_rm_client: FakeResourceManagerClient,
+    ) -> None:
+        session_id = await self._prepare(hearing_service)
+
+        with patch.object(
+            fast_infra_service, "_ensure_rm_stack", new_callable=AsyncMock, return_value="ocid1.stack.test"
+        ):
+            await fast_infra_service.run_terraform_plan(session_id, "/tmp/tf")
+            await fast_infra_service.run_terraform_apply(session_id, "/tmp/tf")
+            result = await fast_infra_service.run_terraform_plan(session_id, "/tmp/tf")
+
+        assert result.cached is False
+        assert fake_rm_client.calls["create_job"] == 3
+
+
 class TestRunTerraformApply:
     async def test_apply_success(self, hearing_service: HearingService, infra_service: InfraService) -> None:
         session_id = await _create_session_with_architecture(hearing_service)
@@ -112,7 +195,7 @@ class TestRunTerraformApply:
 
         assert result.success is True
         assert result.command == "apply"
-        mock_job.assert_called_once_with("ocid1.stack.test", "APPLY", "apply")
+        mock_job.assert_called_once_with("ocid1.stack.test", "APPLY", "apply", on_created=None, on_log=None)
 
     async def test_apply_failure(self, hearing_service: HearingService, infra_service: InfraService) -> None:
         session_id = await _create_session_with_architecture(hearing_service)
@@ -143,7 +226,7 @@ class TestRunTerraformDestroy:
 
         assert result.success is True
         assert result.command == "destroy"
-        mock_job.assert_called_once_with("ocid1.stack.test", "DESTROY", "destroy")
+        mock_job.assert_called_once_with("ocid1.stack.test", "DESTROY", "destroy", on_created=None, on_log=None)
 
 
 class TestZipTerraformDir:
@@ -200,6 +283,31 @@ class TestZipTerraformDir:
             # 絶対パスが含まれないこと
             assert not any(n.startswith("/") for n in names)
 
+    def test_zip_is_deterministic(self, tmp_path: Path) -> None:
+        """同じ内容からは作成順・更新時刻によらず同じzipが生成される。"""
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        for directory, names in ((first, ["main.tf", "outputs.tf"]), (second, ["outputs.tf", "main.tf"])):
+            directory.mkdir()
+            for name in names:
+                (directory / name).write_text(f"# {name}")
+        os.utime(second / "main.tf", (0, 0))
+
+        assert InfraService._zip_terraform_dir(first) == InfraService._zip_terraform_dir(second)
+        assert InfraService._hash_terraform_dir(first) == InfraService._hash_terraform_dir(second)
+
+    def test_hash_changes_with_content_and_ignores_excluded_files(self, tmp_path: Path) -> None:
+        (tmp_path / "main.tf").write_text("provider {}")
+        original = InfraService._hash_terraform_dir(tmp_path)
+
+        (tmp_path / "terraform.tfstate").write_text("{}")
+        (tmp_path / ".terraform").mkdir()
+        (tmp_path / ".terraform" / "lock").write_text("x")
+        assert InfraService._hash_terraform_dir(tmp_path) == original
+
+        (tmp_path / "main.tf").write_text("provider {} ")
+        assert InfraService._hash_terraform_dir(tmp_path) != original
+
 
 class TestBuildRmVariables:
     def test_adds_auto_variables_from_env(self, infra_service: InfraService, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -207,7 +315,7 @@ class TestBuildRmVariables:
         monkeypatch.setenv("GALLEY_REGION", "ap-osaka-1")
         monkeypatch.setenv("GALLEY_WORK_COMPARTMENT_ID", "ocid1.compartment.test")
         monkeypatch.delenv("OCI_RESOURCE_PRINCIPAL_VERSION", raising=False)
-        with patch("galley.services.infra.oci.config.from_file", return_value={"tenancy": "ocid1.tenancy.test"}):
+        with patch.object(infra_service, "_clients", OCIClientFactory(signer_provider=FakeSigner)):
             result = infra_service._build_rm_variables(None)
         assert result["region"] == "ap-osaka-1"
         assert result["compartment_ocid"] == "ocid1.compartment.test"
@@ -234,7 +342,7 @@ class TestBuildRmVariables:
         monkeypatch.setenv("GALLEY_REGION", "ap-tokyo-1")
         monkeypatch.setenv("GALLEY_WORK_COMPARTMENT_ID", "ocid1.compartment.test")
         monkeypatch.delenv("OCI_RESOURCE_PRINCIPAL_VERSION", raising=False)
-        with patch("galley.services.infra.oci.config.from_file", return_value={"tenancy": "ocid1.tenancy.test"}):
+        with patch.object(infra_service, "_clients", OCIClientFactory(signer_provider=FakeSigner)):
             result = infra_service._build_rm_variables(None)
         assert "region" in result
         assert "compartment_ocid" in result
@@ -246,48 +354,31 @@ class TestBuildRmVariables:
         monkeypatch.setenv("GALLEY_WORK_COMPARTMENT_ID", "ocid1.compartment.test")
         monkeypatch.delenv("OCI_RESOURCE_PRINCIPAL_VERSION", raising=False)
         variables = {"subnet_id": "ocid1.subnet", "image_id": "ocid1.image"}
-        with patch("galley.services.infra.oci.config.from_file", return_value={"tenancy": "ocid1.tenancy.test"}):
+        with patch.object(infra_service, "_clients", OCIClientFactory(signer_provider=FakeSigner)):
             result = infra_service._build_rm_variables(variables)
         assert result["subnet_id"] == "ocid1.subnet"
         assert result["image_id"] == "ocid1.image"
 
 
 class TestGetRmClient:
-    def test_api_key_auth(self, infra_service: InfraService, monkeypatch: pytest.MonkeyPatch) -> None:
-        """API Key認証でRMクライアントが初期化される。"""
-        monkeypatch.delenv("OCI_RESOURCE_PRINCIPAL_VERSION", raising=False)
-        mock_config = {"region": "ap-osaka-1"}
-        with (
-            patch("galley.services.infra.oci.config.from_file", return_value=mock_config) as mock_from_file,
-            patch("galley.services.infra.oci.resource_manager.ResourceManagerClient") as mock_client_cls,
-        ):
-            client = infra_service._get_rm_client()
-            mock_from_file.assert_called_once()
-            mock_client_cls.assert_called_once_with(mock_config)
-            assert client is mock_client_cls.return_value
+    def test_uses_shared_client_factory(self, storage: StorageService, config_dir: Path) -> None:
+        """RMクライアントは共有ファクトリから取得され、署名者・クライアントが使い回される。"""
+        signers: list[FakeSigner] = []
 
-    def test_resource_principal_auth(self, infra_service: InfraService, monkeypatch: pytest.MonkeyPatch) -> None:
-        """ResourcePrincipal認証でRMクライアントが初期化される。"""
-        monkeypatch.setenv("OCI_RESOURCE_PRINCIPAL_VERSION", "2.2")
-        mock_signer = MagicMock()
-        with (
-            patch("galley.services.infra.oci.auth.signers.get_resource_principals_signer", return_value=mock_signer),
-            patch("galley.services.infra.oci.resource_manager.ResourceManagerClient") as mock_client_cls,
-        ):
-            client = infra_service._get_rm_client()
-            mock_client_cls.assert_called_once_with({}, signer=mock_signer)
-            assert client is mock_client_cls.return_value
+        def provide() -> FakeSigner:
+            signers.append(FakeSigner())
+            return signers[-1]
 
-    def test_caches_client(self, infra_service: InfraService, monkeypatch: pytest.MonkeyPatch) -> None:
-        """RMクライアントがキャッシュされる。"""
-        monkeypatch.delenv("OCI_RESOURCE_PRINCIPAL_VERSION", raising=False)
-        with (
-            patch("galley.services.infra.oci.config.from_file", return_value={}),
-            patch("galley.services.infra.oci.resource_manager.ResourceManagerClient"),
-        ):
-            client1 = infra_service._get_rm_client()
-            client2 = infra_service._get_rm_client()
-            assert client1 is client2
+        factory = OCIClientFactory(signer_provider=provide)
+        service = InfraService(storage=storage, config_dir=config_dir, client_factory=factory)
+
+        client = service._get_rm_client()
+
+        assert isinstance(client, oci.resource_manager.ResourceManagerClient)
+        assert service._get_rm_client() is client
+        assert factory.client(oci.resource_manager.ResourceManagerClient) is client
+        assert service._get_tenancy_ocid() == "ocid1.tenancy.test"
+        assert len(signers) == 1
 
 
 class TestBuildStackDisplayName:
@@ -407,122 +498,216 @@ class TestEnsureRmStack:
         assert update_details.display_name.startswith("galley-rest-api-")
         assert update_details.display_name.endswith(session_id[:8])
 
-
-class TestRunRmJob:
-    async def test_plan_job_success(self, infra_service: InfraService) -> None:
-        """Planジョブが成功する。"""
+    async def test_skips_upload_when_unchanged(
+        self, hearing_service: HearingService, infra_service: InfraService, tmp_path: Path
+    ) -> None:
+        """Terraformファイル・変数が前回から変わっていなければzip化とスタック更新を省略する。"""
+        session_id = await _create_session_with_architecture(hearing_service)
+        tf_dir = tmp_path / "tf"
+        tf_dir.mkdir()
+        (tf_dir / "main.tf").write_text("provider {}")
         mock_client = MagicMock()
+        mock_client.create_stack.return_value = SimpleNamespace(data=SimpleNamespace(id="ocid1.stack.new"))
 
-        create_response = SimpleNamespace(data=SimpleNamespace(id="ocid1.job.test"))
-        get_response = SimpleNamespace(data=SimpleNamespace(lifecycle_state="SUCCEEDED"))
-        logs_response = SimpleNamespace(data=SimpleNamespace(text="Plan: 2 to add, 0 to change, 0 to destroy."))
+        async def fake_to_thread(func, *args, **kwargs):
+            return func(*args, **kwargs)
 
-        call_count = 0
+        with (
+            patch.object(infra_service, "_get_rm_client", return_value=mock_client),
+            patch.object(infra_service, "_get_tenancy_ocid", return_value="ocid1.tenancy.test"),
+            patch("asyncio.to_thread", side_effect=fake_to_thread),
+            patch.object(InfraService, "_zip_terraform_dir", wraps=InfraService._zip_terraform_dir) as zip_dir,
+        ):
+            await infra_service._ensure_rm_stack(session_id, tf_dir, {"shape": "small"})
+            stack_id = await infra_service._ensure_rm_stack(session_id, tf_dir, {"shape": "small"})
 
-        async def mock_to_thread(func, *args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if func == mock_client.create_job:
-                return create_response
-            elif func == mock_client.get_job:
-                return get_response
-            elif func == mock_client.get_job_logs_content:
-                return logs_response
-            return None
+            assert stack_id == "ocid1.stack.new"
+            assert zip_dir.call_count == 1
+            mock_client.update_stack.assert_not_called()
+
+            # 変数が変わればスタックを更新する
+            await infra_service._ensure_rm_stack(session_id, tf_dir, {"shape": "large"})
+            assert mock_client.update_stack.call_count == 1
+
+            # Terraformファイルが変わればスタックを更新する
+            (tf_dir / "main.tf").write_text("provider { region = var.region }")
+            await infra_service._ensure_rm_stack(session_id, tf_dir, {"shape": "large"})
+            assert mock_client.update_stack.call_count == 2
+
+            await infra_service._ensure_rm_stack(session_id, tf_dir, {"shape": "large"})
+            assert mock_client.update_stack.call_count == 2
+        assert zip_dir.call_count == 3
+
+    async def test_failed_update_is_retried(
+        self, hearing_service: HearingService, infra_service: InfraService, tmp_path: Path
+    ) -> None:
+        """スタック更新に失敗した場合は次回も更新する。"""
+        session_id = await _create_session_with_architecture(hearing_service)
+        session = await hearing_service._storage.load_session(session_id)
+        session.rm_stack_id = "ocid1.stack.existing"
+        await hearing_service._storage.save_session(session)
+        tf_dir = tmp_path / "tf"
+        tf_dir.mkdir()
+        (tf_dir / "main.tf").write_text("provider {}")
+        mock_client = MagicMock()
+        mock_client.update_stack.side_effect = [RuntimeError("409 Conflict"), None]
+
+        async def fake_to_thread(func, *args, **kwargs):
+            return func(*args, **kwargs)
 
         with (
             patch.object(infra_service, "_get_rm_client", return_value=mock_client),
-            patch("asyncio.to_thread", side_effect=mock_to_thread),
-            patch("asyncio.sleep", new_callable=AsyncMock),
+            patch("asyncio.to_thread", side_effect=fake_to_thread),
         ):
-            result = await infra_service._run_rm_job("ocid1.stack.test", "PLAN", "plan")
+            with pytest.raises(RuntimeError):
+                await infra_service._ensure_rm_stack(session_id, tf_dir)
+            await infra_service._ensure_rm_stack(session_id, tf_dir)
+
+        assert mock_client.update_stack.call_count == 2
+
+
+class TestRunRmJob:
+    async def test_plan_job_success(
+        self, fast_infra_service: InfraService, fake_rm_client: FakeResourceManagerClient
+    ) -> None:
+        """Planジョブが成功する。"""
+        fake_rm_client.logs = "Plan: 2 to add, 0 to change, 0 to destroy."
+
+        result = await fast_infra_service._run_rm_job("ocid1.stack.test", "PLAN", "plan")
 
         assert result.success is True
         assert result.command == "plan"
         assert result.plan_summary == "2 to add, 0 to change, 0 to destroy"
 
-    async def test_apply_job_success(self, infra_service: InfraService) -> None:
+    async def test_apply_job_success(
+        self, fast_infra_service: InfraService, fake_rm_client: FakeResourceManagerClient
+    ) -> None:
         """Applyジョブが成功する。"""
-        mock_client = MagicMock()
-
-        create_response = SimpleNamespace(data=SimpleNamespace(id="ocid1.job.test"))
-        get_response = SimpleNamespace(data=SimpleNamespace(lifecycle_state="SUCCEEDED"))
-        logs_response = SimpleNamespace(data=SimpleNamespace(text="Apply complete!"))
-
-        async def mock_to_thread(func, *args, **kwargs):
-            if func == mock_client.create_job:
-                return create_response
-            elif func == mock_client.get_job:
-                return get_response
-            elif func == mock_client.get_job_logs_content:
-                return logs_response
-            return None
+        fake_rm_client.logs = "Apply complete!"
 
-        with (
-            patch.object(infra_service, "_get_rm_client", return_value=mock_client),
-            patch("asyncio.to_thread", side_effect=mock_to_thread),
-            patch("asyncio.sleep", new_callable=AsyncMock),
-        ):
-            result = await infra_service._run_rm_job("ocid1.stack.test", "APPLY", "apply")
+        result = await fast_infra_service._run_rm_job("ocid1.stack.test", "APPLY", "apply")
 
         assert result.success is True
         assert result.command == "apply"
+        assert result.stdout == "Apply complete!"
 
-    async def test_job_failure(self, infra_service: InfraService) -> None:
+    async def test_job_failure(
+        self, fast_infra_service: InfraService, fake_rm_client: FakeResourceManagerClient
+    ) -> None:
         """ジョブが失敗する。"""
-        mock_client = MagicMock()
-
-        create_response = SimpleNamespace(data=SimpleNamespace(id="ocid1.job.test"))
-        get_response = SimpleNamespace(data=SimpleNamespace(lifecycle_state="FAILED"))
-        logs_response = SimpleNamespace(data=SimpleNamespace(text="Error: Invalid resource type"))
+        fake_rm_client.final_state = "FAILED"
+        fake_rm_client.logs = "Error: Invalid resource type"
 
-        async def mock_to_thread(func, *args, **kwargs):
-            if func == mock_client.create_job:
-                return create_response
-            elif func == mock_client.get_job:
-                return get_response
-            elif func == mock_client.get_job_logs_content:
-                return logs_response
-            return None
-
-        with (
-            patch.object(infra_service, "_get_rm_client", return_value=mock_client),
-            patch("asyncio.to_thread", side_effect=mock_to_thread),
-            patch("asyncio.sleep", new_callable=AsyncMock),
-        ):
-            result = await infra_service._run_rm_job("ocid1.stack.test", "PLAN", "plan")
+        result = await fast_infra_service._run_rm_job("ocid1.stack.test", "PLAN", "plan")
 
         assert result.success is False
         assert "FAILED" in result.stderr
 
-    async def test_job_timeout(self, infra_service: InfraService) -> None:
+    async def test_job_timeout(
+        self, fast_infra_service: InfraService, fake_rm_client: FakeResourceManagerClient
+    ) -> None:
         """ジョブがタイムアウトする。"""
-        mock_client = MagicMock()
+        fake_rm_client.polls_to_finish = None
 
-        create_response = SimpleNamespace(data=SimpleNamespace(id="ocid1.job.test"))
-        get_response = SimpleNamespace(data=SimpleNamespace(lifecycle_state="IN_PROGRESS"))
-        logs_response = SimpleNamespace(data=SimpleNamespace(text=""))
-
-        async def mock_to_thread(func, *args, **kwargs):
-            if func == mock_client.create_job:
-                return create_response
-            elif func == mock_client.get_job:
-                return get_response
-            elif func == mock_client.get_job_logs_content:
-                return logs_response
-            return None
-
-        with (
-            patch.object(infra_service, "_get_rm_client", return_value=mock_client),
-            patch("asyncio.to_thread", side_effect=mock_to_thread),
-            patch("asyncio.sleep", new_callable=AsyncMock),
-            patch("galley.services.infra._JOB_TIMEOUT_PLAN", 5),
-            patch("galley.services.infra._JOB_POLL_INTERVAL", 5),
-        ):
-            result = await infra_service._run_rm_job("ocid1.stack.test", "PLAN", "plan")
+        with patch("galley.services.infra._JOB_TIMEOUT_PLAN", 0.1):
+            result = await fast_infra_service._run_rm_job("ocid1.stack.test", "PLAN", "plan")
 
         assert result.success is False
         assert "timed out" in result.stderr
+        assert fast_infra_service.rm_poller.metrics.in_flight == 0
+
+    async def test_detects_completion_without_fixed_sleep(
+        self, fast_infra_service: InfraService, fake_rm_client: FakeResourceManagerClient
+    ) -> None:
+        """短いジョブは初期間隔で検知される。"""
+        start = time.perf_counter()
+        await fast_infra_service._run_rm_job("ocid1.stack.test", "PLAN", "plan")
+
+        assert time.perf_counter() - start < 1.0
+        assert fake_rm_client.calls["get_job"] == 1
+
+
+class TestRmJobLogStreaming:
+    async def test_streams_logs_while_job_runs(
+        self, fast_infra_service: InfraService, fake_rm_client: FakeResourceManagerClient
+    ) -> None:
+        """実行中に追加されたログが完了前にコールバックへ渡される。"""
+        fake_rm_client.polls_to_finish = None
+        received: list[list[str]] = []
+        first_chunk = asyncio.Event()
+
+        async def on_log(lines: list[str]) -> None:
+            received.append(lines)
+            first_chunk.set()
+
+        async def on_created(job_id: str) -> None:
+            fake_rm_client.emit(job_id, "Initializing provider plugins...")
+
+        task = asyncio.create_task(
+            fast_infra_service._run_rm_job("ocid1.stack.test", "PLAN", "plan", on_created=on_created, on_log=on_log)
+        )
+        await asyncio.wait_for(first_chunk.wait(), 5)
+        assert not task.done()
+
+        fake_rm_client.finish("ocid1.ormjob.test1", logs="Plan: 1 to add, 0 to change, 0 to destroy.")
+        result = await asyncio.wait_for(task, 5)
+
+        assert received == [["Initializing provider plugins..."], ["Plan: 1 to add, 0 to change, 0 to destroy."]]
+        assert result.stdout == "Initializing provider plugins...\nPlan: 1 to add, 0 to change, 0 to destroy."
+        assert result.plan_summary == "1 to add, 0 to change, 0 to destroy"
+        assert fake_rm_client.calls["get_job_logs_content"] == 0
+
+    async def test_falls_back_to_log_content_when_streaming_fails(
+        self, fast_infra_service: InfraService, fake_rm_client: FakeResourceManagerClient
+    ) -> None:
+        fake_rm_client.logs = "Apply complete!"
+
+        with patch.object(fake_rm_client, "get_job_logs", side_effect=RuntimeError("unavailable")):
+            result = await fast_infra_service._run_rm_job("ocid1.stack.test", "APPLY", "apply")
+
+        assert result.success is True
+        assert result.stdout == "Apply complete!"
+        assert fake_rm_client.calls["get_job_logs_content"] == 1
+
+
+class TestTerraformJobs:
+    @staticmethod
+    async def _orphaned_job(storage: StorageService, fake_rm_client: FakeResourceManagerClient) -> Job:
+        """再起動前に作成されたRMジョブを持つ未完了のジョブを用意する。"""
+        rm_job = fake_rm_client.create_job(
+            SimpleNamespace(stack_id="ocid1.stack.test", job_operation_details=SimpleNamespace(operation="APPLY"))
+        )
+        job = Job(kind="terraform_apply", session_id="s1", status="running", rm_job_id=rm_job.data.id)
+        await storage.save_job(job)
+        return job
+
+    async def test_resumes_rm_job_after_restart(
+        self, fast_infra_service: InfraService, fake_rm_client: FakeResourceManagerClient, storage: StorageService
+    ) -> None:
+        fake_rm_client.logs = "Apply complete!"
+        job = await self._orphaned_job(storage, fake_rm_client)
+
+        await fast_infra_service._jobs.recover()
+        done = await fast_infra_service._jobs.wait(job.id, timeout=5)
+
+        assert done.status == "succeeded"
+        assert done.result is not None
+        assert done.result["command"] == "apply"
+        assert done.result["stdout"] == "Apply complete!"
+        assert fake_rm_client.calls["create_job"] == 1
+
+    async def test_cancel_cancels_rm_job(
+        self, fast_infra_service: InfraService, fake_rm_client: FakeResourceManagerClient, storage: StorageService
+    ) -> None:
+        fake_rm_client.polls_to_finish = None
+        job = await self._orphaned_job(storage, fake_rm_client)
+        await fast_infra_service._jobs.recover()
+
+        canceled = await fast_infra_service._jobs.cancel(job.id)
+
+        assert canceled.status == "canceled"
+        assert fake_rm_client.calls["cancel_job"] == 1
+        assert fake_rm_client.jobs[job.rm_job_id or ""]["lifecycle_state"] == "CANCELED"
 
 
 class TestGetRmJobStatus:
@@ -664,6 +849,155 @@ class TestRunOciCli:
         assert called_args[1] == "compute"
         assert "--auth" not in called_args
 
+    async def test_sdk_result_skips_subprocess(self, storage: StorageService, config_dir: Path) -> None:
+        sdk = MagicMock()
+        sdk.run_cli = AsyncMock(return_value=CLIResult(success=True, stdout='{"data": []}', stderr="", exit_code=0))
+        service = InfraService(storage=storage, config_dir=config_dir, oci_sdk=sdk)
+        with patch.object(service, "_run_subprocess", new_callable=AsyncMock) as mock_proc:
+            result = await service.run_oci_cli("oci compute instance list --compartment-id ocid1.test")
+
+        assert result.stdout == '{"data": []}'
+        assert sdk.run_cli.call_args[0][0][1:] == ["compute", "instance", "list", "--compartment-id", "ocid1.test"]
+        mock_proc.assert_not_called()
+
+    async def test_unsupported_sdk_command_falls_back_to_subprocess(
+        self, storage: StorageService, config_dir: Path
+    ) -> None:
+        sdk = MagicMock()
+        sdk.run_cli = AsyncMock(return_value=None)
+        service = InfraService(storage=storage, config_dir=config_dir, oci_sdk=sdk)
+        with patch.object(service, "_run_subprocess", new_callable=AsyncMock) as mock_proc:
+            mock_proc.return_value = (0, "{}", "")
+            result = await service.run_oci_cli("oci compute instance launch --compartment-id ocid1.test")
+
+        assert result.success is True
+        mock_proc.assert_called_once()
+
+    async def test_read_only_result_is_cached(self, infra_service: InfraService) -> None:
+        with patch.object(infra_service, "_run_subprocess", new_callable=AsyncMock) as mock_proc:
+            mock_proc.return_value = (0, '{"data": []}', "")
+            first = await infra_service.run_oci_cli("oci compute shape list --compartment-id ocid1.test")
+            second = await infra_service.run_oci_cli("compute shape list --compartment-id=ocid1.test")
+
+        assert first.cached is False
+        assert second.cached is True
+        assert second.stdout == first.stdout
+        mock_proc.assert_called_once()
+        assert infra_service.cli_cache.metrics.hits == 1
+
+    async def test_force_bypasses_cache(self, infra_service: InfraService) -> None:
+        with patch.object(infra_service, "_run_subprocess", new_callable=AsyncMock) as mock_proc:
+            mock_proc.return_value = (0, '{"data": []}', "")
+            await infra_service.run_oci_cli("oci compute shape list --compartment-id ocid1.test")
+            result = await infra_service.run_oci_cli("oci compute shape list --compartment-id ocid1.test", force=True)
+
+        assert result.cached is False
+        assert mock_proc.call_count == 2
+        assert infra_service.cli_cache.metrics.bypasses == 1
+
+    async def test_mutating_command_is_not_cached_and_invalidates_service(self, infra_service: InfraService) -> None:
+        with patch.object(infra_service, "_run_subprocess", new_callable=AsyncMock) as mock_proc:
+            mock_proc.return_value = (0, "{}", "")
+            await infra_service.run_oci_cli("oci compute instance list --compartment-id ocid1.test")
+            await infra_service.run_oci_cli("oci compute instance terminate --instance-id ocid1.i --force")
+            await infra_service.run_oci_cli("oci compute instance terminate --instance-id ocid1.i --force")
+            result = await infra_service.run_oci_cli("oci compute instance list --compartment-id ocid1.test")
+
+        assert result.cached is False
+        assert mock_proc.call_count == 4
+        assert infra_service.cli_cache.metrics.invalidations == 1
+
+
+class TestRunOciCliBatch:
+    async def test_results_keep_input_order_under_concurrency_cap(
+        self, storage: StorageService, config_dir: Path
+    ) -> None:
+        service = InfraService(storage=storage, config_dir=config_dir, cli_batch_concurrency=2)
+        running = 0
+        max_running = 0
+
+        async def fake_subprocess(args: list[str], cwd: str | None = None) -> tuple[int, str, str]:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            # 後のコマンドほど早く終わる
+            await asyncio.sleep(0.01 * (5 - int(args[-1])))
+            running -= 1
+            return (0, args[-1], "")
+
+        commands = [f"oci compute image get --image-id {i}" for i in range(5)]
+        with patch.object(service, "_run_subprocess", side_effect=fake_subprocess):
+            items = await service.run_oci_cli_batch(commands)
+
+        assert [item.command for item in items] == commands
+        assert [item.result.stdout for item in items if item.result] == ["0", "1", "2", "3", "4"]
+        assert all(item.duration_seconds > 0 for item in items)
+        assert max_running == 2
+
+    async def test_disallowed_command_is_reported_per_item(self, infra_service: InfraService) -> None:
+        with patch.object(infra_service, "_run_subprocess", new_callable=AsyncMock) as mock_proc:
+            mock_proc.return_value = (0, '{"data": []}', "")
+            items = await infra_service.run_oci_cli_batch(
+                ["oci iam region list", "oci setup config", "oci compute shape list -c ocid1.test"]
+            )
+
+        assert items[0].result is not None and items[0].result.success
+        assert items[1].error == "CommandNotAllowedError"
+        assert items[1].result is None
+        assert items[2].result is not None and items[2].result.success
+        assert mock_proc.call_count == 2
+
+    async def test_validates_each_command_once(self, infra_service: InfraService) -> None:
+        commands = ["oci iam region list", "oci compute shape list -c ocid1.test"]
+        with (
+            patch.object(infra_service, "_run_subprocess", new_callable=AsyncMock) as mock_proc,
+            patch.object(infra_service, "_validate_oci_command", wraps=infra_service._validate_oci_command) as validate,
+        ):
+            mock_proc.return_value = (0, '{"data": []}', "")
+            await infra_service.run_oci_cli_batch(commands)
+
+        assert validate.call_count == len(commands)
+
+    async def test_execution_error_is_reported_per_item(self, infra_service: InfraService) -> None:
+        with patch.object(infra_service, "_run_subprocess", new_callable=AsyncMock) as mock_proc:
+            mock_proc.side_effect = FileNotFoundError("oci")
+            items = await infra_service.run_oci_cli_batch(["oci iam region list"])
+
+        assert items[0].error == "FileNotFoundError"
+        assert items[0].result is None
+
+    async def test_unexpected_error_is_recorded_per_command(self, infra_service: InfraService) -> None:
+        async def run_subprocess(args: list[str]) -> tuple[int, str, str]:
+            if args[1] == "compute":
+                raise RuntimeError("unexpected")
+            await asyncio.sleep(0.01)
+            return 0, '{"data": []}', ""
+
+        with patch.object(infra_service, "_run_subprocess", side_effect=run_subprocess):
+            items = await infra_service.run_oci_cli_batch(
+                ["oci iam region list", "oci compute instance list", "oci iam compartment list"]
+            )
+
+        assert [item.error for item in items] == [None, "RuntimeError", None]
+        assert items[1].message == "unexpected"
+        assert items[0].result is not None and items[0].result.success
+        assert items[2].result is not None and items[2].result.success
+
+    async def test_uses_sdk_executor_and_cache(self, storage: StorageService, config_dir: Path) -> None:
+        sdk = MagicMock()
+        sdk.run_cli = AsyncMock(return_value=CLIResult(success=True, stdout='{"data": []}', stderr="", exit_code=0))
+        service = InfraService(storage=storage, config_dir=config_dir, oci_sdk=sdk)
+
+        await service.run_oci_cli_batch(["oci iam region list"])
+        items = await service.run_oci_cli_batch(["oci iam region list", "oci iam compartment list"])
+
+        assert sdk.run_cli.call_count == 2
+        assert items[0].result is not None and items[0].result.cached is True
+
+    async def test_too_many_commands(self, infra_service: InfraService) -> None:
+        with pytest.raises(ValueError, match="Too many commands"):
+            await infra_service.run_oci_cli_batch(["oci iam region list"] * (MAX_CLI_BATCH_SIZE + 1))
+
 
 class TestCommandWhitelist:
     def test_allowed_services(self, infra_service: InfraService) -> None:
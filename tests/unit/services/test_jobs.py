@@ -0,0 +1,306 @@
+"""JobServiceのユニットテスト。"""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from galley.models.errors import InfraOperationInProgressError, JobNotFoundError
+from galley.models.jobs import Job
+from galley.services.jobs import JobService
+from galley.storage.service import StorageService
+
+
+@pytest.fixture
+def job_service(storage: StorageService) -> JobService:
+    return JobService(storage, max_concurrency=2)
+
+
+async def _succeed(job: Job) -> dict[str, Any]:
+    return {"success": True, "value": 42}
+
+
+class TestSubmit:
+    async def test_returns_immediately_and_persists_result(
+        self, job_service: JobService, storage: StorageService
+    ) -> None:
+        release = asyncio.Event()
+
+        async def handler(job: Job) -> dict[str, Any]:
+            await release.wait()
+            return {"success": True}
+
+        job = await job_service.submit("terraform_plan", "s1", handler, params={"terraform_dir": "/tmp/tf"})
+        assert job.status == "queued"
+
+        release.set()
+        done = await job_service.wait(job.id, timeout=5)
+
+        assert done.status == "succeeded"
+        assert done.result == {"success": True}
+        assert done.finished_at is not None
+        persisted = await storage.load_job(job.id)
+        assert persisted.status == "succeeded"
+        assert persisted.params == {"terraform_dir": "/tmp/tf"}
+
+    async def test_unsuccessful_result_marks_job_failed(self, job_service: JobService) -> None:
+        async def handler(job: Job) -> dict[str, Any]:
+            return {"success": False, "reason": "boom"}
+
+        job = await job_service.submit("build_and_deploy", "s1", handler)
+        done = await job_service.wait(job.id, timeout=5)
+
+        assert done.status == "failed"
+        assert done.result == {"success": False, "reason": "boom"}
+
+    async def test_exception_marks_job_failed(self, job_service: JobService) -> None:
+        async def handler(job: Job) -> dict[str, Any]:
+            raise RuntimeError("kaboom")
+
+        job = await job_service.submit("terraform_apply", "s1", handler)
+        done = await job_service.wait(job.id, timeout=5)
+
+        assert done.status == "failed"
+        assert done.error == "RuntimeError: kaboom"
+
+    async def test_rejects_second_job_for_same_session(self, job_service: JobService) -> None:
+        release = asyncio.Event()
+
+        async def handler(job: Job) -> dict[str, Any]:
+            await release.wait()
+            return {}
+
+        await job_service.submit("terraform_apply", "s1", handler)
+        with pytest.raises(InfraOperationInProgressError):
+            await job_service.submit("terraform_plan", "s1", handler)
+        # 別セッションは投入できる
+        await job_service.submit("terraform_plan", "s2", handler)
+        release.set()
+
+    async def test_limits_concurrency(self, job_service: JobService) -> None:
+        running = 0
+        peak = 0
+
+        async def handler(job: Job) -> dict[str, Any]:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return {}
+
+        jobs = [await job_service.submit("terraform_plan", f"s{i}", handler) for i in range(5)]
+        await asyncio.sleep(0.005)
+        queued = await job_service.get(jobs[-1].id)
+        assert queued.status == "queued"
+
+        for job in jobs:
+            await job_service.wait(job.id, timeout=5)
+        assert peak == 2
+
+
+class TestWaitAndGet:
+    async def test_wait_returns_current_state_on_timeout(self, job_service: JobService) -> None:
+        release = asyncio.Event()
+
+        async def handler(job: Job) -> dict[str, Any]:
+            await release.wait()
+            return {}
+
+        job = await job_service.submit("terraform_plan", "s1", handler)
+        waited = await job_service.wait(job.id, timeout=0.05)
+        assert waited.status == "running"
+        release.set()
+
+    async def test_get_unknown_job(self, job_service: JobService) -> None:
+        with pytest.raises(JobNotFoundError):
+            await job_service.get("nonexistent")
+
+    async def test_list_jobs_by_session(self, job_service: JobService) -> None:
+        first = await job_service.submit("terraform_plan", "s1", _succeed)
+        await job_service.wait(first.id)
+        second = await job_service.submit("terraform_apply", "s1", _succeed)
+        await job_service.wait(second.id)
+        await job_service.submit("terraform_plan", "s2", _succeed)
+
+        jobs = await job_service.list_jobs("s1")
+
+        assert [j.id for j in jobs] == [first.id, second.id]
+
+
+class TestProgress:
+    async def test_wait_forwards_progress(self, job_service: JobService) -> None:
+        release = asyncio.Event()
+
+        async def handler(job: Job) -> dict[str, Any]:
+            await release.wait()
+            job_service.report_progress(job.id, ["Apply complete!"])
+            return {"success": True}
+
+        job = await job_service.submit("terraform_apply", "s1", handler)
+        job_service.report_progress(job.id, ["Initializing...", ""])
+        received: list[tuple[int, list[str]]] = []
+
+        async def on_progress(current: Job, lines: list[str]) -> None:
+            received.append((current.progress_lines, lines))
+            if len(received) == 1:
+                release.set()
+
+        waiter = asyncio.create_task(job_service.wait(job.id, timeout=5, on_progress=on_progress))
+        await asyncio.sleep(0)
+        job_service.report_progress(job.id, ["Creating..."])
+        done = await waiter
+
+        assert received == [(3, ["Creating..."]), (4, ["Apply complete!"])]
+        assert done.status == "succeeded"
+        assert done.progress_lines == 4
+        assert done.progress_message == "Apply complete!"
+
+    async def test_report_progress_for_finished_job_is_ignored(self, job_service: JobService) -> None:
+        job = await job_service.submit("terraform_plan", "s1", _succeed)
+        await job_service.wait(job.id)
+
+        job_service.report_progress(job.id, ["late"])
+
+        assert (await job_service.get(job.id)).progress_lines == 0
+
+
+class TestCancel:
+    async def test_cancels_task_and_external_job(self, job_service: JobService) -> None:
+        canceled_rm_jobs: list[str | None] = []
+
+        async def cancel_rm(job: Job) -> None:
+            canceled_rm_jobs.append(job.rm_job_id)
+
+        job_service.register("terraform_apply", cancel=cancel_rm)
+        started = asyncio.Event()
+
+        async def handler(job: Job) -> dict[str, Any]:
+            job.rm_job_id = "ocid1.ormjob.test"
+            await job_service.update(job)
+            started.set()
+            await asyncio.sleep(60)
+            return {}
+
+        job = await job_service.submit("terraform_apply", "s1", handler)
+        await started.wait()
+
+        canceled = await job_service.cancel(job.id)
+
+        assert canceled.status == "canceled"
+        assert canceled_rm_jobs == ["ocid1.ormjob.test"]
+
+    async def test_cancel_before_start(self, job_service: JobService, storage: StorageService) -> None:
+        job = await job_service.submit("terraform_plan", "s1", _succeed)
+
+        canceled = await job_service.cancel(job.id)
+
+        assert canceled.status == "canceled"
+        assert (await storage.load_job(job.id)).status == "canceled"
+        # キャンセル後は同じセッションで新しいジョブを投入できる
+        await job_service.submit("terraform_plan", "s1", _succeed)
+
+    async def test_cancel_finished_job_is_noop(self, job_service: JobService) -> None:
+        job = await job_service.submit("terraform_plan", "s1", _succeed)
+        await job_service.wait(job.id)
+
+        result = await job_service.cancel(job.id)
+
+        assert result.status == "succeeded"
+
+
+class TestRecover:
+    async def test_resumes_jobs_with_rm_job_and_fails_others(self, storage: StorageService) -> None:
+        resumable = Job(kind="terraform_apply", session_id="s1", status="running", rm_job_id="ocid1.ormjob.a")
+        interrupted = Job(kind="build_and_deploy", session_id="s2", status="running")
+        never_started = Job(kind="terraform_plan", session_id="s3")
+        finished = Job(kind="terraform_plan", session_id="s4", status="succeeded")
+        for job in (resumable, interrupted, never_started, finished):
+            await storage.save_job(job)
+
+        resumed: list[str | None] = []
+
+        async def resume(job: Job) -> dict[str, Any]:
+            resumed.append(job.rm_job_id)
+            return {"success": True}
+
+        job_service = JobService(storage)
+        job_service.register("terraform_apply", resume=resume)
+        await job_service.recover()
+        await job_service.recover()  # 2回目は何もしない
+
+        done = await job_service.wait(resumable.id, timeout=5)
+        assert done.status == "succeeded"
+        assert resumed == ["ocid1.ormjob.a"]
+        for job_id in (interrupted.id, never_started.id):
+            job = await job_service.get(job_id)
+            assert job.status == "failed"
+            assert job.error == "Interrupted by server restart"
+        assert (await job_service.get(finished.id)).status == "succeeded"
+
+
+class TestClose:
+    async def test_shutdown_keeps_jobs_resumable(self, storage: StorageService) -> None:
+        started = asyncio.Event()
+
+        async def handler(job: Job) -> dict[str, Any]:
+            job.rm_job_id = "ocid1.ormjob.test"
+            await job_service.update(job)
+            started.set()
+            await asyncio.sleep(60)
+            return {}
+
+        job_service = JobService(storage, max_concurrency=1)
+        running = await job_service.submit("terraform_apply", "s1", handler)
+        queued = await job_service.submit("terraform_plan", "s2", _succeed)
+        await started.wait()
+
+        await job_service.close()
+
+        assert (await storage.load_job(running.id)).status == "running"
+        assert (await storage.load_job(queued.id)).status == "queued"
+        assert not job_service.has_active_job("s1")
+
+        resumed: list[str | None] = []
+
+        async def resume(job: Job) -> dict[str, Any]:
+            resumed.append(job.rm_job_id)
+            return {"success": True}
+
+        restarted = JobService(storage)
+        restarted.register("terraform_apply", resume=resume)
+        await restarted.recover()
+
+        assert (await restarted.wait(running.id, timeout=5)).status == "succeeded"
+        assert resumed == ["ocid1.ormjob.test"]
+        assert (await restarted.get(queued.id)).status == "failed"
+
+    async def test_unrequested_task_cancellation_is_not_recorded_as_canceled(
+        self, job_service: JobService, storage: StorageService
+    ) -> None:
+        started = asyncio.Event()
+
+        async def handler(job: Job) -> dict[str, Any]:
+            started.set()
+            await asyncio.sleep(60)
+            return {}
+
+        job = await job_service.submit("terraform_apply", "s1", handler)
+        await started.wait()
+        # イベントループ終了時と同じく、cancelを経由せずにタスクをキャンセルする
+        task = job_service._tasks[job.id]
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert (await storage.load_job(job.id)).status == "running"
+
+    async def test_recover_runs_again_after_close(self, storage: StorageService) -> None:
+        job_service = JobService(storage)
+        await job_service.recover()
+        await job_service.close()
+        await storage.save_job(Job(kind="terraform_plan", session_id="s1", status="running"))
+
+        await job_service.recover()
+
+        assert [j.status for j in await job_service.list_jobs("s1")] == ["failed"]
@@ -0,0 +1,45 @@
+"""OCI CLIの引数解析のユニットテスト。"""
+
+from galley.services.oci_cli_args import command_service, parse_command
+
+
+class TestParseCommand:
+    def test_splits_auth_words_and_options(self) -> None:
+        command = parse_command(
+            ["oci", "--auth", "resource_principal", "compute", "instance", "list", "-c", "ocid1.c", "--all"]
+        )
+
+        assert command is not None
+        assert command.auth == "resource_principal"
+        assert command.words == ["compute", "instance", "list"]
+        assert command.service == "compute"
+        assert command.options == {"compartment_id": "ocid1.c", "all": True}
+
+    def test_aliases_and_syntax_are_normalized(self) -> None:
+        forms = [
+            ["os", "object", "list", "--namespace", "ns", "--bucket-name", "b"],
+            ["os", "object", "list", "--namespace-name=ns", "-bn", "b"],
+            ["os", "object", "list", "-ns", "ns", "--bucket-name=b"],
+        ]
+
+        for args in forms:
+            command = parse_command(args)
+            assert command is not None
+            assert command.options == {"namespace_name": "ns", "bucket_name": "b"}
+
+    def test_negative_number_is_a_value(self) -> None:
+        command = parse_command(["monitoring", "metric-data", "get", "--offset", "-1", "-c", "ocid1.c"])
+
+        assert command is not None
+        assert command.options == {"offset": "-1", "compartment_id": "ocid1.c"}
+
+    def test_repeated_option_is_rejected(self) -> None:
+        assert parse_command(["compute", "image", "list", "-c", "ocid1.a", "--compartment-id", "ocid1.b"]) is None
+        assert parse_command(["compute", "image", "list", "--all", "--all"]) is None
+
+    def test_positional_after_options_is_rejected(self) -> None:
+        assert parse_command(["compute", "image", "list", "--all", "extra", "value"]) is None
+
+    def test_command_service(self) -> None:
+        assert command_service(["oci", "--auth", "resource_principal", "iam", "region", "list"]) == "iam"
+        assert command_service(["compute", "instance", "list"]) == "compute"
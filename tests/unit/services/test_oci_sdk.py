@@ -0,0 +1,259 @@
+"""OCISDKExecutorのユニットテスト。"""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import oci
+import pytest
+
+from galley.services.oci_sdk import OCISDKExecutor
+
+
+def _response(data: Any, next_page: str | None = None) -> oci.response.Response:
+    headers = {"opc-next-page": next_page} if next_page else {}
+    return oci.response.Response(200, headers, data, None)
+
+
+class FakeComputeClient:
+    """ComputeClientのフェイク（2ページのインスタンス一覧を返す）。"""
+
+    def __init__(self, region: str | None) -> None:
+        self.region = region
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    def list_instances(self, compartment_id: str, **kwargs: Any) -> oci.response.Response:
+        """
+        :param str compartment_id: (required)
+        :param int limit: (optional)
+        :param str page: (optional)
+        :param str lifecycle_state: (optional)
+        """
+        unknown = set(kwargs) - {"limit", "page", "lifecycle_state"}
+        if unknown:
+            raise ValueError(f"list_instances got unknown kwargs: {unknown!r}")
+        self.calls.append(("list_instances", {"compartment_id": compartment_id, **kwargs}))
+        if kwargs.get("page") == "2":
+            return _response([oci.core.models.Instance(id="ocid1.instance.b", display_name="vm-b")])
+        return _response(
+            [oci.core.models.Instance(id="ocid1.instance.a", display_name="vm-a", lifecycle_state="RUNNING")],
+            next_page="2",
+        )
+
+    def get_instance(self, instance_id: str, **kwargs: Any) -> oci.response.Response:
+        """
+        :param str instance_id: (required)
+        """
+        self.calls.append(("get_instance", {"instance_id": instance_id}))
+        if instance_id == "missing":
+            raise oci.exceptions.ServiceError(404, "NotAuthorizedOrNotFound", {"opc-request-id": "req-1"}, "not found")
+        return _response(oci.core.models.Instance(id=instance_id, display_name="vm"))
+
+
+class FakeObjectStorageClient:
+    """ObjectStorageClientのフェイク。"""
+
+    def __init__(self) -> None:
+        self.namespace_calls = 0
+        self.objects: dict[tuple[str, str, str], bytes] = {}
+        self.list_calls: list[dict[str, Any]] = []
+
+    def get_namespace(self, **kwargs: Any) -> oci.response.Response:
+        self.namespace_calls += 1
+        return _response("testns")
+
+    def list_objects(self, namespace_name: str, bucket_name: str, **kwargs: Any) -> oci.response.Response:
+        """
+        :param str namespace_name: (required)
+        :param str bucket_name: (required)
+        """
+        self.list_calls.append({"namespace_name": namespace_name, "bucket_name": bucket_name, **kwargs})
+        return _response(oci.object_storage.models.ListObjects(objects=[], prefixes=[]))
+
+    def put_object(self, namespace_name: str, bucket_name: str, object_name: str, body: Any) -> None:
+        self.objects[(namespace_name, bucket_name, object_name)] = body.read()
+
+
+class FakeContainerEngineClient:
+    def create_kubeconfig(self, cluster_id: str, details: Any) -> oci.response.Response:
+        self.details = details
+        return _response(SimpleNamespace(text=f"cluster: {cluster_id}\n"))
+
+
+class FakeInstanceAgentClient:
+    def __init__(self) -> None:
+        self.created: list[Any] = []
+
+    def create_instance_agent_command(self, details: Any) -> oci.response.Response:
+        self.created.append(details)
+        return _response(SimpleNamespace(id="ocid1.command.test"))
+
+    def get_instance_agent_command_execution(self, command_id: str, instance_id: str) -> oci.response.Response:
+        models = oci.compute_instance_agent.models
+        return _response(
+            models.InstanceAgentCommandExecution(
+                lifecycle_state="SUCCEEDED",
+                content=models.InstanceAgentCommandExecutionOutputViaTextDetails(exit_code=0, text="BUILD_SUCCESS"),
+            )
+        )
+
+
+class FakeClientFactory:
+    """クライアントクラス・リージョンごとにフェイクを返すファクトリ。"""
+
+    def __init__(self) -> None:
+        self.compute: dict[str | None, FakeComputeClient] = {}
+        self.object_storage = FakeObjectStorageClient()
+        self.container_engine = FakeContainerEngineClient()
+        self.instance_agent = FakeInstanceAgentClient()
+        self.created: list[tuple[type[Any], str | None]] = []
+
+    def __call__(self, client_class: type[Any], region: str | None) -> Any:
+        self.created.append((client_class, region))
+        if client_class is oci.core.ComputeClient:
+            return self.compute.setdefault(region, FakeComputeClient(region))
+        if client_class is oci.object_storage.ObjectStorageClient:
+            return self.object_storage
+        if client_class is oci.container_engine.ContainerEngineClient:
+            return self.container_engine
+        if client_class is oci.compute_instance_agent.ComputeInstanceAgentClient:
+            return self.instance_agent
+        return object()
+
+
+@pytest.fixture
+def factory() -> FakeClientFactory:
+    return FakeClientFactory()
+
+
+@pytest.fixture
+def executor(factory: FakeClientFactory) -> OCISDKExecutor:
+    return OCISDKExecutor(client_factory=factory)
+
+
+class TestRunCli:
+    async def test_list_returns_cli_json_with_next_page(
+        self, executor: OCISDKExecutor, factory: FakeClientFactory
+    ) -> None:
+        result = await executor.run_cli(["oci", "compute", "instance", "list", "--compartment-id", "ocid1.c"])
+
+        assert result is not None
+        assert result.success is True
+        output = json.loads(result.stdout)
+        assert output["data"][0]["id"] == "ocid1.instance.a"
+        assert output["data"][0]["display-name"] == "vm-a"
+        assert output["data"][0]["lifecycle-state"] == "RUNNING"
+        assert output["opc-next-page"] == "2"
+        assert factory.compute[None].calls == [("list_instances", {"compartment_id": "ocid1.c"})]
+
+    async def test_all_follows_pagination(self, executor: OCISDKExecutor) -> None:
+        result = await executor.run_cli(["compute", "instance", "list", "-c", "ocid1.c", "--all"])
+
+        assert result is not None
+        output = json.loads(result.stdout)
+        assert [item["id"] for item in output["data"]] == ["ocid1.instance.a", "ocid1.instance.b"]
+        assert "opc-next-page" not in output
+
+    async def test_options_are_coerced_to_sdk_types(self, executor: OCISDKExecutor, factory: FakeClientFactory) -> None:
+        await executor.run_cli(["compute", "instance", "list", "--compartment-id=ocid1.c", "--limit", "5"])
+
+        assert factory.compute[None].calls[0][1] == {"compartment_id": "ocid1.c", "limit": 5}
+
+    async def test_region_selects_regional_client(self, executor: OCISDKExecutor, factory: FakeClientFactory) -> None:
+        await executor.run_cli(["compute", "instance", "get", "--instance-id", "ocid1.i", "--region", "us-ashburn-1"])
+        await executor.run_cli(["compute", "instance", "get", "--instance-id", "ocid1.i", "--region", "us-ashburn-1"])
+
+        assert len(factory.compute["us-ashburn-1"].calls) == 2
+        assert None not in factory.compute
+
+    async def test_resource_principal_auth_args_are_ignored(self, executor: OCISDKExecutor) -> None:
+        result = await executor.run_cli(
+            ["oci", "--auth", "resource_principal", "compute", "instance", "get", "--instance-id", "ocid1.i"]
+        )
+
+        assert result is not None
+        assert json.loads(result.stdout)["data"]["id"] == "ocid1.i"
+
+    async def test_service_error_is_returned_as_failed_result(self, executor: OCISDKExecutor) -> None:
+        result = await executor.run_cli(["compute", "instance", "get", "--instance-id", "missing"])
+
+        assert result is not None
+        assert result.success is False
+        assert result.exit_code == 1
+        assert result.stderr.startswith("ServiceError:")
+        assert json.loads(result.stderr.split("\n", 1)[1])["code"] == "NotAuthorizedOrNotFound"
+
+    async def test_object_storage_namespace_is_resolved_once(
+        self, executor: OCISDKExecutor, factory: FakeClientFactory
+    ) -> None:
+        await executor.run_cli(["os", "object", "list", "--bucket-name", "b"])
+        await executor.run_cli(["os", "object", "list", "-bn", "b"])
+
+        assert factory.object_storage.namespace_calls == 1
+        assert factory.object_storage.list_calls[0] == {"namespace_name": "testns", "bucket_name": "b"}
+
+    async def test_namespace_get_uses_alias(self, executor: OCISDKExecutor) -> None:
+        result = await executor.run_cli(["os", "ns", "get"])
+
+        assert result is not None
+        assert json.loads(result.stdout) == {"data": "testns"}
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ["compute", "instance", "launch", "--compartment-id", "ocid1.c"],
+            ["compute", "instance", "terminate", "--instance-id", "ocid1.i", "--force"],
+            ["compute", "instance", "list", "--compartment-id", "ocid1.c", "--query", "data[0]"],
+            ["compute", "instance", "list", "--compartment-id", "ocid1.c", "--output", "table"],
+            ["compute", "instance", "list", "--compartment-id", "ocid1.c", "--unknown-option", "x"],
+            ["compute", "no-such-resource", "list"],
+            ["compute", "instance", "list", "positional"],
+            ["setup", "config", "get"],
+        ],
+    )
+    async def test_unsupported_commands_fall_back(self, executor: OCISDKExecutor, args: list[str]) -> None:
+        assert await executor.run_cli(args) is None
+
+    async def test_unavailable_when_credentials_cannot_be_loaded(self) -> None:
+        def failing_factory(client_class: type[Any], region: str | None) -> Any:
+            raise oci.exceptions.ConfigFileNotFound("no config")
+
+        executor = OCISDKExecutor(client_factory=failing_factory)
+
+        assert executor.available is False
+        assert await executor.run_cli(["compute", "instance", "list", "-c", "ocid1.c"]) is None
+
+
+class TestDeployOperations:
+    async def test_put_object_uploads_file(
+        self, executor: OCISDKExecutor, factory: FakeClientFactory, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "app.tar.gz"
+        path.write_bytes(b"archive")
+
+        await executor.put_object("ns", "bucket", "builds/app.tar.gz", path)
+
+        assert factory.object_storage.objects[("ns", "bucket", "builds/app.tar.gz")] == b"archive"
+
+    async def test_create_kubeconfig_writes_file(
+        self, executor: OCISDKExecutor, factory: FakeClientFactory, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "session" / "kubeconfig"
+
+        await executor.create_kubeconfig("ocid1.cluster.test", path)
+
+        assert path.read_text(encoding="utf-8") == "cluster: ocid1.cluster.test\n"
+        assert factory.container_engine.details.token_version == "2.0.0"
+
+    async def test_instance_agent_command_round_trip(
+        self, executor: OCISDKExecutor, factory: FakeClientFactory
+    ) -> None:
+        command_id = await executor.create_instance_agent_command("ocid1.c", "ocid1.instance", "echo hi", 600)
+        state, exit_code, output = await executor.get_instance_agent_command_execution(command_id, "ocid1.instance")
+
+        details = factory.instance_agent.created[0]
+        assert command_id == "ocid1.command.test"
+        assert details.target.instance_id == "ocid1.instance"
+        assert details.content.source.text == "echo hi"
+        assert (state, exit_code, output) == ("SUCCEEDED", 0, "BUILD_SUCCESS")
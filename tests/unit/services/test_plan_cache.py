@@ -0,0 +1,78 @@
+"""PlanCacheのユニットテスト。"""
+
+from galley.models.infra import TerraformResult
+from galley.services.plan_cache import PlanCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _plan(success: bool = True) -> TerraformResult:
+    return TerraformResult(
+        success=success,
+        command="plan",
+        stdout="Plan: 1 to add, 0 to change, 0 to destroy.",
+        stderr="",
+        exit_code=0 if success else 1,
+        plan_summary="1 to add, 0 to change, 0 to destroy" if success else None,
+    )
+
+
+class TestPlanCache:
+    def test_hit_for_same_stack_config(self) -> None:
+        cache = PlanCache(60)
+        cache.put("stack", "hash-a", _plan())
+
+        cached = cache.get("stack", "hash-a")
+
+        assert cached is not None
+        assert cached.cached is True
+        assert cached.plan_summary == "1 to add, 0 to change, 0 to destroy"
+        assert cache.metrics.hits == 1
+        assert cache.metrics.misses == 0
+
+    def test_miss_for_changed_config_or_other_stack(self) -> None:
+        cache = PlanCache(60)
+        cache.put("stack", "hash-a", _plan())
+
+        assert cache.get("stack", "hash-b") is None
+        assert cache.get("other", "hash-a") is None
+        assert cache.metrics.misses == 2
+        assert cache.metrics.entries == 1
+
+    def test_entries_expire(self) -> None:
+        clock = _Clock()
+        cache = PlanCache(60, clock=clock)
+        cache.put("stack", "hash-a", _plan())
+
+        clock.now = 59.0
+        assert cache.get("stack", "hash-a") is not None
+        clock.now = 60.0
+        assert cache.get("stack", "hash-a") is None
+        assert cache.metrics.entries == 0
+
+    def test_failed_plan_is_not_cached(self) -> None:
+        cache = PlanCache(60)
+        cache.put("stack", "hash-a", _plan(success=False))
+
+        assert cache.get("stack", "hash-a") is None
+
+    def test_invalidate(self) -> None:
+        cache = PlanCache(60)
+        cache.put("stack", "hash-a", _plan())
+
+        cache.invalidate("stack")
+
+        assert cache.get("stack", "hash-a") is None
+
+    def test_disabled_with_zero_ttl(self) -> None:
+        cache = PlanCache(0)
+        cache.put("stack", "hash-a", _plan())
+
+        assert cache.enabled is False
+        assert cache.metrics.entries == 0
@@ -0,0 +1,58 @@
+"""RMJobLogStreamのユニットテスト。"""
+
+from types import SimpleNamespace
+
+from galley.services.rm_logs import RMJobLogStream
+from tests.unit.services.conftest import FakeResourceManagerClient
+
+_JOB_ID = "ocid1.ormjob.test1"
+
+
+def _client(**kwargs: object) -> FakeResourceManagerClient:
+    client = FakeResourceManagerClient(**kwargs)  # type: ignore[arg-type]
+    client.log_entries[_JOB_ID] = []
+    return client
+
+
+class TestRMJobLogStream:
+    async def test_returns_only_new_lines(self) -> None:
+        client = _client()
+        stream = RMJobLogStream(client, _JOB_ID)
+
+        client.emit(_JOB_ID, "Initializing...", "Refreshing state...")
+        assert await stream.fetch() == ["Initializing...", "Refreshing state..."]
+        assert await stream.fetch() == []
+
+        client.emit(_JOB_ID, "Plan: 1 to add, 0 to change, 0 to destroy.")
+        assert await stream.fetch() == ["Plan: 1 to add, 0 to change, 0 to destroy."]
+        assert stream.line_count == 3
+
+    async def test_deduplicates_entries_with_same_timestamp(self) -> None:
+        client = _client()
+        stream = RMJobLogStream(client, _JOB_ID)
+        client.emit(_JOB_ID, "a", "b")
+        await stream.fetch()
+
+        # 取得済みのエントリと同じタイムスタンプのエントリが後から追加される
+        timestamp = client.log_entries[_JOB_ID][-1].timestamp
+        client.log_entries[_JOB_ID].append(SimpleNamespace(timestamp=timestamp, message="c"))
+
+        assert await stream.fetch() == ["c"]
+
+    async def test_follows_pages(self) -> None:
+        client = _client(log_page_size=2)
+        stream = RMJobLogStream(client, _JOB_ID)
+        client.emit(_JOB_ID, *(f"line {i}" for i in range(5)))
+
+        assert await stream.fetch() == [f"line {i}" for i in range(5)]
+        assert client.calls["get_job_logs"] == 3
+
+    async def test_keeps_only_tail(self) -> None:
+        client = _client()
+        stream = RMJobLogStream(client, _JOB_ID, tail_lines=2)
+        client.emit(_JOB_ID, "one", "two\nthree")
+
+        await stream.fetch()
+
+        assert stream.line_count == 3
+        assert stream.text == "... (1 earlier log lines omitted)\ntwo\nthree"
@@ -0,0 +1,108 @@
+"""RMJobPollerのユニットテスト。"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from galley.services.rm_poller import RMJobPoller
+from tests.unit.services.conftest import FakeResourceManagerClient
+
+
+def _create_jobs(client: FakeResourceManagerClient, count: int) -> list[str]:
+    details = SimpleNamespace(stack_id="ocid1.stack.test", job_operation_details=SimpleNamespace(operation="PLAN"))
+    return [client.create_job(details).data.id for _ in range(count)]
+
+
+@pytest.fixture
+def client() -> FakeResourceManagerClient:
+    return FakeResourceManagerClient(polls_to_finish=None)
+
+
+@pytest.fixture
+def poller(client: FakeResourceManagerClient) -> RMJobPoller:
+    return RMJobPoller(lambda: client, initial_interval=0.01, max_interval=0.04, backoff=2.0)
+
+
+class TestRMJobPoller:
+    async def test_returns_terminal_job(self, client: FakeResourceManagerClient, poller: RMJobPoller) -> None:
+        (job_id,) = _create_jobs(client, 1)
+        client.finish(job_id, "FAILED")
+
+        job = await poller.wait(job_id, timeout=1)
+
+        assert job.lifecycle_state == "FAILED"
+        metrics = poller.metrics
+        assert metrics.jobs_completed == 1
+        assert metrics.in_flight == 0
+        assert metrics.detection_count == 1
+        assert metrics.detection_latency_max_seconds < 1
+
+    async def test_batches_jobs_in_same_compartment(
+        self, client: FakeResourceManagerClient, poller: RMJobPoller
+    ) -> None:
+        job_ids = _create_jobs(client, 10)
+        waits = [
+            asyncio.create_task(poller.wait(job_id, compartment_id=client.compartment_id, timeout=2))
+            for job_id in job_ids
+        ]
+        await asyncio.sleep(0.1)
+        for job_id in job_ids:
+            client.finish(job_id)
+
+        jobs = await asyncio.gather(*waits)
+
+        assert all(job.lifecycle_state == "SUCCEEDED" for job in jobs)
+        assert client.calls["get_job"] == 0
+        # 10件のジョブを1回のlist_jobsでまとめて確認する
+        assert client.calls["list_jobs"] == poller.metrics.polls
+        assert poller.metrics.api_calls == client.calls["list_jobs"]
+
+    async def test_shares_polling_between_waiters(self, client: FakeResourceManagerClient, poller: RMJobPoller) -> None:
+        (job_id,) = _create_jobs(client, 1)
+        waits = [asyncio.create_task(poller.wait(job_id, timeout=2)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        client.finish(job_id)
+
+        await asyncio.gather(*waits)
+
+        assert poller.metrics.jobs_tracked == 1
+        assert client.calls["get_job"] == poller.metrics.polls
+
+    async def test_backs_off_for_long_running_jobs(
+        self, client: FakeResourceManagerClient, poller: RMJobPoller
+    ) -> None:
+        (job_id,) = _create_jobs(client, 1)
+        with pytest.raises(TimeoutError):
+            await poller.wait(job_id, timeout=0.5)
+
+        # 間隔0.01→0.02→0.04（上限）なので、固定0.01秒間隔の50回より大幅に少ない
+        assert 5 <= client.calls["get_job"] <= 18
+        assert poller.metrics.in_flight == 0
+
+    async def test_timeout_of_one_waiter_keeps_others(
+        self, client: FakeResourceManagerClient, poller: RMJobPoller
+    ) -> None:
+        (job_id,) = _create_jobs(client, 1)
+        long_wait = asyncio.create_task(poller.wait(job_id, timeout=2))
+        with pytest.raises(TimeoutError):
+            await poller.wait(job_id, timeout=0.05)
+        client.finish(job_id)
+
+        job = await long_wait
+        assert job.lifecycle_state == "SUCCEEDED"
+
+    async def test_raises_after_repeated_errors(self, poller: RMJobPoller) -> None:
+        with pytest.raises(KeyError):
+            await poller.wait("ocid1.ormjob.unknown", timeout=2)
+        assert poller.metrics.poll_errors == 3
+
+    async def test_close_cancels_waiters(self, client: FakeResourceManagerClient, poller: RMJobPoller) -> None:
+        (job_id,) = _create_jobs(client, 1)
+        waiter = asyncio.create_task(poller.wait(job_id))
+        await asyncio.sleep(0.02)
+
+        await poller.close()
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
@@ -0,0 +1,205 @@
+"""ストレージ層テスト用フィクスチャ。"""
+
+import json
+import threading
+import uuid
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import oci
+import pytest
+
+
+class _NoopSigner(oci.auth.signers.SecurityTokenSigner):  # type: ignore[misc]
+    """リクエストに署名しないテスト用Signer。"""
+
+    def __init__(self) -> None:
+        pass
+
+    def __call__(self, request: Any, enforce_content_headers: bool = True) -> Any:
+        return request
+
+
+class FakeSigner(oci.auth.signers.SecurityTokenSigner):  # type: ignore[misc]
+    """セッショントークンを持つ署名者のフェイク。生成回数とトークン確認回数を数える。"""
+
+    created = 0
+
+    def __init__(self, *, region: str = "ap-osaka-1", tenancy_id: str = "ocid1.tenancy.test") -> None:
+        type(self).created += 1
+        self.region = region
+        self.tenancy_id = tenancy_id
+        self.token_checks = 0
+        self.refreshes = 0
+        self.expired = False
+
+    def get_security_token(self) -> str:
+        self.token_checks += 1
+        if self.expired:
+            self.refreshes += 1
+            self.expired = False
+        return f"token-{self.refreshes}"
+
+    def __call__(self, request: Any, enforce_content_headers: bool = True) -> Any:
+        return request
+
+
+class FakeObjectStorageServer:
+    """OCI Object StorageのHTTP API（オブジェクトのPUT/GET/DELETE/一覧）を模したローカルサーバー。
+
+    If-Match / If-None-Match による条件付きPUT・DELETEとETagを実装する。
+    """
+
+    def __init__(self, page_size: int = 1000) -> None:
+        self.objects: dict[str, tuple[bytes, str]] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def create_client(self) -> Any:
+        return oci.object_storage.ObjectStorageClient(
+            {},
+            signer=_NoopSigner(),
+            service_endpoint=self.endpoint,
+            retry_strategy=oci.retry.NoneRetryStrategy(),
+        )
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body and self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _error(self, status: int, code: str) -> None:
+                body = json.dumps({"code": code, "message": code}).encode()
+                self._send(status, body, {"Content-Type": "application/json"})
+
+            def _parse(self) -> tuple[str | None, dict[str, list[str]]]:
+                url = urlsplit(self.path)
+                parts = url.path.split("/")
+                # /n/{namespace}/b/{bucket}/o[/{object}]
+                name = unquote(parts[6]) if len(parts) > 6 else None
+                return name, parse_qs(url.query)
+
+            def do_PUT(self) -> None:
+                name, _ = self._parse()
+                assert name is not None
+                body = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+                server.requests.append(("PUT", name))
+                with server._lock:
+                    current = server.objects.get(name)
+                    if_match = self.headers.get("if-match")
+                    if_none_match = self.headers.get("if-none-match")
+                    if if_match and (current is None or current[1] != if_match):
+                        self._error(412, "IfMatchFailed")
+                        return
+                    if if_none_match == "*" and current is not None:
+                        self._error(412, "IfNoneMatchFailed")
+                        return
+                    etag = str(uuid.uuid4())
+                    server.objects[name] = (body, etag)
+                self._send(200, headers={"ETag": etag})
+
+            def do_GET(self) -> None:
+                name, query = self._parse()
+                if name is None:
+                    self._list(query)
+                    return
+                server.requests.append(("GET", name))
+                current = server.objects.get(name)
+                if current is None:
+                    self._error(404, "ObjectNotFound")
+                    return
+                self._send(200, current[0], {"ETag": current[1], "Content-Type": "application/octet-stream"})
+
+            def do_DELETE(self) -> None:
+                name, _ = self._parse()
+                assert name is not None
+                server.requests.append(("DELETE", name))
+                with server._lock:
+                    current = server.objects.get(name)
+                    if current is None:
+                        self._error(404, "ObjectNotFound")
+                        return
+                    if_match = self.headers.get("if-match")
+                    if if_match and current[1] != if_match:
+                        self._error(412, "IfMatchFailed")
+                        return
+                    del server.objects[name]
+                self._send(204)
+
+            def _list(self, query: dict[str, list[str]]) -> None:
+                server.requests.append(("LIST", ""))
+                prefix = query.get("prefix", [""])[0]
+                delimiter = query.get("delimiter", [""])[0]
+                start = query.get("start", [""])[0]
+                objects: list[dict[str, str]] = []
+                prefixes: list[str] = []
+                next_start: str | None = None
+                for name in sorted(server.objects):
+                    if not name.startswith(prefix):
+                        continue
+                    rest = name[len(prefix) :]
+                    if delimiter and delimiter in rest:
+                        entry = prefix + rest.split(delimiter, 1)[0] + delimiter
+                        if entry < start or entry in prefixes:
+                            continue
+                        if len(objects) + len(prefixes) >= server.page_size:
+                            next_start = entry
+                            break
+                        prefixes.append(entry)
+                    else:
+                        if name < start:
+                            continue
+                        if len(objects) + len(prefixes) >= server.page_size:
+                            next_start = name
+                            break
+                        objects.append({"name": name})
+                body: dict[str, Any] = {"objects": objects, "prefixes": prefixes}
+                if next_start:
+                    body["nextStartWith"] = next_start
+                self._send(200, json.dumps(body).encode(), {"Content-Type": "application/json"})
+
+        return Handler
+
+
+@pytest.fixture
+def object_storage_server() -> Iterator[FakeObjectStorageServer]:
+    """ローカルで動作するObject Storage互換サーバー。"""
+    server = FakeObjectStorageServer()
+    server.start()
+    yield server
+    server.stop()
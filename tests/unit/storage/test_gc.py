@@ -0,0 +1,220 @@
+"""SessionGarbageCollectorのユニットテスト。"""
+
+import asyncio
+import os
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from galley.models.errors import SessionNotFoundError
+from galley.models.jobs import Job
+from galley.models.session import Session
+from galley.services.app import AppService
+from galley.services.infra import InfraService
+from galley.services.jobs import JobService
+from galley.storage.gc import SessionGarbageCollector
+from galley.storage.service import StorageService
+
+
+async def _create_session(
+    storage: StorageService,
+    session_id: str,
+    *,
+    days_ago: int,
+    status: str = "completed",
+    payload: int = 0,
+    rm_stack_id: str | None = None,
+) -> None:
+    timestamp = datetime.now(UTC) - timedelta(days=days_ago)
+    session = Session(
+        id=session_id,
+        status=status,  # type: ignore[arg-type]
+        rm_stack_id=rm_stack_id,
+        created_at=timestamp,
+        updated_at=timestamp,
+    )
+    await storage.save_session(session)
+    if payload:
+        app_dir = storage.get_session_dir(session_id) / "app"
+        app_dir.mkdir()
+        (app_dir / "blob.bin").write_bytes(b"x" * payload)
+
+
+def _create_snapshots(storage: StorageService, session_id: str, count: int) -> None:
+    snapshots_dir = storage.get_session_dir(session_id) / "snapshots"
+    now = time.time()
+    for i in range(count):
+        snapshot = snapshots_dir / f"snap{i}"
+        snapshot.mkdir(parents=True)
+        (snapshot / "main.py").write_bytes(b"print('hello')\n" * 10)
+        os.utime(snapshot, (now - count + i, now - count + i))
+
+
+class TestSessionGarbageCollector:
+    async def test_disabled_by_default(self, storage: StorageService) -> None:
+        gc = SessionGarbageCollector(storage)
+        assert not gc.enabled
+        gc.start()
+        await gc.stop()
+
+    async def test_deletes_expired_sessions_with_target_status(self, storage: StorageService) -> None:
+        await _create_session(storage, "old-done", days_ago=40, payload=1000)
+        await _create_session(storage, "old-open", days_ago=40, status="in_progress")
+        await _create_session(storage, "new-done", days_ago=1)
+
+        report = await SessionGarbageCollector(storage, retention_days=30).collect()
+
+        assert report.deleted_sessions == ["old-done"]
+        assert report.reclaimed_bytes >= 1000
+        assert not storage.get_session_dir("old-done").exists()
+        assert sorted(await storage.list_sessions()) == ["new-done", "old-open"]
+        with pytest.raises(SessionNotFoundError):
+            await storage.load_session("old-done")
+
+    async def test_processes_in_batches(self, storage: StorageService) -> None:
+        for i in range(7):
+            await _create_session(storage, f"s{i}", days_ago=40)
+
+        report = await SessionGarbageCollector(storage, retention_days=30, batch_size=2).collect()
+
+        assert len(report.deleted_sessions) == 7
+        assert await storage.list_sessions() == []
+
+    async def test_skips_locked_sessions(self, storage: StorageService) -> None:
+        await _create_session(storage, "busy", days_ago=40)
+        await _create_session(storage, "idle", days_ago=40)
+        gc = SessionGarbageCollector(storage, retention_days=30, batch_size=1)
+
+        async with storage.session_lock("busy"):
+            report = await gc.collect()
+
+        assert report.deleted_sessions == ["idle"]
+        assert report.skipped_locked == 1
+        assert await storage.list_sessions() == ["busy"]
+
+    async def test_skips_sessions_with_active_job(self, storage: StorageService) -> None:
+        await _create_session(storage, "busy", days_ago=40)
+        await _create_session(storage, "idle", days_ago=40)
+        jobs = JobService(storage)
+        release = asyncio.Event()
+
+        async def handler(job: Job) -> dict[str, Any]:
+            await release.wait()
+            return {"success": True}
+
+        job = await jobs.submit("build_and_deploy", "busy", handler)
+        gc = SessionGarbageCollector(storage, retention_days=30, busy_checks=[jobs.has_active_job])
+        try:
+            report = await gc.collect()
+        finally:
+            release.set()
+            await jobs.wait(job.id, timeout=5)
+
+        assert report.deleted_sessions == ["idle"]
+        assert report.skipped_in_use == 1
+        assert await storage.list_sessions() == ["busy"]
+
+    async def test_skips_sessions_with_running_infra_operation(
+        self, storage: StorageService, infra_service: InfraService
+    ) -> None:
+        await _create_session(storage, "busy", days_ago=40)
+        await _create_session(storage, "idle", days_ago=40)
+        gc = SessionGarbageCollector(storage, retention_days=30, busy_checks=[infra_service.has_running_operation])
+
+        async with infra_service._get_session_lock("busy"):
+            report = await gc.collect()
+
+        assert report.deleted_sessions == ["idle"]
+        assert report.skipped_in_use == 1
+        assert await storage.list_sessions() == ["busy"]
+
+    async def test_skips_sessions_with_rm_stack(self, storage: StorageService) -> None:
+        await _create_session(storage, "stack", days_ago=40, rm_stack_id="ocid1.ormstack.oc1..a")
+        await _create_session(storage, "idle", days_ago=40)
+
+        report = await SessionGarbageCollector(storage, retention_days=30).collect()
+
+        assert report.deleted_sessions == ["idle"]
+        assert report.skipped_in_use == 1
+        assert await storage.list_sessions() == ["stack"]
+
+    async def test_skips_deployed_sessions(self, storage: StorageService, app_service: AppService) -> None:
+        await _create_session(storage, "deployed", days_ago=40)
+        await _create_session(storage, "idle", days_ago=40)
+        (storage.get_session_dir("deployed") / "k8s").mkdir()
+        gc = SessionGarbageCollector(storage, retention_days=30, busy_checks=[app_service.has_deployment])
+
+        report = await gc.collect()
+
+        assert report.deleted_sessions == ["idle"]
+        assert report.skipped_in_use == 1
+        assert await storage.list_sessions() == ["deployed"]
+
+    async def test_scan_does_not_touch_cache(self, tmp_data_dir: Path) -> None:
+        storage = StorageService(tmp_data_dir, cache_size=2)
+        for i in range(5):
+            await _create_session(storage, f"old{i}", days_ago=1)
+        await _create_session(storage, "hot", days_ago=0)
+        cached = list(storage._cache)
+
+        report = await SessionGarbageCollector(storage, retention_days=30, max_total_bytes=10**9).collect()
+
+        assert report.deleted_sessions == []
+        assert list(storage._cache) == cached
+
+    async def test_prunes_old_snapshots(self, storage: StorageService) -> None:
+        await _create_session(storage, "s1", days_ago=0)
+        _create_snapshots(storage, "s1", 5)
+
+        report = await SessionGarbageCollector(storage, snapshot_retention=2).collect()
+
+        remaining = sorted(p.name for p in (storage.get_session_dir("s1") / "snapshots").iterdir())
+        assert remaining == ["snap3", "snap4"]
+        assert report.pruned_snapshots == 3
+        assert report.reclaimed_bytes > 0
+
+    async def test_evicts_oldest_sessions_over_budget(self, storage: StorageService) -> None:
+        for i in range(4):
+            await _create_session(storage, f"s{i}", days_ago=10 - i, payload=10_000)
+        await _create_session(storage, "open", days_ago=20, status="in_progress", payload=10_000)
+
+        report = await SessionGarbageCollector(storage, max_total_bytes=35_000).collect()
+
+        assert report.deleted_sessions == ["s0", "s1"]
+        assert report.total_bytes is not None and report.total_bytes <= 35_000
+
+    async def test_over_budget_skips_sessions_in_use(self, storage: StorageService) -> None:
+        await _create_session(storage, "stack", days_ago=10, payload=10_000, rm_stack_id="ocid1.ormstack.oc1..a")
+        await _create_session(storage, "busy", days_ago=9, payload=10_000)
+        await _create_session(storage, "idle", days_ago=8, payload=10_000)
+        await _create_session(storage, "new", days_ago=1, payload=10_000)
+        gc = SessionGarbageCollector(storage, max_total_bytes=35_000, busy_checks=[lambda sid: sid == "busy"])
+
+        report = await gc.collect()
+
+        assert report.deleted_sessions == ["idle"]
+        assert report.skipped_in_use == 2
+        assert sorted(await storage.list_sessions()) == ["busy", "new", "stack"]
+
+    async def test_background_task_runs_periodically(self, storage: StorageService) -> None:
+        await _create_session(storage, "old", days_ago=40)
+        gc = SessionGarbageCollector(storage, retention_days=30, interval=0.01)
+
+        gc.start()
+        for _ in range(100):
+            if gc.last_report is not None:
+                break
+            await asyncio.sleep(0.01)
+        await gc.stop()
+
+        assert gc.last_report is not None
+        assert await storage.list_sessions() == []
+
+    async def test_empty_data_dir(self, tmp_path: Path) -> None:
+        storage = StorageService(tmp_path / "empty")
+        report = await SessionGarbageCollector(storage, retention_days=1, max_total_bytes=1).collect()
+        assert report.deleted_sessions == []
+        assert report.total_bytes == 0
@@ -0,0 +1,106 @@
+"""BoundedIOExecutorのユニットテスト。"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from galley.storage.io import BoundedIOExecutor, write_text_file
+
+
+class TestBoundedIOExecutor:
+    async def test_runs_in_worker_thread(self) -> None:
+        executor = BoundedIOExecutor(max_workers=1)
+        try:
+            thread_name = await executor.run(lambda: threading.current_thread().name)
+        finally:
+            await executor.shutdown()
+        assert thread_name.startswith("galley-io")
+
+    async def test_restarts_after_shutdown(self) -> None:
+        executor = BoundedIOExecutor(max_workers=1)
+        try:
+            assert await executor.run(lambda: 1) == 1
+            await executor.shutdown()
+            assert await executor.run(lambda: 2) == 2
+        finally:
+            await executor.shutdown()
+
+    async def test_propagates_exceptions(self) -> None:
+        executor = BoundedIOExecutor(max_workers=1)
+
+        def fail() -> None:
+            raise FileNotFoundError("missing")
+
+        try:
+            with pytest.raises(FileNotFoundError):
+                await executor.run(fail)
+            assert executor.pending == 0
+        finally:
+            await executor.shutdown()
+
+    async def test_limits_running_and_queued_work(self) -> None:
+        executor = BoundedIOExecutor(max_workers=2, queue_depth=3)
+        release = threading.Event()
+        peak = 0
+
+        def blocking() -> None:
+            release.wait(timeout=5)
+
+        async def observe() -> None:
+            nonlocal peak
+            while not release.is_set():
+                peak = max(peak, executor.pending)
+                await asyncio.sleep(0.001)
+
+        tasks = [asyncio.create_task(executor.run(blocking)) for _ in range(10)]
+        observer = asyncio.create_task(observe())
+        await asyncio.sleep(0.05)
+        assert executor.pending == 5
+        release.set()
+        await asyncio.gather(*tasks, observer)
+        await executor.shutdown()
+
+        assert peak == 5
+        assert executor.pending == 0
+
+    async def test_does_not_block_event_loop(self) -> None:
+        executor = BoundedIOExecutor(max_workers=1)
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            for _ in range(10):
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        try:
+            await asyncio.gather(executor.run(time.sleep, 0.3), ticker())
+        finally:
+            await executor.shutdown()
+        assert ticks == 10
+
+    async def test_shutdown_does_not_block_event_loop(self) -> None:
+        executor = BoundedIOExecutor(max_workers=1)
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            for _ in range(10):
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        running = asyncio.create_task(executor.run(time.sleep, 0.3))
+        await asyncio.sleep(0.01)
+        await asyncio.gather(executor.shutdown(), ticker())
+
+        assert ticks == 10
+        assert running.done()
+
+
+def test_write_text_file_creates_parents(tmp_path: Path) -> None:
+    target = tmp_path / "a" / "b" / "c.txt"
+    write_text_file(target, "hello")
+    assert target.read_text(encoding="utf-8") == "hello"
@@ -0,0 +1,67 @@
+"""SessionLockManager / SessionLockのユニットテスト。"""
+
+import asyncio
+import gc
+
+import pytest
+
+from galley.storage.locks import SessionLock, SessionLockManager
+
+
+class TestSessionLockManager:
+    def test_same_session_shares_lock(self) -> None:
+        manager = SessionLockManager()
+        lock = manager.get("s1")
+        assert manager.get("s1") is lock
+        assert manager.get("s2") is not lock
+
+    async def test_locked_does_not_create_lock(self) -> None:
+        manager = SessionLockManager()
+        assert not manager.locked("s1")
+        assert len(manager) == 0
+
+        async with manager.get("s1"):
+            assert manager.locked("s1")
+        assert not manager.locked("s1")
+
+    async def test_idle_locks_are_evicted(self) -> None:
+        manager = SessionLockManager()
+        for i in range(100):
+            async with manager.get(f"s{i}"):
+                pass
+        gc.collect()
+        assert len(manager) == 0
+
+    async def test_lock_is_kept_while_held_or_awaited(self) -> None:
+        manager = SessionLockManager()
+        order: list[int] = []
+
+        async def worker(index: int) -> None:
+            async with manager.get("s1"):
+                order.append(index)
+                await asyncio.sleep(0)
+                order.append(index)
+
+        await asyncio.gather(*(worker(i) for i in range(20)))
+
+        # 各ワーカーの区間が重ならない（同一ロックが使われ続けた）
+        assert all(order[i] == order[i + 1] for i in range(0, len(order), 2))
+        gc.collect()
+        assert len(manager) == 0
+
+
+class TestSessionLock:
+    async def test_calls_on_error_only_when_body_raises(self) -> None:
+        errors: list[bool] = []
+        lock = SessionLock(asyncio.Lock(), lambda: errors.append(lock.locked()))
+
+        async with lock:
+            assert lock.locked()
+        assert errors == []
+
+        with pytest.raises(ValueError):
+            async with lock:
+                raise ValueError("failed")
+        # ロックの解放前に呼ばれる
+        assert errors == [True]
+        assert not lock.locked()
@@ -0,0 +1,198 @@
+"""ObjectStorageServiceのユニットテスト。"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from galley.models.errors import SessionNotFoundError, StorageError
+from galley.models.jobs import Job
+from galley.models.session import Answer, Session
+from galley.storage.object_storage import ObjectStorageService
+from tests.unit.storage.conftest import FakeObjectStorageServer
+
+
+@pytest.fixture
+def os_storage(tmp_path: Path, object_storage_server: FakeObjectStorageServer) -> ObjectStorageService:
+    return ObjectStorageService(
+        tmp_path / "node-a",
+        namespace="ns",
+        bucket_name="galley",
+        client=object_storage_server.create_client(),
+    )
+
+
+def _other_node(tmp_path: Path, server: FakeObjectStorageServer) -> ObjectStorageService:
+    return ObjectStorageService(
+        tmp_path / "node-b",
+        namespace="ns",
+        bucket_name="galley",
+        client=server.create_client(),
+    )
+
+
+class TestObjectStorageService:
+    def test_requires_namespace_and_bucket(self, tmp_path: Path) -> None:
+        with pytest.raises(StorageError):
+            ObjectStorageService(tmp_path, namespace="", bucket_name="galley")
+
+    async def test_save_writes_object(
+        self, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        await os_storage.save_session(Session(id="s1"))
+
+        assert "sessions/s1/session.json" in object_storage_server.objects
+        loaded = await os_storage.load_session("s1")
+        assert loaded.id == "s1"
+
+    async def test_load_reads_through_when_local_missing(
+        self, tmp_path: Path, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        session = Session(id="s1")
+        session.answers["q1"] = Answer(question_id="q1", value="v1")
+        await os_storage.save_session(session)
+        shutil.rmtree(tmp_path / "node-a")
+
+        loaded = await os_storage.load_session("s1")
+
+        assert loaded.answers["q1"].value == "v1"
+        assert (tmp_path / "node-a" / "sessions" / "s1" / "session.json").exists()
+
+    async def test_load_nonexistent_raises(self, os_storage: ObjectStorageService) -> None:
+        with pytest.raises(SessionNotFoundError):
+            await os_storage.load_session("missing")
+
+    async def test_cached_load_does_not_hit_remote(
+        self, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        await os_storage.save_session(Session(id="s1"))
+        object_storage_server.requests.clear()
+
+        await os_storage.load_session("s1")
+        await os_storage.load_session("s1")
+
+        assert object_storage_server.requests == []
+
+    async def test_concurrent_writer_is_detected(
+        self, tmp_path: Path, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        await os_storage.save_session(Session(id="s1"))
+        other = _other_node(tmp_path, object_storage_server)
+        remote = await other.load_session("s1")
+        remote.status = "completed"
+        await other.save_session(remote)
+
+        stale = await os_storage.load_session("s1")
+        with pytest.raises(StorageError, match="modified by another writer"):
+            await os_storage.save_session(stale)
+
+        # ローカルキャッシュは破棄され、次の読み込みで最新を取得する
+        reloaded = await os_storage.load_session("s1")
+        assert reloaded.status == "completed"
+        await os_storage.save_session(reloaded)
+
+    async def test_create_conflicts_with_existing_remote(
+        self, tmp_path: Path, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        await os_storage.save_session(Session(id="s1"))
+        other = _other_node(tmp_path, object_storage_server)
+
+        with pytest.raises(StorageError):
+            await other.save_session(Session(id="s1"))
+
+    async def test_answer_journal_is_shared(
+        self, tmp_path: Path, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        await os_storage.save_session(Session(id="s1"))
+        await os_storage.append_answers("s1", [Answer(question_id="q1", value="v1")])
+
+        assert "sessions/s1/answers.log" in object_storage_server.objects
+        other = _other_node(tmp_path, object_storage_server)
+        loaded = await other.load_session("s1")
+        assert loaded.answers["q1"].value == "v1"
+
+        # save時にジャーナルはsession.jsonへ畳み込まれ、リモートからも削除される
+        await os_storage.save_session(await os_storage.load_session("s1"))
+        assert "sessions/s1/answers.log" not in object_storage_server.objects
+
+    async def test_concurrent_journal_writer_is_detected(
+        self, tmp_path: Path, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        await os_storage.save_session(Session(id="s1"))
+        other = _other_node(tmp_path, object_storage_server)
+        await other.load_session("s1")
+
+        await os_storage.append_answers("s1", [Answer(question_id="q1", value="a")])
+        with pytest.raises(StorageError, match="modified by another writer"):
+            await other.append_answers("s1", [Answer(question_id="q2", value="b")])
+
+        # 競合した側は最新を読み直して追記し直せる。どちらの回答も失われない
+        await other.append_answers("s1", [Answer(question_id="q2", value="b")])
+        with pytest.raises(StorageError, match="modified by another writer"):
+            await os_storage.append_answers("s1", [Answer(question_id="q3", value="c")])
+        fresh = _other_node(tmp_path / "fresh", object_storage_server)
+        loaded = await fresh.load_session("s1")
+        assert {q: a.value for q, a in loaded.answers.items()} == {"q1": "a", "q2": "b"}
+
+    async def test_save_keeps_journal_appended_by_another_writer(
+        self, tmp_path: Path, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        await os_storage.save_session(Session(id="s1"))
+        await os_storage.append_answers("s1", [Answer(question_id="q1", value="a")])
+        other = _other_node(tmp_path, object_storage_server)
+        await other.append_answers("s1", [Answer(question_id="q2", value="b")])
+
+        session = await os_storage.load_session("s1")
+        session.status = "completed"
+        await os_storage.save_session(session)
+
+        # 畳み込んでいない回答を含むジャーナルは削除しない
+        assert "sessions/s1/answers.log" in object_storage_server.objects
+        reloaded = await os_storage.load_session("s1")
+        assert reloaded.status == "completed"
+        assert set(reloaded.answers) == {"q1", "q2"}
+
+    async def test_delete_removes_remote_and_local(
+        self, tmp_path: Path, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        await os_storage.save_session(Session(id="s1"))
+        await os_storage.append_answers("s1", [Answer(question_id="q1", value="v1")])
+
+        await os_storage.delete_session("s1")
+
+        assert object_storage_server.objects == {}
+        assert not (tmp_path / "node-a" / "sessions" / "s1").exists()
+        with pytest.raises(SessionNotFoundError):
+            await os_storage.load_session("s1")
+
+    async def test_list_sessions_paginates(
+        self, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        object_storage_server.page_size = 2
+        for i in range(5):
+            await os_storage.save_session(Session(id=f"s{i}"))
+        object_storage_server.requests.clear()
+
+        sessions = await os_storage.list_sessions()
+
+        assert sorted(sessions) == [f"s{i}" for i in range(5)]
+        assert object_storage_server.requests.count(("LIST", "")) == 3
+
+    async def test_reuses_http_connections(
+        self, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        for i in range(10):
+            await os_storage.save_session(Session(id=f"s{i}"))
+
+        assert object_storage_server.connections < 10
+
+    async def test_jobs_are_shared_between_nodes(
+        self, tmp_path: Path, os_storage: ObjectStorageService, object_storage_server: FakeObjectStorageServer
+    ) -> None:
+        job = Job(kind="terraform_apply", session_id="s1", status="running", rm_job_id="ocid1.ormjob.a")
+        await os_storage.save_job(job)
+
+        assert f"jobs/{job.id}.json" in object_storage_server.objects
+        other = _other_node(tmp_path, object_storage_server)
+        assert (await other.load_job(job.id)).rm_job_id == "ocid1.ormjob.a"
+        assert [j.id for j in await _other_node(tmp_path / "c", object_storage_server).list_jobs()] == [job.id]
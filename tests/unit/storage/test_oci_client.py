@@ -0,0 +1,117 @@
+"""OCIClientFactoryのユニットテスト。"""
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import oci
+import pytest
+
+from galley.storage.oci_client import OCIClientFactory
+from tests.unit.storage.conftest import FakeSigner
+
+
+class _FakeClient:
+    """SDKクライアントのフェイク（受け取った設定と署名者を保持する）。"""
+
+    def __init__(self, config: dict[str, Any], *, signer: Any) -> None:
+        self.config = config
+        self.signer = signer
+
+
+class _OtherFakeClient(_FakeClient):
+    pass
+
+
+@pytest.fixture
+def signers() -> list[FakeSigner]:
+    return []
+
+
+@pytest.fixture
+def factory(signers: list[FakeSigner]) -> OCIClientFactory:
+    def provide() -> FakeSigner:
+        signer = FakeSigner()
+        signers.append(signer)
+        return signer
+
+    return OCIClientFactory(signer_provider=provide)
+
+
+class TestOCIClientFactory:
+    def test_signer_is_built_once_for_all_clients(self, factory: OCIClientFactory, signers: list[FakeSigner]) -> None:
+        clients = [factory.client(_FakeClient) for _ in range(10)]
+        clients.append(factory.client(_OtherFakeClient))
+        clients.append(factory.client(_FakeClient, "us-ashburn-1"))
+
+        assert len(signers) == 1
+        assert all(client.signer is signers[0] for client in clients)
+
+    def test_clients_are_cached_per_class_and_region(self, factory: OCIClientFactory) -> None:
+        default = factory.client(_FakeClient)
+
+        assert factory.client(_FakeClient) is default
+        assert factory.client(_FakeClient, "ap-osaka-1") is default
+        assert factory.client(_OtherFakeClient) is not default
+        assert factory.client(_FakeClient, "us-ashburn-1") is not default
+        assert factory.client(_FakeClient, "us-ashburn-1").config["region"] == "us-ashburn-1"
+
+    def test_expired_token_is_refreshed_on_shared_signer(
+        self, factory: OCIClientFactory, signers: list[FakeSigner]
+    ) -> None:
+        client = factory.client(_FakeClient)
+        signers[0].expired = True
+
+        assert factory.client(_FakeClient) is client
+        assert signers[0].refreshes == 1
+        assert len(signers) == 1
+
+    def test_region_overrides_credentials_region(self) -> None:
+        factory = OCIClientFactory(region="us-phoenix-1", signer_provider=FakeSigner)
+
+        assert factory.client(_FakeClient).config["region"] == "us-phoenix-1"
+
+    def test_tenancy_id_from_signer(self, factory: OCIClientFactory) -> None:
+        assert factory.tenancy_id == "ocid1.tenancy.test"
+
+    def test_resource_principal_signer_is_not_rebuilt(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("OCI_RESOURCE_PRINCIPAL_VERSION", "2.2")
+        signer = FakeSigner(region="ap-tokyo-1", tenancy_id="ocid1.tenancy.rp")
+        with patch.object(oci.auth.signers, "get_resource_principals_signer", return_value=signer) as get_signer:
+            factory = OCIClientFactory()
+            for _ in range(5):
+                factory.client(_FakeClient)
+            assert factory.tenancy_id == "ocid1.tenancy.rp"
+
+        get_signer.assert_called_once()
+        assert factory.client(_FakeClient).config["region"] == "ap-tokyo-1"
+        assert signer.token_checks == 6
+
+    def test_api_key_config_is_loaded_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("OCI_RESOURCE_PRINCIPAL_VERSION", raising=False)
+        config = {
+            "tenancy": "ocid1.tenancy.key",
+            "user": "ocid1.user.key",
+            "fingerprint": "aa:bb",
+            "key_file": "/tmp/key.pem",
+            "region": "ap-osaka-1",
+        }
+        with (
+            patch.object(oci.config, "from_file", return_value=config) as from_file,
+            patch.object(oci.signer, "Signer", return_value=MagicMock(spec=[])) as signer_cls,
+        ):
+            factory = OCIClientFactory()
+            factory.client(_FakeClient)
+            factory.client(_OtherFakeClient)
+
+        from_file.assert_called_once()
+        signer_cls.assert_called_once()
+        assert signer_cls.call_args.kwargs["private_key_file_location"] == "/tmp/key.pem"
+        assert factory.tenancy_id == "ocid1.tenancy.key"
+
+    def test_missing_config_raises(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("OCI_RESOURCE_PRINCIPAL_VERSION", raising=False)
+        with (
+            patch.object(oci.config, "from_file", side_effect=oci.exceptions.ConfigFileNotFound("missing")),
+            pytest.raises(oci.exceptions.ConfigFileNotFound),
+        ):
+            OCIClientFactory().client(_FakeClient)
@@ -0,0 +1,65 @@
+"""セッションシリアライザのユニットテスト。"""
+
+import pytest
+
+from galley.models.errors import StorageError
+from galley.models.session import Answer, Session
+from galley.storage.serializers import (
+    JsonSessionSerializer,
+    MsgpackSessionSerializer,
+    OrjsonSessionSerializer,
+    SessionSerializer,
+    get_serializer,
+    is_json_payload,
+    load_session_payload,
+)
+
+
+def _sample_session() -> Session:
+    session = Session(id="ser-1", status="completed")
+    session.answers["q1"] = Answer(question_id="q1", value=["a", "b"])
+    return session
+
+
+class TestSessionSerializers:
+    def test_json_dumps_is_compact(self) -> None:
+        payload = JsonSessionSerializer().dumps(_sample_session())
+        assert b"\n" not in payload
+        assert is_json_payload(payload)
+
+    def test_orjson_output_is_plain_json(self) -> None:
+        pytest.importorskip("orjson")
+        session = _sample_session()
+        payload = OrjsonSessionSerializer().dumps(session)
+        assert is_json_payload(payload)
+        assert load_session_payload(payload) == session
+
+    def test_msgpack_output_is_detected_as_binary(self) -> None:
+        pytest.importorskip("msgpack")
+        session = _sample_session()
+        payload = MsgpackSessionSerializer().dumps(session)
+        assert not is_json_payload(payload)
+        assert load_session_payload(payload) == session
+
+    def test_load_indented_json(self) -> None:
+        session = _sample_session()
+        payload = ("\n" + session.model_dump_json(indent=2)).encode("utf-8")
+        assert load_session_payload(payload) == session
+
+    def test_get_serializer_unknown_name_raises_error(self) -> None:
+        with pytest.raises(StorageError):
+            get_serializer("yaml")
+
+    def test_load_empty_payload_raises_error(self) -> None:
+        with pytest.raises(StorageError):
+            load_session_payload(b"")
+
+    def test_serializer_without_loads_cannot_be_instantiated(self) -> None:
+        class DumpsOnlySerializer(SessionSerializer):
+            name = "dumps-only"
+
+            def dumps(self, session: Session) -> bytes:
+                return b""
+
+        with pytest.raises(TypeError):
+            DumpsOnlySerializer()  # type: ignore[abstract]
@@ -1,9 +1,23 @@
 """StorageServiceのユニットテスト。"""
 
+import os
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
 
-from galley.models.errors import SessionNotFoundError, StorageError
+from galley.models.errors import JobNotFoundError, SessionNotFoundError, StorageError
+from galley.models.jobs import Job
 from galley.models.session import Answer, Session
+from galley.storage.serializers import (
+    JsonSessionSerializer,
+    MsgpackSessionSerializer,
+    get_serializer,
+    load_session_payload,
+)
 from galley.storage.service import StorageService
 
 
@@ -65,3 +79,338 @@ class TestStorageService:
     async def test_directory_traversal_prevention(self, storage: StorageService) -> None:
         with pytest.raises(StorageError):
             await storage.load_session("../../../etc/passwd")
+
+
+class TestSessionCache:
+    async def test_load_session_returns_cached_session(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="cached-1"))
+
+        with patch("galley.storage.service.load_session_payload") as restore:
+            first = await storage.load_session("cached-1")
+            second = await storage.load_session("cached-1")
+
+        # ヒット時は復元（解析・検証）を行わず、キャッシュ中のセッションを返す
+        restore.assert_not_called()
+        assert first is second
+
+    async def test_failure_under_session_lock_discards_cached_session(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="cached-1b"))
+
+        with pytest.raises(RuntimeError):
+            async with storage.session_lock("cached-1b"):
+                session = await storage.load_session("cached-1b")
+                session.status = "completed"
+                raise RuntimeError("update failed")
+
+        # 保存されなかった変更はキャッシュに残らない
+        reloaded = await storage.load_session("cached-1b")
+        assert reloaded.status == "in_progress"
+        assert reloaded is not session
+        assert not storage.session_lock("cached-1b").locked()
+
+    async def test_cache_validation_runs_off_event_loop(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="cached-stat"))
+        threads: list[str] = []
+        signature = storage._signature
+
+        def record(session_id: str) -> tuple[int, int, int, int]:
+            threads.append(threading.current_thread().name)
+            return signature(session_id)
+
+        with patch.object(storage, "_signature", side_effect=record):
+            await storage.load_session("cached-stat")
+            await storage.peek_session("cached-stat")
+
+        assert len(threads) == 2
+        assert all(name.startswith("galley-io") for name in threads)
+
+    async def test_load_session_skips_file_read_on_cache_hit(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="cached-2"))
+
+        with patch.object(storage, "_read_local_session", wraps=storage._read_local_session) as read:
+            await storage.load_session("cached-2")
+            await storage.load_session("cached-2")
+        read.assert_not_called()
+
+    async def test_save_session_does_not_copy_session(self, storage: StorageService) -> None:
+        session = Session(id="cached-2b")
+
+        with patch.object(Session, "model_copy", side_effect=AssertionError("copied")):
+            await storage.save_session(session)
+            loaded = await storage.load_session("cached-2b")
+
+        assert loaded is session
+
+    async def test_appended_answers_update_cached_session(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="cached-2c"))
+        await storage.load_session("cached-2c")
+        await storage.append_answers("cached-2c", [Answer(question_id="q1", value="a")])
+
+        with patch.object(storage, "_read_local_session", wraps=storage._read_local_session) as read:
+            session = await storage.load_session("cached-2c")
+        read.assert_not_called()
+        assert session.answers["q1"].value == "a"
+
+    async def test_load_session_detects_external_modification(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="cached-3"))
+        await storage.load_session("cached-3")
+
+        # プロセス外からの書き換え（mtimeを明示的に進める）
+        session_file = storage.get_session_dir("cached-3") / "session.json"
+        modified = Session(id="cached-3", status="completed")
+        session_file.write_text(modified.model_dump_json(), encoding="utf-8")
+        stat = session_file.stat()
+        os.utime(session_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        loaded = await storage.load_session("cached-3")
+        assert loaded.status == "completed"
+
+    async def test_save_session_writes_through_cache(self, storage: StorageService) -> None:
+        session = Session(id="cached-4")
+        await storage.save_session(session)
+        await storage.load_session("cached-4")
+
+        session.status = "completed"
+        await storage.save_session(session)
+
+        loaded = await storage.load_session("cached-4")
+        assert loaded.status == "completed"
+
+    async def test_delete_session_invalidates_cache(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="cached-5"))
+        await storage.load_session("cached-5")
+        await storage.delete_session("cached-5")
+
+        with pytest.raises(SessionNotFoundError):
+            await storage.load_session("cached-5")
+
+    async def test_cache_evicts_least_recently_used(self, tmp_data_dir: Path) -> None:
+        storage = StorageService(data_dir=tmp_data_dir, cache_size=2)
+        for session_id in ("lru-a", "lru-b", "lru-c"):
+            await storage.save_session(Session(id=session_id))
+
+        assert list(storage._cache) == ["lru-b", "lru-c"]
+
+        await storage.load_session("lru-b")
+        await storage.save_session(Session(id="lru-d"))
+        assert list(storage._cache) == ["lru-b", "lru-d"]
+
+    async def test_cache_entry_expires_after_ttl(self, tmp_data_dir: Path) -> None:
+        storage = StorageService(data_dir=tmp_data_dir, cache_ttl=0.0)
+        await storage.save_session(Session(id="ttl-1"))
+
+        with patch("galley.storage.service.load_session_payload", wraps=load_session_payload) as parse:
+            await storage.load_session("ttl-1")
+        parse.assert_called_once()
+
+    async def test_cache_disabled_with_zero_size(self, tmp_data_dir: Path) -> None:
+        storage = StorageService(data_dir=tmp_data_dir, cache_size=0)
+        await storage.save_session(Session(id="nocache-1"))
+        await storage.load_session("nocache-1")
+
+        assert len(storage._cache) == 0
+
+
+class TestAtomicWrite:
+    async def test_save_session_writes_compact_json_by_default(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="atomic-1"))
+
+        raw = (storage.get_session_dir("atomic-1") / "session.json").read_text(encoding="utf-8")
+        assert raw.startswith('{"id":"atomic-1"')
+        assert "\n" not in raw
+
+    async def test_save_session_leaves_no_temp_files(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="atomic-2"))
+        await storage.save_session(Session(id="atomic-2", status="completed"))
+
+        names = [p.name for p in storage.get_session_dir("atomic-2").iterdir()]
+        assert names == ["session.json"]
+
+    async def test_failed_write_keeps_previous_file(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="atomic-3"))
+
+        with (
+            patch("galley.storage.service.os.replace", side_effect=OSError("disk full")),
+            pytest.raises(OSError),
+        ):
+            await storage.save_session(Session(id="atomic-3", status="completed"))
+
+        storage.invalidate_cache()
+        loaded = await storage.load_session("atomic-3")
+        assert loaded.status == "in_progress"
+        assert [p.name for p in storage.get_session_dir("atomic-3").iterdir()] == ["session.json"]
+
+    async def test_load_legacy_indented_json(self, storage: StorageService) -> None:
+        session_dir = storage.get_session_dir("legacy-1")
+        session_dir.mkdir(parents=True)
+        legacy = Session(id="legacy-1", status="completed")
+        (session_dir / "session.json").write_text(legacy.model_dump_json(indent=2), encoding="utf-8")
+
+        loaded = await storage.load_session("legacy-1")
+        assert loaded.status == "completed"
+
+
+class TestSessionFormats:
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+    async def test_round_trip_with_serializer(self, tmp_data_dir: Path, name: str) -> None:
+        if name != "json":
+            pytest.importorskip(name)
+        storage = StorageService(data_dir=tmp_data_dir, serializer=get_serializer(name), cache_size=0)
+        session = Session(id=f"ser-{name}")
+        session.answers["q1"] = Answer(question_id="q1", value=["a", "b"])
+        await storage.save_session(session)
+
+        loaded = await storage.load_session(f"ser-{name}")
+        assert loaded == session
+
+    async def test_load_detects_format_after_switching_serializer(self, tmp_data_dir: Path) -> None:
+        pytest.importorskip("msgpack")
+        msgpack_storage = StorageService(data_dir=tmp_data_dir, serializer=MsgpackSessionSerializer())
+        await msgpack_storage.save_session(Session(id="switch-1", status="completed"))
+
+        json_storage = StorageService(data_dir=tmp_data_dir, serializer=JsonSessionSerializer())
+        loaded = await json_storage.load_session("switch-1")
+        assert loaded.status == "completed"
+
+
+class TestAnswerJournal:
+    async def test_append_answers_does_not_rewrite_session_file(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="journal-1"))
+        session_file = storage.get_session_dir("journal-1") / "session.json"
+        before = session_file.read_bytes()
+
+        await storage.append_answers("journal-1", [Answer(question_id="q1", value="a1")])
+
+        assert session_file.read_bytes() == before
+        journal = storage.get_session_dir("journal-1") / "answers.log"
+        assert len(journal.read_text(encoding="utf-8").splitlines()) == 1
+
+    async def test_load_session_replays_journal(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="journal-2"))
+        await storage.append_answers("journal-2", [Answer(question_id="q1", value="old")])
+        await storage.append_answers("journal-2", [Answer(question_id="q1", value="new")])
+
+        storage.invalidate_cache()
+        loaded = await storage.load_session("journal-2")
+        assert loaded.answers["q1"].value == "new"
+        assert loaded.updated_at == loaded.answers["q1"].answered_at
+
+    async def test_append_answers_updates_cached_session(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="journal-3"))
+        await storage.load_session("journal-3")
+
+        await storage.append_answers("journal-3", [Answer(question_id="q1", value="a1")])
+
+        with patch.object(storage, "_read_journal", wraps=storage._read_journal) as read_journal:
+            loaded = await storage.load_session("journal-3")
+        read_journal.assert_not_called()
+        assert loaded.answers["q1"].value == "a1"
+
+    async def test_load_session_ignores_torn_journal_line(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="journal-4"))
+        await storage.append_answers("journal-4", [Answer(question_id="q1", value="a1")])
+        journal = storage.get_session_dir("journal-4") / "answers.log"
+        with open(journal, "ab") as f:
+            f.write(b'{"question_id": "q2", "val')
+
+        storage.invalidate_cache()
+        loaded = await storage.load_session("journal-4")
+        assert list(loaded.answers) == ["q1"]
+
+    async def test_save_session_folds_journal(self, storage: StorageService) -> None:
+        await storage.save_session(Session(id="journal-5"))
+        await storage.append_answers("journal-5", [Answer(question_id="q1", value="a1")])
+
+        session = await storage.load_session("journal-5")
+        await storage.save_session(session)
+
+        assert not (storage.get_session_dir("journal-5") / "answers.log").exists()
+        storage.invalidate_cache()
+        loaded = await storage.load_session("journal-5")
+        assert loaded.answers["q1"].value == "a1"
+
+    async def test_append_answers_compacts_at_threshold(self, tmp_data_dir: Path) -> None:
+        storage = StorageService(data_dir=tmp_data_dir, journal_max_bytes=300)
+        await storage.save_session(Session(id="journal-6"))
+
+        for i in range(5):
+            await storage.append_answers("journal-6", [Answer(question_id=f"q{i}", value="x" * 50)])
+
+        journal = storage.get_session_dir("journal-6") / "answers.log"
+        assert not journal.exists() or journal.stat().st_size < 300
+        storage.invalidate_cache()
+        loaded = await storage.load_session("journal-6")
+        assert sorted(loaded.answers) == [f"q{i}" for i in range(5)]
+
+    async def test_append_answers_nonexistent_session_raises_error(self, storage: StorageService) -> None:
+        with pytest.raises(SessionNotFoundError):
+            await storage.append_answers("missing", [Answer(question_id="q1", value="a1")])
+
+
+def _dated_session(session_id: str, *, days_ago: int, status: str = "in_progress") -> Session:
+    timestamp = datetime.now(UTC) - timedelta(days=days_ago)
+    return Session(id=session_id, status=status, created_at=timestamp, updated_at=timestamp)  # type: ignore[arg-type]
+
+
+class TestSessionQueries:
+    async def test_find_sessions(self, storage: StorageService) -> None:
+        await storage.save_session(_dated_session("old-done", days_ago=40, status="completed"))
+        await storage.save_session(_dated_session("new-done", days_ago=1, status="completed"))
+        await storage.save_session(_dated_session("old-open", days_ago=40))
+
+        cutoff = datetime.now(UTC) - timedelta(days=30)
+
+        assert await storage.find_sessions(status="completed", updated_before=cutoff) == ["old-done"]
+        assert await storage.list_sessions(limit=2) == ["new-done", "old-done"]
+
+    async def test_list_sessions_by_age_orders_by_file_mtime(self, storage: StorageService) -> None:
+        for session_id in ("b", "a", "c"):
+            await storage.save_session(Session(id=session_id))
+        now = time.time()
+        for age, session_id in ((30, "c"), (20, "b"), (10, "a")):
+            os.utime(storage.get_session_dir(session_id) / "session.json", (now - age, now - age))
+        # 回答の追記（ジャーナルの更新）も最終更新として扱う
+        await storage.append_answers("c", [Answer(question_id="q1", value="v1")])
+
+        assert await storage.list_sessions_by_age() == ["b", "a", "c"]
+
+    async def test_peek_session_does_not_touch_cache(self, tmp_data_dir: Path) -> None:
+        storage = StorageService(data_dir=tmp_data_dir, cache_size=2)
+        for session_id in ("hot-a", "hot-b"):
+            await storage.save_session(Session(id=session_id))
+        storage.invalidate_cache("hot-a")
+        await storage.append_answers("hot-b", [Answer(question_id="q1", value="v1")])
+
+        peeked = [await storage.peek_session(session_id) for session_id in ("hot-b", "hot-a")]
+
+        assert [s.id for s in peeked] == ["hot-b", "hot-a"]
+        assert "q1" in peeked[0].answers
+        assert list(storage._cache) == ["hot-b"]
+        with pytest.raises(SessionNotFoundError):
+            await storage.peek_session("missing")
+
+
+class TestJobs:
+    async def test_save_and_load_job(self, storage: StorageService) -> None:
+        job = Job(kind="terraform_plan", session_id="s1", params={"terraform_dir": "/tmp/tf"})
+        await storage.save_job(job)
+
+        loaded = await storage.load_job(job.id)
+
+        assert loaded == job
+
+    async def test_load_unknown_job_raises_error(self, storage: StorageService) -> None:
+        with pytest.raises(JobNotFoundError):
+            await storage.load_job("missing")
+        with pytest.raises(JobNotFoundError):
+            await storage.load_job("../sessions/s1/session")
+
+    async def test_list_jobs_filters_by_session_and_status(self, storage: StorageService) -> None:
+        first = Job(kind="terraform_plan", session_id="s1", status="succeeded")
+        second = Job(kind="terraform_apply", session_id="s1", status="running")
+        other = Job(kind="terraform_plan", session_id="s2", status="running")
+        for job in (first, second, other):
+            await storage.save_job(job)
+
+        assert [j.id for j in await storage.list_jobs(session_id="s1")] == [first.id, second.id]
+        assert [j.id for j in await storage.list_jobs(statuses={"running"})] == [second.id, other.id]
@@ -0,0 +1,179 @@
+"""SnapshotStoreのユニットテスト。"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from galley.models.errors import SnapshotNotFoundError
+from galley.storage.io import disk_usage
+from galley.storage.snapshots import SnapshotStore
+
+
+@pytest.fixture
+def app_dir(tmp_path: Path) -> Path:
+    app = tmp_path / "app"
+    (app / "src").mkdir(parents=True)
+    (app / "src" / "main.py").write_text("print('hello')\n", encoding="utf-8")
+    (app / "src" / "routes.py").write_text("routes = []\n", encoding="utf-8")
+    (app / "README.md").write_text("# app\n" * 1000, encoding="utf-8")
+    return app
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SnapshotStore:
+    return SnapshotStore(tmp_path / "snapshots")
+
+
+def _age(directory: Path, seconds: int) -> None:
+    """ディレクトリ配下のファイルの更新時刻を過去にずらす。"""
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+class TestCreate:
+    def test_records_all_files(self, store: SnapshotStore, app_dir: Path) -> None:
+        info = store.create(app_dir)
+
+        snapshot = store.get(info.snapshot_id)
+        assert sorted(snapshot.files) == ["README.md", "src/main.py", "src/routes.py"]
+        assert info.file_count == 3
+        assert info.total_bytes == sum(f.stat().st_size for f in app_dir.rglob("*") if f.is_file())
+
+    def test_unchanged_files_are_stored_once(self, store: SnapshotStore, app_dir: Path) -> None:
+        store.create(app_dir)
+        usage = disk_usage(store.root / ".objects")
+
+        (app_dir / "src" / "routes.py").write_text("routes = ['/health']\n", encoding="utf-8")
+        for _ in range(5):
+            store.create(app_dir)
+
+        growth = disk_usage(store.root / ".objects") - usage
+        assert growth == len("routes = ['/health']\n")
+        assert len(store.list_snapshots()) == 6
+
+    def test_skips_hashing_files_unchanged_since_previous_snapshot(
+        self, store: SnapshotStore, app_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _age(app_dir, 10)
+        store.create(app_dir)
+        (app_dir / "src" / "main.py").write_text("print('changed')\n", encoding="utf-8")
+
+        hashed: list[Path] = []
+        original = SnapshotStore._store_blob
+
+        def tracking(self: SnapshotStore, path: Path) -> str:
+            hashed.append(path)
+            return original(self, path)
+
+        monkeypatch.setattr(SnapshotStore, "_store_blob", tracking)
+        store.create(app_dir)
+
+        assert hashed == [app_dir / "src" / "main.py"]
+
+    def test_rehashes_recently_modified_files(self, store: SnapshotStore, app_dir: Path) -> None:
+        """直前のスナップショットと同時刻に更新されたファイルは内容から再計算する。"""
+        first = store.create(app_dir)
+        routes = app_dir / "src" / "routes.py"
+        mtime_ns = routes.stat().st_mtime_ns
+        routes.write_text("routes = [1]\n", encoding="utf-8")  # 同じサイズ
+        os.utime(routes, ns=(mtime_ns, mtime_ns))
+
+        second = store.create(app_dir)
+
+        before = store.get(first.snapshot_id).files["src/routes.py"].digest
+        after = store.get(second.snapshot_id).files["src/routes.py"].digest
+        assert before != after
+
+
+class TestRestore:
+    def test_restores_contents_and_removes_extra_files(self, store: SnapshotStore, app_dir: Path) -> None:
+        info = store.create(app_dir)
+        (app_dir / "src" / "routes.py").write_text("broken\n", encoding="utf-8")
+        (app_dir / "src" / "extra").mkdir()
+        (app_dir / "src" / "extra" / "new.py").write_text("x = 1\n", encoding="utf-8")
+        (app_dir / "README.md").unlink()
+
+        store.restore(info.snapshot_id, app_dir)
+
+        assert (app_dir / "src" / "routes.py").read_text(encoding="utf-8") == "routes = []\n"
+        assert (app_dir / "README.md").exists()
+        assert not (app_dir / "src" / "extra").exists()
+
+    def test_preserves_file_mode(self, store: SnapshotStore, app_dir: Path) -> None:
+        script = app_dir / "run.sh"
+        script.write_text("#!/bin/sh\n", encoding="utf-8")
+        script.chmod(0o755)
+        info = store.create(app_dir)
+        script.unlink()
+
+        store.restore(info.snapshot_id, app_dir)
+
+        assert script.stat().st_mode & 0o777 == 0o755
+
+    def test_skips_files_matching_current_snapshot(
+        self, store: SnapshotStore, app_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        target = store.create(app_dir)
+        (app_dir / "src" / "routes.py").write_text("changed\n", encoding="utf-8")
+        current = store.get(store.create(app_dir).snapshot_id)
+
+        copied: list[str] = []
+        original = os.replace
+
+        def tracking(src: str, dst: str | Path) -> None:
+            copied.append(Path(dst).name)
+            original(src, dst)
+
+        monkeypatch.setattr(os, "replace", tracking)
+        store.restore(target.snapshot_id, app_dir, current)
+
+        assert copied == ["routes.py"]
+
+    def test_unknown_snapshot(self, store: SnapshotStore, app_dir: Path) -> None:
+        with pytest.raises(SnapshotNotFoundError):
+            store.restore("deadbeef", app_dir)
+
+    def test_rejects_invalid_snapshot_id(self, store: SnapshotStore) -> None:
+        with pytest.raises(SnapshotNotFoundError):
+            store.get("../../session")
+
+
+class TestPrune:
+    def test_keeps_newest_and_sweeps_unreferenced_blobs(self, store: SnapshotStore, app_dir: Path) -> None:
+        routes = app_dir / "src" / "routes.py"
+        created = []
+        for i in range(4):
+            routes.write_text(f"routes = [{i}]\n", encoding="utf-8")
+            created.append(store.create(app_dir).snapshot_id)
+
+        pruned, reclaimed = store.prune(2)
+
+        assert pruned == 2
+        assert reclaimed > 0
+        assert [s.snapshot_id for s in store.list_snapshots()] == created[:1:-1]
+        blobs = [p for p in (store.root / ".objects").rglob("*") if p.is_file()]
+        # README.md・main.py と、残った2件のroutes.py
+        assert len(blobs) == 4
+        store.restore(created[2], app_dir)
+        assert routes.read_text(encoding="utf-8") == "routes = [2]\n"
+
+    def test_prunes_legacy_directory_snapshots(self, store: SnapshotStore, app_dir: Path) -> None:
+        legacy = store.root / "0ld5nap"
+        legacy.mkdir(parents=True)
+        (legacy / "main.py").write_text("print('old')\n", encoding="utf-8")
+        os.utime(legacy, (0, 0))
+        info = store.create(app_dir)
+
+        pruned, _ = store.prune(1)
+
+        assert pruned == 1
+        assert not legacy.exists()
+        assert [s.snapshot_id for s in store.list_snapshots()] == [info.snapshot_id]
+
+    def test_noop_when_under_limit(self, store: SnapshotStore, app_dir: Path) -> None:
+        store.create(app_dir)
+        assert store.prune(3) == (0, 0)
@@ -0,0 +1,184 @@
+"""SQLiteStorageServiceのユニットテスト。"""
+
+import sqlite3
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from galley.models.errors import SessionNotFoundError, StorageError
+from galley.models.session import Answer, Session
+from galley.storage.service import StorageService
+from galley.storage.sqlite import SQLiteStorageService
+
+
+@pytest.fixture
+async def sqlite_storage(tmp_path: Path) -> AsyncIterator[SQLiteStorageService]:
+    service = SQLiteStorageService(tmp_path, fsync=False)
+    yield service
+    await service.close()
+
+
+def _session(session_id: str, *, days_ago: int = 0, status: str = "in_progress", stack: str | None = None) -> Session:
+    timestamp = datetime.now(UTC) - timedelta(days=days_ago)
+    return Session(
+        id=session_id,
+        status=status,  # type: ignore[arg-type]
+        rm_stack_id=stack,
+        created_at=timestamp,
+        updated_at=timestamp,
+    )
+
+
+class TestSQLiteStorageService:
+    async def test_save_and_load(self, sqlite_storage: SQLiteStorageService) -> None:
+        session = Session(id="s1")
+        session.answers["q1"] = Answer(question_id="q1", value="v1")
+        await sqlite_storage.save_session(session)
+
+        sqlite_storage.invalidate_cache()
+        loaded = await sqlite_storage.load_session("s1")
+
+        assert loaded.answers["q1"].value == "v1"
+
+    async def test_close_shuts_down_and_reopens(self, sqlite_storage: SQLiteStorageService) -> None:
+        await sqlite_storage.save_session(Session(id="s1"))
+
+        await sqlite_storage.close()
+        assert sqlite_storage._executor is None
+        assert sqlite_storage._connections == []
+
+        sqlite_storage.invalidate_cache()
+        loaded = await sqlite_storage.load_session("s1")
+        assert loaded.id == "s1"
+
+    async def test_uses_wal_mode(self, tmp_path: Path, sqlite_storage: SQLiteStorageService) -> None:
+        await sqlite_storage.save_session(Session(id="s1"))
+
+        conn = sqlite3.connect(tmp_path / "sessions.db")
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+
+    async def test_load_nonexistent_raises(self, sqlite_storage: SQLiteStorageService) -> None:
+        with pytest.raises(SessionNotFoundError):
+            await sqlite_storage.load_session("missing")
+
+    async def test_invalid_session_id_raises(self, sqlite_storage: SQLiteStorageService) -> None:
+        with pytest.raises(StorageError):
+            await sqlite_storage.load_session("../etc")
+
+    async def test_cache_is_invalidated_by_other_process(self, tmp_path: Path) -> None:
+        first = SQLiteStorageService(tmp_path, fsync=False)
+        second = SQLiteStorageService(tmp_path, fsync=False)
+        try:
+            await first.save_session(Session(id="s1"))
+            await first.load_session("s1")
+
+            updated = await second.load_session("s1")
+            updated.status = "completed"
+            await second.save_session(updated)
+
+            assert (await first.load_session("s1")).status == "completed"
+        finally:
+            await first.close()
+            await second.close()
+
+    async def test_append_answers_is_replayed(self, sqlite_storage: SQLiteStorageService) -> None:
+        await sqlite_storage.save_session(Session(id="s1"))
+        await sqlite_storage.load_session("s1")
+
+        await sqlite_storage.append_answers("s1", [Answer(question_id="q1", value="v1")])
+        await sqlite_storage.append_answers("s1", [Answer(question_id="q1", value="v2")])
+
+        assert (await sqlite_storage.load_session("s1")).answers["q1"].value == "v2"
+        sqlite_storage.invalidate_cache()
+        assert (await sqlite_storage.load_session("s1")).answers["q1"].value == "v2"
+
+    async def test_append_answers_to_missing_session_raises(self, sqlite_storage: SQLiteStorageService) -> None:
+        with pytest.raises(SessionNotFoundError):
+            await sqlite_storage.append_answers("missing", [Answer(question_id="q1", value="v1")])
+
+    async def test_journal_is_compacted_at_threshold(self, tmp_path: Path) -> None:
+        service = SQLiteStorageService(tmp_path, fsync=False, journal_max_bytes=200)
+        try:
+            await service.save_session(Session(id="s1"))
+            for i in range(5):
+                await service.append_answers("s1", [Answer(question_id=f"q{i}", value="v")])
+
+            conn = sqlite3.connect(tmp_path / "sessions.db")
+            try:
+                (count,) = conn.execute("SELECT count(*) FROM answer_journal").fetchone()
+            finally:
+                conn.close()
+            assert count < 5
+            assert len((await service.load_session("s1")).answers) == 5
+        finally:
+            await service.close()
+
+    async def test_delete_session(self, tmp_path: Path, sqlite_storage: SQLiteStorageService) -> None:
+        await sqlite_storage.save_session(Session(id="s1"))
+        sqlite_storage.get_session_dir("s1").mkdir(parents=True)
+
+        await sqlite_storage.delete_session("s1")
+
+        assert not sqlite_storage.get_session_dir("s1").exists()
+        with pytest.raises(SessionNotFoundError):
+            await sqlite_storage.load_session("s1")
+
+    async def test_list_sessions_paginates(self, sqlite_storage: SQLiteStorageService) -> None:
+        for i in range(5):
+            await sqlite_storage.save_session(Session(id=f"s{i}"))
+
+        assert await sqlite_storage.list_sessions() == ["s0", "s1", "s2", "s3", "s4"]
+        assert await sqlite_storage.list_sessions(limit=2, offset=2) == ["s2", "s3"]
+
+    async def test_find_sessions_by_status_and_age(self, sqlite_storage: SQLiteStorageService) -> None:
+        await sqlite_storage.save_session(_session("old-done", days_ago=40, status="completed"))
+        await sqlite_storage.save_session(_session("older-done", days_ago=60, status="completed"))
+        await sqlite_storage.save_session(_session("new-done", days_ago=1, status="completed"))
+        await sqlite_storage.save_session(_session("old-open", days_ago=40))
+
+        cutoff = datetime.now(UTC) - timedelta(days=30)
+        found = await sqlite_storage.find_sessions(status="completed", updated_before=cutoff)
+
+        assert found == ["older-done", "old-done"]
+
+    async def test_find_sessions_by_stack_id(self, sqlite_storage: SQLiteStorageService) -> None:
+        await sqlite_storage.save_session(_session("s1", stack="ocid1.ormstack.a"))
+        await sqlite_storage.save_session(_session("s2", stack="ocid1.ormstack.b"))
+
+        assert await sqlite_storage.find_sessions(rm_stack_id="ocid1.ormstack.b") == ["s2"]
+
+    async def test_list_sessions_by_age_and_peek(self, sqlite_storage: SQLiteStorageService) -> None:
+        await sqlite_storage.save_session(_session("new", days_ago=1))
+        await sqlite_storage.save_session(_session("old", days_ago=40))
+        await sqlite_storage.append_answers("old", [Answer(question_id="q1", value="v1")])
+        sqlite_storage.invalidate_cache()
+
+        assert await sqlite_storage.list_sessions_by_age() == ["new", "old"]
+        assert "q1" in (await sqlite_storage.peek_session("old")).answers
+        assert len(sqlite_storage._cache) == 0
+
+    async def test_answers_update_updated_at_index(self, sqlite_storage: SQLiteStorageService) -> None:
+        await sqlite_storage.save_session(_session("s1", days_ago=40))
+        cutoff = datetime.now(UTC) - timedelta(days=30)
+        assert await sqlite_storage.find_sessions(updated_before=cutoff) == ["s1"]
+
+        await sqlite_storage.append_answers("s1", [Answer(question_id="q1", value="v1")])
+
+        assert await sqlite_storage.find_sessions(updated_before=cutoff) == []
+
+    async def test_imports_existing_file_sessions(self, tmp_path: Path) -> None:
+        file_storage = StorageService(tmp_path)
+        await file_storage.save_session(Session(id="legacy"))
+        await file_storage.append_answers("legacy", [Answer(question_id="q1", value="v1")])
+
+        service = SQLiteStorageService(tmp_path, fsync=False)
+        try:
+            loaded = await service.load_session("legacy")
+        finally:
+            await service.close()
+        assert loaded.answers["q1"].value == "v1"
@@ -1,9 +1,17 @@
 """ArchitectureValidatorのユニットテスト。"""
 
+import random
 from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+import yaml
 
 from galley.models.architecture import Architecture, Component, Connection
-from galley.validators.architecture import ArchitectureValidator
+from galley.models.validation import ValidationResult, ValidationRule
+from galley.validators.architecture import ArchitectureValidator, compile_component_rules, compile_rules
+from galley.validators.graph import ArchitectureGraph
 
 
 class TestArchitectureValidator:
@@ -82,3 +90,401 @@ class TestArchitectureValidator:
         # apigateway -> functions connection: info level only, no errors
         error_results = [r for r in results if r.severity == "error"]
         assert len(error_results) == 0
+
+
+def _write_rules(config_dir: Path, rules: list[dict[str, Any]]) -> None:
+    rules_dir = config_dir / "validation-rules"
+    rules_dir.mkdir(parents=True, exist_ok=True)
+    (rules_dir / "rules.yaml").write_text(yaml.safe_dump({"rules": rules}), encoding="utf-8")
+
+
+def _rule(rule_id: str, condition: dict[str, str], target_config: dict[str, str] | None = None) -> dict[str, Any]:
+    return {
+        "id": rule_id,
+        "description": rule_id,
+        "severity": "error",
+        "condition": condition,
+        "requirement": {"target_config": target_config or {"endpoint_type": "private"}},
+        "recommendation": "",
+    }
+
+
+def _requirement_rule(rule_id: str, condition: dict[str, str], requirement: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": rule_id,
+        "description": rule_id,
+        "severity": "warning",
+        "condition": condition,
+        "requirement": requirement,
+        "recommendation": "",
+    }
+
+
+# グラフ述語を使うルール一式
+_GRAPH_RULES = [
+    _requirement_rule("same-vcn", {"source_service": "compute", "target_service": "adb"}, {"same_vcn": True}),
+    _requirement_rule("oke-needs-lb", {"service": "oke"}, {"incoming": {"service": "loadbalancer", "min": 1}}),
+    _requirement_rule("adb-in-subnet", {"service": "adb"}, {"deployed_in": "subnet"}),
+    _requirement_rule("adb-reachable-from-oke", {"service": "adb"}, {"reachable_from": "oke"}),
+    _requirement_rule("lb-fanout", {"service": "loadbalancer"}, {"outgoing": {"connection_type": "public", "max": 1}}),
+    _requirement_rule(
+        "lb-oke-in-vcn",
+        {"source_service": "loadbalancer", "target_service": "oke"},
+        {"deployed_in": "vcn", "target_config": {}},
+    ),
+]
+
+
+def _oke_adb_architecture(connection_type: str) -> Architecture:
+    return Architecture(
+        session_id="s1",
+        components=[
+            Component(id="oke-1", service_type="oke", display_name="OKE"),
+            Component(id="adb-1", service_type="adb", display_name="ADB"),
+        ],
+        connections=[
+            Connection(source_id="oke-1", target_id="adb-1", connection_type=connection_type, description=""),
+        ],
+    )
+
+
+class TestCompileRules:
+    def test_rules_are_bucketed_by_services_and_connection_type(self) -> None:
+        rules = [
+            ValidationRule.model_validate(_rule("any", {"source_service": "oke", "target_service": "adb"})),
+            ValidationRule.model_validate(
+                _rule("typed", {"source_service": "oke", "target_service": "adb", "connection_type": "public"})
+            ),
+            ValidationRule.model_validate(_rule("no-target", {"source_service": "oke"})),
+        ]
+
+        index = compile_rules(rules)
+
+        assert {key: [rule.id for _, rule in bucket] for key, bucket in index.items()} == {
+            ("oke", "adb", None): ["any"],
+            ("oke", "adb", "public"): ["typed"],
+        }
+        assert index[("oke", "adb", "public")][0][0] == 1
+
+    def test_component_rules_are_bucketed_by_service(self) -> None:
+        rules = [ValidationRule.model_validate(r) for r in _GRAPH_RULES]
+
+        index = compile_component_rules(rules)
+
+        assert {key: [rule.id for _, rule in bucket] for key, bucket in index.items()} == {
+            "oke": ["oke-needs-lb"],
+            "adb": ["adb-in-subnet", "adb-reachable-from-oke"],
+            "loadbalancer": ["lb-fanout"],
+        }
+        assert ("loadbalancer", "oke", None) in compile_rules(rules)
+
+
+class TestIndexedRules:
+    def test_connection_type_rule_applies_only_to_matching_connections(self, tmp_path: Path) -> None:
+        _write_rules(
+            tmp_path,
+            [_rule("public-only", {"source_service": "oke", "target_service": "adb", "connection_type": "public"})],
+        )
+        validator = ArchitectureValidator(config_dir=tmp_path)
+
+        assert [r.rule_id for r in validator.validate(_oke_adb_architecture("public"))] == ["public-only"]
+        assert validator.validate(_oke_adb_architecture("private_endpoint")) == []
+
+    def test_results_follow_rule_order(self, tmp_path: Path) -> None:
+        _write_rules(
+            tmp_path,
+            [
+                _rule("first", {"source_service": "oke", "target_service": "adb", "connection_type": "public"}),
+                _rule("second", {"source_service": "oke", "target_service": "adb"}),
+                _rule("third", {"source_service": "oke", "target_service": "adb", "connection_type": "public"}),
+            ],
+        )
+        validator = ArchitectureValidator(config_dir=tmp_path)
+
+        results = validator.validate(_oke_adb_architecture("public"))
+
+        assert [r.rule_id for r in results] == ["first", "second", "third"]
+
+    def test_rules_are_compiled_once(self, tmp_path: Path) -> None:
+        _write_rules(tmp_path, [_rule("any", {"source_service": "oke", "target_service": "adb"})])
+        validator = ArchitectureValidator(config_dir=tmp_path)
+
+        validator.validate(_oke_adb_architecture("public"))
+        index = validator._rule_index
+        validator.validate(_oke_adb_architecture("public"))
+
+        assert index is not None
+        assert validator._rule_index is index
+
+    def test_subnet_placement_checked_in_same_pass(self, tmp_path: Path) -> None:
+        validator = ArchitectureValidator(config_dir=tmp_path)
+        arch = Architecture(
+            session_id="s1",
+            components=[
+                Component(id="lb-1", service_type="loadbalancer", display_name="LB"),
+                Component(
+                    id="sn-1", service_type="subnet", display_name="Private", config={"prohibit_public_ip": True}
+                ),
+            ],
+            connections=[Connection(source_id="lb-1", target_id="sn-1", connection_type="deployed_in", description="")],
+        )
+
+        results = validator.validate(arch)
+
+        assert [(r.rule_id, r.affected_components) for r in results] == [
+            ("public-resource-private-subnet", ["lb-1", "sn-1"])
+        ]
+
+
+def _placed_architecture() -> Architecture:
+    """VCN-A/VCN-Bのサブネットにコンポーネントを配置したアーキテクチャ。"""
+
+    def connect(source_id: str, target_id: str, connection_type: str = "public") -> Connection:
+        return Connection(source_id=source_id, target_id=target_id, connection_type=connection_type, description="")
+
+    return Architecture(
+        session_id="s1",
+        components=[
+            Component(id="vcn-a", service_type="vcn", display_name="VCN-A"),
+            Component(id="vcn-b", service_type="vcn", display_name="VCN-B"),
+            Component(id="subnet-a", service_type="subnet", display_name="subnet-a"),
+            Component(id="subnet-b", service_type="subnet", display_name="subnet-b"),
+            Component(id="vm", service_type="compute", display_name="VM"),
+            Component(id="adb", service_type="adb", display_name="ADB", config={"endpoint_type": "private"}),
+        ],
+        connections=[
+            connect("subnet-a", "vcn-a", "deployed_in"),
+            connect("subnet-b", "vcn-b", "deployed_in"),
+            connect("vm", "subnet-a", "deployed_in"),
+            connect("adb", "subnet-b", "deployed_in"),
+            connect("vm", "adb", "private_endpoint"),
+        ],
+    )
+
+
+class TestGraphRequirements:
+    def test_same_vcn_rule_fires_for_different_vcns(self, config_dir: Path) -> None:
+        validator = ArchitectureValidator(config_dir=config_dir)
+
+        results = validator.validate(_placed_architecture())
+
+        assert [(r.rule_id, r.affected_components) for r in results] == [("compute-adb-same-vcn", ["vm", "adb"])]
+
+    def test_same_vcn_rule_passes_for_same_vcn(self, config_dir: Path) -> None:
+        validator = ArchitectureValidator(config_dir=config_dir)
+        arch = _placed_architecture()
+        arch.connections[3] = Connection(
+            source_id="adb", target_id="subnet-a", connection_type="deployed_in", description=""
+        )
+
+        assert validator.validate(arch) == []
+
+    def test_same_vcn_rule_ignores_unplaced_components(self, config_dir: Path) -> None:
+        validator = ArchitectureValidator(config_dir=config_dir)
+        arch = _placed_architecture()
+        arch.connections = [c for c in arch.connections if c.source_id != "adb"]
+
+        assert validator.validate(arch) == []
+
+    def test_component_rules(self, tmp_path: Path) -> None:
+        _write_rules(tmp_path, _GRAPH_RULES)
+        validator = ArchitectureValidator(config_dir=tmp_path)
+        arch = _placed_architecture()
+        arch.components += [
+            Component(id="oke", service_type="oke", display_name="OKE"),
+            Component(id="lb", service_type="loadbalancer", display_name="LB"),
+        ]
+        arch.connections += [
+            Connection(source_id="lb", target_id="vm", connection_type="public", description=""),
+            Connection(source_id="lb", target_id="adb", connection_type="public", description=""),
+        ]
+
+        results = validator.validate(arch)
+
+        assert [(r.rule_id, r.affected_components) for r in results] == [
+            ("same-vcn", ["vm", "adb"]),
+            ("oke-needs-lb", ["oke"]),
+            ("adb-reachable-from-oke", ["adb"]),
+            ("lb-fanout", ["lb"]),
+        ]
+        assert results[1].message == "OKE (oke): oke-needs-lb"
+
+    def test_connection_rule_evaluates_graph_predicate_on_target(self, tmp_path: Path) -> None:
+        _write_rules(tmp_path, _GRAPH_RULES)
+        validator = ArchitectureValidator(config_dir=tmp_path)
+        arch = _placed_architecture()
+        arch.components += [
+            Component(id="oke", service_type="oke", display_name="OKE"),
+            Component(id="lb", service_type="loadbalancer", display_name="LB"),
+        ]
+        arch.connections.append(Connection(source_id="lb", target_id="oke", connection_type="public", description=""))
+
+        assert "lb-oke-in-vcn" in [r.rule_id for r in validator.validate(arch)]
+
+        arch.connections.append(
+            Connection(source_id="oke", target_id="subnet-a", connection_type="deployed_in", description="")
+        )
+        assert "lb-oke-in-vcn" not in [r.rule_id for r in validator.validate(arch)]
+
+    def test_graph_is_built_once_per_validation(self, config_dir: Path) -> None:
+        validator = ArchitectureValidator(config_dir=config_dir)
+
+        with patch("galley.validators.architecture.ArchitectureGraph", wraps=ArchitectureGraph) as graph_class:
+            validator.validate(_placed_architecture())
+
+        assert graph_class.call_count == 1
+
+    def test_graph_is_not_built_without_graph_rules(self, tmp_path: Path) -> None:
+        _write_rules(tmp_path, [_rule("any", {"source_service": "oke", "target_service": "adb"})])
+        validator = ArchitectureValidator(config_dir=tmp_path)
+
+        with patch("galley.validators.architecture.ArchitectureGraph") as graph_class:
+            validator.validate(_placed_architecture())
+
+        graph_class.assert_not_called()
+
+    def test_graph_rules_are_reevaluated_incrementally(self, config_dir: Path) -> None:
+        validator = ArchitectureValidator(config_dir=config_dir)
+        arch = _placed_architecture()
+        previous = validator.validate(arch)
+        # サブネットの配置先だけを変更する（VMとADBは変更されていない）
+        arch.connections[1] = Connection(
+            source_id="subnet-b", target_id="vcn-a", connection_type="deployed_in", description=""
+        )
+
+        results = validator.validate(arch, previous=previous, dirty_component_ids={"subnet-b", "vcn-a", "vcn-b"})
+
+        assert results == validator.validate(arch) == []
+
+
+class TestIncrementalValidation:
+    """差分検証が全体の検証と同じ結果（順序を含む）を返すことを確認する。"""
+
+    _SERVICE_TYPES = [
+        "oke",
+        "adb",
+        "compute",
+        "loadbalancer",
+        "apigateway",
+        "subnet",
+        "vcn",
+        "objectstorage",
+        "streaming",
+    ]
+    _CONNECTION_TYPES = ["public", "private_endpoint", "deployed_in"]
+
+    def _random_component(self, rng: random.Random, index: int) -> Component:
+        service_type = rng.choice(self._SERVICE_TYPES)
+        config: dict[str, Any] = {}
+        if service_type == "adb":
+            config["endpoint_type"] = rng.choice(["private", "public"])
+        elif service_type == "subnet":
+            config["prohibit_public_ip"] = rng.choice(["true", "false"])
+        elif service_type == "loadbalancer":
+            config["is_private"] = rng.choice(["true", "false"])
+        name = rng.choice([f"component-{index}", f"component {index}"])
+        return Component(id=f"c-{index}", service_type=service_type, display_name=name, config=config)
+
+    def _random_connection(self, rng: random.Random, arch: Architecture) -> Connection:
+        source, target = rng.choice(arch.components), rng.choice(arch.components)
+        return Connection(
+            source_id=source.id,
+            target_id=target.id,
+            connection_type=rng.choice(self._CONNECTION_TYPES),
+            description="",
+        )
+
+    def _mutate(self, rng: random.Random, arch: Architecture, next_index: int) -> None:
+        """ランダムな変更を1つ加え、DesignServiceと同じ規則で変更したコンポーネントを記録する。"""
+        operation = rng.choice(["add", "remove", "configure", "rename", "connect", "disconnect"])
+        if operation == "add" or not arch.components:
+            component = self._random_component(rng, next_index)
+            arch.components.append(component)
+            arch.mark_dirty(component.id)
+        elif operation == "remove":
+            component = arch.components.pop(rng.randrange(len(arch.components)))
+            arch.mark_dirty(component.id)
+            for conn in arch.connections:
+                if component.id in (conn.source_id, conn.target_id):
+                    arch.mark_dirty(conn.source_id, conn.target_id)
+            arch.connections = [c for c in arch.connections if component.id not in (c.source_id, c.target_id)]
+        elif operation == "configure":
+            component = rng.choice(arch.components)
+            replacement = self._random_component(rng, next_index)
+            component.config.update(replacement.config)
+            arch.mark_dirty(component.id)
+        elif operation == "rename":
+            component = rng.choice(arch.components)
+            component.display_name = rng.choice(["renamed", "renamed name"])
+            arch.mark_dirty(component.id)
+        elif operation == "connect":
+            conn = self._random_connection(rng, arch)
+            arch.connections.append(conn)
+            arch.mark_dirty(conn.source_id, conn.target_id)
+        elif arch.connections:
+            conn = arch.connections.pop(rng.randrange(len(arch.connections)))
+            arch.mark_dirty(conn.source_id, conn.target_id)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_incremental_matches_full_validation(self, config_dir: Path, seed: int) -> None:
+        rng = random.Random(seed)
+        validator = ArchitectureValidator(config_dir=config_dir)
+        self._check_incremental_matches_full(rng, validator)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_incremental_matches_full_validation_with_graph_rules(self, tmp_path: Path, seed: int) -> None:
+        _write_rules(tmp_path, _GRAPH_RULES)
+        validator = ArchitectureValidator(config_dir=tmp_path)
+        self._check_incremental_matches_full(random.Random(seed), validator)
+
+    def _check_incremental_matches_full(self, rng: random.Random, validator: ArchitectureValidator) -> None:
+        arch = Architecture(session_id="s1", components=[self._random_component(rng, i) for i in range(30)])
+        arch.connections = [self._random_connection(rng, arch) for _ in range(40)]
+        previous = validator.validate(arch)
+        arch.validation_results = [r.model_dump() for r in previous]
+
+        for step in range(15):
+            for i in range(rng.randint(1, 3)):
+                self._mutate(rng, arch, next_index=100 + step * 3 + i)
+            incremental = validator.validate(arch, previous=previous, dirty_component_ids=arch.dirty_component_ids)
+
+            assert incremental == validator.validate(arch)
+            previous = incremental
+            arch.dirty_component_ids = []
+
+    def test_unchanged_connections_are_not_rechecked(self, config_dir: Path) -> None:
+        validator = ArchitectureValidator(config_dir=config_dir)
+        arch = _oke_adb_architecture("public")
+        arch.components.append(Component(id="oke-2", service_type="oke", display_name="OKE2"))
+        arch.connections.append(
+            Connection(source_id="oke-2", target_id="adb-1", connection_type="public", description="")
+        )
+        previous = validator.validate(arch)
+
+        with patch.object(validator, "_check_requirement", wraps=validator._check_requirement) as check:
+            results = validator.validate(arch, previous=previous, dirty_component_ids={"oke-2"})
+
+        assert check.call_count == 1
+        assert results == previous
+
+    def test_previous_results_of_unknown_rules_are_dropped(self, tmp_path: Path) -> None:
+        _write_rules(tmp_path, [_rule("current", {"source_service": "oke", "target_service": "adb"})])
+        validator = ArchitectureValidator(config_dir=tmp_path)
+        stale = ValidationResult(
+            severity="error",
+            rule_id="removed-rule",
+            message="",
+            affected_components=["oke-1", "adb-1"],
+            recommendation="",
+        )
+
+        results = validator.validate(_oke_adb_architecture("public"), previous=[stale])
+
+        assert results == []
+
+    def test_rules_digest_changes_with_rules(self, tmp_path: Path) -> None:
+        _write_rules(tmp_path, [_rule("a", {"source_service": "oke", "target_service": "adb"})])
+        digest = ArchitectureValidator(config_dir=tmp_path).rules_digest
+        _write_rules(tmp_path, [_rule("b", {"source_service": "oke", "target_service": "adb"})])
+
+        assert ArchitectureValidator(config_dir=tmp_path).rules_digest != digest
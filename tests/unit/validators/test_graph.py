@@ -0,0 +1,171 @@
+"""ArchitectureGraphのユニットテスト。"""
+
+from galley.models.architecture import Architecture, Component, Connection
+from galley.validators.graph import ArchitectureGraph
+
+
+def _component(component_id: str, service_type: str) -> Component:
+    return Component(id=component_id, service_type=service_type, display_name=component_id)
+
+
+def _connection(source_id: str, target_id: str, connection_type: str = "public") -> Connection:
+    return Connection(source_id=source_id, target_id=target_id, connection_type=connection_type, description="")
+
+
+def _network_architecture() -> Architecture:
+    """2つのVCNにサブネットとコンポーネントを配置したアーキテクチャ。"""
+    return Architecture(
+        session_id="s1",
+        components=[
+            _component("vcn-a", "vcn"),
+            _component("vcn-b", "vcn"),
+            _component("subnet-a", "subnet"),
+            _component("subnet-b", "subnet"),
+            _component("lb", "loadbalancer"),
+            _component("oke", "oke"),
+            _component("adb", "adb"),
+            _component("vm", "compute"),
+        ],
+        connections=[
+            _connection("subnet-a", "vcn-a", "deployed_in"),
+            _connection("subnet-b", "vcn-b", "deployed_in"),
+            _connection("lb", "subnet-a", "deployed_in"),
+            _connection("oke", "subnet-a", "deployed_in"),
+            _connection("adb", "subnet-b", "deployed_in"),
+            _connection("lb", "oke"),
+            _connection("oke", "adb", "private_endpoint"),
+        ],
+    )
+
+
+class TestContainers:
+    def test_containers_follow_deployed_in_transitively(self) -> None:
+        graph = ArchitectureGraph(_network_architecture())
+
+        assert graph.containers("lb", "vcn") == {"vcn-a"}
+        assert graph.containers("lb", "subnet") == {"subnet-a"}
+        assert graph.containers("vcn-a", "vcn") == frozenset()
+        assert graph.containers("vm", "vcn") == frozenset()
+
+    def test_containers_are_memoized_per_service(self) -> None:
+        graph = ArchitectureGraph(_network_architecture())
+
+        first = graph.containers("oke", "vcn")
+
+        assert graph.containers("oke", "vcn") is first
+        assert graph._containers["vcn"]["subnet-a"] == {"vcn-a"}
+
+    def test_cycle_terminates(self) -> None:
+        arch = Architecture(
+            session_id="s1",
+            components=[_component("a", "subnet"), _component("b", "subnet")],
+            connections=[_connection("a", "b", "deployed_in"), _connection("b", "a", "deployed_in")],
+        )
+        graph = ArchitectureGraph(arch)
+
+        assert graph.containers("a", "subnet") == {"b"}
+
+    def test_cycle_results_do_not_depend_on_query_order(self) -> None:
+        arch = Architecture(
+            session_id="s1",
+            components=[_component("a", "subnet"), _component("b", "subnet"), _component("c", "subnet")]
+            + [_component("vcn", "vcn"), _component("vm", "compute")],
+            connections=[
+                _connection("a", "b", "deployed_in"),
+                _connection("b", "c", "deployed_in"),
+                _connection("c", "a", "deployed_in"),
+                _connection("c", "vcn", "deployed_in"),
+                _connection("vm", "a", "deployed_in"),
+            ],
+        )
+        expected = {"a": {"b", "c"}, "b": {"a", "c"}, "c": {"a", "b"}, "vm": {"a", "b", "c"}}
+
+        for first in ("a", "b", "c", "vm"):
+            graph = ArchitectureGraph(arch)
+            graph.containers(first, "subnet")
+            assert {node: graph.containers(node, "subnet") for node in expected} == expected
+            assert all(graph.vcn_of(node) == "vcn" for node in expected)
+
+    def test_long_chain_does_not_recurse(self) -> None:
+        count = 5000
+        components = [_component(f"c-{i}", "subnet") for i in range(count)] + [_component("vcn", "vcn")]
+        connections = [_connection(f"c-{i}", f"c-{i + 1}", "deployed_in") for i in range(count - 1)]
+        connections.append(_connection(f"c-{count - 1}", "vcn", "deployed_in"))
+        graph = ArchitectureGraph(Architecture(session_id="s1", components=components, connections=connections))
+
+        assert graph.vcn_of("c-0") == "vcn"
+
+    def test_dangling_connections_are_ignored(self) -> None:
+        arch = Architecture(
+            session_id="s1",
+            components=[_component("a", "compute")],
+            connections=[_connection("a", "missing", "deployed_in"), _connection("missing", "a")],
+        )
+        graph = ArchitectureGraph(arch)
+
+        assert graph.containers("a", "subnet") == frozenset()
+        assert graph.degree("a", direction="incoming") == 0
+
+
+class TestContainment:
+    def test_vcn_of_resolves_containing_vcn(self) -> None:
+        graph = ArchitectureGraph(_network_architecture())
+
+        assert graph.vcn_of("oke") == "vcn-a"
+        assert graph.vcn_of("adb") == "vcn-b"
+        assert graph.vcn_of("vcn-a") == "vcn-a"
+        assert graph.vcn_of("vm") is None
+        assert graph.vcn_of("missing") is None
+
+    def test_vcn_of_is_none_when_ambiguous(self) -> None:
+        arch = _network_architecture()
+        arch.connections.append(_connection("vm", "subnet-a", "deployed_in"))
+        arch.connections.append(_connection("vm", "subnet-b", "deployed_in"))
+        graph = ArchitectureGraph(arch)
+
+        assert graph.vcn_of("vm") is None
+
+    def test_is_deployed_in(self) -> None:
+        graph = ArchitectureGraph(_network_architecture())
+
+        assert graph.is_deployed_in("lb", "subnet") is True
+        assert graph.is_deployed_in("lb", "vcn") is True
+        assert graph.is_deployed_in("vm", "subnet") is False
+
+
+class TestReachability:
+    def test_reachable_along_connections_excluding_containment(self) -> None:
+        graph = ArchitectureGraph(_network_architecture())
+
+        assert graph.is_reachable_from("oke", "loadbalancer") is True
+        assert graph.is_reachable_from("adb", "loadbalancer") is True
+        # deployed_inは通信経路として扱わない
+        assert graph.is_reachable_from("subnet-a", "loadbalancer") is False
+        # 向きは接続元から接続先
+        assert graph.is_reachable_from("lb", "adb") is False
+
+    def test_start_component_is_not_reachable_from_itself(self) -> None:
+        graph = ArchitectureGraph(_network_architecture())
+
+        assert graph.is_reachable_from("lb", "loadbalancer") is False
+
+    def test_reachable_sets_are_memoized_per_service(self) -> None:
+        graph = ArchitectureGraph(_network_architecture())
+
+        graph.is_reachable_from("oke", "loadbalancer")
+
+        assert graph._reachable["loadbalancer"] == {"oke", "adb"}
+
+
+class TestDegree:
+    def test_degree_filters_by_service_and_connection_type(self) -> None:
+        arch = _network_architecture()
+        arch.components.append(_component("lb2", "loadbalancer"))
+        arch.connections.append(_connection("lb2", "oke"))
+        graph = ArchitectureGraph(arch)
+
+        assert graph.degree("oke", direction="incoming") == 2
+        assert graph.degree("oke", direction="incoming", service_type="loadbalancer") == 2
+        assert graph.degree("oke", direction="outgoing") == 2
+        assert graph.degree("oke", direction="outgoing", connection_type="deployed_in") == 1
+        assert graph.degree("oke", direction="outgoing", service_type="adb") == 1